@@ -93,6 +93,15 @@ def create_app(config_name: str | None = None):
     # Register CLI commands
     register_commands(app)
 
+    # Resume lead alert escalations queued before this process started
+    if not app.testing:
+        try:
+            from app.services.alert_service import alert_service
+
+            alert_service.start_escalation_scheduler()
+        except Exception as e:
+            app.logger.warning(f"Failed to start escalation scheduler: {e}")
+
     # Health check endpoint
     @app.route("/health")
     def health_check():
@@ -373,6 +382,15 @@ def register_blueprints(app):
     except Exception as e:
         app.logger.warning(f"Failed to register CRM assistant routes: {e}")
 
+    # Background Job Routes (status, results and cancellation of queued work)
+    try:
+        from app.routes import jobs
+
+        app.register_blueprint(jobs.bp, url_prefix="/api/jobs")
+        app.logger.info("Background job routes registered successfully")
+    except Exception as e:
+        app.logger.warning(f"Failed to register background job routes: {e}")
+
 
 def register_error_handlers(app):
     """
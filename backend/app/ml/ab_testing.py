@@ -6,9 +6,13 @@ for testing different model versions, features, and configurations.
 """
 
 from typing import Dict, List, Optional, Any
+from collections import deque
 from datetime import datetime, timedelta
 from enum import Enum
 import hashlib
+import json
+import os
+import threading
 import numpy as np
 from scipy import stats
 from sqlalchemy.orm import Session
@@ -16,6 +20,7 @@ from sqlalchemy import func, and_
 from pydantic import BaseModel, Field
 
 from app.database import get_db
+from app.utils import redis_cache
 
 
 class ExperimentStatus(str, Enum):
@@ -45,6 +50,12 @@ class ExperimentConfig(BaseModel):
     significance_level: float = Field(0.05, description="Statistical significance threshold")
     start_date: Optional[datetime] = None
     end_date: Optional[datetime] = None
+    sequential_testing: bool = Field(
+        False, description="Use always-valid (mSPRT) p-values so the experiment can stop as soon as one is significant"
+    )
+    sequential_tau: float = Field(
+        0.05, gt=0, description="Expected absolute conversion-rate difference (mSPRT mixing scale)"
+    )
 
 
 class ExperimentResult(BaseModel):
@@ -58,13 +69,140 @@ class ExperimentResult(BaseModel):
     is_winner: bool = False
 
 
+STAT_FIELDS = ('n', 'conversions', 'sum', 'sum_sq')
+
+# Most recent raw results (user, metadata) kept per experiment for auditing
+RESULT_LOG_SIZE = int(os.getenv("AB_RESULT_LOG_SIZE", 1000))
+
+
+class VariantStatsStore:
+    """
+    Per-variant sufficient statistics for experiments
+
+    Each result adds to its variant's count, conversions, metric sum and
+    sum of squares, which is all the analysis needs. The raw result (user,
+    metadata) goes to a per-experiment log capped at RESULT_LOG_SIZE
+    entries, so recent results can be audited without the store growing
+    with traffic. Counters, logs and experiment configs live in Redis when
+    it is available (updated in one MULTI/EXEC so concurrent writers never
+    lose an increment) and in process memory otherwise.
+    """
+
+    KEY_PREFIX = "ab"
+
+    def __init__(self):
+        self._configs: Dict[str, str] = {}
+        self._stats: Dict[str, Dict[str, Dict[str, float]]] = {}
+        self._sequence: Dict[str, int] = {}
+        self._logs: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, experiment_id: str, *parts: str) -> str:
+        return ":".join((self.KEY_PREFIX, experiment_id) + parts)
+
+    def save_config(self, experiment_id: str, config: ExperimentConfig):
+        """Persist an experiment's configuration."""
+        payload = config.model_dump_json()
+        if redis_cache.redis_client is not None:
+            redis_cache.redis_client.set(self._key(experiment_id, "config"), payload)
+        else:
+            self._configs[experiment_id] = payload
+
+    def load_config(self, experiment_id: str) -> Optional[ExperimentConfig]:
+        """Load an experiment's configuration, or None if unknown."""
+        if redis_cache.redis_client is not None:
+            payload = redis_cache.redis_client.get(self._key(experiment_id, "config"))
+        else:
+            payload = self._configs.get(experiment_id)
+        return ExperimentConfig.model_validate_json(payload) if payload else None
+
+    def record(
+        self,
+        experiment_id: str,
+        variant_id: str,
+        metric_value: float,
+        converted: bool,
+        user_id: Optional[str] = None,
+        metadata: Optional[Dict] = None
+    ) -> int:
+        """
+        Add one result to its variant's statistics and the experiment's result log.
+
+        Returns:
+            Sequence number of the result within the experiment
+        """
+        metric_value = float(metric_value)
+        entry = json.dumps({
+            'user_id': user_id,
+            'variant_id': variant_id,
+            'metric_value': metric_value,
+            'converted': bool(converted),
+            'metadata': metadata or {},
+            'recorded_at': datetime.utcnow().isoformat()
+        }, default=str)
+        client = redis_cache.redis_client
+        if client is not None:
+            stats_key = self._key(experiment_id, "stats", variant_id)
+            log_key = self._key(experiment_id, "log")
+            pipe = client.pipeline(transaction=True)
+            pipe.incr(self._key(experiment_id, "results"))
+            pipe.hincrby(stats_key, 'n', 1)
+            pipe.hincrby(stats_key, 'conversions', int(bool(converted)))
+            pipe.hincrbyfloat(stats_key, 'sum', metric_value)
+            pipe.hincrbyfloat(stats_key, 'sum_sq', metric_value * metric_value)
+            pipe.lpush(log_key, entry)
+            pipe.ltrim(log_key, 0, RESULT_LOG_SIZE - 1)
+            return int(pipe.execute()[0])
+
+        with self._lock:
+            self._logs.setdefault(experiment_id, deque(maxlen=RESULT_LOG_SIZE)).appendleft(entry)
+            stats = self._stats.setdefault(experiment_id, {}).setdefault(
+                variant_id, dict.fromkeys(STAT_FIELDS, 0)
+            )
+            stats['n'] += 1
+            stats['conversions'] += int(bool(converted))
+            stats['sum'] += metric_value
+            stats['sum_sq'] += metric_value * metric_value
+            self._sequence[experiment_id] = self._sequence.get(experiment_id, 0) + 1
+            return self._sequence[experiment_id]
+
+    def recent_results(self, experiment_id: str, limit: int = 100) -> List[Dict]:
+        """Most recent raw results for an experiment, newest first."""
+        limit = max(0, min(limit, RESULT_LOG_SIZE))
+        client = redis_cache.redis_client
+        if client is not None:
+            entries = client.lrange(self._key(experiment_id, "log"), 0, limit - 1) if limit else []
+        else:
+            with self._lock:
+                entries = list(self._logs.get(experiment_id, ()))[:limit]
+        return [json.loads(entry) for entry in entries]
+
+    def get(self, experiment_id: str, variant_ids: List[str]) -> Dict[str, Dict[str, float]]:
+        """Statistics for each variant (zeros for variants without results)."""
+        client = redis_cache.redis_client
+        if client is not None:
+            pipe = client.pipeline(transaction=False)
+            for variant_id in variant_ids:
+                pipe.hgetall(self._key(experiment_id, "stats", variant_id))
+            rows = pipe.execute()
+        else:
+            with self._lock:
+                stored = self._stats.get(experiment_id, {})
+                rows = [dict(stored.get(variant_id, {})) for variant_id in variant_ids]
+
+        return {
+            variant_id: {field: float(row.get(field, 0)) for field in STAT_FIELDS}
+            for variant_id, row in zip(variant_ids, rows)
+        }
+
+
 class ABTestingFramework:
     """A/B Testing framework for ML experiments."""
 
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, store: Optional[VariantStatsStore] = None):
         self.db = db
         self.experiments: Dict[str, ExperimentConfig] = {}
-        self.results: Dict[str, List[Dict]] = {}
+        self.store = store or VariantStatsStore()
 
     def create_experiment(
         self,
@@ -99,9 +237,7 @@ class ABTestingFramework:
 
         # Store experiment
         self.experiments[experiment_id] = config
-
-        # Initialize results storage
-        self.results[experiment_id] = []
+        self.store.save_config(experiment_id, config)
 
         return {
             'experiment_id': experiment_id,
@@ -127,10 +263,7 @@ class ABTestingFramework:
         Returns:
             Dict with assigned variant details
         """
-        if experiment_id not in self.experiments:
-            raise ValueError(f"Experiment {experiment_id} not found")
-
-        config = self.experiments[experiment_id]
+        config = self._get_config(experiment_id)
 
         # Consistent hashing for stable assignment
         hash_input = f"{experiment_id}:{user_id}".encode('utf-8')
@@ -187,27 +320,40 @@ class ABTestingFramework:
         Returns:
             Dict confirming result recording
         """
-        if experiment_id not in self.experiments:
-            raise ValueError(f"Experiment {experiment_id} not found")
-
-        result = {
-            'experiment_id': experiment_id,
-            'user_id': user_id,
-            'variant_id': variant_id,
-            'metric_value': metric_value,
-            'converted': converted,
-            'recorded_at': datetime.utcnow().isoformat(),
-            'metadata': metadata or {}
-        }
-
-        self.results[experiment_id].append(result)
+        config = self._get_config(experiment_id)
+        if variant_id not in config.traffic_allocation:
+            raise ValueError(f"Variant {variant_id} not found in experiment")
+
+        # Analysis reads the running statistics; user and metadata go to the
+        # capped result log (see get_recent_results)
+        result_id = self.store.record(
+            experiment_id, variant_id, metric_value, converted, user_id=user_id, metadata=metadata
+        )
 
         return {
             'status': 'recorded',
-            'result_id': len(self.results[experiment_id]),
+            'result_id': result_id,
             'experiment_id': experiment_id
         }
 
+    def get_recent_results(self, experiment_id: str, limit: int = 100) -> List[Dict]:
+        """
+        Most recent raw results for an experiment, newest first.
+
+        Only the last RESULT_LOG_SIZE results are kept; statistics always
+        cover every result.
+
+        Args:
+            experiment_id: Experiment identifier
+            limit: Maximum results to return
+
+        Returns:
+            List of results with user_id, variant_id, metric_value,
+            converted, metadata and recorded_at
+        """
+        self._get_config(experiment_id)
+        return self.store.recent_results(experiment_id, limit)
+
     def analyze_experiment(
         self,
         experiment_id: str,
@@ -223,13 +369,10 @@ class ABTestingFramework:
         Returns:
             Dict with analysis results
         """
-        if experiment_id not in self.experiments:
-            raise ValueError(f"Experiment {experiment_id} not found")
+        config = self._get_config(experiment_id)
+        stats_by_variant = self.store.get(experiment_id, [v['id'] for v in config.variants])
 
-        config = self.experiments[experiment_id]
-        results = self.results.get(experiment_id, [])
-
-        if not results:
+        if not any(s['n'] for s in stats_by_variant.values()):
             return {
                 'experiment_id': experiment_id,
                 'status': 'insufficient_data',
@@ -237,33 +380,10 @@ class ABTestingFramework:
                 'variants': []  # Include empty variants list
             }
 
-        # Group results by variant
-        variant_data = {}
-        for variant in config.variants:
-            variant_id = variant['id']
-            variant_results = [r for r in results if r['variant_id'] == variant_id]
-
-            if not variant_results:
-                variant_data[variant_id] = {
-                    'sample_size': 0,
-                    'conversions': 0,
-                    'conversion_rate': 0,
-                    'metric_values': [],
-                    'avg_metric': 0
-                }
-                continue
-
-            conversions = sum(1 for r in variant_results if r['converted'])
-            metric_values = [r['metric_value'] for r in variant_results]
-
-            variant_data[variant_id] = {
-                'sample_size': len(variant_results),
-                'conversions': conversions,
-                'conversion_rate': conversions / len(variant_results) if variant_results else 0,
-                'metric_values': metric_values,
-                'avg_metric': np.mean(metric_values) if metric_values else 0,
-                'std_metric': np.std(metric_values) if len(metric_values) > 1 else 0
-            }
+        # Per-variant summaries from the running statistics
+        variant_data = {
+            variant_id: self._summarize(s) for variant_id, s in stats_by_variant.items()
+        }
 
         # Find control variant
         control_id = next(
@@ -300,8 +420,13 @@ class ABTestingFramework:
                     [control_data['conversions'], control_data['sample_size'] - control_data['conversions']]
                 ]
 
-                if min(data['sample_size'], control_data['sample_size']) >= config.min_sample_size:
-                    chi2, p_value = stats.chi2_contingency(contingency_table)[:2]
+                min_size = min(data['sample_size'], control_data['sample_size'])
+                if min_size >= config.min_sample_size or (config.sequential_testing and min_size > 0):
+                    if config.sequential_testing:
+                        # Valid at any sample size, so significance can stop the test early
+                        p_value = self._sequential_p_value(data, control_data, config.sequential_tau)
+                    else:
+                        chi2, p_value = stats.chi2_contingency(contingency_table)[:2]
                     is_significant = p_value < config.significance_level
 
                     # Calculate lift
@@ -344,7 +469,8 @@ class ABTestingFramework:
             for d in variant_data.values()
         )
 
-        if winner_id and min_samples_met:
+        stopped_early = bool(winner_id) and config.sequential_testing and not min_samples_met
+        if winner_id and (min_samples_met or config.sequential_testing):
             status = 'winner_identified'
             recommendation = f"Variant '{next(r['variant_name'] for r in analysis_results if r['variant_id'] == winner_id)}' is statistically significant winner"
         elif min_samples_met:
@@ -367,6 +493,8 @@ class ABTestingFramework:
             'winner': next((r for r in analysis_results if r['is_winner']), None),
             'recommendation': recommendation,
             'confidence_level': confidence_level,
+            'sequential_testing': config.sequential_testing,
+            'stopped_early': stopped_early,
             'analyzed_at': datetime.utcnow().isoformat()
         }
 
@@ -386,10 +514,7 @@ class ABTestingFramework:
         Returns:
             Dict confirming winner selection
         """
-        if experiment_id not in self.experiments:
-            raise ValueError(f"Experiment {experiment_id} not found")
-
-        config = self.experiments[experiment_id]
+        config = self._get_config(experiment_id)
 
         # Auto-detect winner if not provided
         if winner_variant_id is None:
@@ -431,23 +556,19 @@ class ABTestingFramework:
         Returns:
             Dict with experiment summary
         """
-        if experiment_id not in self.experiments:
-            raise ValueError(f"Experiment {experiment_id} not found")
-
-        config = self.experiments[experiment_id]
-        results = self.results.get(experiment_id, [])
+        config = self._get_config(experiment_id)
+        stats_by_variant = self.store.get(experiment_id, [v['id'] for v in config.variants])
 
         # Calculate basic stats
-        total_samples = len(results)
-        conversions = sum(1 for r in results if r['converted'])
+        total_samples = int(sum(s['n'] for s in stats_by_variant.values()))
+        conversions = sum(s['conversions'] for s in stats_by_variant.values())
         conversion_rate = (conversions / total_samples * 100) if total_samples > 0 else 0
 
         # Samples per variant
-        variant_samples = {}
-        for variant in config.variants:
-            variant_id = variant['id']
-            count = sum(1 for r in results if r['variant_id'] == variant_id)
-            variant_samples[variant['name']] = count
+        variant_samples = {
+            variant['name']: int(stats_by_variant[variant['id']]['n'])
+            for variant in config.variants
+        }
 
         # Determine experiment status
         if total_samples == 0:
@@ -475,6 +596,58 @@ class ABTestingFramework:
         }
 
     # Helper methods
+    def _get_config(self, experiment_id: str) -> ExperimentConfig:
+        """Experiment config from this instance or the shared store."""
+        config = self.experiments.get(experiment_id)
+        if config is None:
+            config = self.store.load_config(experiment_id)
+            if config is None:
+                raise ValueError(f"Experiment {experiment_id} not found")
+            self.experiments[experiment_id] = config
+        return config
+
+    @staticmethod
+    def _summarize(variant_stats: Dict[str, float]) -> Dict:
+        """Conversion rate and metric mean/std from a variant's running sums."""
+        n = int(variant_stats['n'])
+        if n == 0:
+            return {'sample_size': 0, 'conversions': 0, 'conversion_rate': 0, 'avg_metric': 0, 'std_metric': 0}
+
+        conversions = int(variant_stats['conversions'])
+        mean = variant_stats['sum'] / n
+        # Population std (as np.std); clamp float cancellation below zero
+        variance = max(variant_stats['sum_sq'] / n - mean * mean, 0.0)
+        return {
+            'sample_size': n,
+            'conversions': conversions,
+            'conversion_rate': conversions / n,
+            'avg_metric': mean,
+            'std_metric': float(np.sqrt(variance)) if n > 1 else 0
+        }
+
+    @staticmethod
+    def _sequential_p_value(data: Dict, control_data: Dict, tau: float) -> float:
+        """
+        Always-valid p-value for a difference in conversion rates (mSPRT).
+
+        Uses the normal-mixture likelihood ratio with mixing variance tau^2
+        (Johari et al., "Always Valid Inference"). Unlike the chi-square
+        p-value it can be checked after every result without inflating the
+        false positive rate. The current value is reported rather than the
+        running minimum, which is conservative.
+        """
+        p1, n1 = data['conversion_rate'], data['sample_size']
+        p0, n0 = control_data['conversion_rate'], control_data['sample_size']
+        variance = p1 * (1 - p1) / n1 + p0 * (1 - p0) / n0
+        if variance <= 0:
+            return 1.0
+
+        tau_sq = tau * tau
+        log_lr = 0.5 * np.log(variance / (variance + tau_sq)) + (
+            tau_sq * (p1 - p0) ** 2 / (2 * variance * (variance + tau_sq))
+        )
+        return float(min(1.0, np.exp(-log_lr)))
+
     def _generate_experiment_id(self, name: str) -> str:
         """Generate unique experiment ID."""
         timestamp = datetime.utcnow().strftime('%Y%m%d%H%M%S')
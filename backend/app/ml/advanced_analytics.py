@@ -11,6 +11,7 @@ Provides sophisticated analytics capabilities including:
 """
 
 from typing import Dict, List, Optional, Tuple
+import asyncio
 from datetime import datetime, timedelta
 from decimal import Decimal
 import numpy as np
@@ -23,6 +24,7 @@ from app.models.project_sqlalchemy import Project
 from app.models.customer_sqlalchemy import Customer
 from app.models.interaction_sqlalchemy import Interaction
 from app.database import get_db
+from app.ml.forecasting_service import revenue_forecast_service
 
 
 class AdvancedAnalytics:
@@ -46,78 +48,26 @@ class AdvancedAnalytics:
         Returns:
             Dict with forecast data including confidence intervals
         """
-        # Get historical revenue data (last 90 days)
-        end_date = datetime.utcnow()
-        start_date = end_date - timedelta(days=90)
-
-        # Query daily revenue
-        daily_revenue = (
-            self.db.query(
-                func.date(Project.created_at).label('date'),
-                func.sum(Project.final_amount).label('revenue'),
-                func.count(Project.id).label('count')
-            )
-            .filter(
-                and_(
-                    Project.created_at >= start_date,
-                    Project.created_at <= end_date,
-                    Project.status.in_(['completed', 'in_progress']),
-                    Project.final_amount.isnot(None)
-                )
-            )
-            .group_by(func.date(Project.created_at))
-            .order_by(func.date(Project.created_at))
-            .all()
-        )
-
-        # Convert to pandas for time series analysis (extract only date and revenue)
-        df = pd.DataFrame([(row[0], row[1]) for row in daily_revenue], columns=['date', 'revenue'])
-        df['date'] = pd.to_datetime(df['date'])
-        df = df.set_index('date')
-
-        # Fill missing dates with 0 revenue
-        date_range = pd.date_range(start=start_date, end=end_date, freq='D')
-        df = df.reindex(date_range, fill_value=0)
-
-        # Calculate trend using moving average
-        df['ma_7'] = df['revenue'].rolling(window=7).mean()
-        df['ma_30'] = df['revenue'].rolling(window=30).mean()
-
-        # Simple linear regression for trend
-        X = np.arange(len(df)).reshape(-1, 1)
-        y = df['revenue'].values
-
-        # Calculate trend line
-        from sklearn.linear_model import LinearRegression
-        model = LinearRegression()
-        model.fit(X, y)
+        # Forecast from the cached model for the last 90 days; it is only
+        # refitted when new revenue lands
+        # (fitting blocks, so keep it off the event loop)
+        model = await asyncio.to_thread(revenue_forecast_service.get_model, self.db, 90)
+        predictions = model._predict(days_ahead)
 
-        # Forecast future values
-        future_X = np.arange(len(df), len(df) + days_ahead).reshape(-1, 1)
-        forecast = model.predict(future_X)
-
-        # Calculate confidence intervals based on historical variance
-        residuals = y - model.predict(X)
-        std_error = np.std(residuals)
+        # Model intervals are 95%; rescale to the requested level
         z_score = 1.96 if confidence_level == 0.95 else 2.576  # 95% or 99%
-
-        confidence_interval = z_score * std_error
-
-        # Generate forecast dates
-        forecast_dates = pd.date_range(
-            start=end_date + timedelta(days=1),
-            periods=days_ahead,
-            freq='D'
-        )
+        scale = z_score / 1.96
 
         # Build forecast response
         forecast_data = []
-        for i, date in enumerate(forecast_dates):
+        for p in predictions:
+            predicted = p['predicted_revenue']
+            half_width = max(p['upper_bound'] - predicted, 0) * scale
             forecast_data.append({
-                'date': date.strftime('%Y-%m-%d'),
-                'predicted_revenue': max(0, float(forecast[i])),
-                'lower_bound': max(0, float(forecast[i] - confidence_interval)),
-                'upper_bound': float(forecast[i] + confidence_interval),
+                'date': p['date'],
+                'predicted_revenue': predicted,
+                'lower_bound': max(0, predicted - half_width),
+                'upper_bound': predicted + half_width,
                 'confidence_level': confidence_level
             })
 
@@ -126,6 +76,7 @@ class AdvancedAnalytics:
         avg_daily = total_forecast / days_ahead
 
         # Historical average for comparison
+        df = model.training_data
         historical_avg = float(df['revenue'].mean())
         growth_rate = ((avg_daily - historical_avg) / historical_avg * 100) if historical_avg > 0 else 0
 
@@ -142,7 +93,9 @@ class AdvancedAnalytics:
             'metadata': {
                 'generated_at': datetime.utcnow().isoformat(),
                 'historical_days': 90,
-                'model_type': 'linear_regression',
+                'model_type': model.model_type,
+                'holdout_mae': model.selection['holdout_mae'],
+                'model_trained_at': model.selection['trained_at'],
                 'data_points': len(df)
             }
         }
@@ -160,6 +113,10 @@ class AdvancedAnalytics:
         Returns:
             Dict with heatmap data
         """
+        return await asyncio.to_thread(self._lead_quality_heatmap, segment_by)
+
+    def _lead_quality_heatmap(self, segment_by: str = 'source') -> Dict:
+        """Blocking body of get_lead_quality_heatmap; runs in a worker thread."""
         # Query leads with conversion status
         leads_query = (
             self.db.query(Lead)
@@ -242,6 +199,10 @@ class AdvancedAnalytics:
         Returns:
             Dict with funnel data and conversion rates
         """
+        return await asyncio.to_thread(self._conversion_funnel)
+
+    def _conversion_funnel(self) -> Dict:
+        """Blocking body of get_conversion_funnel; runs in a worker thread."""
         # Define funnel stages
         stages = [
             ('new', 'New Lead'),
@@ -326,6 +287,10 @@ class AdvancedAnalytics:
         Returns:
             Dict with CLV distribution data
         """
+        return await asyncio.to_thread(self._clv_distribution)
+
+    def _clv_distribution(self) -> Dict:
+        """Blocking body of get_clv_distribution; runs in a worker thread."""
         # Get all customers with completed projects
         customers = (
             self.db.query(Customer)
@@ -428,6 +393,10 @@ class AdvancedAnalytics:
         Returns:
             Dict with churn risk scores and predictions
         """
+        return await asyncio.to_thread(self._churn_risk_analysis)
+
+    def _churn_risk_analysis(self) -> Dict:
+        """Blocking body of get_churn_risk_analysis; runs in a worker thread."""
         # Get active customers (with projects in last 3 years)
         three_years_ago = datetime.utcnow() - timedelta(days=1095)
 
@@ -521,6 +490,10 @@ class AdvancedAnalytics:
         Returns:
             Dict with attribution data by channel
         """
+        return await asyncio.to_thread(self._marketing_attribution)
+
+    def _marketing_attribution(self) -> Dict:
+        """Blocking body of get_marketing_attribution; runs in a worker thread."""
         # Get leads from last 90 days
         start_date = datetime.utcnow() - timedelta(days=90)
 
@@ -15,6 +15,15 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Columns produced by BehavioralFeatureExtractor
+BEHAVIORAL_FEATURES = [
+    'interaction_count',
+    'email_open_rate',
+    'response_rate',
+    'appointment_show_rate',
+    'avg_interaction_duration',
+]
+
 
 class TemporalFeatureExtractor(BaseEstimator, TransformerMixin):
     """Extract time-based features from lead data"""
@@ -37,14 +46,17 @@ class TemporalFeatureExtractor(BaseEstimator, TransformerMixin):
         if not pd.api.types.is_datetime64_any_dtype(X['created_at']):
             X['created_at'] = pd.to_datetime(X['created_at'])
 
+        # One reference time so both ages are measured from the same instant
+        now = pd.Timestamp.now()
+
         # Lead age
-        X['lead_age_days'] = (pd.Timestamp.now() - X['created_at']).dt.days
+        X['lead_age_days'] = (now - X['created_at']).dt.days
 
         # Last contact recency
         if 'last_interaction_at' in X.columns:
             X['last_interaction_at'] = pd.to_datetime(X['last_interaction_at'], errors='coerce')
             X['days_since_last_contact'] = (
-                pd.Timestamp.now() - X['last_interaction_at']
+                now - X['last_interaction_at']
             ).dt.days
             X['days_since_last_contact'] = X['days_since_last_contact'].fillna(
                 X['lead_age_days']  # If no interactions, use lead age
@@ -61,6 +73,120 @@ class TemporalFeatureExtractor(BaseEstimator, TransformerMixin):
         return X
 
 
+def explode_records(values: pd.Series, fields: List[str]) -> tuple:
+    """
+    Flatten a column of lists of dicts into one frame
+
+    Args:
+        values: Series whose cells are lists of dicts (anything else counts as empty)
+        fields: Keys to pull out of each dict (missing keys become NaN)
+
+    Returns:
+        (records, row, counts): the flattened records with `fields` as columns,
+        the positional row each record came from, and the list length per row
+    """
+    lists = [v if isinstance(v, list) else [] for v in values]
+    counts = np.fromiter((len(v) for v in lists), dtype=np.int64, count=len(lists))
+    row = np.repeat(np.arange(len(lists)), counts)
+    records = pd.DataFrame.from_records(
+        [item for items in lists for item in items], columns=fields
+    ) if row.size else pd.DataFrame(columns=fields)
+    return records, row, counts
+
+
+def _truthy(column: pd.Series) -> np.ndarray:
+    """Python truthiness of each value, with missing values as False"""
+    return np.fromiter(
+        (bool(v) if not (v is None or (isinstance(v, float) and np.isnan(v))) else False
+         for v in column),
+        dtype=bool,
+        count=len(column),
+    )
+
+
+def _rate(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """numerator / denominator per row, 0.0 where the denominator is 0"""
+    out = np.zeros(len(denominator), dtype=float)
+    np.divide(numerator, denominator, out=out, where=denominator > 0)
+    return out
+
+
+def build_history_features(X: pd.DataFrame) -> pd.DataFrame:
+    """
+    Columnar builder for the behavioral features
+
+    Explodes the `interactions` and `appointments` histories into flat frames
+    once, then aggregates per lead with bincount (a groupby-sum over row
+    position). Produces the same values as the per-row rules documented on
+    BehavioralFeatureExtractor.
+
+    Args:
+        X: Leads with an `interactions` column and optionally `appointments`
+
+    Returns:
+        DataFrame indexed like X with interaction_count, email_open_rate,
+        response_rate, appointment_show_rate and avg_interaction_duration
+    """
+    n = len(X)
+
+    interactions, row, interaction_count = explode_records(
+        X['interactions'], ['type', 'opened', 'direction', 'response_received', 'duration_minutes']
+    )
+    is_email = (interactions['type'] == 'email').to_numpy()
+    is_outbound = (interactions['direction'] == 'outbound').to_numpy()
+    opened = _truthy(interactions['opened'])
+    responded = _truthy(interactions['response_received'])
+    duration = pd.to_numeric(interactions['duration_minutes'], errors='coerce').fillna(0).to_numpy(dtype=float)
+
+    def per_lead(mask, weights=None):
+        return np.bincount(row[mask], weights=None if weights is None else weights[mask], minlength=n)
+
+    everything = np.ones(len(row), dtype=bool)
+    features = {
+        'interaction_count': interaction_count,
+        'email_open_rate': _rate(per_lead(is_email & opened), per_lead(is_email)),
+        'response_rate': _rate(per_lead(is_outbound & responded), per_lead(is_outbound)),
+        'avg_interaction_duration': _rate(per_lead(everything, duration), interaction_count),
+    }
+
+    if 'appointments' in X.columns:
+        appointments, appt_row, appointment_count = explode_records(X['appointments'], ['completed'])
+        completed = np.bincount(appt_row[_truthy(appointments['completed'])], minlength=n)
+        features['appointment_show_rate'] = _rate(completed, appointment_count)
+    else:
+        features['appointment_show_rate'] = np.zeros(n)
+
+    return pd.DataFrame(features, index=X.index)
+
+
+def history_features_from_counts(counts: pd.DataFrame) -> pd.DataFrame:
+    """
+    Behavioral features from running counters instead of raw histories
+
+    Same definitions as build_history_features, fed by the per-lead
+    aggregates kept in the lead feature store (app.ml.feature_store).
+
+    Args:
+        counts: interaction_count, email_count, email_opened_count,
+            outbound_count, outbound_responded_count, total_duration_minutes,
+            appointment_count and appointment_completed_count per lead
+
+    Returns:
+        DataFrame indexed like counts with the BEHAVIORAL_FEATURES columns
+    """
+    def col(name):
+        return pd.to_numeric(counts[name], errors='coerce').fillna(0).to_numpy(dtype=float)
+
+    interaction_count = col('interaction_count')
+    return pd.DataFrame({
+        'interaction_count': interaction_count.astype(np.int64),
+        'email_open_rate': _rate(col('email_opened_count'), col('email_count')),
+        'response_rate': _rate(col('outbound_responded_count'), col('outbound_count')),
+        'avg_interaction_duration': _rate(col('total_duration_minutes'), interaction_count),
+        'appointment_show_rate': _rate(col('appointment_completed_count'), col('appointment_count')),
+    }, index=counts.index)
+
+
 class BehavioralFeatureExtractor(BaseEstimator, TransformerMixin):
     """Extract behavioral engagement features"""
 
@@ -75,25 +201,21 @@ class BehavioralFeatureExtractor(BaseEstimator, TransformerMixin):
         - response_rate: Proportion of outbound contacts that got responses
         - appointment_show_rate: Proportion of appointments attended
         - avg_interaction_duration: Average interaction length in minutes
+
+        Computed column-wise by build_history_features; the _calculate_*
+        methods below are the per-row reference definitions. Rows without an
+        `interactions` column that already carry these features (read from
+        the lead feature store) are passed through unchanged.
         """
         X = X.copy()
 
-        # Interaction count
-        X['interaction_count'] = X['interactions'].apply(
-            lambda x: len(x) if isinstance(x, list) else 0
-        )
-
-        # Email open rate
-        X['email_open_rate'] = X.apply(self._calculate_email_open_rate, axis=1)
+        if 'interactions' not in X.columns and set(BEHAVIORAL_FEATURES) <= set(X.columns):
+            logger.info("✅ Behavioral features precomputed")
+            return X
 
-        # Response rate
-        X['response_rate'] = X.apply(self._calculate_response_rate, axis=1)
-
-        # Appointment show rate
-        X['appointment_show_rate'] = X.apply(self._calculate_show_rate, axis=1)
-
-        # Average interaction duration
-        X['avg_interaction_duration'] = X.apply(self._calculate_avg_duration, axis=1)
+        history = build_history_features(X)
+        for name in BEHAVIORAL_FEATURES:
+            X[name] = history[name]
 
         logger.info("✅ Behavioral features extracted")
         return X
@@ -234,23 +356,21 @@ class LeadSourceFeatureExtractor(BaseEstimator, TransformerMixin):
         referral_sources = ['referral', 'partner', 'word_of_mouth']
         organic_sources = ['organic_search', 'website', 'seo']
 
-        X['is_paid_channel'] = X['source'].str.lower().isin(paid_sources).astype(int)
-        X['is_referral'] = X['source'].str.lower().isin(referral_sources).astype(int)
-        X['is_organic'] = X['source'].str.lower().isin(organic_sources).astype(int)
+        source_lower = X['source'].astype(str).str.lower()
+        is_paid = source_lower.isin(paid_sources)
+        is_referral = source_lower.isin(referral_sources)
+        is_organic = source_lower.isin(organic_sources)
+
+        X['is_paid_channel'] = is_paid.astype(int)
+        X['is_referral'] = is_referral.astype(int)
+        X['is_organic'] = is_organic.astype(int)
 
         # Source category
-        def categorize_source(source):
-            source_lower = str(source).lower()
-            if source_lower in paid_sources:
-                return 'paid'
-            elif source_lower in referral_sources:
-                return 'referral'
-            elif source_lower in organic_sources:
-                return 'organic'
-            else:
-                return 'other'
-
-        X['source_category'] = X['source'].apply(categorize_source)
+        X['source_category'] = np.select(
+            [is_paid, is_referral, is_organic],
+            ['paid', 'referral', 'organic'],
+            default='other'
+        )
 
         logger.info("✅ Lead source features extracted")
         return X
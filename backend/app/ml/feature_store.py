@@ -0,0 +1,311 @@
+"""
+Lead Feature Store for online NBA inference
+Keeps per-lead interaction/appointment counters up to date so predictions
+can be made from a lead_id without shipping or rescanning the history
+"""
+
+from datetime import datetime
+from typing import Dict, List, Optional
+import logging
+
+import pandas as pd
+from sqlalchemy import case, func, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from app.database import get_db_session
+from app.ml.feature_engineering import history_features_from_counts
+from app.models.lead_feature_sqlalchemy import LeadFeatureRecord
+from app.models.lead_sqlalchemy import Lead
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Running counters kept per lead (see migrations/009_lead_feature_store.sql)
+COUNTER_COLUMNS = [
+    'interaction_count',
+    'email_count',
+    'email_opened_count',
+    'outbound_count',
+    'outbound_responded_count',
+    'total_duration_minutes',
+    'appointment_count',
+    'appointment_completed_count',
+]
+
+# Interaction outcomes that count as the lead responding to outbound contact
+RESPONDED_OUTCOMES = {
+    'successful',
+    'scheduled_callback',
+    'scheduled_appointment',
+    'quote_requested',
+    'objection_handled',
+}
+
+_UPSERT_BY_DIALECT = {
+    'postgresql': postgresql_insert,
+    'sqlite': sqlite_insert,
+}
+
+
+def _value(v):
+    """Enum members to their value, everything else unchanged"""
+    return getattr(v, 'value', v)
+
+
+def _parse_datetime(v) -> Optional[datetime]:
+    """ISO strings/datetimes to naive datetimes (matches LeadFeatures parsing)"""
+    if v is None or v == '':
+        return None
+    if isinstance(v, str):
+        v = datetime.fromisoformat(v.replace('Z', '+00:00'))
+    return v.replace(tzinfo=None) if v.tzinfo is not None else v
+
+
+def resolve_lead_id(record: dict) -> Optional[str]:
+    """Lead id of an interaction/appointment row, if it belongs to a lead"""
+    if record.get('lead_id'):
+        return str(record['lead_id'])
+    if _value(record.get('entity_type')) == 'lead' and record.get('entity_id'):
+        return str(record['entity_id'])
+    return None
+
+
+def interaction_counters(interaction: dict) -> Dict[str, float]:
+    """Counter increments contributed by one interaction row"""
+    is_email = _value(interaction.get('interaction_type') or interaction.get('type')) == 'email'
+    is_outbound = _value(interaction.get('direction')) == 'outbound'
+    opened = bool(interaction.get('email_opened') or interaction.get('opened'))
+    if 'response_received' in interaction:
+        responded = bool(interaction['response_received'])
+    else:
+        responded = _value(interaction.get('outcome')) in RESPONDED_OUTCOMES
+
+    return {
+        'interaction_count': 1,
+        'email_count': int(is_email),
+        'email_opened_count': int(is_email and opened),
+        'outbound_count': int(is_outbound),
+        'outbound_responded_count': int(is_outbound and responded),
+        'total_duration_minutes': float(interaction.get('duration_minutes') or 0),
+    }
+
+
+class LeadFeatureStore:
+    """
+    Per-lead NBA feature vectors maintained incrementally
+
+    Writers call record_interaction/record_appointment as activity is
+    created; each call is a single atomic upsert that adds to the lead's
+    counters. Readers call get_feature_frame to load many leads' features
+    with one query, ready for the NBA feature pipeline.
+    """
+
+    def record_interaction(self, interaction: dict) -> bool:
+        """
+        Add one new interaction to its lead's counters
+
+        Failures are logged and swallowed so callers never fail on the store.
+
+        Returns:
+            True if a lead's counters were updated
+        """
+        lead_id = resolve_lead_id(interaction)
+        if not lead_id:
+            return False
+
+        occurred_at = _parse_datetime(
+            interaction.get('interaction_date') or interaction.get('created_at')
+        ) or datetime.utcnow()
+        return self._increment(lead_id, interaction_counters(interaction), occurred_at)
+
+    def record_appointment(self, appointment: dict, scheduled: bool = True, completed: bool = False) -> bool:
+        """
+        Add an appointment event to its lead's counters
+
+        Args:
+            appointment: Appointment row
+            scheduled: A new appointment was booked
+            completed: The appointment was attended
+
+        Returns:
+            True if a lead's counters were updated
+        """
+        lead_id = resolve_lead_id(appointment)
+        if not lead_id:
+            return False
+
+        return self._increment(lead_id, {
+            'appointment_count': int(scheduled),
+            'appointment_completed_count': int(completed),
+        })
+
+    def _increment(
+        self,
+        lead_id: str,
+        counters: Dict[str, float],
+        last_interaction_at: Optional[datetime] = None
+    ) -> bool:
+        """Atomically add `counters` to the lead's row, creating it if needed"""
+        try:
+            with get_db_session() as db:
+                dialect = db.get_bind().dialect.name
+                if dialect not in _UPSERT_BY_DIALECT:
+                    raise NotImplementedError(f"No upsert for dialect {dialect}")
+
+                values = {name: 0 for name in COUNTER_COLUMNS}
+                values.update(counters)
+                stmt = _UPSERT_BY_DIALECT[dialect](LeadFeatureRecord).values(
+                    lead_id=lead_id,
+                    last_interaction_at=last_interaction_at,
+                    updated_at=datetime.utcnow(),
+                    **values
+                )
+
+                table = LeadFeatureRecord.__table__
+                updates = {name: table.c[name] + stmt.excluded[name] for name in counters}
+                updates['updated_at'] = stmt.excluded.updated_at
+                if last_interaction_at is not None:
+                    updates['last_interaction_at'] = case(
+                        (table.c.last_interaction_at.is_(None), stmt.excluded.last_interaction_at),
+                        (stmt.excluded.last_interaction_at > table.c.last_interaction_at,
+                         stmt.excluded.last_interaction_at),
+                        else_=table.c.last_interaction_at,
+                    )
+
+                db.execute(stmt.on_conflict_do_update(index_elements=[table.c.lead_id], set_=updates))
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to update lead features for {lead_id}: {e}")
+            return False
+
+    def get_feature_frame(self, lead_ids: List[str]) -> pd.DataFrame:
+        """
+        Load pipeline-ready rows for many leads with one query
+
+        Leads without a feature row (no activity yet) get zero counters.
+        Deleted and unknown leads are left out.
+
+        Args:
+            lead_ids: Lead ids to load
+
+        Returns:
+            DataFrame indexed by lead id with the columns expected by
+            build_feature_pipeline, behavioral features precomputed
+        """
+        query = (
+            select(
+                Lead.id,
+                Lead.source,
+                Lead.created_at,
+                Lead.last_contact_date,
+                Lead.assigned_to,
+                Lead.property_value,
+                Lead.zip_code,
+                Lead.lead_score,
+                LeadFeatureRecord.last_interaction_at,
+                *[getattr(LeadFeatureRecord, name) for name in COUNTER_COLUMNS],
+            )
+            .outerjoin(LeadFeatureRecord, LeadFeatureRecord.lead_id == Lead.id)
+            .where(Lead.id.in_(list(lead_ids)), Lead.is_deleted == False)
+        )
+
+        with get_db_session() as db:
+            rows = pd.DataFrame(db.execute(query).mappings().all(), columns=[
+                'id', 'source', 'created_at', 'last_contact_date', 'assigned_to', 'property_value',
+                'zip_code', 'lead_score', 'last_interaction_at', *COUNTER_COLUMNS,
+            ])
+
+        rows = rows.set_index('id', drop=False)
+        rows.index.name = None
+        created_at = pd.to_datetime(rows['created_at'])
+        last_interaction_at = pd.to_datetime(rows['last_interaction_at']).fillna(
+            pd.to_datetime(rows['last_contact_date'])
+        ).fillna(created_at)
+
+        frame = pd.DataFrame({
+            'id': rows['id'],
+            'source': rows['source'].map(_value),
+            'created_at': created_at,
+            'last_interaction_at': last_interaction_at,
+            'assigned_to': rows['assigned_to'].fillna('unassigned'),
+            'estimated_value': pd.to_numeric(rows['property_value'], errors='coerce'),
+            'property_zip': rows['zip_code'].fillna(''),
+            'lead_score': rows['lead_score'].fillna(0).astype(int),
+        }, index=rows.index)
+        return frame.join(history_features_from_counts(rows[COUNTER_COLUMNS]))
+
+    def rebuild(self) -> int:
+        """
+        Recompute every lead's counters from the interactions and appointments tables
+
+        Used to backfill the store or repair drift; incremental updates keep
+        it current afterwards.
+
+        Returns:
+            Number of leads with a feature row
+        """
+        from app.models.appointment_sqlalchemy import Appointment, AppointmentStatus
+        from app.models.interaction_sqlalchemy import (
+            EntityType,
+            Interaction,
+            InteractionDirection,
+            InteractionOutcome,
+            InteractionType,
+        )
+
+        def count_if(condition):
+            return func.sum(case((condition, 1), else_=0))
+
+        is_email = Interaction.interaction_type == InteractionType.EMAIL
+        is_outbound = Interaction.direction == InteractionDirection.OUTBOUND
+        responded = Interaction.outcome.in_([InteractionOutcome(v) for v in RESPONDED_OUTCOMES])
+        interactions = (
+            select(
+                Interaction.entity_id,
+                func.count().label('interaction_count'),
+                count_if(is_email).label('email_count'),
+                count_if(is_email & (Interaction.email_opened == True)).label('email_opened_count'),
+                count_if(is_outbound).label('outbound_count'),
+                count_if(is_outbound & responded).label('outbound_responded_count'),
+                func.coalesce(func.sum(Interaction.duration_minutes), 0).label('total_duration_minutes'),
+                func.max(Interaction.interaction_date).label('last_interaction_at'),
+            )
+            .where(Interaction.entity_type == EntityType.LEAD)
+            .group_by(Interaction.entity_id)
+        )
+        appointments = (
+            select(
+                Appointment.entity_id,
+                func.count().label('appointment_count'),
+                count_if(Appointment.status == AppointmentStatus.COMPLETED).label('appointment_completed_count'),
+            )
+            .where(Appointment.entity_type == EntityType.LEAD.value)
+            .group_by(Appointment.entity_id)
+        )
+
+        records: Dict[str, dict] = {}
+        with get_db_session() as db:
+            for row in db.execute(interactions).mappings():
+                record = records.setdefault(row['entity_id'], {'lead_id': row['entity_id']})
+                record.update({k: v for k, v in row.items() if k != 'entity_id'})
+            for row in db.execute(appointments).mappings():
+                record = records.setdefault(row['entity_id'], {'lead_id': row['entity_id']})
+                record.update({k: v for k, v in row.items() if k != 'entity_id'})
+
+            now = datetime.utcnow()
+            rows = [
+                {**{name: 0 for name in COUNTER_COLUMNS}, 'last_interaction_at': None,
+                 **record, 'updated_at': now}
+                for record in records.values()
+            ]
+            db.query(LeadFeatureRecord).delete()
+            if rows:
+                db.execute(LeadFeatureRecord.__table__.insert(), rows)
+
+        logger.info(f"✅ Lead feature store rebuilt for {len(rows)} leads")
+        return len(rows)
+
+
+# Create singleton instance
+lead_feature_store = LeadFeatureStore()
@@ -0,0 +1,350 @@
+"""
+Revenue Forecasting Service
+
+Fits the candidate forecasting models (Prophet, ARIMA, linear), keeps the
+one with the lowest holdout error, and persists it keyed by a revenue data
+watermark. Candidates are fitted concurrently in a process pool only where
+FORECAST_PROCESS_POOL is enabled (the standalone job worker); web processes
+fit them in-process rather than forking per request. Forecast requests reuse the fitted
+model until new revenue lands, so they only pay for prediction.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+import hashlib
+import logging
+import os
+import threading
+
+import joblib
+import numpy as np
+import pandas as pd
+from sqlalchemy import and_, func
+from sqlalchemy.orm import Session
+
+from app.models.project_sqlalchemy import Project
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Project statuses whose final_amount counts as revenue
+REVENUE_STATUSES = ['completed', 'in_progress']
+
+# Candidate models, in tie-break order
+CANDIDATE_MODELS = ('prophet', 'arima', 'linear')
+
+# Trailing days held out to score candidates (matches get_forecast_accuracy)
+HOLDOUT_DAYS = 30
+
+FORECAST_MODEL_DIR = os.getenv("FORECAST_MODEL_DIR", "./models/forecasts")
+
+# Fit candidates in a process pool (set by the standalone job worker)
+FORECAST_PROCESS_POOL = os.getenv("FORECAST_PROCESS_POOL", "false").lower() == "true"
+
+# Model trained explicitly via POST /ml/revenue/train, shared by all processes
+TRAINED_MODEL_FILE = "revenue_model_trained.joblib"
+
+
+def query_daily_revenue(db: Session, start_date: datetime, end_date: datetime) -> List:
+    """Daily revenue and project count rows between two dates"""
+    return (
+        db.query(
+            func.date(Project.created_at).label('date'),
+            func.sum(Project.final_amount).label('revenue'),
+            func.count(Project.id).label('project_count')
+        )
+        .filter(
+            and_(
+                Project.created_at >= start_date,
+                Project.created_at <= end_date,
+                Project.status.in_(REVENUE_STATUSES),
+                Project.final_amount.isnot(None)
+            )
+        )
+        .group_by(func.date(Project.created_at))
+        .order_by(func.date(Project.created_at))
+        .all()
+    )
+
+
+def daily_revenue_frame(rows: List, start_date: datetime, historical_days: int) -> pd.DataFrame:
+    """Rows from query_daily_revenue as a gap-free daily frame (missing days are 0)"""
+    df = pd.DataFrame([tuple(row)[:3] for row in rows], columns=['date', 'revenue', 'project_count'])
+    df['date'] = pd.to_datetime(df['date'])
+    df['revenue'] = df['revenue'].astype(float)
+    df = df.set_index('date')
+
+    # Rows are keyed by calendar day, so the range must start at midnight
+    date_range = pd.date_range(start=pd.Timestamp(start_date).normalize(), periods=historical_days, freq='D')
+    df = df.reindex(date_range, fill_value=0)
+    df.index.name = 'date'
+    return df
+
+
+def revenue_watermark(db: Session) -> str:
+    """
+    Cheap fingerprint of the revenue data
+
+    Changes whenever a revenue project is added, removed or edited, which is
+    when a cached forecast model has to be refitted.
+    """
+    row = (
+        db.query(
+            func.max(Project.updated_at).label('last_updated'),
+            func.count(Project.id).label('projects')
+        )
+        .filter(
+            Project.status.in_(REVENUE_STATUSES),
+            Project.final_amount.isnot(None)
+        )
+        .one()
+    )
+    return f"{row.last_updated}|{row.projects}"
+
+
+def fit_candidate(model_type: str, df: pd.DataFrame, holdout_days: int = HOLDOUT_DAYS) -> Dict:
+    """
+    Score one candidate on a holdout, then refit it on all data
+
+    Runs in a worker process; failures are returned rather than raised so
+    one broken candidate (e.g. Prophet without a Stan backend) doesn't sink
+    the selection.
+    """
+    from app.ml.revenue_forecasting import RevenueForecastingModel
+
+    model = RevenueForecastingModel(db=None)
+    model.model_type = model_type
+    try:
+        train, holdout = df.iloc[:-holdout_days], df.iloc[-holdout_days:]
+        model.training_data = train
+        model._train(train)
+        predicted = np.array([p['predicted_revenue'] for p in model._predict(holdout_days)])
+        holdout_mae = float(np.mean(np.abs(holdout['revenue'].values - predicted)))
+
+        model.training_data = df
+        metrics = model._train(df)
+        return {
+            'model_type': model_type,
+            'holdout_mae': round(holdout_mae, 2),
+            'metrics': metrics,
+            'model': model.model,
+        }
+    except Exception as e:
+        return {'model_type': model_type, 'error': f"{type(e).__name__}: {e}"}
+
+
+def select_model(
+    df: pd.DataFrame,
+    candidates: Optional[List[str]] = None,
+    holdout_days: int = HOLDOUT_DAYS,
+    max_workers: Optional[int] = None,
+    processes: Optional[bool] = None
+) -> Dict:
+    """
+    Fit candidates and return the one with the lowest holdout MAE
+
+    Args:
+        df: Daily revenue frame from daily_revenue_frame
+        candidates: Model types to try (defaults to every available one)
+        holdout_days: Trailing days used for scoring
+        max_workers: Worker processes (defaults to one per candidate, capped at CPU count)
+        processes: Fit in a process pool (defaults to FORECAST_PROCESS_POOL)
+
+    Returns:
+        Winning fit_candidate result plus a 'candidates' summary of all of them
+    """
+    from app.ml.revenue_forecasting import PROPHET_AVAILABLE
+
+    if candidates is None:
+        candidates = [m for m in CANDIDATE_MODELS if m != 'prophet' or PROPHET_AVAILABLE]
+    if len(df) <= holdout_days:
+        raise ValueError(f"Need more than {holdout_days} days of data to score forecasting models")
+
+    if processes is None:
+        processes = FORECAST_PROCESS_POOL
+
+    results = None
+    if processes:
+        workers = max_workers or min(len(candidates), os.cpu_count() or 1)
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(fit_candidate, candidates, [df] * len(candidates),
+                                        [holdout_days] * len(candidates)))
+        except (OSError, RuntimeError) as e:
+            # No process support (sandboxed/embedded interpreters); fit in-process instead
+            logger.warning(f"Process pool unavailable ({e}); fitting forecasting models sequentially")
+    if results is None:
+        results = [fit_candidate(m, df, holdout_days) for m in candidates]
+
+    fitted = [r for r in results if 'error' not in r]
+    for failed in (r for r in results if 'error' in r):
+        logger.warning(f"Forecast candidate {failed['model_type']} failed: {failed['error']}")
+    if not fitted:
+        raise ValueError("No forecasting model could be fitted")
+
+    best = min(fitted, key=lambda r: (r['holdout_mae'], candidates.index(r['model_type'])))
+    best['candidates'] = [
+        {k: v for k, v in r.items() if k in ('model_type', 'holdout_mae', 'error')}
+        for r in results
+    ]
+    logger.info(
+        f"Selected {best['model_type']} forecasting model (holdout MAE {best['holdout_mae']}) "
+        f"from {len(fitted)}/{len(candidates)} candidates"
+    )
+    return best
+
+
+class RevenueForecastService:
+    """
+    Serves revenue forecasts from a fitted model cached by data watermark
+
+    Models are kept in memory and on disk under FORECAST_MODEL_DIR so every
+    worker process shares them. A new model is selected when the watermark,
+    the history window, or the calendar day (the window's end) changes.
+    """
+
+    def __init__(self, model_dir: str = FORECAST_MODEL_DIR):
+        self.model_dir = Path(model_dir)
+        self._models: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def _cache_key(self, db: Session, historical_days: int, end_date: datetime) -> Optional[str]:
+        try:
+            watermark = revenue_watermark(db)
+        except Exception as e:
+            logger.warning(f"Revenue watermark unavailable, forecast model won't be cached: {e}")
+            return None
+        raw = f"{watermark}|{historical_days}|{end_date.date().isoformat()}"
+        return hashlib.blake2b(raw.encode(), digest_size=12).hexdigest()
+
+    def _model_file(self, historical_days: int, key: str) -> Path:
+        return self.model_dir / f"revenue_forecast_{historical_days}d_{key}.joblib"
+
+    def _load(self, historical_days: int, key: str) -> Optional[Dict]:
+        if key in self._models:
+            return self._models[key]
+        path = self._model_file(historical_days, key)
+        if not path.exists():
+            return None
+        try:
+            entry = joblib.load(path)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable forecast model {path}: {e}")
+            return None
+        self._remember(historical_days, key, entry)
+        return entry
+
+    def _remember(self, historical_days: int, key: str, entry: Dict):
+        # Keep only the current model for each history window
+        self._models = {
+            k: v for k, v in self._models.items() if v.get('historical_days') != historical_days
+        }
+        self._models[key] = entry
+
+    def _store(self, historical_days: int, key: str, entry: Dict):
+        self._remember(historical_days, key, entry)
+        try:
+            self.model_dir.mkdir(parents=True, exist_ok=True)
+            path = self._model_file(historical_days, key)
+            # Older models for the same window are superseded
+            for stale in self.model_dir.glob(f"revenue_forecast_{historical_days}d_*.joblib"):
+                if stale != path:
+                    stale.unlink(missing_ok=True)
+            tmp = path.with_suffix('.tmp')
+            joblib.dump(entry, tmp, protocol=5)
+            tmp.replace(path)
+        except OSError as e:
+            logger.warning(f"Could not persist forecast model: {e}")
+
+    def get_model(self, db: Session, historical_days: int = 180, refresh: bool = False):
+        """
+        Fitted RevenueForecastingModel for the current revenue data
+
+        Args:
+            db: Database session
+            historical_days: Days of history to fit on
+            refresh: Refit even if a cached model exists
+
+        Returns:
+            RevenueForecastingModel ready for predict_revenue, with
+            the selection summary in `selection`
+        """
+        from app.ml.revenue_forecasting import RevenueForecastingModel
+
+        end_date = datetime.utcnow()
+        key = self._cache_key(db, historical_days, end_date)
+
+        with self._lock:
+            entry = None if refresh or key is None else self._load(historical_days, key)
+            if entry is None:
+                start_date = end_date - timedelta(days=historical_days)
+                df = daily_revenue_frame(query_daily_revenue(db, start_date, end_date), start_date, historical_days)
+                best = select_model(df)
+                entry = {
+                    'historical_days': historical_days,
+                    'model_type': best['model_type'],
+                    'model': best['model'],
+                    'training_data': df,
+                    'selection': {
+                        'holdout_days': HOLDOUT_DAYS,
+                        'holdout_mae': best['holdout_mae'],
+                        'metrics': best['metrics'],
+                        'candidates': best['candidates'],
+                        'trained_at': datetime.utcnow().isoformat(),
+                    },
+                }
+                if key is not None:
+                    self._store(historical_days, key, entry)
+
+        model = RevenueForecastingModel(db)
+        model.model = entry['model']
+        model.model_type = entry['model_type']
+        model.training_data = entry['training_data']
+        model.selection = entry['selection']
+        return model
+
+    def save_trained(self, model):
+        """
+        Persist an explicitly trained RevenueForecastingModel
+
+        Training runs as a background job, possibly in another process, so
+        the result is handed to the serving processes through disk.
+        """
+        entry = {
+            'model_type': model.model_type,
+            'model': model.model,
+            'training_data': model.training_data,
+            'selection': model.selection,
+        }
+        path = self.model_dir / TRAINED_MODEL_FILE
+        self.model_dir.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix('.tmp')
+        joblib.dump(entry, tmp, protocol=5)
+        tmp.replace(path)
+
+    def load_trained(self, model) -> bool:
+        """Load the last persisted trained model into `model` if it holds an older one"""
+        path = self.model_dir / TRAINED_MODEL_FILE
+        try:
+            mtime = path.stat().st_mtime
+        except OSError:
+            return False
+        if model.trained_mtime == mtime:
+            return False
+        try:
+            entry = joblib.load(path)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable trained forecast model {path}: {e}")
+            return False
+        model.model = entry['model']
+        model.model_type = entry['model_type']
+        model.training_data = entry['training_data']
+        model.selection = entry['selection']
+        model.trained_mtime = mtime
+        return True
+
+
+# Create singleton instance
+revenue_forecast_service = RevenueForecastService()
@@ -3,16 +3,20 @@ Next Best Action (NBA) Prediction Model
 Recommends optimal action for each lead using Gradient Boosting
 """
 
-from sklearn.ensemble import GradientBoostingClassifier
+from sklearn.ensemble import GradientBoostingClassifier, HistGradientBoostingClassifier
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401 (enables HalvingRandomSearchCV)
+from sklearn.inspection import permutation_importance
 from sklearn.metrics import (
     accuracy_score,
+    f1_score,
     precision_recall_fscore_support,
     confusion_matrix,
     classification_report
 )
-from sklearn.model_selection import RandomizedSearchCV
+from sklearn.model_selection import HalvingRandomSearchCV, RandomizedSearchCV
 import joblib
 import json
+import time
 from pathlib import Path
 import numpy as np
 import pandas as pd
@@ -24,6 +28,82 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+class _TimedFitMixin:
+    """Records the CPU seconds of each fit in fit_cpu_time_
+
+    time.process_time covers every thread of the process, so OpenMP threads
+    used by HistGradientBoosting are included.
+    """
+
+    def fit(self, X, y, **fit_params):
+        start = time.process_time()
+        super().fit(X, y, **fit_params)
+        self.fit_cpu_time_ = time.process_time() - start
+        return self
+
+
+class TimedGradientBoostingClassifier(_TimedFitMixin, GradientBoostingClassifier):
+    """GradientBoostingClassifier that records its fit CPU time"""
+
+
+class TimedHistGradientBoostingClassifier(_TimedFitMixin, HistGradientBoostingClassifier):
+    """HistGradientBoostingClassifier that records its fit CPU time"""
+
+
+# Training backends: estimator class, defaults and search space
+BACKENDS = {
+    # Exact-split boosting; every tree sees every sample, single-threaded per fit
+    'gbm': {
+        'estimator': TimedGradientBoostingClassifier,
+        'defaults': {'n_estimators': 200, 'learning_rate': 0.05, 'max_depth': 5, 'random_state': 42, 'verbose': 1},
+        'search_defaults': {'random_state': 42},
+        'param_distributions': {
+            'n_estimators': [100, 200, 300, 400],
+            'learning_rate': [0.01, 0.05, 0.1, 0.2],
+            'max_depth': [3, 5, 7, 9],
+            'min_samples_split': [2, 5, 10, 20],
+            'min_samples_leaf': [1, 2, 4, 8],
+            'subsample': [0.8, 0.9, 1.0],
+            'max_features': ['sqrt', 'log2', None]
+        },
+    },
+    # Histogram boosting; multithreaded, stops adding trees once validation loss plateaus
+    'hist': {
+        'estimator': TimedHistGradientBoostingClassifier,
+        'defaults': {
+            'max_iter': 500, 'learning_rate': 0.1, 'early_stopping': True,
+            'validation_fraction': 0.1, 'n_iter_no_change': 10, 'random_state': 42
+        },
+        'search_defaults': {
+            'max_iter': 500, 'early_stopping': True, 'validation_fraction': 0.1,
+            'n_iter_no_change': 10, 'random_state': 42
+        },
+        'param_distributions': {
+            'learning_rate': [0.03, 0.05, 0.1, 0.2],
+            'max_leaf_nodes': [15, 31, 63],
+            'max_depth': [None, 3, 5, 7],
+            'min_samples_leaf': [10, 20, 40],
+            'l2_regularization': [0.0, 0.1, 1.0],
+            'max_features': [0.5, 0.8, 1.0]
+        },
+    },
+}
+
+SEARCH_STRATEGIES = ('random', 'halving')
+
+
+def _search_scorer(estimator, X, y) -> Dict[str, float]:
+    """Weighted F1 for model selection, plus the fit CPU time as a side metric
+
+    The selection metric is keyed 'score' because HalvingRandomSearchCV
+    ranks candidates by cv_results_['mean_test_score'].
+    """
+    return {
+        'score': f1_score(y, estimator.predict(X), average='weighted', zero_division=0),
+        'fit_cpu_time': getattr(estimator, 'fit_cpu_time_', 0.0),
+    }
+
+
 class NextBestActionModel:
     """
     NBA Model predicts optimal next action for each lead
@@ -55,10 +135,14 @@ class NextBestActionModel:
         """
         self.model_path = Path(model_path)
         self.model_path.mkdir(exist_ok=True, parents=True)
-        self.model: Optional[GradientBoostingClassifier] = None
+        self.model: Optional[Any] = None
         self.feature_names: List[str] = []
         self.version: str = "1.0"
         self.trained_at: Optional[str] = None
+        self.backend: str = "gbm"
+        self.search_results: List[Dict[str, Any]] = []
+        self.training_stats: Dict[str, Any] = {}
+        self.permutation_importances_: Optional[np.ndarray] = None
 
     def train(
         self,
@@ -67,7 +151,10 @@ class NextBestActionModel:
         X_val: np.ndarray,
         y_val: np.ndarray,
         hyperparameter_search: bool = True,
-        n_iter: int = 20
+        n_iter: int = 20,
+        backend: str = "gbm",
+        search: str = "random",
+        n_jobs: int = -1
     ) -> 'NextBestActionModel':
         """
         Train NBA model with optional hyperparameter optimization
@@ -78,11 +165,23 @@ class NextBestActionModel:
             X_val: Validation features
             y_val: Validation labels
             hyperparameter_search: Whether to perform hyperparameter tuning
-            n_iter: Number of iterations for random search
+            n_iter: Number of candidates to sample
+            backend: 'gbm' (GradientBoostingClassifier) or 'hist'
+                (HistGradientBoostingClassifier with early stopping)
+            search: 'random' (every candidate on all data) or 'halving'
+                (successive halving: candidates start on a small sample and
+                only the best third advance to more data each round)
+            n_jobs: Parallel fits during the search (-1 = all cores)
 
         Returns:
             Self for method chaining
         """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend '{backend}', expected one of {list(BACKENDS)}")
+        if search not in SEARCH_STRATEGIES:
+            raise ValueError(f"Unknown search '{search}', expected one of {list(SEARCH_STRATEGIES)}")
+        self.backend = backend
+
         logger.info("=" * 50)
         logger.info("Starting NBA Model Training")
         logger.info("=" * 50)
@@ -96,20 +195,32 @@ class NextBestActionModel:
         logger.info(f"Features: {X_train.shape[1]}")
         logger.info(f"Classes: {np.unique(y_train)}")
 
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+
         if hyperparameter_search:
-            logger.info(f"\nPerforming hyperparameter optimization ({n_iter} iterations)...")
-            self.model = self._hyperparameter_search(X_train, y_train, n_iter)
+            logger.info(f"\nPerforming {search} hyperparameter search ({n_iter} candidates, backend={backend})...")
+            self.model = self._hyperparameter_search(X_train, y_train, n_iter, backend, search, n_jobs)
         else:
-            logger.info("\nTraining with default hyperparameters...")
-            self.model = GradientBoostingClassifier(
-                n_estimators=200,
-                learning_rate=0.05,
-                max_depth=5,
-                random_state=42,
-                verbose=1
-            )
+            logger.info(f"\nTraining with default hyperparameters (backend={backend})...")
+            self.search_results = []
+            self.model = BACKENDS[backend]['estimator'](**BACKENDS[backend]['defaults'])
             self.model.fit(X_train, y_train)
 
+        # Search CPU time in worker processes isn't visible here; see search_results
+        self.training_stats = {
+            'backend': backend,
+            'search': search if hyperparameter_search else None,
+            'wall_time_s': time.perf_counter() - wall_start,
+            'cpu_time_s': time.process_time() - cpu_start,
+            'n_candidates': len(self.search_results),
+            'n_estimators': self._n_estimators(),
+        }
+        self.permutation_importances_ = None
+        logger.info(
+            f"Training finished in {self.training_stats['wall_time_s']:.1f}s wall "
+            f"({self.training_stats['n_estimators']} trees)"
+        )
+
         # Validate
         train_score = self.model.score(X_train, y_train)
         val_score = self.model.score(X_val, y_val)
@@ -131,51 +242,111 @@ class NextBestActionModel:
         self,
         X_train: np.ndarray,
         y_train: np.ndarray,
-        n_iter: int
-    ) -> GradientBoostingClassifier:
+        n_iter: int,
+        backend: str = "gbm",
+        search: str = "random",
+        n_jobs: int = -1
+    ) -> Any:
         """
-        Perform randomized hyperparameter search
+        Perform randomized or successive-halving hyperparameter search
+
+        Candidates are fitted in parallel across `n_jobs` processes. Per
+        candidate wall and CPU fit times are kept in self.search_results.
 
         Args:
             X_train: Training features
             y_train: Training labels
-            n_iter: Number of search iterations
+            n_iter: Number of candidates to sample
+            backend: Key of BACKENDS
+            search: 'random' or 'halving'
+            n_jobs: Parallel fits (-1 = all cores)
 
         Returns:
             Best model from search
         """
-        param_dist = {
-            'n_estimators': [100, 200, 300, 400],
-            'learning_rate': [0.01, 0.05, 0.1, 0.2],
-            'max_depth': [3, 5, 7, 9],
-            'min_samples_split': [2, 5, 10, 20],
-            'min_samples_leaf': [1, 2, 4, 8],
-            'subsample': [0.8, 0.9, 1.0],
-            'max_features': ['sqrt', 'log2', None]
-        }
-
-        base_model = GradientBoostingClassifier(random_state=42)
-
-        search = RandomizedSearchCV(
-            base_model,
-            param_distributions=param_dist,
-            n_iter=n_iter,
+        config = BACKENDS[backend]
+        base_model = config['estimator'](**config['search_defaults'])
+        common = dict(
+            scoring=_search_scorer,
+            refit='score',
             cv=5,
-            scoring='f1_weighted',
-            n_jobs=-1,
+            n_jobs=n_jobs,
             random_state=42,
             verbose=1
         )
 
-        search.fit(X_train, y_train)
+        if search == 'halving':
+            search_cv = HalvingRandomSearchCV(
+                base_model,
+                param_distributions=config['param_distributions'],
+                n_candidates=n_iter,
+                factor=3,
+                min_resources='exhaust',  # last round uses all training data
+                **common
+            )
+        else:
+            search_cv = RandomizedSearchCV(
+                base_model,
+                param_distributions=config['param_distributions'],
+                n_iter=n_iter,
+                **common
+            )
+
+        search_cv.fit(X_train, y_train)
+        self.search_results = self._collect_search_results(search_cv.cv_results_)
 
         logger.info(f"\nBest hyperparameters found:")
-        for param, value in search.best_params_.items():
+        for param, value in search_cv.best_params_.items():
             logger.info(f"  {param}: {value}")
 
-        logger.info(f"\nBest cross-validation F1 score: {search.best_score_:.4f}")
+        logger.info(f"\nBest cross-validation F1 score: {search_cv.best_score_:.4f}")
+        logger.info(
+            f"Search fits: {sum(r['fit_wall_time_s'] * r['n_folds'] for r in self.search_results):.1f}s wall, "
+            f"{sum(r['fit_cpu_time_s'] * r['n_folds'] for r in self.search_results):.1f}s CPU "
+            f"over {len(self.search_results)} candidate evaluations"
+        )
 
-        return search.best_estimator_
+        return search_cv.best_estimator_
+
+    @staticmethod
+    def _collect_search_results(cv_results: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        One record per evaluated candidate (per round for halving search)
+
+        Times are means over the CV folds of a single fit.
+        """
+        n_folds = sum(1 for key in cv_results if key.startswith('split') and key.endswith('_test_score'))
+        records = []
+        for i, params in enumerate(cv_results['params']):
+            records.append({
+                'params': {k: (v.item() if isinstance(v, np.generic) else v) for k, v in params.items()},
+                'mean_f1_weighted': float(cv_results['mean_test_score'][i]),
+                'rank': int(cv_results['rank_test_score'][i]),
+                'fit_wall_time_s': float(cv_results['mean_fit_time'][i]),
+                'fit_cpu_time_s': float(cv_results['mean_test_fit_cpu_time'][i]),
+                'score_time_s': float(cv_results['mean_score_time'][i]),
+                'n_folds': n_folds,
+                'iteration': int(cv_results['iter'][i]) if 'iter' in cv_results else 0,
+                'n_resources': int(cv_results['n_resources'][i]) if 'n_resources' in cv_results else None,
+            })
+        return records
+
+    def _n_estimators(self) -> Optional[int]:
+        """Number of boosting iterations actually fitted"""
+        if self.model is None:
+            return None
+        n = getattr(self.model, 'n_iter_', None)  # hist: after early stopping
+        if n is None:
+            n = getattr(self.model, 'n_estimators_', getattr(self.model, 'n_estimators', None))
+        return int(n) if n is not None else None
+
+    def _feature_importances(self) -> np.ndarray:
+        """Impurity importances, or permutation importances from evaluate() for hist models"""
+        if hasattr(self.model, 'feature_importances_'):
+            return self.model.feature_importances_
+        if self.permutation_importances_ is not None:
+            return self.permutation_importances_
+        raise ValueError("This backend has no built-in feature importances. Call evaluate() first.")
 
     def evaluate(
         self,
@@ -217,8 +388,12 @@ class NextBestActionModel:
             y_test, y_pred, output_dict=True, zero_division=0
         )
 
-        # Feature importance
-        feature_importance = self.model.feature_importances_
+        # Feature importance (hist models have none built in; permute on the test set)
+        if not hasattr(self.model, 'feature_importances_'):
+            self.permutation_importances_ = permutation_importance(
+                self.model, X_test, y_test, scoring='f1_weighted', n_repeats=5, random_state=42, n_jobs=-1
+            ).importances_mean
+        feature_importance = self._feature_importances()
 
         metrics = {
             'accuracy': float(accuracy),
@@ -270,13 +445,14 @@ class NextBestActionModel:
         if self.model is None:
             raise ValueError("Model not trained. Call train() or load() first.")
 
-        predictions = self.model.predict(X)
+        # One predict_proba pass; predict() would re-run every tree for argmax
         probabilities = self.model.predict_proba(X)
+        predictions = self.model.classes_[probabilities.argmax(axis=1)]
 
         results = []
-        for i, (pred, probs) in enumerate(zip(predictions, probabilities)):
+        for pred, probs in zip(predictions, probabilities):
             result = {
-                'action': pred,
+                'action': str(pred),
                 'confidence': float(probs.max())
             }
 
@@ -324,12 +500,13 @@ class NextBestActionModel:
         if self.model is None:
             raise ValueError("Model not trained")
 
+        importances = self._feature_importances()
         if feature_names is None:
-            feature_names = [f"feature_{i}" for i in range(len(self.model.feature_importances_))]
+            feature_names = [f"feature_{i}" for i in range(len(importances))]
 
         importance_df = pd.DataFrame({
             'feature': feature_names,
-            'importance': self.model.feature_importances_
+            'importance': importances
         }).sort_values('importance', ascending=False).head(top_n)
 
         return importance_df
@@ -355,15 +532,19 @@ class NextBestActionModel:
         joblib.dump(self.model, model_file, protocol=5)
 
         # Save metadata
+        max_depth = self.model.get_params().get('max_depth')
         metadata = {
             'version': version,
+            'backend': self.backend,
             'classes': list(self.model.classes_),
             'n_features': int(self.model.n_features_in_),
-            'n_estimators': int(self.model.n_estimators),
-            'max_depth': int(self.model.max_depth),
+            'n_estimators': self._n_estimators(),
+            'max_depth': int(max_depth) if max_depth is not None else None,
             'learning_rate': float(self.model.learning_rate),
             'trained_at': self.trained_at,
-            'feature_names': self.feature_names
+            'feature_names': self.feature_names,
+            'training_stats': self.training_stats,
+            'search_results': self.search_results
         }
 
         metadata_file = self.model_path / f"nba_model_v{version}_metadata.json"
@@ -376,12 +557,14 @@ class NextBestActionModel:
 
         return model_file
 
-    def load(self, version: Optional[str] = None) -> 'NextBestActionModel':
+    def load(self, version: Optional[str] = None, mmap_mode: Optional[str] = None) -> 'NextBestActionModel':
         """
         Load model from disk
 
         Args:
             version: Model version to load (defaults to self.version)
+            mmap_mode: joblib mmap_mode (e.g. 'r') to map numpy arrays from the
+                file instead of copying them into the heap
 
         Returns:
             Self for method chaining
@@ -396,7 +579,7 @@ class NextBestActionModel:
             raise FileNotFoundError(f"Model file not found: {model_file}")
 
         # Load model
-        self.model = joblib.load(model_file)
+        self.model = joblib.load(model_file, mmap_mode=mmap_mode)
 
         # Load metadata
         if metadata_file.exists():
@@ -7,13 +7,13 @@ Implements time series forecasting for 30-day revenue predictions using:
 - Linear regression with seasonal components
 """
 
+import asyncio
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 from decimal import Decimal
 import numpy as np
 import pandas as pd
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
 
 try:
     from prophet import Prophet
@@ -25,9 +25,15 @@ except ImportError:
 from sklearn.linear_model import LinearRegression
 from statsmodels.tsa.arima.model import ARIMA
 
-from app.models.project_sqlalchemy import Project
 from app.models.lead_sqlalchemy import Lead
 from app.database import get_db
+from app.ml.forecasting_service import (
+    HOLDOUT_DAYS,
+    daily_revenue_frame,
+    query_daily_revenue,
+    revenue_forecast_service,
+    select_model
+)
 
 
 class RevenueForecastingModel:
@@ -38,6 +44,8 @@ class RevenueForecastingModel:
         self.model = None
         self.model_type = None
         self.training_data = None
+        self.selection = None
+        self.trained_mtime = None
 
     async def train_model(
         self,
@@ -49,7 +57,9 @@ class RevenueForecastingModel:
 
         Args:
             historical_days: Number of days of historical data to use
-            model_type: Model type ('prophet', 'arima', 'linear', or 'auto')
+            model_type: Model type ('prophet', 'arima', 'linear', or 'auto').
+                'auto' fits every candidate and keeps the one
+                with the lowest error on the last HOLDOUT_DAYS days.
 
         Returns:
             Dict with training results and metrics
@@ -59,64 +69,43 @@ class RevenueForecastingModel:
         if model_type not in valid_types:
             raise ValueError(f"Invalid model_type '{model_type}'. Must be one of {valid_types}")
 
+        # Querying and fitting are blocking; keep them off the shared event loop
+        return await asyncio.to_thread(self._train_model, historical_days, model_type)
+
+    def _train_model(self, historical_days: int, model_type: str) -> Dict:
+        """Blocking body of train_model; runs in a worker thread."""
         # Get historical data
         end_date = datetime.utcnow()
         start_date = end_date - timedelta(days=historical_days)
 
         # Query daily revenue from completed projects
-        daily_revenue = (
-            self.db.query(
-                func.date(Project.created_at).label('date'),
-                func.sum(Project.final_amount).label('revenue'),
-                func.count(Project.id).label('project_count')
-            )
-            .filter(
-                and_(
-                    Project.created_at >= start_date,
-                    Project.created_at <= end_date,
-                    Project.status.in_(['completed', 'in_progress']),
-                    Project.final_amount.isnot(None)
-                )
-            )
-            .group_by(func.date(Project.created_at))
-            .order_by(func.date(Project.created_at))
-            .all()
-        )
+        daily_revenue = query_daily_revenue(self.db, start_date, end_date)
 
         if not daily_revenue or len(daily_revenue) < 30:
             raise ValueError("Insufficient historical data for training (minimum 30 days required)")
 
-        # Convert to pandas DataFrame
-        df = pd.DataFrame(daily_revenue, columns=['date', 'revenue', 'project_count'])
-        df['date'] = pd.to_datetime(df['date'])
-        df = df.set_index('date')
-
         # Fill missing dates with 0 revenue
-        # Use periods parameter to get exact number of days requested
-        date_range = pd.date_range(start=start_date, periods=historical_days, freq='D')
-        df = df.reindex(date_range, fill_value=0)
-        df.index.name = 'date'
+        df = daily_revenue_frame(daily_revenue, start_date, historical_days)
 
         self.training_data = df
-
-        # Auto-select model if requested
-        if model_type == 'auto':
-            if PROPHET_AVAILABLE and len(df) >= 60:
-                model_type = 'prophet'
-            elif len(df) >= 50:
-                model_type = 'arima'
-            else:
-                model_type = 'linear'
-
-        # Train selected model
-        if model_type == 'prophet' and PROPHET_AVAILABLE:
-            metrics = self._train_prophet(df)
-        elif model_type == 'arima':
-            metrics = self._train_arima(df)
+        self.selection = None
+
+        # Auto-select by holdout error when there is enough history to score on
+        if model_type == 'auto' and len(df) >= HOLDOUT_DAYS * 2:
+            best = select_model(df)
+            self.model = best['model']
+            self.model_type = model_type = best['model_type']
+            metrics = best['metrics']
+            self.selection = {
+                'holdout_days': HOLDOUT_DAYS,
+                'holdout_mae': best['holdout_mae'],
+                'candidates': best['candidates']
+            }
         else:
-            metrics = self._train_linear(df)
-
-        self.model_type = model_type
+            if model_type == 'auto' or (model_type == 'prophet' and not PROPHET_AVAILABLE):
+                model_type = 'linear'
+            self.model_type = model_type
+            metrics = self._train(df)
 
         return {
             'model_type': model_type,
@@ -127,6 +116,7 @@ class RevenueForecastingModel:
                 'end_date': end_date.strftime('%Y-%m-%d')
             },
             'metrics': metrics,
+            'selection': self.selection,
             'trained_at': datetime.utcnow().isoformat()
         }
 
@@ -155,12 +145,7 @@ class RevenueForecastingModel:
             raise ValueError("No trained model available")
 
         # Generate predictions based on model type
-        if self.model_type == 'prophet':
-            predictions = self._predict_prophet(days_ahead)
-        elif self.model_type == 'arima':
-            predictions = self._predict_arima(days_ahead)
-        else:
-            predictions = self._predict_linear(days_ahead)
+        predictions = self._predict(days_ahead)
 
         # Apply custom scenario adjustments if provided
         if scenarios:
@@ -223,15 +208,8 @@ class RevenueForecastingModel:
 
         self.training_data = train_data
 
-        if self.model_type == 'prophet':
-            self._train_prophet(train_data)
-            predictions = self._predict_prophet(test_days)
-        elif self.model_type == 'arima':
-            self._train_arima(train_data)
-            predictions = self._predict_arima(test_days)
-        else:
-            self._train_linear(train_data)
-            predictions = self._predict_linear(test_days)
+        self._train(train_data)
+        predictions = self._predict(test_days)
 
         # Restore original model
         self.model = original_model
@@ -267,6 +245,22 @@ class RevenueForecastingModel:
             'calculated_at': datetime.utcnow().isoformat()
         }
 
+    def _train(self, df: pd.DataFrame) -> Dict:
+        """Train the model for self.model_type on df."""
+        if self.model_type == 'prophet':
+            return self._train_prophet(df)
+        if self.model_type == 'arima':
+            return self._train_arima(df)
+        return self._train_linear(df)
+
+    def _predict(self, days_ahead: int) -> List[Dict]:
+        """Predict with the model for self.model_type."""
+        if self.model_type == 'prophet':
+            return self._predict_prophet(days_ahead)
+        if self.model_type == 'arima':
+            return self._predict_arima(days_ahead)
+        return self._predict_linear(days_ahead)
+
     # Model-specific training methods
     def _train_prophet(self, df: pd.DataFrame) -> Dict:
         """Train Prophet model."""
@@ -367,7 +361,9 @@ class RevenueForecastingModel:
     def _predict_arima(self, days_ahead: int) -> List[Dict]:
         """Generate predictions using ARIMA."""
         forecast_result = self.model.forecast(steps=days_ahead)
-        std_error = np.sqrt(self.model.params.get('sigma2', 1))
+        # params is an ndarray when fitted on a plain array; look sigma2 up by name
+        params = dict(zip(self.model.param_names, np.atleast_1d(self.model.params)))
+        std_error = np.sqrt(params.get('sigma2', 1))
 
         # Generate dates
         last_date = self.training_data.index[-1]
@@ -469,4 +465,6 @@ def get_revenue_forecasting_model(db: Session = None) -> RevenueForecastingModel
     global _revenue_forecasting_model
     if _revenue_forecasting_model is None:
         _revenue_forecasting_model = RevenueForecastingModel(db or next(get_db()))
+    # Pick up a model trained by a background job in another process
+    revenue_forecast_service.load_trained(_revenue_forecasting_model)
     return _revenue_forecasting_model
@@ -19,6 +19,7 @@ from app.models.appointment_sqlalchemy import Appointment
 from app.models.base import Base, BaseModel
 from app.models.customer_sqlalchemy import Customer
 from app.models.interaction_sqlalchemy import Interaction
+from app.models.lead_feature_sqlalchemy import LeadFeatureRecord
 
 # SQLAlchemy models (properly converted)
 from app.models.lead_sqlalchemy import Lead
@@ -32,6 +33,7 @@ __all__ = [
     "Base",
     "BaseModel",
     "Lead",
+    "LeadFeatureRecord",
     "Customer",
     "Project",
     "Appointment",
@@ -0,0 +1,44 @@
+"""
+iSwitch Roofs CRM - Lead Feature Store SQLAlchemy Model
+Version: 1.0.0
+
+Per-lead running counters behind the NBA behavioral features. Rates are
+derived from the counters at read time, so each new interaction or
+appointment is a constant-cost increment instead of a history rescan.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Float, Integer, String
+
+from app.models.base import Base
+
+
+class LeadFeatureRecord(Base):
+    """
+    Precomputed interaction/appointment aggregates for one lead.
+
+    Maintained by app.ml.feature_store.LeadFeatureStore.
+    """
+
+    __tablename__ = "lead_features"
+
+    lead_id = Column(String(36), primary_key=True)
+
+    # Interaction counters
+    interaction_count = Column(Integer, default=0, nullable=False)
+    email_count = Column(Integer, default=0, nullable=False)
+    email_opened_count = Column(Integer, default=0, nullable=False)
+    outbound_count = Column(Integer, default=0, nullable=False)
+    outbound_responded_count = Column(Integer, default=0, nullable=False)
+    total_duration_minutes = Column(Float, default=0.0, nullable=False)
+    last_interaction_at = Column(DateTime, nullable=True)
+
+    # Appointment counters
+    appointment_count = Column(Integer, default=0, nullable=False)
+    appointment_completed_count = Column(Integer, default=0, nullable=False)
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<LeadFeatureRecord(lead_id='{self.lead_id}', interactions={self.interaction_count})>"
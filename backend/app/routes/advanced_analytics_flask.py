@@ -12,30 +12,20 @@ Flask blueprint for advanced analytics features including:
 - Revenue forecasting ML
 """
 
-import asyncio
-from functools import wraps
 from flask import Blueprint, jsonify, request
 
 from app.database import get_db
 from app.ml.advanced_analytics import AdvancedAnalytics
 from app.ml.revenue_forecasting import get_revenue_forecasting_model
 from app.ml.ab_testing import get_ab_testing_framework, ExperimentConfig
+from app.routes.jobs import current_user_id, job_accepted
+from app.services.job_queue import job_queue
+from app.utils.async_runner import async_route
 
 # Create Flask blueprint
 bp = Blueprint('advanced_analytics', __name__)
 
-
-def async_route(f):
-    """Decorator to run async functions in Flask routes."""
-    @wraps(f)
-    def wrapper(*args, **kwargs):
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            return loop.run_until_complete(f(*args, **kwargs))
-        finally:
-            loop.close()
-    return wrapper
+REVENUE_MODEL_TYPES = ('auto', 'prophet', 'arima', 'linear')
 
 
 # ============================================================================
@@ -164,11 +154,13 @@ async def get_marketing_attribution():
 # ============================================================================
 
 @bp.route('/ml/revenue/train', methods=['POST'])
-@async_route
-async def train_revenue_model():
+def train_revenue_model():
     """
     POST /api/advanced-analytics/ml/revenue/train
 
+    Queues training as a background job and returns 202 with its job_id;
+    the trained model is served by /ml/revenue/predict once the job succeeds.
+
     JSON body:
         historical_days: Days of data (30-365, default 180)
         model_type: auto, prophet, arima, or linear (default: auto)
@@ -179,19 +171,16 @@ async def train_revenue_model():
 
     if not (30 <= historical_days <= 365):
         return jsonify({'error': 'historical_days must be between 30 and 365'}), 400
-
-    db = next(get_db())
-    model = get_revenue_forecasting_model(db)
+    if model_type not in REVENUE_MODEL_TYPES:
+        return jsonify({'error': f"model_type must be one of {', '.join(REVENUE_MODEL_TYPES)}"}), 400
 
     try:
-        result = await model.train_model(historical_days, model_type)
-        return jsonify(result), 200
-    except ValueError as e:
-        return jsonify({'error': str(e)}), 400
+        job = job_queue.enqueue(
+            'revenue.train', historical_days, model_type, created_by=current_user_id()
+        )
+        return job_accepted(job)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
-    finally:
-        db.close()
 
 
 @bp.route('/ml/revenue/predict', methods=['GET'])
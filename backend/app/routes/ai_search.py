@@ -8,8 +8,8 @@ from typing import List
 from flask import Blueprint, jsonify, request
 from app.database import get_db
 from app.services.ai_search_service import AISearchService
+from app.utils.async_runner import run_async
 from app.utils.auth import require_auth
-import asyncio
 
 logger = logging.getLogger(__name__)
 bp = Blueprint("ai_search", __name__)
@@ -58,13 +58,8 @@ def ai_search():
 
         # Process search query using GPT-4o
         try:
-            # Run async function in sync context
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            results = loop.run_until_complete(
-                service.process_search_query(query, context)
-            )
-            loop.close()
+            # Run on the shared event loop so the OpenAI client pool is reused
+            results = run_async(service.process_search_query(query, context))
         finally:
             db.close()
 
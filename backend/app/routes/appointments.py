@@ -36,6 +36,9 @@ bp = Blueprint("appointments", __name__)
 # Initialize Pusher service for real-time updates
 pusher_service = get_pusher_service()
 
+# Non-nullable columns usable as keyset sort keys
+APPOINTMENT_KEYSET_SORT_FIELDS = ["scheduled_date", "created_at"]
+
 
 @bp.route("/", methods=["GET"])
 @require_auth
@@ -52,6 +55,10 @@ def get_appointments():
         - end_date: Filter appointments before this date
         - page: Page number (default: 1)
         - limit: Items per page (default: 20)
+        - cursor: Switch to keyset pagination; empty for the first page, then
+          the previous response's next_cursor
+        - sort: Keyset mode only - scheduled_date or created_at (default: scheduled_date:asc)
+        - include_total: Keyset mode only - exact, estimate or cached
 
     Returns:
         200: List of appointments
@@ -63,7 +70,15 @@ def get_appointments():
     """
     try:
         from app.utils.database import get_db_session
-        from app.utils.pagination import paginate_query, create_pagination_response
+        from app.utils.pagination import (
+            count_total,
+            create_keyset_response,
+            create_pagination_response,
+            extract_total_mode,
+            paginate_keyset,
+            paginate_query,
+            resolve_keyset_sort,
+        )
         from sqlalchemy import and_
         from app.models.appointment_sqlalchemy import Appointment
         from app.models.customer_sqlalchemy import Customer
@@ -107,11 +122,25 @@ def get_appointments():
         if filters:
             query = query.filter(and_(*filters))
 
-        # Apply sorting
-        query = query.order_by(Appointment.scheduled_date.asc())
+        # Keyset pagination (opt-in with ?cursor=)
+        keyset = "cursor" in request.args
+        if keyset:
+            sort_column, direction = resolve_keyset_sort(
+                Appointment,
+                request.args.get("sort"),
+                APPOINTMENT_KEYSET_SORT_FIELDS,
+                default="scheduled_date:asc",
+            )
+            appointments, next_cursor = paginate_keyset(
+                query, sort_column, request.args.get("cursor"), limit=limit, direction=direction
+            )
+            total, total_type = count_total(query, extract_total_mode(request.args), tag="appointments")
+        else:
+            # Apply sorting
+            query = query.order_by(Appointment.scheduled_date.asc())
 
-        # Get paginated results
-        appointments, total = paginate_query(query, page=page, per_page=limit)
+            # Get paginated results
+            appointments, total = paginate_query(query, page=page, per_page=limit)
 
         # Convert SQLAlchemy models to dicts
         appointments_data = []
@@ -154,15 +183,22 @@ def get_appointments():
             appointments_data.append(appointment_dict)
 
         # Create pagination response
-        response = create_pagination_response(
-            items=appointments_data,
-            total=total,
-            page=page,
-            per_page=limit
-        )
+        if keyset:
+            response = create_keyset_response(
+                appointments_data, next_cursor, limit, total, total_type
+            )
+        else:
+            response = create_pagination_response(
+                items=appointments_data,
+                total=total,
+                page=page,
+                per_page=limit
+            )
 
         return jsonify(response), 200
 
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         logger.error(f"Error fetching appointments: {str(e)}", exc_info=True)
         return jsonify({"error": "Failed to fetch appointments"}), 500
@@ -637,6 +673,74 @@ def get_available_slots():
         return jsonify({"error": "Failed to get available slots"}), 500
 
 
+@bp.route("/availability/find", methods=["GET"])
+@require_auth
+def find_slots():
+    """
+    Find free windows for a crew over a date range
+
+    Query Parameters:
+        - team_member_ids: Comma-separated team member UUIDs (required, max 50)
+        - start_date: Start date (required, format: YYYY-MM-DD)
+        - end_date: End date (required, format: YYYY-MM-DD)
+        - duration: Minimum window length in minutes (optional, default: 60)
+
+    Returns:
+        200: Free windows per team member and windows where the whole crew is free
+        400: Validation error
+        401: Unauthorized
+        500: Server error
+
+    Example:
+        GET /api/appointments/availability/find?team_member_ids=uuid1,uuid2&start_date=2025-01-13&end_date=2025-01-17
+    """
+    try:
+        team_member_ids = [
+            member_id.strip()
+            for member_id in request.args.get("team_member_ids", "").split(",")
+            if member_id.strip()
+        ]
+        start_date_str = request.args.get("start_date")
+        end_date_str = request.args.get("end_date")
+
+        if not team_member_ids:
+            return jsonify({"error": "team_member_ids is required"}), 400
+
+        if len(team_member_ids) > 50:
+            return jsonify({"error": "Cannot search more than 50 team members"}), 400
+
+        if not start_date_str or not end_date_str:
+            return jsonify({"error": "start_date and end_date are required"}), 400
+
+        # Parse dates
+        try:
+            start_date = datetime.strptime(start_date_str, "%Y-%m-%d")
+            end_date = datetime.strptime(end_date_str, "%Y-%m-%d")
+        except ValueError:
+            return jsonify({"error": "Invalid date format. Use YYYY-MM-DD"}), 400
+
+        # Validate date range
+        if end_date < start_date:
+            return jsonify({"error": "end_date must be after start_date"}), 400
+
+        if (end_date - start_date).days > 90:
+            return jsonify({"error": "Date range cannot exceed 90 days"}), 400
+
+        duration = request.args.get("duration", type=int)
+        if duration is not None and duration <= 0:
+            return jsonify({"error": "duration must be positive"}), 400
+
+        slots = appointments_service.find_slots(
+            (start_date, end_date), team_member_ids, duration=duration
+        )
+
+        return jsonify({"success": True, **slots}), 200
+
+    except Exception as e:
+        logger.error(f"Error finding slots: {str(e)}")
+        return jsonify({"error": "Failed to find slots"}), 500
+
+
 @bp.route("/schedule/<team_member_id>", methods=["GET"])
 @require_auth
 def get_team_schedule(team_member_id: str):
@@ -705,6 +809,71 @@ def get_team_schedule(team_member_id: str):
         return jsonify({"error": "Failed to get team schedule"}), 500
 
 
+@bp.route("/schedule", methods=["GET"])
+@require_auth
+def get_team_schedules():
+    """
+    Get the whole team's schedule and free/busy blocks for a date range
+
+    Query Parameters:
+        - team_member_ids: Comma-separated team member UUIDs (required, max 50)
+        - start_date: Start date (required, format: YYYY-MM-DD)
+        - end_date: End date (required, format: YYYY-MM-DD)
+
+    Returns:
+        200: Compact schedule matrix. "busy" and "free" are indexed
+             [member][day] and hold [start, end] minutes from midnight;
+             "common_free" holds the windows where every member is free.
+        400: Validation error
+        401: Unauthorized
+        500: Server error
+
+    Example:
+        GET /api/appointments/schedule?team_member_ids=uuid1,uuid2&start_date=2025-01-13&end_date=2025-01-26
+    """
+    try:
+        team_member_ids = [
+            member_id.strip()
+            for member_id in request.args.get("team_member_ids", "").split(",")
+            if member_id.strip()
+        ]
+        start_date_str = request.args.get("start_date")
+        end_date_str = request.args.get("end_date")
+
+        if not team_member_ids:
+            return jsonify({"error": "team_member_ids is required"}), 400
+
+        if len(team_member_ids) > 50:
+            return jsonify({"error": "Cannot load more than 50 team members"}), 400
+
+        if not start_date_str or not end_date_str:
+            return jsonify({"error": "start_date and end_date are required"}), 400
+
+        # Parse dates
+        try:
+            start_date = datetime.strptime(start_date_str, "%Y-%m-%d")
+            end_date = datetime.strptime(end_date_str, "%Y-%m-%d")
+        except ValueError:
+            return jsonify({"error": "Invalid date format. Use YYYY-MM-DD"}), 400
+
+        # Validate date range
+        if end_date < start_date:
+            return jsonify({"error": "end_date must be after start_date"}), 400
+
+        if (end_date - start_date).days > 90:
+            return jsonify({"error": "Date range cannot exceed 90 days"}), 400
+
+        schedule = appointments_service.get_team_schedules(
+            team_member_ids, start_date=start_date, end_date=end_date
+        )
+
+        return jsonify({"success": True, **schedule}), 200
+
+    except Exception as e:
+        logger.error(f"Error getting team schedules: {str(e)}")
+        return jsonify({"error": "Failed to get team schedules"}), 500
+
+
 @bp.route("/<appointment_id>/complete", methods=["POST"])
 @require_auth
 def complete_appointment(appointment_id: str):
@@ -45,10 +45,14 @@ def get_stats() -> tuple[Dict[str, Any], int]:
             "success": true,
             "data": {
                 "hits": 1250,
+                "l1_hits": 900,
+                "l2_hits": 350,
                 "misses": 350,
                 "errors": 5,
                 "total_requests": 1600,
                 "hit_rate_percent": 78.13,
+                "l1_hit_rate_percent": 56.25,
+                "l1_entries": 12,
                 "last_reset": "2025-10-09T10:00:00"
             }
         }
@@ -189,16 +189,13 @@ def chat():
                 # Import required modules
                 from app.database import get_db
                 from app.services.intelligence.live_data_collector import run_live_collection
-                import asyncio
+                from app.utils.async_runner import run_async
 
                 # Get database session and run collection
                 db = next(get_db())
                 try:
-                    # Run async collection
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                    results = loop.run_until_complete(run_live_collection(db, count))
-                    loop.close()
+                    # Run async collection on the shared event loop
+                    results = run_async(run_live_collection(db, count))
                 finally:
                     db.close()
 
@@ -20,12 +20,16 @@ from app.schemas.customer import (
 from app.services.customer_service import customer_service
 from app.services.notification import notification_service
 from app.utils.auth import require_auth
+from app.utils.cache import invalidate_tags
 from app.utils.validation import validate_request
 from app.utils.pusher_client import get_pusher_service
 
 bp = Blueprint("customers", __name__, url_prefix="/api/customers")
 logger = logging.getLogger(__name__)
 
+# Non-nullable columns usable as keyset sort keys
+CUSTOMER_KEYSET_SORT_FIELDS = ["created_at", "updated_at", "lifetime_value"]
+
 # Initialize clients
 supabase_client = None
 pusher_service = get_pusher_service()
@@ -48,6 +52,9 @@ def list_customers():
     Query Parameters:
         - page: Page number (default: 1)
         - limit: Items per page (default: 50, max: 100)
+        - cursor: Switch to keyset pagination; empty for the first page, then
+          the previous response's next_cursor
+        - include_total: Keyset mode only - exact, estimate or cached
         - sort: Sort field:direction (e.g., 'created_at:desc')
         - status: Filter by status (comma-separated)
         - segment: Filter by segment (comma-separated)
@@ -59,7 +66,15 @@ def list_customers():
     """
     try:
         from app.utils.database import get_db_session
-        from app.utils.pagination import paginate_query, create_pagination_response
+        from app.utils.pagination import (
+            count_total,
+            create_keyset_response,
+            create_pagination_response,
+            extract_total_mode,
+            paginate_keyset,
+            paginate_query,
+            resolve_keyset_sort,
+        )
         from sqlalchemy import and_
         from app.models.customer_sqlalchemy import Customer
 
@@ -100,27 +115,40 @@ def list_customers():
         if filters:
             query = query.filter(and_(*filters))
 
-        # Sorting
-        sort_field = "created_at"
-        sort_dir = "desc"
-        if sort := request.args.get("sort"):
-            parts = sort.split(":")
-            sort_field = parts[0]
-            sort_dir = parts[1] if len(parts) > 1 else "asc"
-
-        # Apply sorting
-        if hasattr(Customer, sort_field):
-            order_column = getattr(Customer, sort_field)
-            if sort_dir == "desc":
-                query = query.order_by(order_column.desc())
-            else:
-                query = query.order_by(order_column.asc())
+        # Keyset pagination (opt-in with ?cursor=)
+        keyset = "cursor" in request.args
+        if keyset:
+            sort_column, direction = resolve_keyset_sort(
+                Customer, request.args.get("sort"), CUSTOMER_KEYSET_SORT_FIELDS
+            )
+            customers, next_cursor = paginate_keyset(
+                query, sort_column, request.args.get("cursor"), limit=limit, direction=direction
+            )
+            total, total_type = count_total(
+                query, extract_total_mode(request.args), tag="customers"
+            )
         else:
-            # Default sort
-            query = query.order_by(Customer.created_at.desc())
+            # Sorting
+            sort_field = "created_at"
+            sort_dir = "desc"
+            if sort := request.args.get("sort"):
+                parts = sort.split(":")
+                sort_field = parts[0]
+                sort_dir = parts[1] if len(parts) > 1 else "asc"
+
+            # Apply sorting
+            if hasattr(Customer, sort_field):
+                order_column = getattr(Customer, sort_field)
+                if sort_dir == "desc":
+                    query = query.order_by(order_column.desc())
+                else:
+                    query = query.order_by(order_column.asc())
+            else:
+                # Default sort
+                query = query.order_by(Customer.created_at.desc())
 
-        # Get paginated results
-        customers, total = paginate_query(query, page=page, per_page=limit)
+            # Get paginated results
+            customers, total = paginate_query(query, page=page, per_page=limit)
 
         # Convert SQLAlchemy models to dicts
         customers_data = []
@@ -151,15 +179,22 @@ def list_customers():
             customers_data.append(customer_dict)
 
         # Create pagination response
-        response = create_pagination_response(
-            items=customers_data,
-            total=total,
-            page=page,
-            per_page=limit
-        )
+        if keyset:
+            response = create_keyset_response(
+                customers_data, next_cursor, limit, total, total_type
+            )
+        else:
+            response = create_pagination_response(
+                items=customers_data,
+                total=total,
+                page=page,
+                per_page=limit
+            )
 
         return jsonify(response), 200
 
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         logger.error(f"Error listing customers: {str(e)}", exc_info=True)
         return jsonify({"error": "Failed to list customers"}), 500
@@ -277,6 +312,7 @@ def create_customer():
             return jsonify({"error": "Failed to create customer"}), 500
 
         customer = result.data[0]
+        invalidate_tags("customers")
 
         # Send notification
         notification_service.send_notification(
@@ -339,6 +375,7 @@ def update_customer(customer_id: str):
             return jsonify({"error": "Customer not found"}), 404
 
         customer = result.data[0]
+        invalidate_tags("customers", f"customer:{customer_id}")
 
         # Determine new segment if LTV changed
         if "lifetime_value" in data or "project_count" in data:
@@ -403,6 +440,8 @@ def delete_customer(customer_id: str):
         if not result.data:
             return jsonify({"error": "Customer not found"}), 404
 
+        invalidate_tags("customers", f"customer:{customer_id}")
+
         logger.info(f"Customer soft deleted: {customer_id}")
         return jsonify({"message": f"Customer {customer_id} deleted successfully"}), 200
 
@@ -732,6 +771,8 @@ def bulk_update_customers():
         result = supabase.from_("customers").update(updates).in_("id", customer_ids).execute()
 
         updated = len(result.data) if result.data else 0
+        if updated:
+            invalidate_tags("customers", *(f"customer:{customer_id}" for customer_id in customer_ids))
 
         response = {
             "message": f"Updated {updated} customers",
@@ -6,9 +6,10 @@ Control and monitor the automated lead discovery pipeline
 import logging
 from flask import Blueprint, jsonify, request
 from app.database import get_db
+from app.routes.jobs import current_user_id, job_accepted
 from app.services.intelligence.data_pipeline_service import get_pipeline_service
+from app.services.job_queue import job_queue
 from app.utils.auth import require_auth
-import asyncio
 
 logger = logging.getLogger(__name__)
 bp = Blueprint("data_pipeline", __name__)
@@ -18,23 +19,44 @@ bp = Blueprint("data_pipeline", __name__)
 @require_auth
 def run_pipeline():
     """
-    Execute the complete data pipeline
+    Queue a run of the complete data pipeline
+
+    The pipeline runs as a background job (retried on failure); poll
+    status_url for progress and fetch the results from result_url.
 
     Request Body:
         {
             "cities": ["Bloomfield Hills", "Birmingham", ...],
             "min_home_value": 500000,
             "max_roof_age": 20,
-            "date_range_days": 30
+            "date_range_days": 30,
+            "concurrent": true,        # optional, run collection stages concurrently
+            "stage_timeout": 120       # optional, per-stage timeout in seconds
         }
 
     Returns:
-        200: Pipeline execution results
-        500: Pipeline execution failed
+        202: Job queued, with job_id, status_url and result_url
+        400: Invalid concurrent or stage_timeout
+        500: Pipeline could not be queued
     """
     try:
         data = request.get_json() or {}
 
+        concurrent = data.get("concurrent", True)
+        if isinstance(concurrent, str) and concurrent.lower() in ("true", "false"):
+            concurrent = concurrent.lower() == "true"
+        if not isinstance(concurrent, bool):
+            return jsonify({"error": "concurrent must be a boolean"}), 400
+
+        stage_timeout = data.get("stage_timeout")
+        if stage_timeout is not None:
+            try:
+                stage_timeout = float(stage_timeout)
+            except (TypeError, ValueError):
+                stage_timeout = None
+            if stage_timeout is None or not 0 < stage_timeout < float("inf"):
+                return jsonify({"error": "stage_timeout must be a positive number of seconds"}), 400
+
         # Get filters
         filters = {
             "cities": data.get("cities", [
@@ -46,22 +68,17 @@ def run_pipeline():
             "date_range_days": data.get("date_range_days", 30)
         }
 
-        # Initialize service
-        db = next(get_db())
-        service = get_pipeline_service(db)
-
-        # Run pipeline (async to sync conversion)
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        results = loop.run_until_complete(service.run_pipeline(filters))
-        loop.close()
-
-        db.close()
-
-        return jsonify(results), 200
+        job = job_queue.enqueue(
+            "data_pipeline.run",
+            filters,
+            concurrent=concurrent,
+            stage_timeout=stage_timeout,
+            created_by=current_user_id()
+        )
+        return job_accepted(job)
 
     except Exception as e:
-        logger.error(f"Pipeline execution failed: {str(e)}")
+        logger.error(f"Failed to queue pipeline: {str(e)}")
         return jsonify({
             "error": "Pipeline execution failed",
             "details": str(e)
@@ -0,0 +1,144 @@
+"""
+iSwitch Roofs CRM - Background Job API Routes
+
+Enqueue registered tasks and poll, fetch or cancel background jobs.
+Jobs are visible only to the user who queued them and to admins; anyone
+else gets 404, so job ids do not leak whether a job exists.
+Long-running endpoints (data pipeline, live data, model training, bulk
+import, review refresh) answer 202 with a job from job_accepted() instead
+of blocking the request.
+"""
+
+import logging
+
+from flask import Blueprint, g, jsonify, request
+
+from app.services.job_queue import Job, JobStatus, get_task, job_queue
+from app.utils.auth import require_auth
+
+logger = logging.getLogger(__name__)
+bp = Blueprint("jobs", __name__)
+
+
+def job_accepted(job: Job, **extra):
+    """202 response pointing the client at a queued job"""
+    body = {
+        "job_id": job.job_id,
+        "task": job.task,
+        "status": job.status,
+        "status_url": f"/api/jobs/{job.job_id}",
+        "result_url": f"/api/jobs/{job.job_id}/result",
+        **extra,
+    }
+    return jsonify(body), 202
+
+
+def current_user_id() -> str | None:
+    return getattr(g, "user_id", None)
+
+
+def visible_job(job_id: str) -> Job | None:
+    """The job if the current user queued it (or is an admin), else None"""
+    job = job_queue.get(job_id)
+    if job is None:
+        return None
+    if g.get("user_role") == "admin":
+        return job
+    user_id = current_user_id()
+    return job if user_id is not None and job.created_by == user_id else None
+
+
+@bp.route("", methods=["POST"])
+@require_auth
+def enqueue_job():
+    """
+    Queue a registered task
+
+    Request Body:
+        {
+            "task": "reviews.refresh",
+            "args": [],       # optional positional arguments
+            "kwargs": {}      # optional keyword arguments
+        }
+
+    Returns:
+        202: Job queued
+        400: Unknown task or invalid arguments
+    """
+    data = request.get_json() or {}
+    spec = get_task(data.get("task") or "")
+    if spec is None or not spec.exposed:
+        return jsonify({"error": f"Unknown task: {data.get('task')}"}), 400
+
+    args, kwargs = data.get("args", []), data.get("kwargs", {})
+    if not isinstance(args, list) or not isinstance(kwargs, dict):
+        return jsonify({"error": "args must be a list and kwargs an object"}), 400
+
+    try:
+        job = job_queue.enqueue(spec.name, *args, created_by=current_user_id(), **kwargs)
+    except Exception as e:
+        logger.error(f"Failed to queue {spec.name}: {str(e)}", exc_info=True)
+        return jsonify({"error": "Failed to queue job", "details": str(e)}), 500
+    return job_accepted(job)
+
+
+@bp.route("/<job_id>", methods=["GET"])
+@require_auth
+def get_job_status(job_id: str):
+    """
+    Get a job's status and progress
+
+    Returns:
+        200: Status, progress (0-100), message, attempts and error
+        404: Unknown, expired or another user's job
+    """
+    status = job_queue.status(job_id) if visible_job(job_id) else None
+    if status is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(status), 200
+
+
+@bp.route("/<job_id>/result", methods=["GET"])
+@require_auth
+def get_job_result(job_id: str):
+    """
+    Get the return value of a finished job
+
+    Returns:
+        200: Job succeeded, result in "result"
+        202: Job not finished yet
+        404: Unknown, expired or another user's job
+        409: Job failed or was cancelled
+    """
+    job = visible_job(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+
+    if job.status == JobStatus.SUCCEEDED:
+        return jsonify({"job_id": job_id, "status": job.status, "result": job.result}), 200
+    if job.status in JobStatus.FINISHED:
+        return jsonify({"job_id": job_id, "status": job.status, "error": job.error}), 409
+    return jsonify(job_queue.status(job_id)), 202
+
+
+@bp.route("/<job_id>/cancel", methods=["POST"])
+@require_auth
+def cancel_job(job_id: str):
+    """
+    Cancel a job
+
+    Queued jobs are cancelled immediately; running jobs stop at their next
+    checkpoint (cancel_requested is true until they do).
+
+    Returns:
+        200: Updated job status
+        404: Unknown, expired or another user's job
+        409: Job already finished
+    """
+    status = job_queue.status(job_id) if visible_job(job_id) else None
+    if status is None:
+        return jsonify({"error": "Job not found"}), 404
+    if status["status"] in JobStatus.FINISHED:
+        return jsonify({"error": f"Job already {status['status']}", **status}), 409
+
+    return jsonify(job_queue.cancel(job_id)), 200
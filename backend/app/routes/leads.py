@@ -6,14 +6,13 @@ Complete REST API for lead management with pagination, filtering, sorting,
 and automatic lead scoring.
 """
 
-import io
 import json
 import logging
+from dataclasses import asdict
 from datetime import datetime
 from typing import Any
 from uuid import uuid4
 
-import pandas as pd
 from flask import Blueprint, jsonify, request
 
 from app.config import get_supabase_client
@@ -30,8 +29,18 @@ from app.schemas.lead import (
     LeadListResponse,
     LeadUpdate,
 )
+from app.services.background_tasks import spool_upload
+from app.services.job_queue import job_queue
+from app.services.lead_import_service import (
+    REQUIRED_FIELDS,
+    SYNC_IMPORT_MAX_ROWS,
+    ImportOptions,
+    MissingFieldsError,
+    lead_import_service,
+)
 from app.services.lead_scoring import lead_scoring_engine
 from app.services.lead_service import lead_service
+from app.utils.pagination import create_keyset_response, extract_total_mode
 from app.utils.validators import validate_uuid
 from app.utils.pusher_client import get_pusher_service
 
@@ -122,6 +131,11 @@ def get_leads():
     Query Parameters:
         - page: Page number (default: 1)
         - per_page: Items per page (default: 50, max: 100)
+        - cursor: Switch to keyset pagination; empty for the first page, then
+          the previous response's next_cursor (sort: created_at, updated_at
+          or lead_score)
+        - include_total: Keyset mode only - exact, estimate or cached
+          (default: no total)
         - sort: Sort field:direction (e.g., lead_score:desc, created_at:asc)
         - status: Comma-separated status values
         - temperature: Comma-separated temperature values
@@ -135,6 +149,7 @@ def get_leads():
 
     Returns:
         200: Paginated list of leads with metadata
+        400: Invalid cursor, sort or include_total
         500: Server error
     """
     try:
@@ -158,6 +173,20 @@ def get_leads():
             converted=request.args.get("converted"),
         )
 
+        # Keyset pagination (opt-in with ?cursor=)
+        if "cursor" in request.args:
+            lead_data, next_cursor, total, total_type = lead_service.get_leads_page(
+                filters,
+                cursor=request.args.get("cursor"),
+                per_page=per_page,
+                sort=sort,
+                total_mode=extract_total_mode(request.args),
+            )
+            response = create_keyset_response(
+                lead_data, next_cursor, per_page, total, total_type, data_key="leads"
+            )
+            return jsonify(response), 200
+
         # Get leads from service (already converted to dicts)
         lead_data, total = lead_service.get_leads_with_filters(filters, page, per_page, sort)
 
@@ -168,6 +197,8 @@ def get_leads():
 
         return jsonify(response.model_dump()), 200
 
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         logger.error(f"Error fetching leads: {str(e)}", exc_info=True)
         return jsonify({"error": "Failed to fetch leads", "details": str(e)}), 500
@@ -765,11 +796,90 @@ def get_lead_stats():
         return jsonify({"error": "Failed to fetch stats", "details": str(e)}), 500
 
 
+def _read_bulk_import_upload():
+    """
+    Parse the bulk import form shared by the sync and background endpoints.
+
+    Returns:
+        tuple: (data, filename, options, total_rows, None) on success, or
+               (None, None, None, None, error_response) on a client error
+    """
+    from app.middleware.audit_middleware import get_current_user
+
+    def error(body, status=400):
+        return None, None, None, None, (jsonify(body), status)
+
+    # Check if file is present
+    if "file" not in request.files:
+        return error({"error": "No file provided"})
+
+    file = request.files["file"]
+
+    if file.filename == "":
+        return error({"error": "No file selected"})
+
+    # Check file extension
+    filename = file.filename.lower()
+    if not lead_import_service.is_supported_file(filename):
+        return error({"error": "Invalid file format. Only CSV and Excel files are supported"})
+
+    # Parse field mapping if provided
+    field_mapping = {}
+    if "field_mapping" in request.form:
+        try:
+            field_mapping = json.loads(request.form["field_mapping"])
+        except json.JSONDecodeError:
+            return error({"error": "Invalid field_mapping JSON"})
+
+    options = ImportOptions(
+        skip_duplicates=request.form.get("skip_duplicates", "true").lower() == "true",
+        auto_score=request.form.get("auto_score", "true").lower() == "true",
+        validate_strict=request.form.get("validate_strict", "false").lower() == "true",
+        field_mapping=field_mapping,
+        max_rows=int(request.form.get("max_rows", 10000)),
+        import_id=request.form.get("import_id") or str(uuid4()),
+        user=get_current_user(),
+    )
+
+    data = file.read()
+    try:
+        total_rows = lead_import_service.count_rows(data, filename)
+    except Exception as e:
+        return error({"error": f"Failed to read file: {str(e)}"})
+
+    # Check file size limits
+    if total_rows > options.max_rows:
+        return error(
+            {
+                "error": f"File contains {total_rows} rows, which exceeds the limit of {options.max_rows} rows"
+            }
+        )
+
+    return data, filename, options, total_rows, None
+
+
+def _missing_fields_response(e: MissingFieldsError):
+    return (
+        jsonify(
+            {
+                "error": str(e),
+                "required_fields": REQUIRED_FIELDS,
+                "found_fields": e.found,
+            }
+        ),
+        400,
+    )
+
+
 @bp.route("/bulk-import", methods=["POST"])
 def bulk_import_leads():
     """
     Bulk import leads from CSV or Excel file.
 
+    Small files only; uploads over SYNC_IMPORT_MAX_ROWS rows must use
+    POST /bulk-import/async. Rows are validated, deduplicated and inserted
+    in chunks (batched duplicate lookups and one insert per chunk).
+
     Form Data:
         file: CSV or Excel file (required)
         skip_duplicates: bool (optional, skip duplicate emails)
@@ -779,252 +889,116 @@ def bulk_import_leads():
         max_rows: int (optional, maximum rows to import, default 10000)
 
     Returns:
-        201: Import summary with success/failure counts
+        201: Import summary with success/failure counts. imported_leads
+             lists at most the first 10 imported leads (id, name, score);
+             use success for the total.
         207: Partial success with errors
         400: Validation error or invalid file
-        413: File too large
+        413: File too large for a synchronous import
         500: Server error
     """
     try:
-        # Check if file is present
-        if "file" not in request.files:
-            return jsonify({"error": "No file provided"}), 400
+        data, filename, options, total_rows, error = _read_bulk_import_upload()
+        if error:
+            return error
 
-        file = request.files["file"]
-
-        if file.filename == "":
-            return jsonify({"error": "No file selected"}), 400
-
-        # Check file extension
-        filename = file.filename.lower()
-        if not (
-            filename.endswith(".csv") or filename.endswith(".xlsx") or filename.endswith(".xls")
-        ):
-            return (
-                jsonify({"error": "Invalid file format. Only CSV and Excel files are supported"}),
-                400,
-            )
-
-        # Parse form parameters
-        skip_duplicates = request.form.get("skip_duplicates", "true").lower() == "true"
-        auto_score = request.form.get("auto_score", "true").lower() == "true"
-        validate_strict = request.form.get("validate_strict", "false").lower() == "true"
-        max_rows = int(request.form.get("max_rows", 10000))
-
-        # Parse field mapping if provided
-        field_mapping = {}
-        if "field_mapping" in request.form:
-            try:
-                field_mapping = json.loads(request.form["field_mapping"])
-            except json.JSONDecodeError:
-                return jsonify({"error": "Invalid field_mapping JSON"}), 400
-
-        # Read the file into a DataFrame
-        try:
-            if filename.endswith(".csv"):
-                df = pd.read_csv(io.BytesIO(file.read()))
-            else:
-                df = pd.read_excel(io.BytesIO(file.read()))
-        except Exception as e:
-            return jsonify({"error": f"Failed to read file: {str(e)}"}), 400
-
-        # Check file size limits
-        if len(df) > max_rows:
+        if total_rows > SYNC_IMPORT_MAX_ROWS:
             return (
                 jsonify(
                     {
-                        "error": f"File contains {len(df)} rows, which exceeds the limit of {max_rows} rows"
+                        "error": f"File contains {total_rows} rows; synchronous imports are limited to "
+                        f"{SYNC_IMPORT_MAX_ROWS} rows. Use POST /api/leads/bulk-import/async instead"
                     }
                 ),
-                400,
+                413,
             )
 
-        # Apply field mapping if provided
-        if field_mapping:
-            df = df.rename(columns=field_mapping)
-
-        # Check for required fields
-        required_fields = ["first_name", "last_name", "phone", "source"]
+        try:
+            result = lead_import_service.run_import(data, filename, options, total_rows)
+        except MissingFieldsError as e:
+            return _missing_fields_response(e)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
 
-        # Handle full_name if present
-        if "full_name" in df.columns and (
-            "first_name" not in df.columns or "last_name" not in df.columns
-        ):
-            # Split full name into first and last
-            df[["first_name", "last_name"]] = df["full_name"].str.split(" ", n=1, expand=True)
-            df["last_name"] = df["last_name"].fillna("")
+        status_code = 201 if result.failed == 0 else 207  # 207 for partial success
 
-        missing_fields = [field for field in required_fields if field not in df.columns]
-        if missing_fields:
-            return (
-                jsonify(
-                    {
-                        "error": f"Missing required fields: {', '.join(missing_fields)}",
-                        "required_fields": required_fields,
-                        "found_fields": list(df.columns),
-                    }
-                ),
-                400,
-            )
+        response_data = {
+            "import_id": result.import_id,
+            "total_imported": result.total_rows,
+            "success": result.success,
+            "failed": result.failed,
+            "duplicates": result.duplicates,
+            "imported_leads": result.imported_leads,
+        }
 
-        # Initialize counters
-        total_rows = len(df)
-        success_count = 0
-        failed_count = 0
-        duplicate_count = 0
-        errors = []
-        imported_leads = []
+        if result.errors and (options.validate_strict or result.failed <= 10):
+            response_data["errors"] = result.errors
 
-        supabase = get_supabase()
+        return jsonify(response_data), status_code
 
-        # Process each row
-        for index, row in df.iterrows():
-            try:
-                # Convert row to dict and remove NaN values
-                lead_data = row.to_dict()
-                lead_data = {k: v for k, v in lead_data.items() if pd.notna(v)}
-
-                # Clean phone number
-                if "phone" in lead_data:
-                    lead_data["phone"] = (
-                        str(lead_data["phone"])
-                        .replace("-", "")
-                        .replace(" ", "")
-                        .replace("(", "")
-                        .replace(")", "")[:15]
-                    )
+    except Exception as e:
+        logger.error(f"Error in bulk import: {str(e)}", exc_info=True)
+        return jsonify({"error": "Failed to import leads", "details": str(e)}), 500
 
-                # Validate email if present
-                if "email" in lead_data:
-                    email = lead_data["email"]
-
-                    # Check for duplicates if enabled
-                    if skip_duplicates:
-                        existing = supabase.table("leads").select("id").eq("email", email).execute()
-                        if existing.data:
-                            duplicate_count += 1
-                            continue
-
-                # Map source values if needed
-                if "source" in lead_data:
-                    source_mapping = {
-                        "website": "website_form",
-                        "google": "google_ads",
-                        "facebook": "facebook_ads",
-                        "referral": "referral",
-                    }
-                    source = str(lead_data["source"]).lower()
-                    lead_data["source"] = source_mapping.get(source, source)
-
-                # Create Lead object for validation
-                try:
-                    lead = LeadCreate(**lead_data)
-                    lead_dict = lead.model_dump(exclude_none=True)
-                except Exception as e:
-                    if validate_strict:
-                        errors.append(
-                            {
-                                "row": index + 2,  # +2 for header and 0-index
-                                "error": str(e),
-                                "data": lead_data,
-                            }
-                        )
-                        failed_count += 1
-                        continue
-                    else:
-                        # Use partial data
-                        lead_dict = lead_data
-
-                # Calculate lead score if enabled
-                if auto_score:
-                    lead_obj = Lead(**lead_dict, lead_score=0, temperature=None)
-                    score_breakdown = lead_scoring_engine.calculate_score(lead_obj)
-                    lead_dict["lead_score"] = score_breakdown.total_score
-                    lead_dict["temperature"] = score_breakdown.temperature.value
-
-                # Add metadata
-                lead_dict["id"] = str(uuid4())
-                lead_dict["created_at"] = datetime.utcnow().isoformat()
-                lead_dict["updated_at"] = datetime.utcnow().isoformat()
-                lead_dict["import_batch_id"] = request.form.get("import_id", str(uuid4()))
-
-                # Add audit fields
-                from app.middleware.audit_middleware import get_current_user
-
-                user = get_current_user()
-                if user:
-                    lead_dict["created_by"] = user.get("id")
-                    lead_dict["created_by_email"] = user.get("email")
-                    lead_dict["updated_by"] = user.get("id")
-                    lead_dict["updated_by_email"] = user.get("email")
-
-                # Insert lead
-                result = supabase.table("leads").insert(lead_dict).execute()
-
-                if result.data:
-                    success_count += 1
-                    imported_leads.append(
-                        {
-                            "id": lead_dict["id"],
-                            "name": f"{lead_dict.get('first_name', '')} {lead_dict.get('last_name', '')}",
-                            "score": lead_dict.get("lead_score"),
-                        }
-                    )
-                else:
-                    failed_count += 1
-                    errors.append(
-                        {"row": index + 2, "error": "Failed to insert", "data": lead_data}
-                    )
 
-            except Exception as e:
-                failed_count += 1
-                errors.append(
-                    {
-                        "row": index + 2,
-                        "error": str(e),
-                        "data": lead_data if "lead_data" in locals() else row.to_dict(),
-                    }
-                )
+@bp.route("/bulk-import/async", methods=["POST"])
+def bulk_import_leads_async():
+    """
+    Start a background bulk import of a CSV or Excel file.
 
-        # Prepare response
-        import_id = request.form.get("import_id", str(uuid4()))
-        status_code = 201 if failed_count == 0 else 207  # 207 for partial success
+    Accepts the same form data as POST /bulk-import. The upload is checked
+    for required columns before it is handed to the job queue.
 
-        response_data = {
-            "import_id": import_id,
-            "total_imported": total_rows,
-            "success": success_count,
-            "failed": failed_count,
-            "duplicates": duplicate_count,
-            "imported_leads": (
-                imported_leads[:10] if len(imported_leads) > 10 else imported_leads
-            ),  # Limit response size
-        }
+    Returns:
+        202: Job queued, with import_id, status_url and job_id
+        400: Validation error or invalid file
+        500: Server error
+    """
+    try:
+        data, filename, options, total_rows, error = _read_bulk_import_upload()
+        if error:
+            return error
 
-        if errors and (validate_strict or len(errors) <= 10):
-            response_data["errors"] = errors[:10]  # Limit errors in response
+        # Fail fast on unreadable files or missing columns instead of
+        # reporting them through the status endpoint
+        try:
+            next(lead_import_service.read_chunks(data, filename, options.field_mapping), None)
+        except MissingFieldsError as e:
+            return _missing_fields_response(e)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        status = lead_import_service.mark_queued(options, total_rows)
+        job = job_queue.enqueue(
+            "leads.bulk_import",
+            spool_upload(data, filename),
+            filename,
+            asdict(options),
+            total_rows,
+            created_by=(options.user or {}).get("id"),
+        )
 
-        if success_count > 0:
-            # Send real-time notification
-            from app.utils.pusher_client import get_pusher_client
+        response = status.to_dict()
+        response["status_url"] = f"/api/leads/bulk-import/{status.import_id}/status"
+        response["job_id"] = job.job_id
+        response["job_url"] = f"/api/jobs/{job.job_id}"
+        return jsonify(response), 202
 
-            pusher = get_pusher_client()
-            pusher.trigger(
-                "leads",
-                "bulk-import-complete",
-                {
-                    "import_id": import_id,
-                    "success_count": success_count,
-                    "failed_count": failed_count,
-                },
-            )
+    except Exception as e:
+        logger.error(f"Error starting bulk import: {str(e)}", exc_info=True)
+        return jsonify({"error": "Failed to start import", "details": str(e)}), 500
 
-        logger.info(
-            f"Bulk import completed: {success_count} success, {failed_count} failed, {duplicate_count} duplicates"
-        )
 
-        return jsonify(response_data), status_code
+@bp.route("/bulk-import/<import_id>/status", methods=["GET"])
+def get_bulk_import_status(import_id: str):
+    """
+    Get progress of a background bulk import.
 
-    except Exception as e:
-        logger.error(f"Error in bulk import: {str(e)}", exc_info=True)
-        return jsonify({"error": "Failed to import leads", "details": str(e)}), 500
+    Returns:
+        200: Status with processed/success/failed/duplicate counts and progress_percentage
+        404: Unknown or expired import_id
+    """
+    status = lead_import_service.get_status(import_id)
+    if status is None:
+        return jsonify({"error": "Import not found"}), 404
+    return jsonify(status), 200
@@ -3,13 +3,15 @@ Live Data Collection API Routes
 Real-time lead generation and data extraction
 """
 
-import asyncio
 from flask import Blueprint, jsonify, request
 from sqlalchemy.orm import Session
 
 from app.database import get_db
+from app.routes.jobs import current_user_id, job_accepted
+from app.services.job_queue import job_queue
+from app.utils.async_runner import run_async
 from app.utils.auth import require_auth
-from app.services.intelligence.live_data_collector import LiveDataCollector, run_live_collection
+from app.services.intelligence.live_data_collector import LiveDataCollector
 
 bp = Blueprint("live_data", __name__)
 
@@ -29,7 +31,8 @@ def generate_leads():
         }
     }
 
-    Returns: Generation results with statistics
+    Returns: 202 with the background job generating the leads; its
+    result holds the generation statistics
     """
     try:
         data = request.get_json() or {}
@@ -40,24 +43,8 @@ def generate_leads():
                 "error": "Count must be between 1 and 500"
             }), 400
 
-        # Get database session
-        db = next(get_db())
-
-        # Run async collection
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        results = loop.run_until_complete(run_live_collection(db, count))
-        loop.close()
-
-        return jsonify({
-            "success": results["success"],
-            "message": f"Generated and ingested {results.get('ingested', 0)} leads",
-            "statistics": {
-                "total_generated": results.get("total", 0),
-                "successfully_ingested": results.get("ingested", 0),
-                "duplicates_skipped": results.get("skipped", 0)
-            }
-        }), 200
+        job = job_queue.enqueue("live_data.generate", count, created_by=current_user_id())
+        return job_accepted(job)
 
     except Exception as e:
         return jsonify({
@@ -87,10 +74,7 @@ def preview_leads():
         collector = LiveDataCollector(db)
 
         # Generate leads
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        leads = loop.run_until_complete(collector.collect_sample_leads(count))
-        loop.close()
+        leads = run_async(collector.collect_sample_leads(count))
 
         # Convert datetime objects to strings
         for lead in leads:
@@ -23,6 +23,7 @@ from app.models.project_sqlalchemy import (
 from app.services.project_service import project_service
 from app.services.realtime_service import realtime_service
 from app.utils.auth import require_auth, require_role
+from app.utils.cache import invalidate_tags
 from app.utils.supabase_client import get_supabase_client
 from app.utils.validation import validate_request, validate_uuid
 from app.utils.pusher_client import get_pusher_service
@@ -33,6 +34,9 @@ logger = logging.getLogger(__name__)
 # Initialize Pusher service for real-time updates
 pusher_service = get_pusher_service()
 
+# Non-nullable columns usable as keyset sort keys
+PROJECT_KEYSET_SORT_FIELDS = ["created_at", "updated_at"]
+
 
 @bp.route("/", methods=["GET"])
 @require_auth
@@ -43,6 +47,9 @@ def list_projects():
     Query Parameters:
         - page: Page number (default: 1)
         - per_page: Items per page (default: 50, max: 100)
+        - cursor: Switch to keyset pagination; empty for the first page, then
+          the previous response's next_cursor (sort: created_at or updated_at)
+        - include_total: Keyset mode only - exact, estimate or cached
         - status: Filter by status (comma-separated)
         - type: Filter by project type
         - customer_id: Filter by customer
@@ -60,7 +67,15 @@ def list_projects():
     """
     try:
         from app.utils.database import get_db_session
-        from app.utils.pagination import paginate_query, create_pagination_response
+        from app.utils.pagination import (
+            count_total,
+            create_keyset_response,
+            create_pagination_response,
+            extract_total_mode,
+            paginate_keyset,
+            paginate_query,
+            resolve_keyset_sort,
+        )
         from sqlalchemy import and_
         from app.models.project_sqlalchemy import Project
 
@@ -115,23 +130,34 @@ def list_projects():
         if filters:
             query = query.filter(and_(*filters))
 
-        # Sorting
-        sort_field = "created_at"
-        sort_dir = "desc"
-        if sort := request.args.get("sort"):
-            parts = sort.split(":")
-            sort_field = parts[0]
-            sort_dir = parts[1] if len(parts) > 1 else "asc"
-
-        if hasattr(Project, sort_field):
-            order_column = getattr(Project, sort_field)
-            if sort_dir == "desc":
-                query = query.order_by(order_column.desc())
-            else:
-                query = query.order_by(order_column.asc())
-
-        # Get paginated results
-        projects, total = paginate_query(query, page=page, per_page=per_page)
+        # Keyset pagination (opt-in with ?cursor=)
+        keyset = "cursor" in request.args
+        if keyset:
+            sort_column, direction = resolve_keyset_sort(
+                Project, request.args.get("sort"), PROJECT_KEYSET_SORT_FIELDS
+            )
+            projects, next_cursor = paginate_keyset(
+                query, sort_column, request.args.get("cursor"), limit=per_page, direction=direction
+            )
+            total, total_type = count_total(query, extract_total_mode(request.args), tag="projects")
+        else:
+            # Sorting
+            sort_field = "created_at"
+            sort_dir = "desc"
+            if sort := request.args.get("sort"):
+                parts = sort.split(":")
+                sort_field = parts[0]
+                sort_dir = parts[1] if len(parts) > 1 else "asc"
+
+            if hasattr(Project, sort_field):
+                order_column = getattr(Project, sort_field)
+                if sort_dir == "desc":
+                    query = query.order_by(order_column.desc())
+                else:
+                    query = query.order_by(order_column.asc())
+
+            # Get paginated results
+            projects, total = paginate_query(query, page=page, per_page=per_page)
 
         # Convert SQLAlchemy models to dicts and serialize enums
         projects_data = []
@@ -178,18 +204,25 @@ def list_projects():
         }
 
         # Create pagination response
-        response = create_pagination_response(
-            items=projects_data,
-            total=total,
-            page=page,
-            per_page=per_page
-        )
+        if keyset:
+            response = create_keyset_response(
+                projects_data, next_cursor, per_page, total, total_type
+            )
+        else:
+            response = create_pagination_response(
+                items=projects_data,
+                total=total,
+                page=page,
+                per_page=per_page
+            )
 
         # Add stats to response
         response["stats"] = stats
 
         return jsonify(response), 200
 
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         logger.error(f"Error listing projects: {str(e)}", exc_info=True)
         return jsonify({"error": "Failed to list projects"}), 500
@@ -416,6 +449,8 @@ def delete_project(project_id: str):
         )
 
         if update_result.data:
+            invalidate_tags("projects")
+
             # Broadcast real-time event
             realtime_service.trigger_event(
                 channel="projects", event="project-deleted", data={"project_id": project_id}
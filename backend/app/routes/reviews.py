@@ -15,6 +15,8 @@ from datetime import datetime, timedelta
 from flask import Blueprint, jsonify, request
 
 # Local imports
+from app.routes.jobs import current_user_id, job_accepted
+from app.services.job_queue import job_queue
 from app.services.reviews_service import reviews_service
 from app.utils.auth import require_auth, require_roles
 # from app.utils.validators import validate_request
@@ -96,15 +98,23 @@ def fetch_reviews():
     """
     Fetch reviews from all configured platforms
 
+    Cached reviews are returned directly. With "refresh": true every platform
+    is re-fetched in a background job and the job is returned instead.
+
     Returns:
         - 200: Reviews fetched successfully
+        - 202: Refresh queued (job_id, status_url, result_url)
         - 500: Server error
     """
     try:
         data = request.get_json() or {}
         refresh = data.get("refresh", False)
 
-        success, result, error = reviews_service.fetch_all_reviews(refresh=refresh)
+        if refresh:
+            job = job_queue.enqueue("reviews.refresh", created_by=current_user_id())
+            return job_accepted(job, success=True)
+
+        success, result, error = reviews_service.fetch_all_reviews(refresh=False)
 
         if success:
             return jsonify({"success": True, "data": result}), 200
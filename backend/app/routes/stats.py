@@ -10,6 +10,7 @@ from app.models.lead_sqlalchemy import Lead
 from app.models.customer_sqlalchemy import Customer
 from app.models.project_sqlalchemy import Project
 from app.models.appointment_sqlalchemy import Appointment
+from app.utils.stats_query import StatsQuery, date_range, day_bounds, run_stats
 
 stats_bp = Blueprint('stats', __name__, url_prefix='/api/stats')
 
@@ -18,7 +19,7 @@ stats_bp = Blueprint('stats', __name__, url_prefix='/api/stats')
 def get_summary_stats():
     """
     Get summary statistics for dashboard
-    Returns real data aggregated from database
+    Returns real data aggregated from database in a single round trip
     """
     db = next(get_db())
     try:
@@ -27,122 +28,99 @@ def get_summary_stats():
         month_start = datetime(today.year, today.month, 1).date()
         last_month_start = (month_start - timedelta(days=1)).replace(day=1)
 
-        # LEADS STATISTICS
-        total_leads = db.query(func.count(Lead.id)).scalar() or 0
-
-        # Leads created today
-        leads_today = db.query(func.count(Lead.id)).filter(
-            func.date(Lead.created_at) == today
-        ).scalar() or 0
-
-        # HOT leads (lead_score >= 80)
-        hot_leads = db.query(func.count(Lead.id)).filter(
-            Lead.lead_score >= 80
-        ).scalar() or 0
-
-        # HOT leads created today
-        hot_today = db.query(func.count(Lead.id)).filter(
-            func.date(Lead.created_at) == today,
-            Lead.lead_score >= 80
-        ).scalar() or 0
+        today_start, tomorrow_start = day_bounds(today)
+
+        # One scan per table, one round trip for the whole dashboard
+        lead_stats = (
+            StatsQuery(Lead)
+            .count('total_leads')
+            .count('leads_today', *date_range(Lead.created_at, today_start, tomorrow_start))
+            # HOT leads (lead_score >= 80)
+            .count('hot_leads', Lead.lead_score >= 80)
+            .count(
+                'hot_today',
+                *date_range(Lead.created_at, today_start, tomorrow_start),
+                Lead.lead_score >= 80
+            )
+            .count('leads_this_month', *date_range(Lead.created_at, month_start))
+            .count('leads_last_month', *date_range(Lead.created_at, last_month_start, month_start))
+            # Use pre-calculated response_time_minutes field
+            .avg('avg_response_minutes', Lead.response_time_minutes)
+            # Conversion funnel
+            .count('contacted_leads', Lead.status.in_(['contacted', 'qualified', 'negotiation', 'won']))
+            # Proposals sent (leads in negotiation or won status)
+            .count('proposals_sent', Lead.status.in_(['quote_sent', 'negotiation', 'won']))
+        )
+
+        # Leads that became customers
+        customer_stats = (
+            StatsQuery(Customer)
+            .count('closed_deals')
+            .count('converted_this_month', *date_range(Customer.created_at, month_start))
+            .count(
+                'converted_last_month',
+                *date_range(Customer.created_at, last_month_start, month_start)
+            )
+        )
+
+        project_stats = (
+            StatsQuery(Project)
+            .count('active_projects', Project.status.in_(['in_progress', 'scheduled', 'inspection']))
+            .count('projects_this_month', *date_range(Project.created_at, month_start))
+            # Sum of project final_amount for completed projects
+            .sum(
+                'monthly_revenue',
+                Project.final_amount,
+                *date_range(Project.updated_at, month_start),
+                Project.status == 'completed'
+            )
+            .sum(
+                'revenue_last_month',
+                Project.final_amount,
+                *date_range(Project.updated_at, last_month_start, month_start),
+                Project.status == 'completed'
+            )
+        )
+
+        appointment_stats = StatsQuery(Appointment).count('appointments_set')
+
+        counts = run_stats(db, lead_stats, customer_stats, project_stats, appointment_stats)
 
         # CONVERSION RATE
-        # Leads that became customers this month
-        converted_this_month = db.query(func.count(Customer.id)).filter(
-            func.date(Customer.created_at) >= month_start
-        ).scalar() or 0
-
-        # Total leads this month
-        leads_this_month = db.query(func.count(Lead.id)).filter(
-            func.date(Lead.created_at) >= month_start
-        ).scalar() or 0
-
+        converted_this_month = counts['converted_this_month']
+        leads_this_month = counts['leads_this_month']
         conversion_rate = (converted_this_month / leads_this_month * 100) if leads_this_month > 0 else 0
 
         # Conversion rate last month for delta
-        converted_last_month = db.query(func.count(Customer.id)).filter(
-            func.date(Customer.created_at) >= last_month_start,
-            func.date(Customer.created_at) < month_start
-        ).scalar() or 0
-
-        leads_last_month = db.query(func.count(Lead.id)).filter(
-            func.date(Lead.created_at) >= last_month_start,
-            func.date(Lead.created_at) < month_start
-        ).scalar() or 0
-
+        converted_last_month = counts['converted_last_month']
+        leads_last_month = counts['leads_last_month']
         conversion_rate_last_month = (converted_last_month / leads_last_month * 100) if leads_last_month > 0 else 0
         conversion_delta = conversion_rate - conversion_rate_last_month
 
-        # PROJECTS STATISTICS
-        active_projects = db.query(func.count(Project.id)).filter(
-            Project.status.in_(['in_progress', 'scheduled', 'inspection'])
-        ).scalar() or 0
-
-        projects_this_month = db.query(func.count(Project.id)).filter(
-            func.date(Project.created_at) >= month_start
-        ).scalar() or 0
-
         # REVENUE STATISTICS
-        # Sum of project final_amount for completed projects this month
-        monthly_revenue = db.query(
-            func.coalesce(func.sum(Project.final_amount), 0)
-        ).filter(
-            func.date(Project.updated_at) >= month_start,
-            Project.status == 'completed'
-        ).scalar() or 0
-
-        # Revenue last month
-        revenue_last_month = db.query(
-            func.coalesce(func.sum(Project.final_amount), 0)
-        ).filter(
-            func.date(Project.updated_at) >= last_month_start,
-            func.date(Project.updated_at) < month_start,
-            Project.status == 'completed'
-        ).scalar() or 0
-
-        revenue_delta = monthly_revenue - revenue_last_month
+        monthly_revenue = counts['monthly_revenue'] or 0
+        revenue_delta = monthly_revenue - (counts['revenue_last_month'] or 0)
 
         # RESPONSE TIME (average in minutes)
-        # Use pre-calculated response_time_minutes field
-        avg_response_minutes = db.query(
-            func.avg(Lead.response_time_minutes)
-        ).filter(
-            Lead.response_time_minutes.isnot(None)
-        ).scalar() or 0
-
-        # CONVERSION FUNNEL DATA
-        contacted_leads = db.query(func.count(Lead.id)).filter(
-            Lead.status.in_(['contacted', 'qualified', 'negotiation', 'won'])
-        ).scalar() or 0
-
-        # Appointments set
-        appointments_set = db.query(func.count(Appointment.id)).scalar() or 0
-
-        # Proposals sent (leads in negotiation or won status)
-        proposals_sent = db.query(func.count(Lead.id)).filter(
-            Lead.status.in_(['quote_sent', 'negotiation', 'won'])
-        ).scalar() or 0
-
-        # Closed deals (converted customers)
-        closed_deals = db.query(func.count(Customer.id)).scalar() or 0
+        avg_response_minutes = float(counts['avg_response_minutes'] or 0)
 
         # Compile response
         stats = {
-            'total_leads': total_leads,
-            'leads_today': leads_today,
-            'hot_leads': hot_leads,
-            'hot_today': hot_today,
+            'total_leads': counts['total_leads'],
+            'leads_today': counts['leads_today'],
+            'hot_leads': counts['hot_leads'],
+            'hot_today': counts['hot_today'],
             'conversion_rate': round(conversion_rate, 1),
             'conversion_delta': round(conversion_delta, 1),
-            'active_projects': active_projects,
-            'projects_this_month': projects_this_month,
+            'active_projects': counts['active_projects'],
+            'projects_this_month': counts['projects_this_month'],
             'monthly_revenue': float(monthly_revenue),
             'revenue_delta': float(revenue_delta),
             'avg_response_time': round(avg_response_minutes, 1),
-            'contacted_leads': contacted_leads,
-            'appointments_set': appointments_set,
-            'proposals_sent': proposals_sent,
-            'closed_deals': closed_deals,
+            'contacted_leads': counts['contacted_leads'],
+            'appointments_set': counts['appointments_set'],
+            'proposals_sent': counts['proposals_sent'],
+            'closed_deals': counts['closed_deals'],
             'timestamp': datetime.now().isoformat()
         }
 
@@ -171,13 +149,13 @@ def get_kpis():
 
         # Lead velocity (leads per day over last 30 days)
         leads_last_30_days = db.query(func.count(Lead.id)).filter(
-            func.date(Lead.created_at) >= month_ago
+            *date_range(Lead.created_at, month_ago)
         ).scalar() or 0
         lead_velocity = round(leads_last_30_days / 30, 1)
 
         # Conversion velocity (customers per day over last 30 days)
         customers_last_30_days = db.query(func.count(Customer.id)).filter(
-            func.date(Customer.created_at) >= month_ago
+            *date_range(Customer.created_at, month_ago)
         ).scalar() or 0
         conversion_velocity = round(customers_last_30_days / 30, 1)
 
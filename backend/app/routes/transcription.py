@@ -23,6 +23,7 @@ from sqlalchemy.orm import Session
 
 from app.database import get_db_session
 from app.services.call_transcription import CallTranscriptionService
+from app.services.job_queue import job_queue
 from app.repositories.conversation_repository import VoiceInteractionRepository
 from app.utils.auth import require_auth
 
@@ -115,6 +116,16 @@ class ProcessingResponse(BaseModel):
     error: Optional[str] = None
 
 
+class ProcessingJobResponse(BaseModel):
+    """Response for queued end-to-end processing (result is a ProcessingResponse)"""
+    success: bool
+    call_id: str
+    job_id: str
+    status: str
+    status_url: str
+    result_url: str
+
+
 # API Endpoints
 
 @router.post("/call/{call_id}", response_model=TranscriptionResponse)
@@ -213,14 +224,11 @@ async def get_transcript(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/call/{call_id}/process", response_model=ProcessingResponse)
+@router.post("/call/{call_id}/process", response_model=ProcessingJobResponse, status_code=202)
 @require_auth
-async def process_call_end_to_end(
-    call_id: str,
-    db: Session = Depends(get_db_session)
-):
+async def process_call_end_to_end(call_id: str):
     """
-    Full end-to-end call processing
+    Queue full end-to-end call processing
 
     1. Transcribe audio (if not done)
     2. Extract action items
@@ -230,37 +238,32 @@ async def process_call_end_to_end(
     6. Detect competitors
     7. Ensure compliance
 
+    Processing runs as a background job (retried on failure); its result
+    at result_url has the ProcessingResponse fields.
+
     Args:
         call_id: Voice interaction ID
-        db: Database session
 
     Returns:
-        ProcessingResponse with complete processing results
+        ProcessingJobResponse with the queued job
     """
     try:
-        logger.info(f"Starting end-to-end processing for call {call_id}")
-
-        service = CallTranscriptionService(db)
-        result = await service.process_call_end_to_end(call_id)
-
-        return ProcessingResponse(**result)
+        job = job_queue.enqueue("calls.process", call_id)
+        logger.info(f"Queued end-to-end processing for call {call_id} as job {job.job_id}")
 
-    except Exception as e:
-        logger.error(f"Error processing call {call_id}: {str(e)}")
-        return ProcessingResponse(
-            success=False,
+        return ProcessingJobResponse(
+            success=True,
             call_id=call_id,
-            processed_at=datetime.now().isoformat(),
-            transcription={},
-            action_items=[],
-            lead_update={},
-            follow_ups=[],
-            property_details={},
-            competitors=[],
-            compliance={},
-            error=str(e)
+            job_id=job.job_id,
+            status=job.status,
+            status_url=f"/api/jobs/{job.job_id}",
+            result_url=f"/api/jobs/{job.job_id}/result"
         )
 
+    except Exception as e:
+        logger.error(f"Error queueing processing for call {call_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 
 @router.post("/extract-actions", response_model=ActionItemResponse)
 @require_auth
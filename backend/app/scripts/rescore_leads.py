@@ -0,0 +1,66 @@
+"""
+iSwitch Roofs CRM - Lead Rescoring Job
+Version: 1.0.0
+Date: 2026-10-16
+
+PURPOSE:
+Recompute lead_score and temperature for every active lead, e.g. nightly or
+after changing the scoring rules in LeadScoringEngine.
+
+USAGE:
+    # From backend directory
+    python -m app.scripts.rescore_leads [--chunk-size 1000]
+
+    # Or from code
+    from app.services.lead_service import lead_service
+    lead_service.rescore_all_leads()
+
+RATIONALE:
+- Leads are streamed in id-ordered chunks, never loaded all at once
+- Each chunk is scored with one vectorized score_batch() call
+- Only changed scores are written, with one bulk UPDATE per chunk
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.services.lead_service import RESCORE_CHUNK_SIZE, lead_service
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+def rescore_leads(chunk_size: int = RESCORE_CHUNK_SIZE) -> dict:
+    """
+    Run the rescoring job and log a summary.
+
+    Returns:
+        dict: scanned/updated counts plus duration_seconds
+    """
+    started = time.perf_counter()
+    result = lead_service.rescore_all_leads(chunk_size=chunk_size)
+    result["duration_seconds"] = round(time.perf_counter() - started, 2)
+
+    logger.info(
+        f"Rescored {result['scanned']} leads in {result['duration_seconds']}s "
+        f"({result['updated']} changed)"
+    )
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Recompute lead scores in bulk")
+    parser.add_argument("--chunk-size", type=int, default=RESCORE_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    try:
+        rescore_leads(chunk_size=args.chunk_size)
+    except Exception as e:
+        logger.error(f"Lead rescoring failed: {e}", exc_info=True)
+        sys.exit(1)
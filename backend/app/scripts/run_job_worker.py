@@ -0,0 +1,69 @@
+"""
+iSwitch Roofs CRM - Background Job Worker
+Version: 1.0.0
+
+PURPOSE:
+Work background jobs (pipeline runs, model training, bulk imports, call
+processing, review refreshes) in a dedicated process instead of inside the
+web workers.
+
+USAGE:
+    # From backend directory; web processes should set JOB_EMBEDDED_WORKERS=false
+    python -m app.scripts.run_job_worker --workers 4
+
+NOTES:
+- Requires Redis: jobs are shared with the web processes through it. Without
+  Redis, jobs run in the process that enqueued them.
+- Revenue model selection fits its candidates in a process pool here
+  (FORECAST_PROCESS_POOL); web processes fit them in-process.
+- Stop with SIGINT/SIGTERM; jobs already running are allowed to finish.
+"""
+
+import argparse
+import logging
+import os
+import signal
+import sys
+import threading
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+# This process exists to run heavy jobs, so forecasting may fork its own pool
+os.environ.setdefault("FORECAST_PROCESS_POOL", "true")
+
+import app.services.background_tasks  # noqa: F401  (registers the job tasks)
+from app.services.job_queue import JOB_WORKERS, JobQueue, RedisJobStore
+from app.utils.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+def main(workers: int = JOB_WORKERS, executor: str = "process") -> int:
+    if not redis_client.is_connected:
+        logger.error("Redis is not connected; a standalone worker cannot see queued jobs")
+        return 1
+
+    queue = JobQueue(store=RedisJobStore(), max_workers=workers, executor=executor)
+    stop = threading.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: stop.set())
+
+    queue.start()
+    stop.wait()
+
+    logger.info("Stopping job worker, waiting for running jobs")
+    queue.shutdown(wait=True)
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run background job workers")
+    parser.add_argument("--workers", type=int, default=JOB_WORKERS, help="Concurrent jobs")
+    parser.add_argument(
+        "--executor", choices=["process", "thread"], default="process", help="Worker pool type"
+    )
+    args = parser.parse_args()
+    sys.exit(main(args.workers, args.executor))
@@ -0,0 +1,67 @@
+"""
+iSwitch Roofs CRM - Scheduled Notification Worker
+Version: 1.0.0
+
+PURPOSE:
+Send scheduled notifications (quiet-hours deferrals and other delayed
+sends) once they are due.
+
+USAGE:
+    # From backend directory; run as many processes as throughput requires
+    python -m app.scripts.run_notification_worker --batch-size 50
+
+NOTES:
+- Each process claims its own batches, so workers never double-send.
+  Apply migrations/010_scheduled_notification_claims.sql so batches are
+  claimed with FOR UPDATE SKIP LOCKED and abandoned claims are retried.
+- Stop with SIGINT/SIGTERM; the batch in flight is allowed to finish.
+"""
+
+import argparse
+import logging
+import signal
+import sys
+import threading
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.services.notification import (
+    SCHEDULED_BATCH_SIZE,
+    SCHEDULED_POLL_INTERVAL,
+    notification_service,
+)
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+def main(batch_size: int = SCHEDULED_BATCH_SIZE, poll_interval: float = SCHEDULED_POLL_INTERVAL) -> int:
+    if not notification_service.supabase:
+        logger.error("Supabase is not configured; there are no scheduled notifications to send")
+        return 1
+
+    stop = threading.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: stop.set())
+
+    notification_service.run_scheduled_notification_worker(
+        stop, batch_size=batch_size, poll_interval=poll_interval
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Send due scheduled notifications")
+    parser.add_argument(
+        "--batch-size", type=int, default=SCHEDULED_BATCH_SIZE, help="Notifications claimed per batch"
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=SCHEDULED_POLL_INTERVAL,
+        help="Seconds between polls when nothing is due",
+    )
+    args = parser.parse_args()
+    sys.exit(main(args.batch_size, args.poll_interval))
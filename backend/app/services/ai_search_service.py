@@ -3,6 +3,7 @@ AI-Powered Search Service
 Uses OpenAI GPT-4o to understand natural language queries and retrieve relevant data
 """
 
+import asyncio
 import logging
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
@@ -190,21 +191,21 @@ Analyze the user's query and return a JSON object with:
         filters = intent.get('filters', {})
         limit = intent.get('limit', 20)
 
-        if entity_type == 'leads':
-            return self._search_leads(filters, limit)
-        elif entity_type == 'customers':
-            return self._search_customers(filters, limit)
-        elif entity_type == 'projects':
-            return self._search_projects(filters, limit)
-        elif entity_type == 'voice_calls':
-            return self._search_voice_calls(filters, limit)
-        elif entity_type == 'chatbot':
-            return self._search_chatbot_conversations(filters, limit)
-        elif entity_type == 'appointments':
-            return self._search_appointments(filters, limit)
-        else:
+        searches = {
+            'leads': self._search_leads,
+            'customers': self._search_customers,
+            'projects': self._search_projects,
+            'voice_calls': self._search_voice_calls,
+            'chatbot': self._search_chatbot_conversations,
+            'appointments': self._search_appointments,
+        }
+        search = searches.get(entity_type)
+        if search is None:
             return []
 
+        # The queries are blocking; keep them off the shared event loop
+        return await asyncio.to_thread(search, filters, limit)
+
     def _search_leads(self, filters: Dict, limit: int) -> List[Lead]:
         """Search leads with filters"""
         query = self.db.query(Lead).filter(Lead.is_deleted == False)
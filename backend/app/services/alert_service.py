@@ -16,14 +16,13 @@ Date: 2025-01-04
 """
 
 import logging
-import threading
-import time
 from datetime import datetime, timedelta
 from enum import Enum
 from typing import Any
 from uuid import uuid4
 
 from app.config import get_supabase_client
+from app.services.escalation_scheduler import EscalationScheduler
 from app.services.notification import notification_service
 from app.services.realtime_service import realtime_service
 from app.utils.redis_client import redis_client
@@ -62,8 +61,10 @@ class AlertService:
     - Round-robin assignment with workload balancing
     """
 
-    def __init__(self):
-        self.escalation_threads = {}
+    def __init__(self, escalation_scheduler: EscalationScheduler | None = None):
+        self.escalation_scheduler = escalation_scheduler or EscalationScheduler(
+            self._fire_escalation
+        )
         self.response_timeout = 120  # 2 minutes in seconds
         self.escalation_levels = [
             {"time": 0, "roles": ["sales_rep"]},
@@ -588,32 +589,24 @@ class AlertService:
         return max(score, 0)  # Don't go negative
 
     def _start_escalation_timer(self, alert_id: str, lead_id: str, lead_data: dict[str, Any]):
-        """Start background thread for escalation timing"""
+        """Schedule escalation for when the response deadline passes"""
+        self.escalation_scheduler.schedule(
+            alert_id, self.response_timeout, {"lead_id": lead_id}
+        )
 
-        def escalation_worker():
-            try:
-                time.sleep(self.response_timeout)
-
-                # Check if still not responded
-                alert_data = self._get_alert_data(alert_id)
-                if alert_data and alert_data["status"] != AlertStatus.RESPONDED.value:
-                    self.escalate_if_no_response(alert_id, lead_id)
-
-            except Exception as e:
-                logger.error(f"Error in escalation worker: {str(e)}")
-
-        thread = threading.Thread(target=escalation_worker)
-        thread.daemon = True
-        thread.start()
-
-        # Store thread reference
-        self.escalation_threads[alert_id] = thread
+    def _fire_escalation(self, alert_id: str, payload: dict[str, Any]):
+        """Escalate a due alert unless it has been responded to"""
+        alert_data = self._get_alert_data(alert_id)
+        if alert_data and alert_data["status"] != AlertStatus.RESPONDED.value:
+            self.escalate_if_no_response(alert_id, payload.get("lead_id") or alert_data["lead_id"])
 
     def _cancel_escalation(self, alert_id: str):
-        """Cancel escalation timer if running"""
-        if alert_id in self.escalation_threads:
-            # Thread will check status and exit
-            del self.escalation_threads[alert_id]
+        """Cancel pending escalation if scheduled"""
+        self.escalation_scheduler.cancel(alert_id)
+
+    def start_escalation_scheduler(self):
+        """Start firing pending escalations in this process, including ones queued before a restart"""
+        self.escalation_scheduler.start()
 
     def _get_alert_data(self, alert_id: str) -> dict[str, Any] | None:
         """Get alert data from Redis"""
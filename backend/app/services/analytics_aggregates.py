@@ -0,0 +1,121 @@
+"""
+Analytics Aggregation Layer for iSwitch Roofs CRM
+Version: 1.0.0
+Date: 2026-10-16
+
+Runs KPI aggregations inside Postgres through Supabase RPC and returns
+only the aggregate rows. The SQL functions are defined in
+migrations/007_analytics_kpi_aggregates.sql.
+
+Each method returns a dict of raw aggregates (counts, sums, averages and
+GROUP BY breakdowns), or None when the functions are not deployed so the
+caller can fall back to computing the metrics from rows.
+"""
+
+import logging
+import time
+from datetime import datetime
+from typing import Any
+
+from app.config import get_supabase_client
+
+logger = logging.getLogger(__name__)
+
+
+class AnalyticsAggregates:
+    """
+    Thin RPC wrapper around the analytics_* aggregate functions.
+
+    After a failed call the layer stays disabled for ``retry_interval``
+    seconds so an undeployed migration costs one failed round trip per
+    interval instead of one per KPI request.
+    """
+
+    LEAD_METRICS = "analytics_lead_metrics"
+    REVENUE_METRICS = "analytics_revenue_metrics"
+    CONVERSION_METRICS = "analytics_conversion_metrics"
+    CUSTOMER_METRICS = "analytics_customer_metrics"
+
+    def __init__(self, retry_interval: int = 600):
+        """Initialize aggregation layer"""
+        self._supabase = None
+        self.retry_interval = retry_interval
+        self._disabled_until = 0.0
+
+    @property
+    def supabase(self):
+        """Lazy load Supabase client"""
+        if self._supabase is None:
+            self._supabase = get_supabase_client()
+        return self._supabase
+
+    @property
+    def available(self) -> bool:
+        """Whether the RPC functions should be tried"""
+        return time.monotonic() >= self._disabled_until
+
+    def lead_metrics(self, start_date: datetime, end_date: datetime) -> dict[str, Any] | None:
+        """Lead counts by temperature and source, averages and previous-period total"""
+        return self._call(self.LEAD_METRICS, start_date, end_date)
+
+    def revenue_metrics(self, start_date: datetime, end_date: datetime) -> dict[str, Any] | None:
+        """Project revenue sums, averages and revenue by project type"""
+        return self._call(self.REVENUE_METRICS, start_date, end_date)
+
+    def conversion_metrics(
+        self, start_date: datetime, end_date: datetime
+    ) -> dict[str, Any] | None:
+        """Funnel counts, conversion counts by temperature/source and conversion time"""
+        return self._call(self.CONVERSION_METRICS, start_date, end_date)
+
+    def customer_metrics(self, start_date: datetime, end_date: datetime) -> dict[str, Any] | None:
+        """New/total customers, LTV, referral breakdown and review aggregates"""
+        return self._call(self.CUSTOMER_METRICS, start_date, end_date)
+
+    def _call(
+        self, function_name: str, start_date: datetime, end_date: datetime
+    ) -> dict[str, Any] | None:
+        """
+        Execute one aggregate function.
+
+        Args:
+            function_name: Postgres function name
+            start_date: Window start (inclusive)
+            end_date: Window end (inclusive)
+
+        Returns:
+            Aggregate dict, or None if the layer is unavailable
+        """
+        if not self.available:
+            return None
+
+        try:
+            result = self.supabase.rpc(
+                function_name,
+                {"p_start": start_date.isoformat(), "p_end": end_date.isoformat()},
+            ).execute()
+
+            data = result.data
+            # Scalar JSONB functions come back as the object itself, but
+            # tolerate the single-row list form as well
+            if isinstance(data, list):
+                data = data[0] if data else None
+            if isinstance(data, dict) and function_name in data and len(data) == 1:
+                data = data[function_name]
+
+            if not isinstance(data, dict):
+                raise ValueError(f"Unexpected RPC payload: {type(data).__name__}")
+
+            return data
+
+        except Exception as e:
+            logger.warning(
+                f"Aggregate RPC {function_name} unavailable, falling back to row scans "
+                f"for {self.retry_interval}s: {str(e)}"
+            )
+            self._disabled_until = time.monotonic() + self.retry_interval
+            return None
+
+
+# Create singleton instance
+analytics_aggregates = AnalyticsAggregates()
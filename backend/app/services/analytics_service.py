@@ -8,6 +8,7 @@ and real-time metrics broadcasting via Pusher.
 
 Features:
 - Real-time KPI calculations with caching
+- KPI aggregation pushed down to Postgres (row-scan fallback)
 - Revenue forecasting with time-series analysis
 - Lead funnel analytics
 - Team performance scoring
@@ -30,6 +31,8 @@ import numpy as np
 
 # Database
 from app.config import get_redis_client, get_supabase_client
+from app.services.analytics_aggregates import analytics_aggregates
+from app.utils.cache import cache_result
 
 # Real-time updates
 from app.utils.pusher_client import get_pusher_service
@@ -133,51 +136,72 @@ class AnalyticsService:
             Dictionary of KPI metrics
         """
         try:
-            # Check cache first
-            cache_key = f"analytics:kpis:{timeframe}"
-            cached_data = self._get_cached_data(cache_key)
-            if cached_data:
-                return cached_data
-
-            # Get date range
-            start_date, end_date = self._get_date_range(timeframe)
-
-            # Calculate individual KPI categories
-            lead_metrics = self._calculate_lead_metrics(start_date, end_date)
-            revenue_metrics = self._calculate_revenue_metrics(start_date, end_date)
-            conversion_metrics = self._calculate_conversion_metrics(start_date, end_date)
-            operational_metrics = self._calculate_operational_metrics(start_date, end_date)
-            customer_metrics = self._calculate_customer_metrics(start_date, end_date)
-
-            # Combine all metrics
-            kpis = {
-                "timestamp": datetime.utcnow().isoformat(),
-                "timeframe": timeframe,
-                "leads": lead_metrics,
-                "revenue": revenue_metrics,
-                "conversion": conversion_metrics,
-                "operational": operational_metrics,
-                "customers": customer_metrics,
-                "summary": self._calculate_summary_metrics(
-                    lead_metrics, revenue_metrics, conversion_metrics
-                ),
-            }
-
-            # Cache the results
-            self._cache_data(cache_key, kpis, self.cache_ttl["standard"])
-
-            # Broadcast real-time update
-            self._broadcast_metrics_update(kpis)
-
-            return kpis
+            return self._compute_kpis(TimeFrame(timeframe))
 
         except Exception as e:
             logger.error(f"Error calculating KPIs: {str(e)}")
             return {}
 
+    @cache_result(ttl=300, key_prefix="analytics", stale_ttl=300)
+    def _compute_kpis(self, timeframe: TimeFrame) -> dict[str, Any]:
+        """
+        Compute and broadcast KPIs for a timeframe.
+        Cached for 5min; served stale for up to 5min more while one worker
+        recomputes, so expiry never sends every dashboard to the database.
+        """
+        # Get date range
+        start_date, end_date = self._get_date_range(timeframe)
+
+        # Calculate individual KPI categories
+        lead_metrics = self._calculate_lead_metrics(start_date, end_date)
+        revenue_metrics = self._calculate_revenue_metrics(start_date, end_date)
+        conversion_metrics = self._calculate_conversion_metrics(start_date, end_date)
+        operational_metrics = self._calculate_operational_metrics(start_date, end_date)
+        customer_metrics = self._calculate_customer_metrics(start_date, end_date)
+
+        # Combine all metrics
+        kpis = {
+            "timestamp": datetime.utcnow().isoformat(),
+            "timeframe": timeframe,
+            "leads": lead_metrics,
+            "revenue": revenue_metrics,
+            "conversion": conversion_metrics,
+            "operational": operational_metrics,
+            "customers": customer_metrics,
+            "summary": self._calculate_summary_metrics(
+                lead_metrics, revenue_metrics, conversion_metrics
+            ),
+        }
+
+        # Broadcast real-time update
+        self._broadcast_metrics_update(kpis)
+
+        return kpis
+
     def _calculate_lead_metrics(self, start_date: datetime, end_date: datetime) -> dict:
         """Calculate lead-related metrics"""
         try:
+            aggregates = analytics_aggregates.lead_metrics(start_date, end_date)
+            if aggregates is not None:
+                total_leads = aggregates["total"]
+                prev_count = aggregates["previous_total"]
+                lead_velocity = (
+                    ((total_leads - prev_count) / max(prev_count, 1)) * 100 if prev_count else 0
+                )
+
+                return {
+                    "total": total_leads,
+                    "hot": aggregates["hot"],
+                    "warm": aggregates["warm"],
+                    "cold": aggregates["cold"],
+                    "avg_response_time": round(float(aggregates["avg_response_time"]), 2),
+                    "avg_lead_score": round(float(aggregates["avg_lead_score"]), 2),
+                    "lead_velocity": round(lead_velocity, 2),
+                    "sources": aggregates["sources"],
+                    "daily_average": round(total_leads / max((end_date - start_date).days, 1), 2),
+                }
+
+            # Fallback: aggregate functions not deployed, pull rows
             # Get leads for period
             leads_result = (
                 self.supabase.table("leads")
@@ -254,6 +278,33 @@ class AnalyticsService:
     def _calculate_revenue_metrics(self, start_date: datetime, end_date: datetime) -> dict:
         """Calculate revenue-related metrics"""
         try:
+            aggregates = analytics_aggregates.revenue_metrics(start_date, end_date)
+            if aggregates is not None:
+                total_actual = float(aggregates["total_actual"])
+
+                # Revenue forecast (simple linear projection)
+                days_elapsed = (datetime.utcnow() - start_date).days
+                days_in_period = (end_date - start_date).days
+                projected_revenue = (
+                    (total_actual / days_elapsed) * days_in_period if days_elapsed > 0 else 0
+                )
+
+                return {
+                    "total_quoted": round(float(aggregates["total_quoted"]), 2),
+                    "total_actual": round(total_actual, 2),
+                    "pipeline_value": round(float(aggregates["pipeline_value"]), 2),
+                    "avg_deal_size": round(float(aggregates["avg_deal_size"]), 2),
+                    "avg_margin": round(float(aggregates["avg_margin"]), 2),
+                    "projected_revenue": round(projected_revenue, 2),
+                    "revenue_by_type": {
+                        ptype: float(revenue)
+                        for ptype, revenue in aggregates["revenue_by_type"].items()
+                    },
+                    "total_projects": aggregates["total_projects"],
+                    "completed_projects": aggregates["completed_projects"],
+                }
+
+            # Fallback: aggregate functions not deployed, pull rows
             # Get projects for period
             projects_result = (
                 self.supabase.table("projects")
@@ -338,6 +389,42 @@ class AnalyticsService:
     def _calculate_conversion_metrics(self, start_date: datetime, end_date: datetime) -> dict:
         """Calculate conversion funnel metrics"""
         try:
+            aggregates = analytics_aggregates.conversion_metrics(start_date, end_date)
+            if aggregates is not None:
+                total_leads = aggregates["total_leads"]
+                qualified_leads = aggregates["qualified_leads"]
+                converted_leads = aggregates["converted_leads"]
+
+                conversion_by_temp = {}
+                for temp in ["hot", "warm", "cold"]:
+                    counts = aggregates["by_temperature"].get(temp, {"total": 0, "converted": 0})
+                    conversion_by_temp[temp] = round(
+                        (counts["converted"] / max(counts["total"], 1)) * 100, 2
+                    )
+
+                conversion_by_source = {
+                    source: {
+                        "rate": round((counts["converted"] / max(counts["total"], 1)) * 100, 2),
+                        "count": counts["converted"],
+                    }
+                    for source, counts in aggregates["by_source"].items()
+                }
+
+                return {
+                    "total_leads": total_leads,
+                    "qualified_leads": qualified_leads,
+                    "converted_leads": converted_leads,
+                    "qualification_rate": round((qualified_leads / max(total_leads, 1)) * 100, 2),
+                    "conversion_rate": round((converted_leads / max(total_leads, 1)) * 100, 2),
+                    "qualified_to_customer": round(
+                        (converted_leads / max(qualified_leads, 1)) * 100, 2
+                    ),
+                    "conversion_by_temperature": conversion_by_temp,
+                    "conversion_by_source": conversion_by_source,
+                    "avg_conversion_days": round(float(aggregates["avg_conversion_days"]), 2),
+                }
+
+            # Fallback: aggregate functions not deployed, pull rows
             # Get leads and their outcomes
             leads_result = (
                 self.supabase.table("leads")
@@ -491,7 +578,34 @@ class AnalyticsService:
 
     def _calculate_customer_metrics(self, start_date: datetime, end_date: datetime) -> dict:
         """Calculate customer-related metrics"""
+        # Customer acquisition cost (CAC) - simplified
+        # Would need marketing spend data for accurate CAC
+        estimated_cac = 500  # Placeholder value
+
         try:
+            aggregates = analytics_aggregates.customer_metrics(start_date, end_date)
+            if aggregates is not None:
+                total_reviews = aggregates["total_reviews"]
+                avg_ltv = float(aggregates["avg_lifetime_value"])
+                nps = (
+                    ((aggregates["promoters"] - aggregates["detractors"]) / total_reviews) * 100
+                    if total_reviews
+                    else 0
+                )
+
+                return {
+                    "new_customers": aggregates["new_customers"],
+                    "total_customers": aggregates["total_customers"],
+                    "avg_lifetime_value": round(avg_ltv, 2),
+                    "referral_sources": aggregates["referral_sources"],
+                    "total_reviews": total_reviews,
+                    "avg_rating": round(float(aggregates["avg_rating"]), 2),
+                    "net_promoter_score": round(nps, 2),
+                    "customer_acquisition_cost": estimated_cac,
+                    "ltv_to_cac_ratio": round(avg_ltv / max(estimated_cac, 1), 2) if avg_ltv else 0,
+                }
+
+            # Fallback: aggregate functions not deployed, pull rows
             # Get customers created in period
             customers_result = (
                 self.supabase.table("customers")
@@ -540,10 +654,6 @@ class AnalyticsService:
             detractors = len([r for r in reviews if r.get("rating", 0) <= 2])
             nps = ((promoters - detractors) / max(len(reviews), 1)) * 100 if reviews else 0
 
-            # Customer acquisition cost (CAC) - simplified
-            # Would need marketing spend data for accurate CAC
-            estimated_cac = 500  # Placeholder value
-
             return {
                 "new_customers": new_customers,
                 "total_customers": total_customers,
@@ -16,9 +16,9 @@ Features:
 - Team calendar coordination
 """
 
-import json
 import logging
 import os
+from datetime import date as date_type
 from datetime import datetime, timedelta
 from enum import Enum
 
@@ -30,7 +30,15 @@ from google_auth_oauthlib.flow import Flow
 from googleapiclient.discovery import build
 
 from app.config import get_redis_client, get_supabase_client
+from app.ml.feature_store import lead_feature_store
 from app.services.alert_service import alert_service
+from app.services.availability_index import (
+    AvailabilityIndex,
+    intersect_windows,
+    parse_timestamp,
+    sweep_schedule,
+)
+from app.utils.cache import invalidate_tags
 
 logger = logging.getLogger(__name__)
 
@@ -60,6 +68,18 @@ class AppointmentType(str, Enum):
     MAINTENANCE = "maintenance"
 
 
+# Statuses that occupy a team member's time (rescheduled appointments keep their new slot)
+BUSY_STATUSES = [
+    AppointmentStatus.SCHEDULED,
+    AppointmentStatus.CONFIRMED,
+    AppointmentStatus.RESCHEDULED,
+]
+
+# Rows per request when reading appointment ranges; PostgREST caps every
+# response at its max-rows setting without an error, so ranges are paged
+APPOINTMENT_PAGE_SIZE = 1000
+
+
 class ReminderType(str, Enum):
     """Reminder type enumeration"""
 
@@ -109,6 +129,11 @@ class AppointmentsService:
         # Cache settings
         self.cache_ttl = 300  # 5 minutes
 
+        # Per member, per day busy intervals for availability checks
+        self.availability_index = AvailabilityIndex(
+            self._fetch_busy_appointments, ttl=self.cache_ttl
+        )
+
     @property
     def supabase(self):
         """Lazy load Supabase client"""
@@ -161,9 +186,9 @@ class AppointmentsService:
             if duration is None:
                 duration = self.default_duration
 
-            # Check availability
+            # Check availability against the database, not a cached index
             is_available, conflict = self.check_availability(
-                team_member_id, scheduled_time, duration
+                team_member_id, scheduled_time, duration, fresh=True
             )
 
             if not is_available:
@@ -205,6 +230,9 @@ class AppointmentsService:
                     ).eq("id", appointment["id"]).execute()
                     appointment["google_calendar_event_id"] = calendar_event_id
 
+            # Keep the lead's NBA features current
+            lead_feature_store.record_appointment(appointment)
+
             # Schedule reminders
             if send_reminders:
                 self._schedule_reminders(appointment)
@@ -215,6 +243,9 @@ class AppointmentsService:
             # Clear availability cache
             self._clear_availability_cache(team_member_id, scheduled_time)
 
+            # Cached list totals (count_total tag) include the new row
+            invalidate_tags("appointments")
+
             logger.info(f"Appointment created: {appointment['id']}")
             return True, appointment, None
 
@@ -257,6 +288,7 @@ class AppointmentsService:
                     new_start,
                     duration,
                     exclude_appointment_id=appointment_id,
+                    fresh=True,
                 )
 
                 if not is_available:
@@ -295,12 +327,18 @@ class AppointmentsService:
                 self._reschedule_reminders(updated_appointment)
                 self._send_reschedule_notification(updated_appointment)
 
-            # Clear caches
+            # Clear caches for the old and new day (and member, if reassigned)
+            self._clear_availability_cache(
+                appointment["team_member_id"],
+                parse_timestamp(appointment["scheduled_start"]),
+            )
             self._clear_availability_cache(
                 updated_appointment["team_member_id"],
-                datetime.fromisoformat(updated_appointment["scheduled_start"]),
+                parse_timestamp(updated_appointment["scheduled_start"]),
             )
 
+            invalidate_tags("appointments")
+
             logger.info(f"Appointment updated: {appointment_id}")
             return True, updated_appointment, None
 
@@ -365,9 +403,11 @@ class AppointmentsService:
             # Clear cache
             self._clear_availability_cache(
                 appointment["team_member_id"],
-                datetime.fromisoformat(appointment["scheduled_start"]),
+                parse_timestamp(appointment["scheduled_start"]),
             )
 
+            invalidate_tags("appointments")
+
             logger.info(f"Appointment cancelled: {appointment_id}")
             return True, None
 
@@ -381,6 +421,7 @@ class AppointmentsService:
         start_time: datetime,
         duration: int,
         exclude_appointment_id: str = None,
+        fresh: bool = False,
     ) -> tuple[bool, str | None]:
         """
         Check if a time slot is available
@@ -390,31 +431,14 @@ class AppointmentsService:
             start_time: Start time to check
             duration: Duration in minutes
             exclude_appointment_id: Appointment ID to exclude
+            fresh: Reload the member's day from the database instead of the index cache
 
         Returns:
             Tuple of (is_available, conflict_description)
         """
         try:
-            # Check cache first
-            cache_key = f"availability:{team_member_id}:{start_time.date()}"
-            cached_slots = self.redis_client.get(cache_key)
-
-            if cached_slots:
-                slots = json.loads(cached_slots)
-                # Check if requested time conflicts with booked slots
-                for slot in slots:
-                    if exclude_appointment_id and slot["id"] == exclude_appointment_id:
-                        continue
-
-                    slot_start = datetime.fromisoformat(slot["start"])
-                    slot_end = datetime.fromisoformat(slot["end"])
-                    end_time = start_time + timedelta(minutes=duration)
-
-                    if start_time < slot_end and end_time > slot_start:
-                        return (
-                            False,
-                            f"Conflicts with existing appointment at {slot_start.strftime('%I:%M %p')}",
-                        )
+            start_time = parse_timestamp(start_time)
+            end_time = start_time + timedelta(minutes=duration)
 
             # Check business hours
             day_name = start_time.strftime("%A").lower()
@@ -423,15 +447,7 @@ class AppointmentsService:
             if not business_hours:
                 return False, f"No availability on {day_name.capitalize()}"
 
-            # Parse business hours
-            bh_start = datetime.combine(
-                start_time.date(), datetime.strptime(business_hours["start"], "%H:%M").time()
-            )
-            bh_end = datetime.combine(
-                start_time.date(), datetime.strptime(business_hours["end"], "%H:%M").time()
-            )
-
-            end_time = start_time + timedelta(minutes=duration)
+            bh_start, bh_end = self._business_window(start_time.date(), business_hours)
 
             if start_time < bh_start or end_time > bh_end:
                 return (
@@ -439,37 +455,12 @@ class AppointmentsService:
                     f"Outside business hours ({business_hours['start']} - {business_hours['end']})",
                 )
 
-            # Query database for conflicts
-            query = (
-                self.supabase.table("appointments")
-                .select("*")
-                .eq("team_member_id", team_member_id)
-                .in_("status", [AppointmentStatus.SCHEDULED, AppointmentStatus.CONFIRMED])
-            )
-
-            if exclude_appointment_id:
-                query = query.neq("id", exclude_appointment_id)
-
-            # Get appointments for the date range
-            date_start = start_time.replace(hour=0, minute=0, second=0).isoformat()
-            date_end = (
-                (start_time + timedelta(days=1)).replace(hour=0, minute=0, second=0).isoformat()
-            )
-
-            query = query.gte("scheduled_start", date_start).lt("scheduled_start", date_end)
-
-            result = query.execute()
-
-            # Check for conflicts
-            for appointment in result.data:
-                apt_start = datetime.fromisoformat(appointment["scheduled_start"])
-                apt_end = datetime.fromisoformat(appointment["scheduled_end"])
+            # Check the member's booked intervals for the day
+            busy = self.availability_index.get(team_member_id, start_time.date(), refresh=fresh)
+            conflict = busy.conflict(start_time, end_time, exclude_appointment_id)
 
-                if start_time < apt_end and end_time > apt_start:
-                    return False, f"Conflicts with appointment at {apt_start.strftime('%I:%M %p')}"
-
-            # Update cache
-            self._update_availability_cache(team_member_id, start_time.date())
+            if conflict:
+                return False, f"Conflicts with appointment at {conflict[0].strftime('%I:%M %p')}"
 
             return True, None
 
@@ -509,47 +500,15 @@ class AppointmentsService:
             if not business_hours:
                 return []
 
-            # Parse business hours
-            start_time = datetime.combine(
-                date.date(), datetime.strptime(business_hours["start"], "%H:%M").time()
-            )
-            end_time = datetime.combine(
-                date.date(), datetime.strptime(business_hours["end"], "%H:%M").time()
-            )
-
-            # Get existing appointments
-            result = (
-                self.supabase.table("appointments")
-                .select("scheduled_start", "scheduled_end")
-                .eq("team_member_id", team_member_id)
-                .in_("status", [AppointmentStatus.SCHEDULED, AppointmentStatus.CONFIRMED])
-                .gte("scheduled_start", date.replace(hour=0, minute=0).isoformat())
-                .lt(
-                    "scheduled_start",
-                    (date + timedelta(days=1)).replace(hour=0, minute=0).isoformat(),
-                )
-                .execute()
-            )
-
-            booked_slots = []
-            for apt in result.data:
-                booked_slots.append(
-                    {
-                        "start": datetime.fromisoformat(apt["scheduled_start"]),
-                        "end": datetime.fromisoformat(apt["scheduled_end"]),
-                    }
-                )
-
-            # Sort booked slots
-            booked_slots.sort(key=lambda x: x["start"])
+            start_time, end_time = self._business_window(date.date(), business_hours)
+            busy = self.availability_index.get(team_member_id, date.date())
 
-            # Find available slots
-            current_time = start_time
+            # Fill each free window with back-to-back slots (including buffer time)
             slot_duration = timedelta(minutes=duration + self.buffer_time)
 
-            for booked in booked_slots:
-                # Check if there's space before this appointment
-                if current_time + slot_duration <= booked["start"]:
+            for window_start, window_end in busy.free_windows(start_time, end_time):
+                current_time = window_start
+                while current_time + slot_duration <= window_end:
                     available_slots.append(
                         {
                             "start": current_time.isoformat(),
@@ -557,20 +516,7 @@ class AppointmentsService:
                             "duration": duration,
                         }
                     )
-
-                # Move current time to after this appointment
-                current_time = max(current_time, booked["end"])
-
-            # Check if there's space after the last appointment
-            while current_time + slot_duration <= end_time:
-                available_slots.append(
-                    {
-                        "start": current_time.isoformat(),
-                        "end": (current_time + timedelta(minutes=duration)).isoformat(),
-                        "duration": duration,
-                    }
-                )
-                current_time += slot_duration
+                    current_time += slot_duration
 
             return available_slots
 
@@ -578,6 +524,79 @@ class AppointmentsService:
             logger.error(f"Error getting available slots: {str(e)}")
             return []
 
+    def find_slots(
+        self,
+        date_range: tuple[datetime, datetime],
+        members: list[str],
+        duration: int = None,
+    ) -> dict:
+        """
+        Find free windows for a crew over a date range in one call
+
+        Loads every member's bookings for the range with one query, then
+        returns each member's free windows within business hours and the
+        windows where the whole crew is free.
+
+        Args:
+            date_range: (start_date, end_date), both inclusive
+            members: Team member IDs
+            duration: Minimum window length in minutes (buffer time is added)
+
+        Returns:
+            Dictionary with per-member windows and common crew windows
+        """
+        if duration is None:
+            duration = self.default_duration
+
+        start_date, end_date = date_range
+        start_day = start_date.date() if isinstance(start_date, datetime) else start_date
+        end_day = end_date.date() if isinstance(end_date, datetime) else end_date
+        min_length = timedelta(minutes=duration + self.buffer_time)
+
+        member_windows = {member_id: [] for member_id in members}
+        common_windows = []
+
+        busy = self.availability_index.get_many(members, start_day, end_day)
+
+        day = start_day
+        while day <= end_day:
+            business_hours = self.business_hours.get(day.strftime("%A").lower())
+            if business_hours:
+                bh_start, bh_end = self._business_window(day, business_hours)
+                crew_free = [(bh_start, bh_end)]
+
+                for member_id in members:
+                    free = busy[(member_id, day)].free_windows(bh_start, bh_end)
+                    member_windows[member_id].extend(
+                        window for window in free if window[1] - window[0] >= min_length
+                    )
+                    crew_free = intersect_windows(crew_free, free)
+
+                common_windows.extend(
+                    window for window in crew_free if window[1] - window[0] >= min_length
+                )
+            day += timedelta(days=1)
+
+        def serialize(windows):
+            return [
+                {
+                    "start": start.isoformat(),
+                    "end": end.isoformat(),
+                    "minutes": int((end - start).total_seconds() // 60),
+                }
+                for start, end in windows
+            ]
+
+        return {
+            "start_date": start_day.isoformat(),
+            "end_date": end_day.isoformat(),
+            "duration": duration,
+            "members": {
+                member_id: serialize(windows) for member_id, windows in member_windows.items()
+            },
+            "common": serialize(common_windows),
+        }
+
     def get_team_schedule(
         self, team_member_id: str, start_date: datetime, end_date: datetime
     ) -> list[dict]:
@@ -609,6 +628,99 @@ class AppointmentsService:
             logger.error(f"Error getting team schedule: {str(e)}")
             return []
 
+    def get_team_schedules(
+        self, team_member_ids: list[str], start_date: datetime, end_date: datetime
+    ) -> dict:
+        """
+        Get the whole team's schedule for a date range in one query
+
+        Returns a compact member x day matrix of busy and free blocks (minutes
+        from midnight) plus the windows where the whole team is free, so a
+        team calendar renders from one call instead of one schedule and one
+        slot lookup per member per day.
+
+        Args:
+            team_member_ids: Team member IDs (matrix row order)
+            start_date: First day (inclusive)
+            end_date: Last day (inclusive)
+
+        Returns:
+            Dictionary with members, days, appointments and block matrices
+        """
+        start_day = start_date.date() if isinstance(start_date, datetime) else start_date
+        end_day = end_date.date() if isinstance(end_date, datetime) else end_date
+        days = [
+            start_day + timedelta(days=offset) for offset in range((end_day - start_day).days + 1)
+        ]
+        member_ids = list(dict.fromkeys(team_member_ids))
+
+        rows = self._fetch_pages(
+            lambda: self.supabase.table("appointments")
+            .select(
+                "id, team_member_id, appointment_type, status, scheduled_start, scheduled_end, "
+                "customers(name)"
+            )
+            .in_("team_member_id", member_ids)
+            .gte("scheduled_start", datetime.combine(start_day, datetime.min.time()).isoformat())
+            .lt(
+                "scheduled_start",
+                datetime.combine(end_day + timedelta(days=1), datetime.min.time()).isoformat(),
+            )
+        )
+
+        member_pos = {member_id: i for i, member_id in enumerate(member_ids)}
+        midnights = {day: datetime.combine(day, datetime.min.time()) for day in days}
+        appointments = []
+        busy_intervals = []
+
+        for row in rows:
+            start = parse_timestamp(row["scheduled_start"])
+            end = parse_timestamp(row["scheduled_end"])
+            if row["team_member_id"] not in member_pos or start.date() not in midnights:
+                continue
+
+            if row.get("status") in BUSY_STATUSES:
+                busy_intervals.append((row["team_member_id"], start, end))
+
+            midnight = midnights[start.date()]
+            appointments.append(
+                {
+                    "id": row["id"],
+                    "member": member_pos[row["team_member_id"]],
+                    "day": (start.date() - start_day).days,
+                    "start": int((start - midnight).total_seconds() // 60),
+                    "end": int((end - midnight).total_seconds() // 60),
+                    "type": row.get("appointment_type"),
+                    "status": row.get("status"),
+                    "customer": (row.get("customers") or {}).get("name"),
+                }
+            )
+
+        business_windows = {}
+        for day in days:
+            business_hours = self.business_hours.get(day.strftime("%A").lower())
+            business_windows[day] = (
+                self._business_window(day, business_hours) if business_hours else None
+            )
+
+        blocks = sweep_schedule(member_ids, days, business_windows, busy_intervals)
+
+        return {
+            "members": member_ids,
+            "days": [day.isoformat() for day in days],
+            "business_hours": [
+                [
+                    int((window[0] - midnights[day]).total_seconds() // 60),
+                    int((window[1] - midnights[day]).total_seconds() // 60),
+                ]
+                if window
+                else None
+                for day, window in business_windows.items()
+            ],
+            "appointments": appointments,
+            **blocks,
+        }
+
     def send_reminder(
         self, appointment_id: str, reminder_type: str = ReminderType.EMAIL
     ) -> tuple[bool, str | None]:
@@ -724,6 +836,15 @@ class AppointmentsService:
 
             appointment = result.data[0]
 
+            # Completed appointments no longer block the slot
+            self._clear_availability_cache(
+                appointment["team_member_id"], parse_timestamp(appointment["scheduled_start"])
+            )
+            invalidate_tags("appointments")
+
+            # Keep the lead's NBA features current
+            lead_feature_store.record_appointment(appointment, scheduled=False, completed=True)
+
             # Create follow-up task if needed
             if follow_up_required:
                 self._create_follow_up_task(appointment)
@@ -1045,42 +1166,50 @@ class AppointmentsService:
         except Exception as e:
             logger.error(f"Error creating follow-up task: {str(e)}")
 
-    def _update_availability_cache(self, team_member_id: str, date: datetime.date):
-        """Update availability cache for a team member"""
-        try:
-            # Get all appointments for the date
-            start_of_day = datetime.combine(date, datetime.min.time())
-            end_of_day = datetime.combine(date, datetime.max.time())
-
-            result = (
-                self.supabase.table("appointments")
-                .select("id", "scheduled_start", "scheduled_end")
-                .eq("team_member_id", team_member_id)
-                .in_("status", [AppointmentStatus.SCHEDULED, AppointmentStatus.CONFIRMED])
-                .gte("scheduled_start", start_of_day.isoformat())
-                .lte("scheduled_start", end_of_day.isoformat())
-                .execute()
-            )
+    def _business_window(self, day: date_type, business_hours: dict) -> tuple[datetime, datetime]:
+        """Business hours for a day as datetimes"""
+        return (
+            datetime.combine(day, datetime.strptime(business_hours["start"], "%H:%M").time()),
+            datetime.combine(day, datetime.strptime(business_hours["end"], "%H:%M").time()),
+        )
 
-            # Format for cache
-            slots = []
-            for apt in result.data:
-                slots.append(
-                    {"id": apt["id"], "start": apt["scheduled_start"], "end": apt["scheduled_end"]}
-                )
+    def _fetch_busy_appointments(
+        self, team_member_ids: list[str], start: datetime, end: datetime
+    ) -> list[dict]:
+        """Busy appointments starting in [start, end) for the given team members"""
+        return self._fetch_pages(
+            lambda: self.supabase.table("appointments")
+            .select("id", "team_member_id", "scheduled_start", "scheduled_end")
+            .in_("team_member_id", team_member_ids)
+            .in_("status", BUSY_STATUSES)
+            .gte("scheduled_start", start.isoformat())
+            .lt("scheduled_start", end.isoformat())
+        )
 
-            # Store in cache
-            cache_key = f"availability:{team_member_id}:{date}"
-            self.redis_client.setex(cache_key, self.cache_ttl, json.dumps(slots))
+    def _fetch_pages(self, build_query) -> list[dict]:
+        """
+        Every row of an appointments query, read APPOINTMENT_PAGE_SIZE at a time
 
-        except Exception as e:
-            logger.error(f"Error updating availability cache: {str(e)}")
+        build_query returns a fresh filtered query for each page; rows are
+        ordered by start time with the id as tie-breaker so pages are stable.
+        """
+        rows = []
+        while True:
+            page = (
+                build_query()
+                .order("scheduled_start")
+                .order("id")
+                .range(len(rows), len(rows) + APPOINTMENT_PAGE_SIZE - 1)
+                .execute()
+            )
+            rows.extend(page.data or [])
+            if len(page.data or []) < APPOINTMENT_PAGE_SIZE:
+                return rows
 
     def _clear_availability_cache(self, team_member_id: str, date: datetime):
         """Clear availability cache"""
         try:
-            cache_key = f"availability:{team_member_id}:{date.date()}"
-            self.redis_client.delete(cache_key)
+            self.availability_index.invalidate(team_member_id, date.date())
 
         except Exception as e:
             logger.error(f"Error clearing availability cache: {str(e)}")
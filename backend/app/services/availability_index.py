@@ -0,0 +1,372 @@
+"""
+iSwitch Roofs CRM - Appointment Availability Index
+Version: 1.0.0
+
+Per team member, per day interval index of booked appointments, used by
+AppointmentsService for conflict checks, slot listings and crew-wide slot
+search.
+
+A day's index is a sorted list of busy intervals (with a running maximum of
+end times), so a conflict check is a bisect plus a short backward scan and
+free windows come from one pass over the day.
+
+Indexes for any set of members and days are built from one bulk range
+query and cached in Redis, with the process-local L1 tier from
+app.utils.cache in front. Without Redis the L1 tier is the only cache.
+AppointmentsService invalidates a member's day on create, update, cancel
+and completion; invalidations reach every worker's L1 tier through the
+cache pub/sub channel.
+
+sweep_schedule() computes busy/free blocks for a whole team and date range
+in one pass, for the team calendar.
+"""
+
+import json
+import logging
+import os
+from bisect import bisect_left
+from collections.abc import Callable, Iterable
+from datetime import date, datetime, timedelta, timezone
+from typing import Any
+
+from app.utils.cache import invalidate_keys, local_cache, start_invalidation_listener
+from app.utils.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+# Seconds a day's index is cached in Redis
+AVAILABILITY_TTL = int(os.getenv("AVAILABILITY_INDEX_TTL", 300))
+
+# Seconds a day's index is kept in process memory in front of Redis
+AVAILABILITY_L1_TTL = int(os.getenv("AVAILABILITY_INDEX_L1_TTL", 30))
+
+Interval = tuple[datetime, datetime, str | None]
+
+
+def parse_timestamp(value: str | datetime) -> datetime:
+    """Parse an appointment timestamp as naive UTC"""
+    parsed = value if isinstance(value, datetime) else datetime.fromisoformat(value)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+class BusyIntervals:
+    """Booked intervals for one team member on one day, sorted by start"""
+
+    def __init__(self, intervals: Iterable[Interval] = ()):
+        self.intervals: list[Interval] = sorted(intervals, key=lambda i: (i[0], i[1]))
+        self._starts = [start for start, _, _ in self.intervals]
+        # Latest end among intervals[0..i], so backward scans can stop early
+        self._max_end: list[datetime] = []
+        for _, end, _ in self.intervals:
+            self._max_end.append(max(end, self._max_end[-1]) if self._max_end else end)
+
+    def __len__(self) -> int:
+        return len(self.intervals)
+
+    def conflict(
+        self, start: datetime, end: datetime, exclude_id: str | None = None
+    ) -> Interval | None:
+        """
+        Earliest booked interval overlapping [start, end), or None.
+
+        Args:
+            start: Requested start
+            end: Requested end
+            exclude_id: Appointment to ignore (the one being rescheduled)
+        """
+        found = None
+        # Only intervals starting before the requested end can overlap it
+        for idx in range(bisect_left(self._starts, end) - 1, -1, -1):
+            if self._max_end[idx] <= start:
+                break
+            interval = self.intervals[idx]
+            if interval[1] > start and (exclude_id is None or interval[2] != exclude_id):
+                found = interval
+        return found
+
+    def free_windows(
+        self, window_start: datetime, window_end: datetime, exclude_id: str | None = None
+    ) -> list[tuple[datetime, datetime]]:
+        """Gaps between booked intervals within [window_start, window_end)"""
+        windows = []
+        cursor = window_start
+        for start, end, appointment_id in self.intervals:
+            if start >= window_end:
+                break
+            if end <= cursor or (exclude_id is not None and appointment_id == exclude_id):
+                continue
+            if start > cursor:
+                windows.append((cursor, start))
+            cursor = max(cursor, end)
+        if cursor < window_end:
+            windows.append((cursor, window_end))
+        return windows
+
+    def to_json(self) -> str:
+        return json.dumps(
+            [[start.isoformat(), end.isoformat(), appointment_id] for start, end, appointment_id in self.intervals]
+        )
+
+    @classmethod
+    def from_json(cls, raw: str) -> "BusyIntervals":
+        return cls(
+            (datetime.fromisoformat(start), datetime.fromisoformat(end), appointment_id)
+            for start, end, appointment_id in json.loads(raw)
+        )
+
+
+def intersect_windows(
+    first: list[tuple[datetime, datetime]], second: list[tuple[datetime, datetime]]
+) -> list[tuple[datetime, datetime]]:
+    """Overlap of two sorted, non-overlapping window lists"""
+    result = []
+    i = j = 0
+    while i < len(first) and j < len(second):
+        start = max(first[i][0], second[j][0])
+        end = min(first[i][1], second[j][1])
+        if start < end:
+            result.append((start, end))
+        if first[i][1] <= second[j][1]:
+            i += 1
+        else:
+            j += 1
+    return result
+
+
+def sweep_schedule(
+    member_ids: list[str],
+    days: list[date],
+    business_windows: dict[date, tuple[datetime, datetime] | None],
+    intervals: Iterable[tuple[str, datetime, datetime]],
+) -> dict[str, list]:
+    """
+    Busy and free blocks for every member and day in one sweep-line pass.
+
+    Appointment starts/ends and business open/close times are merged into
+    one time-ordered event list. Walking it once keeps each member's count
+    of active appointments, emitting a busy block when a member's count
+    leaves and returns to zero and a free block for each gap between busy
+    blocks during business hours. A running count of busy members gives the
+    windows where the whole crew is free.
+
+    Blocks are [start, end] minutes from midnight of their day; a busy block
+    belongs to the day it starts on.
+
+    Args:
+        member_ids: Team members, in matrix row order
+        days: Days, in matrix column order
+        business_windows: Open/close datetimes per day (None when closed)
+        intervals: (member_id, start, end) for each busy appointment
+
+    Returns:
+        Dictionary with "busy" and "free" matrices (member x day x blocks)
+        and "common_free" (day x blocks)
+    """
+    member_pos = {member_id: i for i, member_id in enumerate(member_ids)}
+    day_pos = {day: i for i, day in enumerate(days)}
+    midnights = [datetime.combine(day, datetime.min.time()) for day in days]
+
+    busy = [[[] for _ in days] for _ in member_ids]
+    free = [[[] for _ in days] for _ in member_ids]
+    common_free = [[] for _ in days]
+
+    # At equal times: appointment ends, then closes, then opens, then appointment starts
+    APPT_END, CLOSE, OPEN, APPT_START = range(4)
+    events = []
+    for day, window in business_windows.items():
+        if window and day in day_pos:
+            events.append((window[0], OPEN, day_pos[day]))
+            events.append((window[1], CLOSE, day_pos[day]))
+    for member_id, start, end in intervals:
+        if member_id in member_pos and start < end:
+            events.append((start, APPT_START, member_pos[member_id]))
+            events.append((end, APPT_END, member_pos[member_id]))
+    events.sort(key=lambda event: (event[0], event[1]))
+
+    def minutes(day_idx: int, at: datetime) -> int:
+        return int((at - midnights[day_idx]).total_seconds() // 60)
+
+    def emit(blocks: list, day_idx: int, start: datetime, end: datetime):
+        if start < end:
+            blocks.append([minutes(day_idx, start), minutes(day_idx, end)])
+
+    active = [0] * len(member_ids)
+    busy_since: list[datetime | None] = [None] * len(member_ids)
+    free_since: list[datetime | None] = [None] * len(member_ids)
+    busy_members = 0
+    common_since = None
+    open_day = None
+
+    for at, kind, pos in events:
+        if kind == APPT_START:
+            active[pos] += 1
+            if active[pos] > 1:
+                continue
+            busy_since[pos] = at
+            busy_members += 1
+            if open_day is not None:
+                emit(free[pos][open_day], open_day, free_since[pos], at)
+                if busy_members == 1:
+                    emit(common_free[open_day], open_day, common_since, at)
+        elif kind == APPT_END:
+            active[pos] -= 1
+            if active[pos] > 0:
+                continue
+            start_day = day_pos.get(busy_since[pos].date())
+            if start_day is not None:
+                emit(busy[pos][start_day], start_day, busy_since[pos], at)
+            busy_members -= 1
+            if open_day is not None:
+                free_since[pos] = at
+                if busy_members == 0:
+                    common_since = at
+        elif kind == OPEN:
+            open_day = pos
+            for i in range(len(member_ids)):
+                if active[i] == 0:
+                    free_since[i] = at
+            if busy_members == 0:
+                common_since = at
+        else:
+            for i in range(len(member_ids)):
+                if active[i] == 0:
+                    emit(free[i][pos], pos, free_since[i], at)
+            if busy_members == 0:
+                emit(common_free[pos], pos, common_since, at)
+            open_day = None
+
+    return {"busy": busy, "free": free, "common_free": common_free}
+
+
+class AvailabilityIndex:
+    """Cached BusyIntervals per (team member, day), loaded in bulk"""
+
+    KEY_PREFIX = "crm:availability"
+
+    def __init__(
+        self,
+        fetch: Callable[[list[str], datetime, datetime], list[dict[str, Any]]],
+        ttl: int = AVAILABILITY_TTL,
+        l1_ttl: int = AVAILABILITY_L1_TTL,
+    ):
+        """
+        Args:
+            fetch: Called as fetch(member_ids, start, end) and returns the busy
+                appointments (id, team_member_id, scheduled_start, scheduled_end)
+                starting in [start, end) for those members
+            ttl: Seconds a day's index is cached
+            l1_ttl: Seconds a day's index is kept in process memory while Redis
+                is connected
+        """
+        self.fetch = fetch
+        self.ttl = ttl
+        self.l1_ttl = l1_ttl
+
+    @classmethod
+    def key(cls, member_id: str, day: date) -> str:
+        return f"{cls.KEY_PREFIX}:{member_id}:{day.isoformat()}"
+
+    def get(self, member_id: str, day: date, refresh: bool = False) -> BusyIntervals:
+        """Busy intervals for one member on one day"""
+        return self.get_many([member_id], day, day, refresh=refresh)[(member_id, day)]
+
+    def get_many(
+        self, member_ids: list[str], start_day: date, end_day: date, refresh: bool = False
+    ) -> dict[tuple[str, date], BusyIntervals]:
+        """
+        Busy intervals for every member on every day from start_day to end_day.
+
+        Cached days are served from L1/Redis; the rest are loaded with one
+        range query covering all missing members and days.
+
+        Args:
+            member_ids: Team member IDs
+            start_day: First day (inclusive)
+            end_day: Last day (inclusive)
+            refresh: Skip cached entries and reload from the database
+        """
+        days = [start_day + timedelta(days=offset) for offset in range((end_day - start_day).days + 1)]
+        wanted = [(member_id, day) for member_id in dict.fromkeys(member_ids) for day in days]
+        found: dict[tuple[str, date], BusyIntervals] = {}
+
+        if not refresh:
+            self._read_cached(wanted, found)
+
+        missing = [entry for entry in wanted if entry not in found]
+        if missing:
+            self._load(missing, found)
+
+        return found
+
+    def invalidate(self, member_id: str, *days: date) -> int:
+        """Drop cached indexes for a member's days in every worker"""
+        return invalidate_keys(*(self.key(member_id, day) for day in days))
+
+    def _l1_ttl(self) -> int:
+        if not redis_client.is_connected:
+            # Process memory is the only tier
+            return self.ttl
+        # Without the invalidation listener, other workers' changes would go unseen
+        return self.l1_ttl if start_invalidation_listener() else 0
+
+    def _read_cached(
+        self, wanted: list[tuple[str, date]], found: dict[tuple[str, date], BusyIntervals]
+    ):
+        remote = []
+        for entry in wanted:
+            hit, intervals = local_cache.get(self.key(*entry))
+            if hit:
+                found[entry] = intervals
+            else:
+                remote.append(entry)
+
+        if not remote or not redis_client.is_connected:
+            return
+
+        try:
+            pipe = redis_client.pipeline()
+            for entry in remote:
+                pipe.get(self.key(*entry))
+            l1_ttl = self._l1_ttl()
+            for entry, raw in zip(remote, pipe.execute()):
+                if raw:
+                    intervals = BusyIntervals.from_json(raw)
+                    found[entry] = intervals
+                    local_cache.set(self.key(*entry), intervals, l1_ttl)
+        except Exception as e:
+            logger.error(f"Error reading availability index: {str(e)}")
+
+    def _load(
+        self, missing: list[tuple[str, date]], found: dict[tuple[str, date], BusyIntervals]
+    ):
+        member_ids = list(dict.fromkeys(member_id for member_id, _ in missing))
+        first_day = min(day for _, day in missing)
+        last_day = max(day for _, day in missing)
+        range_start = datetime.combine(first_day, datetime.min.time())
+        range_end = datetime.combine(last_day + timedelta(days=1), datetime.min.time())
+
+        grouped: dict[tuple[str, date], list[Interval]] = {entry: [] for entry in missing}
+        for appointment in self.fetch(member_ids, range_start, range_end):
+            start = parse_timestamp(appointment["scheduled_start"])
+            entry = (appointment["team_member_id"], start.date())
+            if entry in grouped:
+                grouped[entry].append(
+                    (start, parse_timestamp(appointment["scheduled_end"]), appointment.get("id"))
+                )
+
+        l1_ttl = self._l1_ttl()
+        pipe = redis_client.pipeline() if redis_client.is_connected else None
+        for entry, intervals in grouped.items():
+            index = BusyIntervals(intervals)
+            found[entry] = index
+            local_cache.set(self.key(*entry), index, l1_ttl)
+            if pipe is not None:
+                pipe.setex(self.key(*entry), self.ttl, index.to_json())
+
+        if pipe is not None:
+            try:
+                pipe.execute()
+            except Exception as e:
+                logger.error(f"Error caching availability index: {str(e)}")
@@ -0,0 +1,177 @@
+"""
+iSwitch Roofs CRM - Background Job Tasks
+Version: 1.0.0
+
+Long-running operations that endpoints hand to the job queue
+(app.services.job_queue) instead of running inside the request.
+
+Each task takes a JobContext first, opens its own database session (it may
+run in a worker process) and returns a JSON-serializable result. Tasks that
+drive a coroutine run it through cancellable(), so cancelling the job
+cancels the coroutine at its next await; blocking work inside those
+coroutines goes through asyncio.to_thread so it doesn't stall the shared loop.
+
+Tasks whose arguments are validated by their own endpoint are registered
+with exposed=False so POST /api/jobs cannot bypass that validation.
+"""
+
+import asyncio
+import os
+import tempfile
+from collections.abc import Coroutine
+from pathlib import Path
+from typing import Any
+from uuid import uuid4
+
+from app.database import get_db_session
+from app.services.job_queue import JobContext, job_task
+from app.utils.async_runner import run_async
+
+# Where bulk import uploads wait for a worker (must be shared with worker processes)
+JOB_UPLOAD_DIR = os.getenv("JOB_UPLOAD_DIR", os.path.join(tempfile.gettempdir(), "crm-job-uploads"))
+
+# Seconds between cancellation checks while a task awaits a coroutine
+CANCEL_POLL_INTERVAL = 1.0
+
+
+async def cancellable(ctx: JobContext, coro: Coroutine, poll_interval: float = CANCEL_POLL_INTERVAL) -> Any:
+    """
+    Await a coroutine, cancelling it if the job is cancelled.
+
+    Raises:
+        JobCancelled: If the job was cancelled before the coroutine finished
+    """
+    task = asyncio.ensure_future(coro)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=poll_interval)
+            if done:
+                return task.result()
+            # The cancel flag may live in Redis; keep the lookup off the loop
+            await asyncio.to_thread(ctx.check_cancelled)
+    finally:
+        if not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+
+def spool_upload(data: bytes, filename: str) -> str:
+    """Write an upload to JOB_UPLOAD_DIR and return its path"""
+    os.makedirs(JOB_UPLOAD_DIR, exist_ok=True)
+    path = os.path.join(JOB_UPLOAD_DIR, f"{uuid4().hex}{Path(filename).suffix}")
+    with open(path, "wb") as f:
+        f.write(data)
+    return path
+
+
+@job_task("data_pipeline.run", max_retries=2, retry_backoff=30, exposed=False)
+def run_data_pipeline(
+    ctx: JobContext, filters: dict[str, Any], concurrent: bool = True, stage_timeout: float | None = None
+) -> dict[str, Any]:
+    """Run the automated lead discovery pipeline"""
+    from app.services.intelligence.data_pipeline_service import get_pipeline_service
+
+    ctx.report(0, "Running data pipeline")
+    with get_db_session() as db:
+        service = get_pipeline_service(db)
+        return run_async(
+            cancellable(ctx, service.run_pipeline(filters, concurrent=concurrent, stage_timeout=stage_timeout)),
+            timeout=None,
+        )
+
+
+@job_task("data_pipeline.rebuild_known_leads", exposed=False)
+def rebuild_known_leads(ctx: JobContext) -> dict[str, Any]:
+    """Rebuild the pipeline's known-lead Bloom filter from every stored lead"""
+    from app.services.intelligence.data_pipeline_service import get_pipeline_service
+
+    ctx.report(0, "Rebuilding known-lead filter")
+    with get_db_session() as db:
+        return {"leads_loaded": get_pipeline_service(db).rebuild_known_leads_filter()}
+
+
+@job_task("live_data.generate", exposed=False)
+def generate_live_leads(ctx: JobContext, count: int) -> dict[str, Any]:
+    """Generate and ingest leads from public data sources"""
+    from app.services.intelligence.live_data_collector import run_live_collection
+
+    ctx.report(0, f"Generating {count} leads")
+    with get_db_session() as db:
+        results = run_async(cancellable(ctx, run_live_collection(db, count)), timeout=None)
+
+    return {
+        "success": results["success"],
+        "message": f"Generated and ingested {results.get('ingested', 0)} leads",
+        "statistics": {
+            "total_generated": results.get("total", 0),
+            "successfully_ingested": results.get("ingested", 0),
+            "duplicates_skipped": results.get("skipped", 0),
+        },
+    }
+
+
+@job_task("revenue.train", max_retries=1, retry_backoff=10, exposed=False)
+def train_revenue_model(ctx: JobContext, historical_days: int = 180, model_type: str = "auto") -> dict[str, Any]:
+    """Train the revenue forecasting model and publish it to every serving process"""
+    from app.ml.forecasting_service import revenue_forecast_service
+    from app.ml.revenue_forecasting import RevenueForecastingModel
+
+    ctx.report(0, f"Training {model_type} model on {historical_days} days")
+    with get_db_session() as db:
+        model = RevenueForecastingModel(db)
+        result = run_async(cancellable(ctx, model.train_model(historical_days, model_type)), timeout=None)
+    ctx.report(90, "Saving model")
+    revenue_forecast_service.save_trained(model)
+    return result
+
+
+@job_task("leads.bulk_import", exposed=False)
+def bulk_import_leads(
+    ctx: JobContext, upload_path: str, filename: str, options: dict[str, Any], total_rows: int
+) -> dict[str, Any]:
+    """Import a spooled lead upload, reporting progress per chunk"""
+    from app.services.lead_import_service import ImportOptions, lead_import_service
+
+    def progress(result):
+        ctx.report(
+            result.processed / total_rows * 100 if total_rows else 0,
+            f"Processed {result.processed} of {total_rows} rows",
+        )
+
+    try:
+        data = Path(upload_path).read_bytes()
+        result = lead_import_service.run_tracked_import(
+            data, filename, ImportOptions(**options), total_rows, on_progress=progress
+        )
+    finally:
+        Path(upload_path).unlink(missing_ok=True)
+    return result.to_dict()
+
+
+@job_task("calls.process", max_retries=2, retry_backoff=15, exposed=False)
+def process_call(ctx: JobContext, call_id: str) -> dict[str, Any]:
+    """Transcribe and analyze a call end to end"""
+    from app.services.call_transcription import CallTranscriptionService
+
+    ctx.report(0, f"Processing call {call_id}")
+    with get_db_session() as db:
+        result = run_async(
+            cancellable(ctx, CallTranscriptionService(db).process_call_end_to_end(call_id)), timeout=None
+        )
+    if not result.get("success", True):
+        raise RuntimeError(result.get("error") or f"Processing call {call_id} failed")
+    return result
+
+
+@job_task("reviews.refresh", max_retries=3, retry_backoff=30)
+def refresh_reviews(ctx: JobContext) -> dict[str, Any]:
+    """Re-fetch reviews from every configured platform, bypassing the cache"""
+    from app.services.reviews_service import reviews_service
+
+    ctx.report(0, "Fetching reviews from all platforms")
+    success, result, error = reviews_service.fetch_all_reviews(refresh=True, should_stop=ctx.cancel_requested)
+    ctx.check_cancelled()
+    if not success:
+        raise RuntimeError(error or "Failed to fetch reviews")
+    return result
+
@@ -79,11 +79,12 @@ class BusinessMetricsService:
             self._supabase = get_supabase_client()
         return self._supabase
 
-    @cache_result(ttl=300, key_prefix="metrics")
+    @cache_result(ttl=300, key_prefix="metrics", l1_ttl=60, stale_ttl=300)
     def get_premium_market_metrics(self, days: int = 30) -> Dict[str, Any]:
         """
         Calculate premium market penetration metrics.
-        Cached for 5min (standard analytics).
+        Cached for 5min (standard analytics), 60s in-process (L1);
+        served stale for up to 5min more while one worker refreshes it.
 
         Args:
             days: Number of days to analyze
@@ -169,7 +170,7 @@ class BusinessMetricsService:
             logger.error(f"Error calculating segment metrics: {str(e)}")
             return {}
 
-    @cache_result(ttl=30, key_prefix="metrics")
+    @cache_result(ttl=30, key_prefix="metrics", single_flight=True)
     def get_lead_response_metrics(self) -> Dict[str, Any]:
         """
         Calculate lead response time metrics (2-minute target).
@@ -228,7 +229,7 @@ class BusinessMetricsService:
             logger.error(f"Error calculating lead response metrics: {str(e)}")
             return {}
 
-    @cache_result(ttl=3600, key_prefix="metrics")
+    @cache_result(ttl=3600, key_prefix="metrics", stale_ttl=3600)
     def get_marketing_channel_roi(self, days: int = 30) -> Dict[str, Any]:
         """
         Calculate ROI for each marketing channel.
@@ -315,11 +316,12 @@ class BusinessMetricsService:
             logger.error(f"Error calculating marketing ROI: {str(e)}")
             return {}
 
-    @cache_result(ttl=300, key_prefix="metrics")
+    @cache_result(ttl=300, key_prefix="metrics", l1_ttl=60, stale_ttl=300)
     def get_conversion_optimization_metrics(self) -> Dict[str, Any]:
         """
         Calculate conversion optimization metrics (25-35% target).
-        Cached for 5min (standard analytics).
+        Cached for 5min (standard analytics), 60s in-process (L1);
+        served stale for up to 5min more while one worker refreshes it.
 
         Returns:
             Conversion funnel and optimization data
@@ -432,11 +434,12 @@ class BusinessMetricsService:
 
         return opportunities
 
-    @cache_result(ttl=300, key_prefix="metrics")
+    @cache_result(ttl=300, key_prefix="metrics", l1_ttl=60, stale_ttl=300)
     def get_revenue_growth_progress(self) -> Dict[str, Any]:
         """
         Track progress toward revenue growth goals ($6M → $30M).
-        Cached for 5min (standard analytics).
+        Cached for 5min (standard analytics), 60s in-process (L1);
+        served stale for up to 5min more while one worker refreshes it.
 
         Returns:
             Revenue growth tracking data
@@ -23,6 +23,12 @@ from app.utils.cache import cache_result
 logger = logging.getLogger(__name__)
 
 
+def _customer_cache_tags(self, customer, *args, **kwargs) -> list[str]:
+    """Cache tags for per-customer results (customer may be an ORM object or a dict)."""
+    customer_id = customer.get("id") if isinstance(customer, dict) else getattr(customer, "id", None)
+    return ["customers", f"customer:{customer_id}"]
+
+
 class CustomerService:
     """Service for customer business logic and lifecycle management."""
 
@@ -367,7 +373,7 @@ class CustomerService:
 
         return min(score, 100)
 
-    @cache_result(ttl=3600, key_prefix="customers")
+    @cache_result(ttl=3600, key_prefix="customers", tags=_customer_cache_tags)
     def get_customer_insights(
         self, customer: Customer, interactions: list[dict], projects: list[dict]
     ) -> dict[str, Any]:
@@ -271,7 +271,8 @@ class EmailService:
 
         Args:
             recipients: List of recipient dictionaries with email and optional personalization
-            subject: Email subject
+                (substitutions and custom_args); SendGrid accepts up to 1,000 per request
+            subject: Email subject (can include substitution tags)
             html_content: HTML content (can include substitution tags)
             plain_content: Plain text content
             from_email: Sender email
@@ -322,9 +323,16 @@ class EmailService:
                 for category in categories[:10]:
                     message.add_category(category)
 
+            # Mail settings
+            if self.sandbox_mode:
+                message.mail_settings = MailSettings(sandbox_mode=SandBoxMode(enable=True))
+
             # Send email
             response = self.client.send(message)
 
+            if hasattr(response, "headers") and "X-Message-Id" in response.headers:
+                results["message_id"] = response.headers["X-Message-Id"]
+
             if response.status_code in [200, 202]:
                 results["sent"] = len(recipients)
                 results["success"] = True
@@ -41,6 +41,9 @@ from app.utils.pusher_client import get_pusher_service
 
 logger = logging.getLogger(__name__)
 
+# Rows per page when reading forecast history (at or below PostgREST's max-rows)
+FORECAST_PAGE_SIZE = 1000
+
 
 @dataclass
 class RoofingBenchmarks:
@@ -1021,36 +1024,44 @@ class EnhancedAnalyticsService:
             end_date = datetime.utcnow()
             start_date = end_date - timedelta(days=730)  # 24 months
 
-            # Collect monthly revenue data
-            monthly_data = []
-            current_date = start_date
-
-            while current_date < end_date:
-                month_end = current_date + timedelta(days=30)
-
-                projects = (
+            # Fetch the whole window once (paged, since PostgREST caps rows per
+            # response without an error) and bucket it into 30-day periods
+            rows = []
+            while True:
+                page = (
                     self.supabase.table("projects")
-                    .select("final_amount", "completion_date")
+                    .select("id", "final_amount", "completion_date")
                     .eq("status", "completed")
-                    .gte("completion_date", current_date.isoformat())
-                    .lt("completion_date", month_end.isoformat())
+                    .gte("completion_date", start_date.isoformat())
+                    .lt("completion_date", end_date.isoformat())
+                    .order("completion_date")
+                    .order("id")
+                    .range(len(rows), len(rows) + FORECAST_PAGE_SIZE - 1)
                     .execute()
                 )
+                rows.extend(page.data or [])
+                if len(page.data or []) < FORECAST_PAGE_SIZE:
+                    break
 
-                month_revenue = sum(
-                    float(p.get("final_amount", 0))
-                    for p in (projects.data if projects.data else [])
-                )
-
-                monthly_data.append(
-                    {
-                        "date": current_date,
-                        "revenue": month_revenue,
-                        "month": current_date.month,
-                    }
-                )
-
-                current_date = month_end
+            period_starts = []
+            current_date = start_date
+            while current_date < end_date:
+                period_starts.append(current_date)
+                current_date += timedelta(days=30)
+
+            period_revenue = [0.0] * len(period_starts)
+            for p in rows:
+                completed_at = datetime.fromisoformat(
+                    str(p["completion_date"]).replace("Z", "+00:00")
+                ).replace(tzinfo=None)
+                period = (completed_at - start_date).days // 30
+                if 0 <= period < len(period_starts):
+                    period_revenue[period] += float(p.get("final_amount") or 0)
+
+            monthly_data = [
+                {"date": period_start, "revenue": revenue, "month": period_start.month}
+                for period_start, revenue in zip(period_starts, period_revenue)
+            ]
 
             if len(monthly_data) < 6:
                 return {"error": "Insufficient historical data for enhanced forecasting"}
@@ -0,0 +1,223 @@
+"""
+iSwitch Roofs CRM - Lead Alert Escalation Scheduler
+Version: 1.0.0
+
+Fires lead alert escalations when their response deadline passes, from one
+scheduler thread per process instead of one sleeping thread per alert.
+
+Pending escalations live in a delay queue ordered by due time:
+
+- Redis (when connected): a sorted set scored by due time, with each entry's
+  payload in a hash. Pending escalations survive worker restarts and any
+  process running a scheduler can fire them; a due entry is claimed with
+  ZREM, so each escalation fires in exactly one process.
+- Otherwise: a heap in process memory.
+
+Scheduling and cancelling are O(log n). The scheduler thread claims up to
+``batch_size`` due entries at a time and runs the handler for them on a
+small thread pool.
+"""
+
+import heapq
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from app.utils.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+# Seconds between delay queue polls when nothing is due
+ESCALATION_POLL_INTERVAL = float(os.getenv("ESCALATION_POLL_INTERVAL", 1.0))
+
+# Due escalations claimed per poll
+ESCALATION_BATCH_SIZE = int(os.getenv("ESCALATION_BATCH_SIZE", 50))
+
+# Escalations fired concurrently within a batch
+ESCALATION_WORKERS = int(os.getenv("ESCALATION_WORKERS", 4))
+
+
+class InMemoryDelayQueue:
+    """Process-local delay queue used when Redis is unavailable"""
+
+    def __init__(self):
+        self._heap: list[tuple[float, int, str]] = []
+        # key -> (due_at, sequence, payload); heap entries not matching are stale
+        self._entries: dict[str, tuple[float, int, dict[str, Any]]] = {}
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def schedule(self, key: str, due_at: float, payload: dict[str, Any]):
+        with self._lock:
+            seq = next(self._counter)
+            self._entries[key] = (due_at, seq, payload)
+            heapq.heappush(self._heap, (due_at, seq, key))
+
+    def cancel(self, key: str) -> bool:
+        # The heap entry is skipped when it surfaces
+        with self._lock:
+            return self._entries.pop(key, None) is not None
+
+    def claim_due(self, limit: int) -> list[tuple[str, dict[str, Any]]]:
+        now = time.time()
+        claimed = []
+        with self._lock:
+            while self._heap and len(claimed) < limit and self._heap[0][0] <= now:
+                due_at, seq, key = heapq.heappop(self._heap)
+                entry = self._entries.get(key)
+                if entry is None or entry[1] != seq:
+                    continue
+                del self._entries[key]
+                claimed.append((key, entry[2]))
+        return claimed
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class RedisDelayQueue:
+    """Delay queue shared by every process through Redis"""
+
+    QUEUE_KEY = "crm:escalations:queue"
+    PAYLOAD_KEY = "crm:escalations:payload"
+
+    def __init__(self, client=None):
+        self.client = client or redis_client
+
+    def schedule(self, key: str, due_at: float, payload: dict[str, Any]):
+        self.client.hset(self.PAYLOAD_KEY, key, json.dumps(payload, default=str))
+        self.client.zadd(self.QUEUE_KEY, {key: due_at})
+
+    def cancel(self, key: str) -> bool:
+        removed = bool(self.client.zrem(self.QUEUE_KEY, key))
+        self.client.hdel(self.PAYLOAD_KEY, key)
+        return removed
+
+    def claim_due(self, limit: int) -> list[tuple[str, dict[str, Any]]]:
+        claimed = []
+        for key in self.client.zrangebyscore(self.QUEUE_KEY, "-inf", time.time(), start=0, num=limit):
+            # Only the process whose ZREM removes the entry fires it
+            if not self.client.zrem(self.QUEUE_KEY, key):
+                continue
+            raw = self.client.hget(self.PAYLOAD_KEY, key)
+            self.client.hdel(self.PAYLOAD_KEY, key)
+            claimed.append((key, json.loads(raw) if raw else {}))
+        return claimed
+
+    def pending(self) -> int:
+        return self.client.hlen(self.PAYLOAD_KEY)
+
+
+def default_delay_queue():
+    """Redis-backed delay queue when Redis is connected, otherwise process memory"""
+    return RedisDelayQueue() if redis_client.is_connected else InMemoryDelayQueue()
+
+
+class EscalationScheduler:
+    """Runs a handler for each scheduled entry once its due time has passed"""
+
+    def __init__(
+        self,
+        handler: Callable[[str, dict[str, Any]], Any],
+        queue=None,
+        poll_interval: float = ESCALATION_POLL_INTERVAL,
+        batch_size: int = ESCALATION_BATCH_SIZE,
+        max_workers: int = ESCALATION_WORKERS,
+    ):
+        """
+        Args:
+            handler: Called as handler(key, payload) for each due entry
+            queue: Delay queue (defaults to Redis when connected, else in-memory)
+            poll_interval: Seconds between polls when nothing is due
+            batch_size: Due entries claimed per poll
+            max_workers: Handlers run concurrently within a batch
+        """
+        self.handler = handler
+        self.queue = queue or default_delay_queue()
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self._thread: threading.Thread | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._pid: int | None = None
+        self._stopping = threading.Event()
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+
+    def schedule(self, key: str, delay: float, payload: dict[str, Any] | None = None):
+        """Run the handler for key after delay seconds, replacing any pending entry for it"""
+        self.queue.schedule(key, time.time() + delay, payload or {})
+        self.start()
+        self._wake.set()
+
+    def cancel(self, key: str) -> bool:
+        """Drop the pending entry for key; returns whether one was pending"""
+        return self.queue.cancel(key)
+
+    def pending(self) -> int:
+        return self.queue.pending()
+
+    def start(self):
+        """Start the scheduler thread (once per process)"""
+        if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+                return
+            self._stopping.clear()
+            self._pid = os.getpid()
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="escalation-worker"
+            )
+            self._thread = threading.Thread(target=self._run, name="escalation-scheduler", daemon=True)
+            self._thread.start()
+            logger.info(f"Started escalation scheduler (pid {self._pid})")
+
+    def shutdown(self, wait: bool = True):
+        """Stop the scheduler thread; pending entries stay queued"""
+        if self._thread is None or self._pid != os.getpid():
+            return
+        self._stopping.set()
+        self._wake.set()
+        self._thread.join(timeout=5)
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+        self._thread = self._executor = None
+
+    def run_due(self) -> int:
+        """Claim one batch of due entries and run their handlers; returns the batch size"""
+        batch = self.queue.claim_due(self.batch_size)
+        if not batch:
+            return 0
+        executor = self._executor
+        if executor is None:
+            for key, payload in batch:
+                self._fire(key, payload)
+        else:
+            list(executor.map(lambda entry: self._fire(*entry), batch))
+        return len(batch)
+
+    def _fire(self, key: str, payload: dict[str, Any]):
+        try:
+            self.handler(key, payload)
+        except Exception as e:
+            logger.error(f"Escalation handler failed for {key}: {str(e)}", exc_info=True)
+
+    def _run(self):
+        while not self._stopping.is_set():
+            try:
+                fired = self.run_due()
+            except Exception as e:
+                logger.error(f"Failed to claim due escalations: {str(e)}")
+                fired = 0
+            if fired < self.batch_size:
+                # A full batch means more may be due; otherwise wait for the next poll or a new entry
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
@@ -11,18 +11,72 @@ This service orchestrates data collection from multiple sources:
 """
 
 import logging
-from typing import Dict, List, Any, Optional
+import os
+import re
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
+from sqlalchemy import event, or_
 from sqlalchemy.orm import Session
 from dataclasses import dataclass
 import asyncio
 import json
+import time
 
 from app.models.lead_sqlalchemy import Lead, LeadSourceEnum, LeadStatusEnum, LeadTemperatureEnum
 from app.database import get_db
+from app.services.job_queue import job_queue
+from app.utils.bloom_filter import RedisBloomFilter
+from app.utils.redis_client import redis_client
 
 logger = logging.getLogger(__name__)
 
+# Optional Redis Bloom prefilter of known lead addresses/phones/emails.
+# Candidates whose keys are all absent from the filter are only checked
+# against leads written since the filter was built (leads inserted through
+# Supabase never reach the filter), instead of the whole table.
+BLOOM_PREFILTER_ENABLED = os.getenv("PIPELINE_BLOOM_PREFILTER", "false").lower() == "true"
+BLOOM_REBUILD_INTERVAL = int(os.getenv("PIPELINE_BLOOM_REBUILD_INTERVAL", 21600))  # 6 hours
+
+# Slack subtracted from the filter's build time to allow for app/database clock skew
+BLOOM_CLOCK_SKEW = 300
+
+# Minimum seconds between queued background rebuilds
+BLOOM_REBUILD_REQUEST_TTL = 600
+
+known_lead_keys = RedisBloomFilter(
+    "crm:bloom:lead_keys",
+    capacity=int(os.getenv("PIPELINE_BLOOM_CAPACITY", 1_000_000)),
+    error_rate=0.01
+)
+
+
+def _normalize_address(address: Optional[str]) -> str:
+    """Lowercase, whitespace-collapsed street address"""
+    return " ".join((address or "").lower().split())
+
+
+def _normalize_phone(phone: Optional[str]) -> str:
+    """Digits only, without a leading US country code"""
+    digits = re.sub(r"\D", "", phone or "")
+    return digits[1:] if len(digits) == 11 and digits.startswith("1") else digits
+
+
+def _normalize_email(email: Optional[str]) -> str:
+    """Lowercase, trimmed email"""
+    return (email or "").strip().lower()
+
+
+def _lead_key_tokens(address: Optional[str], phone: Optional[str], email: Optional[str]) -> List[str]:
+    """Normalized identity tokens for the Bloom prefilter"""
+    tokens = []
+    if _normalize_address(address):
+        tokens.append(f"address:{_normalize_address(address)}")
+    if _normalize_phone(phone):
+        tokens.append(f"phone:{_normalize_phone(phone)}")
+    if _normalize_email(email):
+        tokens.append(f"email:{_normalize_email(email)}")
+    return tokens
+
 
 @dataclass
 class LeadScore:
@@ -53,6 +107,24 @@ class DataPipelineService:
     Orchestrates the entire data pipeline for lead discovery
     """
 
+    # Independent I/O-bound collection stages: (stage key, method, data sources)
+    COLLECTION_STAGES = [
+        ("property_discovery", "_discover_properties",
+         ["property_assessor", "building_permits"]),
+        ("storm_detection", "_detect_storm_damage",
+         ["noaa_storms", "weather_underground", "insurance_claims"]),
+        ("social_monitoring", "_monitor_social_media",
+         ["facebook_groups", "nextdoor", "twitter"]),
+        ("market_intelligence", "_gather_market_intelligence",
+         ["competitor_sites", "review_platforms", "real_estate_listings"]),
+    ]
+
+    # Default timeout for each collection stage (seconds)
+    DEFAULT_STAGE_TIMEOUT = 120
+
+    # Candidate leads resolved per existence query
+    DEDUPE_CHUNK_SIZE = 500
+
     def __init__(self, db: Session):
         self.db = db
         self.data_sources = self._initialize_data_sources()
@@ -157,18 +229,32 @@ class DataPipelineService:
             )
         }
 
-    async def run_pipeline(self, filters: Optional[Dict] = None) -> Dict[str, Any]:
+    async def run_pipeline(
+        self,
+        filters: Optional[Dict] = None,
+        concurrent: bool = True,
+        stage_timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
         """
         Execute the complete data pipeline
 
+        Collection stages (1-4) are independent, so by default they run
+        concurrently and the pipeline takes as long as the slowest one. A
+        stage that fails or times out contributes no leads; the rest of the
+        pipeline still runs and the result status becomes "partial".
+
         Args:
             filters: Optional filters for geographic area, date range, etc.
+            concurrent: Run collection stages concurrently (False = one after another)
+            stage_timeout: Per-stage timeout in seconds (default: DEFAULT_STAGE_TIMEOUT)
 
         Returns:
-            Pipeline execution results with lead count and statistics
+            Pipeline execution results with lead count, statistics and
+            per-stage status/timings in results["stages"]
         """
         logger.info("Starting data pipeline execution")
         start_time = datetime.utcnow()
+        started = time.perf_counter()
 
         # Default filters for Southeast Michigan premium markets
         if not filters:
@@ -187,58 +273,66 @@ class DataPipelineService:
         results = {
             "pipeline_start": start_time.isoformat(),
             "filters": filters,
+            "execution_mode": "concurrent" if concurrent else "sequential",
             "stages": {}
         }
 
-        try:
-            # Stage 1: Property Discovery
-            logger.info("Stage 1: Property Discovery")
-            property_leads = await self._discover_properties(filters)
-            results["stages"]["property_discovery"] = {
-                "leads_found": len(property_leads),
-                "sources": ["property_assessor", "building_permits"]
-            }
-
-            # Stage 2: Storm Damage Detection
-            logger.info("Stage 2: Storm Damage Detection")
-            storm_leads = await self._detect_storm_damage(filters)
-            results["stages"]["storm_detection"] = {
-                "leads_found": len(storm_leads),
-                "sources": ["noaa_storms", "weather_underground", "insurance_claims"]
-            }
-
-            # Stage 3: Social Media Monitoring
-            logger.info("Stage 3: Social Media Monitoring")
-            social_leads = await self._monitor_social_media(filters)
-            results["stages"]["social_monitoring"] = {
-                "leads_found": len(social_leads),
-                "sources": ["facebook_groups", "nextdoor", "twitter"]
-            }
+        timeout = stage_timeout or self.DEFAULT_STAGE_TIMEOUT
 
-            # Stage 4: Market Intelligence
-            logger.info("Stage 4: Market Intelligence")
-            market_leads = await self._gather_market_intelligence(filters)
-            results["stages"]["market_intelligence"] = {
-                "leads_found": len(market_leads),
-                "sources": ["competitor_sites", "review_platforms", "real_estate_listings"]
-            }
+        try:
+            # Stages 1-4: Property Discovery, Storm Damage Detection,
+            # Social Media Monitoring, Market Intelligence
+            stage_runs = [
+                self._run_collection_stage(name, method, sources, filters, timeout)
+                for name, method, sources in self.COLLECTION_STAGES
+            ]
+
+            if concurrent:
+                outcomes = await asyncio.gather(*stage_runs)
+            else:
+                outcomes = [await stage_run for stage_run in stage_runs]
+
+            all_raw_leads = []
+            for (name, _, _), (leads, stage) in zip(self.COLLECTION_STAGES, outcomes):
+                results["stages"][name] = stage
+                all_raw_leads.extend(leads)
+
+            failed_stages = [
+                name for name, _, _ in self.COLLECTION_STAGES
+                if results["stages"][name]["status"] != "success"
+            ]
+            results["collection_seconds"] = round(time.perf_counter() - started, 3)
 
             # Stage 5: Lead Enrichment & Scoring
             logger.info("Stage 5: Lead Enrichment & Scoring")
-            all_raw_leads = property_leads + storm_leads + social_leads + market_leads
+            stage_started = time.perf_counter()
             enriched_leads = await self._enrich_and_score_leads(all_raw_leads, filters)
+            results["stages"]["enrichment"] = {
+                "leads_out": len(enriched_leads),
+                "duration_seconds": round(time.perf_counter() - stage_started, 3)
+            }
 
             # Stage 6: Deduplication & Validation
             logger.info("Stage 6: Deduplication & Validation")
+            stage_started = time.perf_counter()
             validated_leads = await self._deduplicate_and_validate(enriched_leads)
+            results["stages"]["deduplication"] = {
+                "leads_out": len(validated_leads),
+                "duration_seconds": round(time.perf_counter() - stage_started, 3)
+            }
 
             # Stage 7: Lead Ingestion
             logger.info("Stage 7: Lead Ingestion")
+            stage_started = time.perf_counter()
             ingested_count = await self._ingest_leads(validated_leads)
+            results["stages"]["ingestion"] = {
+                "leads_out": ingested_count,
+                "duration_seconds": round(time.perf_counter() - stage_started, 3)
+            }
 
             # Calculate final statistics
             end_time = datetime.utcnow()
-            duration = (end_time - start_time).total_seconds()
+            duration = time.perf_counter() - started
 
             results["pipeline_end"] = end_time.isoformat()
             results["duration_seconds"] = duration
@@ -250,7 +344,8 @@ class DataPipelineService:
                 (len(enriched_leads) - len(validated_leads)) / len(enriched_leads) * 100
                 if enriched_leads else 0
             )
-            results["status"] = "success"
+            results["failed_stages"] = failed_stages
+            results["status"] = "partial" if failed_stages else "success"
 
             logger.info(f"Pipeline completed: {ingested_count} leads ingested in {duration:.2f}s")
 
@@ -261,6 +356,47 @@ class DataPipelineService:
 
         return results
 
+    async def _run_collection_stage(
+        self,
+        stage_name: str,
+        method_name: str,
+        sources: List[str],
+        filters: Dict,
+        timeout: float
+    ) -> Tuple[List[Dict], Dict[str, Any]]:
+        """
+        Run one collection stage with a timeout, isolating its failures
+
+        Args:
+            stage_name: Key for results["stages"]
+            method_name: Stage coroutine method
+            sources: Data sources the stage reads from
+            filters: Pipeline filters
+            timeout: Timeout in seconds
+
+        Returns:
+            (leads, stage_result) - leads is empty if the stage failed
+        """
+        logger.info(f"Collection stage: {stage_name}")
+        stage_started = time.perf_counter()
+        stage = {"leads_found": 0, "sources": sources, "status": "success"}
+        leads: List[Dict] = []
+
+        try:
+            leads = await asyncio.wait_for(getattr(self, method_name)(filters), timeout=timeout)
+            stage["leads_found"] = len(leads)
+        except asyncio.TimeoutError:
+            logger.warning(f"Stage {stage_name} timed out after {timeout}s")
+            stage["status"] = "timeout"
+            stage["error"] = f"Timed out after {timeout}s"
+        except Exception as e:
+            logger.error(f"Stage {stage_name} failed: {str(e)}")
+            stage["status"] = "failed"
+            stage["error"] = str(e)
+
+        stage["duration_seconds"] = round(time.perf_counter() - stage_started, 3)
+        return leads, stage
+
     async def _discover_properties(self, filters: Dict) -> List[Dict]:
         """
         Stage 1: Discover properties from public databases
@@ -697,7 +833,10 @@ class DataPipelineService:
         seen_phones = set()
         seen_emails = set()
 
-        for lead in leads:
+        # Resolve database existence for the whole batch up front
+        exists_in_db = await self._find_existing_leads(leads)
+
+        for lead, already_exists in zip(leads, exists_in_db):
             # Create deduplication key
             address_key = f"{lead.get('address', '')}{lead.get('zip', '')}".lower().strip()
             phone_key = lead.get("phone", "").replace("-", "").replace(" ", "").strip()
@@ -723,7 +862,7 @@ class DataPipelineService:
                 continue
 
             # Check if lead already exists in database
-            if await self._lead_exists_in_db(lead):
+            if already_exists:
                 logger.debug(f"Lead already in database: {address_key}")
                 continue
 
@@ -748,42 +887,184 @@ class DataPipelineService:
 
     async def _lead_exists_in_db(self, lead: Dict) -> bool:
         """Check if lead already exists in database"""
-        try:
-            # Check by address
-            address = lead.get("address")
-            if address:
-                existing = self.db.query(Lead).filter(
-                    Lead.address == address,
-                    Lead.is_deleted == False
-                ).first()
-                if existing:
-                    return True
-
-            # Check by phone
-            phone = lead.get("phone")
-            if phone:
-                existing = self.db.query(Lead).filter(
-                    Lead.phone == phone,
-                    Lead.is_deleted == False
-                ).first()
-                if existing:
-                    return True
-
-            # Check by email
-            email = lead.get("email")
-            if email:
-                existing = self.db.query(Lead).filter(
-                    Lead.email == email,
-                    Lead.is_deleted == False
-                ).first()
-                if existing:
-                    return True
+        return (await self._find_existing_leads([lead]))[0]
 
-            return False
+    async def _find_existing_leads(self, leads: List[Dict]) -> List[bool]:
+        """
+        Batched existence check by address, phone or email
+
+        Candidates are resolved with one ``IN (...)`` query per chunk
+        instead of up to three queries per lead. With the optional Bloom
+        prefilter, candidates the filter has never seen are only matched
+        against leads written since the filter was built.
+
+        Args:
+            leads: Candidate leads
+
+        Returns:
+            Existence flags aligned with ``leads``
+        """
+        exists = [False] * len(leads)
+        to_check = [i for i, lead in enumerate(leads) if _lead_key_tokens(
+            lead.get("address"), lead.get("phone"), lead.get("email")
+        )]
+
+        checks = [(to_check, None)]
+        if to_check and BLOOM_PREFILTER_ENABLED:
+            maybe_known, unseen, built_at = await asyncio.to_thread(self._bloom_prefilter, leads, to_check)
+            checks = [(maybe_known, None), (unseen, built_at)]
+
+        for indexes, changed_since in checks:
+            for start in range(0, len(indexes), self.DEDUPE_CHUNK_SIZE):
+                chunk = indexes[start:start + self.DEDUPE_CHUNK_SIZE]
+                try:
+                    found = await asyncio.to_thread(
+                        self._query_existing_keys, [leads[i] for i in chunk], changed_since
+                    )
+                except Exception as e:
+                    logger.error(f"Error checking for existing leads: {str(e)}")
+                    continue
+
+                for i in chunk:
+                    lead = leads[i]
+                    exists[i] = bool(
+                        (_normalize_address(lead.get("address")) in found["address"])
+                        or (_normalize_phone(lead.get("phone")) in found["phone"])
+                        or (_normalize_email(lead.get("email")) in found["email"])
+                    )
+
+        return exists
+
+    def _query_existing_keys(
+        self, leads: List[Dict], changed_since: Optional[datetime] = None
+    ) -> Dict[str, set]:
+        """
+        Fetch normalized keys of stored leads matching any candidate key
+
+        Args:
+            leads: One chunk of candidate leads
+            changed_since: Only match leads created or updated at or after this time
+
+        Returns:
+            Sets of normalized addresses, phones and emails already stored
+        """
+        addresses, phones, emails = set(), set(), set()
+        for lead in leads:
+            # Match the stored value as entered or in normalized form
+            if lead.get("address"):
+                addresses.update({lead["address"].strip(), _normalize_address(lead["address"])})
+            if lead.get("phone"):
+                phones.update({lead["phone"].strip(), _normalize_phone(lead["phone"])})
+            if lead.get("email"):
+                emails.update({lead["email"].strip(), _normalize_email(lead["email"])})
+
+        conditions = []
+        if addresses:
+            conditions.append(Lead.street_address.in_(addresses - {""}))
+        if phones:
+            conditions.append(Lead.phone.in_(phones - {""}))
+        if emails:
+            conditions.append(Lead.email.in_(emails - {""}))
+
+        found = {"address": set(), "phone": set(), "email": set()}
+        if not conditions:
+            return found
+
+        filters = [Lead.is_deleted == False, or_(*conditions)]
+        if changed_since is not None:
+            filters.append(or_(Lead.created_at >= changed_since, Lead.updated_at >= changed_since))
+
+        rows = self.db.query(Lead.street_address, Lead.phone, Lead.email).filter(*filters).all()
+
+        for address, phone, email in rows:
+            found["address"].add(_normalize_address(address))
+            found["phone"].add(_normalize_phone(phone))
+            found["email"].add(_normalize_email(email))
+        found["address"].discard("")
+        found["phone"].discard("")
+        found["email"].discard("")
+
+        return found
+
+    def _bloom_prefilter(
+        self, leads: List[Dict], indexes: List[int]
+    ) -> Tuple[List[int], List[int], Optional[datetime]]:
+        """
+        Split candidates into possibly known and never seen by the filter
+
+        The filter only holds leads present when it was built (plus ORM
+        writes since), so "never seen" still has to be confirmed against
+        leads written after the build; that check scans only recent rows.
+        A missing or expired filter is rebuilt in the background and every
+        candidate gets the full database check meanwhile.
+
+        Args:
+            leads: Candidate leads
+            indexes: Positions in ``leads`` still to check
+
+        Returns:
+            (positions that may already exist, positions the filter has
+            never seen, time from which the latter must be re-checked)
+        """
+        built_at = known_lead_keys.built_at()
+        if built_at is None:
+            request_known_leads_rebuild()
+            return indexes, [], None
+
+        tokens = [
+            _lead_key_tokens(leads[i].get("address"), leads[i].get("phone"), leads[i].get("email"))
+            for i in indexes
+        ]
+        flags = iter(known_lead_keys.might_contain_many(t for group in tokens for t in group))
+
+        maybe_known, unseen = [], []
+        for i, group in zip(indexes, tokens):
+            hits = [next(flags) for _ in group]
+            (maybe_known if any(hits) else unseen).append(i)
+
+        logger.info(
+            f"Bloom prefilter: {len(unseen)} of {len(indexes)} candidates "
+            f"only need checking against recently written leads"
+        )
+        changed_since = datetime.utcfromtimestamp(built_at) - timedelta(seconds=BLOOM_CLOCK_SKEW)
+        return maybe_known, unseen, changed_since
+
+    def rebuild_known_leads_filter(self) -> int:
+        """
+        Rebuild the Bloom filter from every stored lead
+
+        The new filter is built beside the live one and swapped in
+        atomically; if another worker is already rebuilding, this returns
+        without doing anything.
+
+        Returns:
+            Number of leads loaded (0 if Redis is unavailable, another
+            rebuild is running or the build failed)
+        """
+        if not redis_client.is_connected:
+            return 0
+
+        loaded = 0
+
+        def tokens():
+            nonlocal loaded
+            rows = self.db.query(Lead.street_address, Lead.phone, Lead.email).filter(
+                Lead.is_deleted == False
+            ).yield_per(5000)
+            for address, phone, email in rows:
+                loaded += 1
+                yield from _lead_key_tokens(address, phone, email)
+
+        try:
+            if known_lead_keys.rebuild(tokens(), BLOOM_REBUILD_INTERVAL) is None:
+                logger.info("Known-lead Bloom filter rebuild already in progress")
+                return 0
+            logger.info(f"Rebuilt known-lead Bloom filter from {loaded} leads")
+            return loaded
 
         except Exception as e:
-            logger.error(f"Error checking for existing lead: {str(e)}")
-            return False
+            logger.error(f"Failed to rebuild known-lead Bloom filter: {str(e)}")
+            return 0
 
     def _validate_lead(self, lead: Dict) -> bool:
         """Validate lead has minimum required information"""
@@ -816,6 +1097,10 @@ class DataPipelineService:
         """
         Stage 7: Ingest validated leads into CRM database
         """
+        return await asyncio.to_thread(self._ingest_leads_sync, validated_leads)
+
+    def _ingest_leads_sync(self, validated_leads: List[Dict]) -> int:
+        """Blocking body of _ingest_leads; runs in a worker thread."""
         ingested_count = 0
 
         for lead_data in validated_leads:
@@ -826,7 +1111,7 @@ class DataPipelineService:
                     last_name=self._extract_last_name(lead_data.get("owner_name", "")),
                     email=lead_data.get("email"),
                     phone=lead_data.get("phone"),
-                    address=lead_data.get("address"),
+                    street_address=lead_data.get("address"),
                     city=lead_data.get("city"),
                     state=lead_data.get("state", "MI"),
                     zip_code=lead_data.get("zip"),
@@ -931,3 +1216,36 @@ _pipeline_service: Optional[DataPipelineService] = None
 def get_pipeline_service(db: Session) -> DataPipelineService:
     """Get or create pipeline service instance"""
     return DataPipelineService(db)
+
+
+def request_known_leads_rebuild() -> bool:
+    """
+    Queue a background rebuild of the known-lead Bloom filter
+
+    At most one request is queued per BLOOM_REBUILD_REQUEST_TTL, so a cold
+    filter does not flood the job queue.
+
+    Returns:
+        True if a rebuild job was queued
+    """
+    if not redis_client.is_connected:
+        return False
+    if not redis_client.set(
+        f"{known_lead_keys.key}:rebuild-requested", "1", ex=BLOOM_REBUILD_REQUEST_TTL, nx=True
+    ):
+        return False
+    try:
+        job_queue.enqueue("data_pipeline.rebuild_known_leads")
+        return True
+    except Exception as e:
+        logger.error(f"Failed to queue known-lead Bloom filter rebuild: {str(e)}")
+        return False
+
+
+if BLOOM_PREFILTER_ENABLED:
+    @event.listens_for(Lead, "after_insert")
+    @event.listens_for(Lead, "after_update")
+    def _track_known_lead(mapper, connection, target):
+        """Keep the prefilter current for leads written through any ORM path"""
+        if known_lead_keys.is_ready():
+            known_lead_keys.add_many(_lead_key_tokens(target.street_address, target.phone, target.email))
@@ -172,6 +172,10 @@ class LiveDataCollector:
         Returns:
             Ingestion results
         """
+        return await asyncio.to_thread(self._ingest_leads_to_database, leads)
+
+    def _ingest_leads_to_database(self, leads: List[Dict]) -> Dict:
+        """Blocking body of ingest_leads_to_database; runs in a worker thread."""
         ingested = 0
         skipped = 0
         errors = []
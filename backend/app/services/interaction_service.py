@@ -16,6 +16,7 @@ from app.models.interaction_schemas import (
     # InteractionStatus,  # TODO: This enum doesn't exist in the model - needs to be added
     InteractionUpdate,
 )
+from app.ml.feature_store import lead_feature_store
 from app.services.notification import notification_service
 from app.utils.supabase_client import get_supabase_client
 
@@ -80,6 +81,9 @@ class InteractionService:
                     interaction.get("customer_id"), interaction["id"]
                 )
 
+                # Keep the lead's NBA features current
+                lead_feature_store.record_interaction(interaction)
+
                 # Handle follow-up if specified
                 if interaction.get("follow_up_required") and interaction.get("follow_up_date"):
                     self._schedule_follow_up(interaction)
@@ -0,0 +1,647 @@
+"""
+iSwitch Roofs CRM - Background Job Queue
+Version: 1.0.0
+
+Runs long operations (pipeline runs, model training, bulk imports, call
+processing, review refreshes) outside the request that started them.
+
+Endpoints enqueue a registered task and return its job id immediately;
+clients poll GET /api/jobs/<job_id> for status and progress and fetch the
+return value from GET /api/jobs/<job_id>/result.
+
+Job records and the queue live in Redis when it is connected, so any
+process can enqueue, poll or work jobs. Without Redis an in-memory store
+stands in and jobs run on threads in the enqueuing process.
+
+- The queue is a sorted set scored by the time a job may next run. A worker
+  claims a due job by adding it to a second sorted set of leases (ZADD NX,
+  so exactly one worker wins) scored by when the lease expires, then
+  removing it from the queue.
+- The claiming process renews the leases of its running jobs every third of
+  JOB_LEASE_TIMEOUT. Every dispatcher also sweeps expired leases: a job
+  whose worker died is treated as a failed attempt and re-queued (or
+  failed) by its retry policy instead of staying "running" forever.
+- Workers are a thread pool in the web processes (forking a process pool
+  from gevent/gunicorn workers is unsafe) and a process pool in the
+  standalone worker (app.scripts.run_job_worker). A dispatcher thread only
+  claims as many jobs as there are free workers.
+- Failed attempts are retried up to the task's max_retries with exponential
+  backoff, by re-queueing the job with a later score.
+- Tasks receive a JobContext first and call ``ctx.report(progress, message)``
+  to publish progress. Cancelling a running job sets a flag that report()
+  and check_cancelled() turn into JobCancelled, so running jobs stop at
+  their next checkpoint; queued jobs are cancelled immediately.
+
+Tasks are registered with @job_task in app.services.background_tasks.
+"""
+
+import importlib
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any
+from uuid import uuid4
+
+from app.utils.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+# How long job records and results are kept (seconds)
+JOB_TTL = int(os.getenv("JOB_TTL", 86400))
+
+# Concurrent jobs per worker process pool
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", 2))
+
+# Start workers in the process that enqueues (disable when running app.scripts.run_job_worker).
+# Embedded workers run on threads unless JOB_WORKER_EXECUTOR says otherwise.
+JOB_EMBEDDED_WORKERS = os.getenv("JOB_EMBEDDED_WORKERS", "true").lower() == "true"
+
+# Seconds a claimed job stays leased without renewal before another worker may requeue it
+JOB_LEASE_TIMEOUT = float(os.getenv("JOB_LEASE_TIMEOUT", 60))
+
+# Seconds between queue polls when nothing is due
+JOB_POLL_INTERVAL = 0.25
+
+# Upper bound on the delay before a retry (seconds)
+MAX_RETRY_BACKOFF = 300
+
+
+class JobStatus:
+    QUEUED = "queued"
+    RUNNING = "running"
+    RETRYING = "retrying"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    FINISHED = (SUCCEEDED, FAILED, CANCELLED)
+
+
+class JobCancelled(Exception):
+    """Raised inside a task when its job has been cancelled"""
+
+
+@dataclass
+class Job:
+    """One queued unit of work and its latest state"""
+
+    job_id: str
+    task: str
+    task_path: str
+    args: list[Any] = field(default_factory=list)
+    kwargs: dict[str, Any] = field(default_factory=dict)
+    status: str = JobStatus.QUEUED
+    progress: float = 0.0
+    message: str | None = None
+    attempts: int = 0
+    max_retries: int = 0
+    retry_backoff: float = 5.0
+    result: Any = None
+    error: str | None = None
+    created_by: str | None = None
+    created_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    started_at: str | None = None
+    finished_at: str | None = None
+    run_at: float = field(default_factory=time.time)
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Job":
+        return cls(**data)
+
+
+@dataclass
+class TaskSpec:
+    """A function that can be run as a job, and its retry policy"""
+
+    name: str
+    path: str
+    max_retries: int = 0
+    retry_backoff: float = 5.0
+    exposed: bool = True
+
+
+# Registered tasks by name
+TASKS: dict[str, TaskSpec] = {}
+
+
+def job_task(name: str, max_retries: int = 0, retry_backoff: float = 5.0, exposed: bool = True):
+    """
+    Register a module-level function as a job task.
+
+    Args:
+        name: Task name used to enqueue it
+        max_retries: Extra attempts after a failure
+        retry_backoff: Delay before the first retry; doubles on each further retry
+        exposed: Whether POST /api/jobs may enqueue it directly
+    """
+
+    def decorator(fn: Callable) -> Callable:
+        TASKS[name] = TaskSpec(
+            name=name,
+            path=f"{fn.__module__}:{fn.__qualname__}",
+            max_retries=max_retries,
+            retry_backoff=retry_backoff,
+            exposed=exposed,
+        )
+        return fn
+
+    return decorator
+
+
+def get_task(name: str) -> TaskSpec | None:
+    """Look up a registered task, loading the built-in task module first"""
+    importlib.import_module("app.services.background_tasks")
+    return TASKS.get(name)
+
+
+# ----------------------------------------------------------------------
+# Stores
+# ----------------------------------------------------------------------
+
+
+class InMemoryJobStore:
+    """Process-local job store used when Redis is unavailable"""
+
+    def __init__(self):
+        self._jobs: dict[str, str] = {}
+        self._queue: dict[str, float] = {}
+        self._cancelled: set[str] = set()
+        self._lock = threading.Lock()
+
+    def save(self, job: Job):
+        with self._lock:
+            self._jobs[job.job_id] = json.dumps(job.to_dict(), default=str)
+
+    def get(self, job_id: str) -> Job | None:
+        with self._lock:
+            raw = self._jobs.get(job_id)
+        return Job.from_dict(json.loads(raw)) if raw else None
+
+    def push(self, job: Job):
+        with self._lock:
+            self._queue[job.job_id] = job.run_at
+
+    def claim(self, lease_timeout: float = JOB_LEASE_TIMEOUT) -> str | None:
+        now = time.time()
+        with self._lock:
+            due = [(run_at, job_id) for job_id, run_at in self._queue.items() if run_at <= now]
+            if not due:
+                return None
+            _, job_id = min(due)
+            del self._queue[job_id]
+            return job_id
+
+    # Jobs run in the process that holds this store and die with it, so
+    # there is nothing for a lease to recover
+
+    def renew(self, job_ids: list[str], lease_timeout: float = JOB_LEASE_TIMEOUT):
+        pass
+
+    def release(self, job_id: str) -> bool:
+        return True
+
+    def reclaim_expired(self) -> list[str]:
+        return []
+
+    def remove(self, job_id: str) -> bool:
+        with self._lock:
+            return self._queue.pop(job_id, None) is not None
+
+    def request_cancel(self, job_id: str):
+        with self._lock:
+            self._cancelled.add(job_id)
+
+    def cancel_requested(self, job_id: str) -> bool:
+        with self._lock:
+            return job_id in self._cancelled
+
+
+class RedisJobStore:
+    """Job store shared by every process through Redis"""
+
+    QUEUE_KEY = "crm:jobs:queue"
+    LEASE_KEY = "crm:jobs:leases"
+
+    def __init__(self, client=None):
+        self.client = client or redis_client
+
+    @staticmethod
+    def _job_key(job_id: str) -> str:
+        return f"crm:jobs:{job_id}"
+
+    @staticmethod
+    def _cancel_key(job_id: str) -> str:
+        return f"crm:jobs:{job_id}:cancel"
+
+    def save(self, job: Job):
+        self.client.setex(self._job_key(job.job_id), JOB_TTL, json.dumps(job.to_dict(), default=str))
+
+    def get(self, job_id: str) -> Job | None:
+        raw = self.client.get(self._job_key(job_id))
+        return Job.from_dict(json.loads(raw)) if raw else None
+
+    def push(self, job: Job):
+        self.client.zadd(self.QUEUE_KEY, {job.job_id: job.run_at})
+
+    def claim(self, lease_timeout: float = JOB_LEASE_TIMEOUT) -> str | None:
+        now = time.time()
+        for job_id in self.client.zrangebyscore(self.QUEUE_KEY, "-inf", now, start=0, num=10):
+            # Only the worker whose ZADD NX creates the lease owns the job. The
+            # lease is taken first so a crash before the ZREM leaves the job
+            # leased (and later reclaimed) rather than lost.
+            if self.client.zadd(self.LEASE_KEY, {job_id: now + lease_timeout}, nx=True):
+                self.client.zrem(self.QUEUE_KEY, job_id)
+                return job_id
+        return None
+
+    def renew(self, job_ids: list[str], lease_timeout: float = JOB_LEASE_TIMEOUT):
+        """Extend the leases of running jobs (leases already reclaimed stay gone)"""
+        if job_ids:
+            expires = time.time() + lease_timeout
+            self.client.zadd(self.LEASE_KEY, {job_id: expires for job_id in job_ids}, xx=True)
+
+    def release(self, job_id: str) -> bool:
+        """Drop a job's lease; False if it had expired and been reclaimed"""
+        return bool(self.client.zrem(self.LEASE_KEY, job_id))
+
+    def reclaim_expired(self) -> list[str]:
+        """Take the jobs whose leases expired; each is returned to exactly one caller"""
+        expired = self.client.zrangebyscore(self.LEASE_KEY, "-inf", time.time(), start=0, num=50)
+        return [job_id for job_id in expired if self.client.zrem(self.LEASE_KEY, job_id)]
+
+    def remove(self, job_id: str) -> bool:
+        return bool(self.client.zrem(self.QUEUE_KEY, job_id))
+
+    def request_cancel(self, job_id: str):
+        self.client.setex(self._cancel_key(job_id), JOB_TTL, "1")
+
+    def cancel_requested(self, job_id: str) -> bool:
+        return bool(self.client.exists(self._cancel_key(job_id)))
+
+
+def default_store():
+    """Redis-backed store when Redis is connected, otherwise process memory"""
+    return RedisJobStore() if redis_client.is_connected else InMemoryJobStore()
+
+
+# ----------------------------------------------------------------------
+# Running tasks
+# ----------------------------------------------------------------------
+
+
+class JobContext:
+    """Handle passed to a running task for progress reporting and cancellation"""
+
+    def __init__(self, store, job_id: str):
+        self.store = store
+        self.job_id = job_id
+
+    def cancel_requested(self) -> bool:
+        """Whether the job has been cancelled (for code that cannot raise JobCancelled)"""
+        return self.store.cancel_requested(self.job_id)
+
+    def check_cancelled(self):
+        """Raise JobCancelled if the job has been cancelled"""
+        if self.cancel_requested():
+            raise JobCancelled(f"Job {self.job_id} was cancelled")
+
+    def report(self, progress: float, message: str | None = None):
+        """
+        Publish progress (0-100) and an optional status message.
+
+        Raises:
+            JobCancelled: If the job has been cancelled
+        """
+        self.check_cancelled()
+        job = self.store.get(self.job_id)
+        if job is None:
+            return
+        job.progress = round(min(max(float(progress), 0.0), 100.0), 1)
+        if message is not None:
+            job.message = message
+        self.store.save(job)
+
+
+def execute_job(job_id: str, task_path: str, args: list, kwargs: dict, store=None) -> Any:
+    """
+    Run one attempt of a job.
+
+    Runs in a worker process (or thread), so the task is imported by path
+    and a process-local store is used unless one is passed in.
+    """
+    module_name, _, attr = task_path.partition(":")
+    fn = getattr(importlib.import_module(module_name), attr)
+    ctx = JobContext(store or default_store(), job_id)
+    ctx.check_cancelled()
+    return fn(ctx, *args, **kwargs)
+
+
+class JobQueue:
+    """Enqueue, track and work background jobs"""
+
+    def __init__(
+        self,
+        store=None,
+        max_workers: int = JOB_WORKERS,
+        executor: str | None = None,
+        poll_interval: float = JOB_POLL_INTERVAL,
+        embedded_workers: bool = JOB_EMBEDDED_WORKERS,
+        lease_timeout: float = JOB_LEASE_TIMEOUT,
+    ):
+        """
+        Args:
+            store: Job store (defaults to Redis when connected, else in-memory)
+            max_workers: Jobs run concurrently by this process
+            executor: "process" or "thread"; in-memory stores always use threads.
+                Defaults to JOB_WORKER_EXECUTOR, else threads for embedded
+                workers and processes otherwise
+            poll_interval: Seconds between queue polls when nothing is due
+            embedded_workers: Start workers on first enqueue
+            lease_timeout: Seconds a claimed job may go without a lease renewal
+        """
+        self.store = store or default_store()
+        self.max_workers = max_workers
+        if isinstance(self.store, InMemoryJobStore):
+            self.executor_kind = "thread"
+        else:
+            self.executor_kind = (
+                executor or os.getenv("JOB_WORKER_EXECUTOR") or ("thread" if embedded_workers else "process")
+            )
+        self.poll_interval = poll_interval
+        self.embedded_workers = embedded_workers
+        self.lease_timeout = lease_timeout
+        self._executor = None
+        self._dispatcher: threading.Thread | None = None
+        self._pid: int | None = None
+        self._stopping = threading.Event()
+        self._slots = threading.Semaphore(max_workers)
+        self._lock = threading.Lock()
+        self._leased: set[str] = set()
+        self._lease_lock = threading.Lock()
+        self._next_lease_check = 0.0
+
+    # ------------------------------------------------------------------
+    # Client API
+    # ------------------------------------------------------------------
+
+    def enqueue(self, task: str, *args, created_by: str | None = None, **kwargs) -> Job:
+        """
+        Queue a registered task and return its job.
+
+        Args and kwargs must be JSON-serializable; they are stored with the job.
+
+        Raises:
+            ValueError: If the task is not registered
+        """
+        spec = get_task(task)
+        if spec is None:
+            raise ValueError(f"Unknown job task: {task}")
+
+        job = Job(
+            job_id=str(uuid4()),
+            task=spec.name,
+            task_path=spec.path,
+            args=list(args),
+            kwargs=kwargs,
+            max_retries=spec.max_retries,
+            retry_backoff=spec.retry_backoff,
+            created_by=created_by,
+        )
+        self.store.save(job)
+        self.store.push(job)
+        logger.info(f"Queued job {job.job_id} ({task})")
+
+        if self.embedded_workers:
+            self.start()
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        return self.store.get(job_id)
+
+    def status(self, job_id: str) -> dict[str, Any] | None:
+        """Public view of a job (without its arguments or result), or None if unknown"""
+        job = self.store.get(job_id)
+        if job is None:
+            return None
+        data = job.to_dict()
+        for private in ("args", "kwargs", "task_path", "result", "run_at"):
+            data.pop(private)
+        if job.status == JobStatus.RETRYING:
+            data["next_attempt_at"] = datetime.utcfromtimestamp(job.run_at).isoformat()
+        data["cancel_requested"] = job.status not in JobStatus.FINISHED and self.store.cancel_requested(job_id)
+        return data
+
+    def cancel(self, job_id: str) -> dict[str, Any] | None:
+        """
+        Cancel a job.
+
+        Queued and retry-waiting jobs are cancelled at once; running jobs stop
+        at their next checkpoint (progress report or check_cancelled()).
+        Finished jobs are left unchanged.
+        """
+        job = self.store.get(job_id)
+        if job is None:
+            return None
+        if job.status not in JobStatus.FINISHED:
+            self.store.request_cancel(job_id)
+            if self.store.remove(job_id):
+                # Still waiting in the queue, so no worker will pick it up
+                self._finish(job, JobStatus.CANCELLED)
+        return self.status(job_id)
+
+    # ------------------------------------------------------------------
+    # Workers
+    # ------------------------------------------------------------------
+
+    def start(self):
+        """Start the dispatcher and worker pool (once per process)"""
+        if self._dispatcher is not None and self._pid == os.getpid() and self._dispatcher.is_alive():
+            return
+        with self._lock:
+            if self._dispatcher is not None and self._pid == os.getpid() and self._dispatcher.is_alive():
+                return
+            self._stopping.clear()
+            self._slots = threading.Semaphore(self.max_workers)
+            self._executor = None
+            self._leased = set()
+            self._next_lease_check = 0.0
+            self._pid = os.getpid()
+            self._dispatcher = threading.Thread(target=self._dispatch, name="job-dispatcher", daemon=True)
+            self._dispatcher.start()
+            logger.info(f"Started job workers ({self.max_workers} x {self.executor_kind}, pid {self._pid})")
+
+    def shutdown(self, wait: bool = True):
+        """Stop claiming jobs and shut the worker pool down"""
+        if self._dispatcher is None or self._pid != os.getpid():
+            return
+        self._stopping.set()
+        if self._executor is not None:
+            # The dispatcher keeps renewing leases while running jobs finish
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+        if not wait:
+            # Abandoned jobs are requeued by another worker once their leases expire
+            with self._lease_lock:
+                self._leased.clear()
+        self._dispatcher.join(timeout=5)
+        self._dispatcher = self._executor = None
+
+    def _get_executor(self):
+        if self._executor is None:
+            if self.executor_kind == "process":
+                try:
+                    self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+                except (OSError, RuntimeError) as e:
+                    logger.warning(f"Process pool unavailable ({e}); running jobs on threads")
+                    self.executor_kind = "thread"
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="job-worker")
+        return self._executor
+
+    def _dispatch(self):
+        while not self._stopping.is_set():
+            self._maintain_leases()
+            if not self._slots.acquire(timeout=self.poll_interval):
+                continue
+            job_id = None
+            try:
+                job_id = self.store.claim(self.lease_timeout)
+            except Exception as e:
+                logger.error(f"Failed to claim job: {str(e)}")
+            if job_id is None:
+                self._slots.release()
+                self._stopping.wait(self.poll_interval)
+                continue
+            with self._lease_lock:
+                self._leased.add(job_id)
+            try:
+                self._run(job_id)
+            except Exception as e:
+                # Left leased: the sweep requeues it once the lease expires
+                logger.error(f"Failed to start job {job_id}: {str(e)}", exc_info=True)
+                with self._lease_lock:
+                    self._leased.discard(job_id)
+                self._slots.release()
+
+        # Keep the leases of running jobs alive until they finish
+        while self._leased:
+            self._maintain_leases()
+            time.sleep(self.poll_interval)
+
+    def _maintain_leases(self):
+        """Renew this process's leases and requeue jobs whose workers stopped renewing theirs"""
+        now = time.time()
+        if now < self._next_lease_check:
+            return
+        self._next_lease_check = now + self.lease_timeout / 3
+        try:
+            with self._lease_lock:
+                leased = list(self._leased)
+            self.store.renew(leased, self.lease_timeout)
+            for job_id in self.store.reclaim_expired():
+                self._requeue_lost(job_id)
+        except Exception as e:
+            logger.error(f"Failed to maintain job leases: {str(e)}", exc_info=True)
+
+    def _requeue_lost(self, job_id: str):
+        job = self.store.get(job_id)
+        if job is None or job.status in JobStatus.FINISHED:
+            return
+        if job.status != JobStatus.RUNNING:
+            # Claimed but never started; nothing ran, so put it straight back
+            self.store.push(job)
+            return
+        job.error = "LeaseExpired: worker stopped before the job finished"
+        self._retry_or_fail(job)
+
+    def _release(self, job_id: str) -> bool:
+        with self._lease_lock:
+            self._leased.discard(job_id)
+        return self.store.release(job_id)
+
+    def _run(self, job_id: str):
+        job = self.store.get(job_id)
+        if job is None or job.status in JobStatus.FINISHED:
+            # Record expired while queued, or a stale entry for a finished job
+            self._release(job_id)
+            self._slots.release()
+            return
+        if self.store.cancel_requested(job_id):
+            self._release(job_id)
+            self._finish(job, JobStatus.CANCELLED)
+            self._slots.release()
+            return
+
+        job.status = JobStatus.RUNNING
+        job.attempts += 1
+        job.started_at = datetime.utcnow().isoformat()
+        self.store.save(job)
+
+        in_process_store = self.store if self.executor_kind == "thread" else None
+        future = self._get_executor().submit(
+            execute_job, job_id, job.task_path, job.args, job.kwargs, in_process_store
+        )
+        future.add_done_callback(lambda f: self._complete(job_id, f))
+
+    def _complete(self, job_id: str, future: Future):
+        try:
+            if not self._release(job_id):
+                # The lease expired and the sweep already requeued or failed the job
+                logger.warning(f"Job {job_id} finished after losing its lease; outcome discarded")
+                return
+            # Re-read to keep the progress the task reported
+            job = self.store.get(job_id)
+            if job is None:
+                return
+            try:
+                result = future.result()
+            except JobCancelled:
+                self._finish(job, JobStatus.CANCELLED)
+            except Exception as e:
+                if isinstance(e, BrokenProcessPool):
+                    self._executor = None
+                job.error = f"{type(e).__name__}: {e}"
+                self._retry_or_fail(job)
+            else:
+                job.result = result
+                job.error = None
+                job.progress = 100.0
+                self._finish(job, JobStatus.SUCCEEDED)
+        except Exception as e:
+            logger.error(f"Failed to record outcome of job {job_id}: {str(e)}", exc_info=True)
+        finally:
+            self._slots.release()
+
+    def _retry_or_fail(self, job: Job):
+        """Re-queue a failed attempt with backoff, or fail the job once retries run out"""
+        if job.attempts <= job.max_retries and not self.store.cancel_requested(job.job_id):
+            delay = min(job.retry_backoff * 2 ** (job.attempts - 1), MAX_RETRY_BACKOFF)
+            job.status = JobStatus.RETRYING
+            job.run_at = time.time() + delay
+            self.store.save(job)
+            self.store.push(job)
+            logger.warning(
+                f"Job {job.job_id} ({job.task}) attempt {job.attempts} failed, retrying in {delay:.0f}s: {job.error}"
+            )
+        else:
+            logger.error(f"Job {job.job_id} ({job.task}) failed after {job.attempts} attempts: {job.error}")
+            self._finish(job, JobStatus.FAILED)
+
+    def _finish(self, job: Job, status: str):
+        job.status = status
+        job.finished_at = datetime.utcnow().isoformat()
+        self.store.save(job)
+        logger.info(f"Job {job.job_id} ({job.task}) {status}")
+
+
+# Create singleton instance
+job_queue = JobQueue()
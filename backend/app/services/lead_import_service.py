@@ -0,0 +1,510 @@
+"""
+iSwitch Roofs CRM - Lead Import Service
+Version: 1.0.0
+
+Streaming bulk import of leads from CSV/Excel uploads.
+
+The file is processed in chunks of IMPORT_CHUNK_SIZE rows. Each chunk is
+normalized with column-wise pandas operations, checked for duplicates with a
+few ``in_("email", [...])`` lookups (DUPLICATE_LOOKUP_CHUNK_SIZE emails
+each) and written with a single bulk insert, so a 10,000-row file costs ~120
+round trips to Supabase instead of ~20,000.
+
+Large files run as a background job (see app.services.job_queue) whose
+progress is stored in Redis (falling back to process memory) and polled via
+GET /api/leads/bulk-import/<import_id>/status.
+"""
+
+import csv
+import io
+import json
+import logging
+import threading
+from collections.abc import Callable, Iterator
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any
+from uuid import uuid4
+
+import pandas as pd
+
+from app.config import get_supabase_client
+from app.schemas.lead import LeadCreate
+from app.services.lead_scoring import lead_scoring_engine
+from app.utils.pusher_client import get_pusher_service
+from app.utils.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+# Rows per validate/dedupe/insert round
+IMPORT_CHUNK_SIZE = 500
+
+# Uploads above this row count must use the background endpoint
+SYNC_IMPORT_MAX_ROWS = 1000
+
+# How long job progress stays queryable
+IMPORT_STATUS_TTL = 86400
+
+REQUIRED_FIELDS = ["first_name", "last_name", "phone", "source"]
+
+SOURCE_MAPPING = {
+    "website": "website_form",
+    "google": "google_ads",
+    "facebook": "facebook_ads",
+    "referral": "referral",
+}
+
+# Emails per duplicate lookup; in_() filters go in the GET query string, so
+# keep each request well under common URL length limits
+DUPLICATE_LOOKUP_CHUNK_SIZE = 100
+
+# Scoring-only inputs on LeadCreate that are not lead columns
+SCORING_ONLY_FIELDS = {"budget_confirmed", "is_decision_maker"}
+
+# Errors and lead previews kept in the job result (and in the synchronous
+# endpoint's response, which has always listed only the first 10 leads)
+MAX_REPORTED_ERRORS = 10
+MAX_REPORTED_LEADS = 10
+
+
+@dataclass
+class ImportOptions:
+    """Per-upload settings taken from the bulk import form"""
+
+    skip_duplicates: bool = True
+    auto_score: bool = True
+    validate_strict: bool = False
+    field_mapping: dict[str, str] = field(default_factory=dict)
+    max_rows: int = 10000
+    import_id: str = field(default_factory=lambda: str(uuid4()))
+    user: dict[str, Any] | None = None
+
+
+@dataclass
+class ImportResult:
+    """Running totals for one import, also used as the job status payload"""
+
+    import_id: str
+    status: str = "queued"
+    total_rows: int = 0
+    processed: int = 0
+    success: int = 0
+    failed: int = 0
+    duplicates: int = 0
+    chunks_processed: int = 0
+    errors: list[dict[str, Any]] = field(default_factory=list)
+    imported_leads: list[dict[str, Any]] = field(default_factory=list)
+    error: str | None = None
+    started_at: str | None = None
+    finished_at: str | None = None
+
+    def add_error(self, row: int, message: str, data: dict[str, Any] | None = None):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row, "error": message, "data": data})
+
+    def to_dict(self) -> dict[str, Any]:
+        result = asdict(self)
+        result["progress_percentage"] = (
+            round(self.processed / self.total_rows * 100, 1) if self.total_rows else 0.0
+        )
+        return result
+
+
+class LeadImportService:
+    """Chunked lead import shared by the sync and background endpoints"""
+
+    def __init__(self, chunk_size: int = IMPORT_CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self._local_status: dict[str, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # File reading
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def is_supported_file(filename: str) -> bool:
+        return filename.lower().endswith((".csv", ".xlsx", ".xls"))
+
+    @staticmethod
+    def count_rows(data: bytes, filename: str) -> int:
+        """
+        Count data rows without building a DataFrame.
+
+        CSV rows are counted with the C csv reader so quoted newlines are
+        handled; Excel has no streaming reader in pandas, so it is loaded once.
+        """
+        if filename.lower().endswith(".csv"):
+            reader = csv.reader(io.StringIO(data.decode("utf-8-sig", errors="replace")))
+            return max(0, sum(1 for row in reader if row) - 1)
+        return len(pd.read_excel(io.BytesIO(data), dtype=str))
+
+    def read_chunks(
+        self, data: bytes, filename: str, field_mapping: dict[str, str] | None = None
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Yield the upload as DataFrames of at most chunk_size rows.
+
+        All cells are read as strings so ZIP codes and phone numbers keep
+        their leading zeros; pydantic coerces numeric fields on validation.
+
+        Raises:
+            ValueError: If the file cannot be parsed or required columns are missing
+        """
+        try:
+            if filename.lower().endswith(".csv"):
+                chunks = pd.read_csv(io.BytesIO(data), dtype=str, chunksize=self.chunk_size)
+            else:
+                frame = pd.read_excel(io.BytesIO(data), dtype=str)
+                chunks = (
+                    frame.iloc[start : start + self.chunk_size]
+                    for start in range(0, len(frame), self.chunk_size)
+                )
+            first = True
+            for chunk in chunks:
+                chunk = self._prepare_columns(chunk, field_mapping)
+                if first:
+                    missing = [f for f in REQUIRED_FIELDS if f not in chunk.columns]
+                    if missing:
+                        raise MissingFieldsError(missing, list(chunk.columns))
+                    first = False
+                yield chunk
+        except MissingFieldsError:
+            raise
+        except Exception as e:
+            raise ValueError(f"Failed to read file: {str(e)}")
+
+    @staticmethod
+    def _prepare_columns(
+        chunk: pd.DataFrame, field_mapping: dict[str, str] | None
+    ) -> pd.DataFrame:
+        """Apply the custom field mapping and split full_name if needed"""
+        if field_mapping:
+            chunk = chunk.rename(columns=field_mapping)
+
+        if "full_name" in chunk.columns and (
+            "first_name" not in chunk.columns or "last_name" not in chunk.columns
+        ):
+            names = chunk["full_name"].fillna("").str.split(" ", n=1, expand=True)
+            chunk = chunk.assign(
+                first_name=names[0],
+                last_name=names[1].fillna("") if 1 in names.columns else "",
+            )
+        return chunk
+
+    # ------------------------------------------------------------------
+    # Chunk processing
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def normalize_chunk(chunk: pd.DataFrame) -> list[dict[str, Any]]:
+        """
+        Clean a chunk column-wise and return one dict per row without NaNs.
+
+        Phone punctuation is stripped, emails are trimmed and source aliases
+        are mapped onto LeadSource values in one pass per column.
+        """
+        chunk = chunk.copy()
+
+        if "phone" in chunk.columns:
+            chunk["phone"] = chunk["phone"].str.replace(r"[-\s()]", "", regex=True).str[:15]
+
+        if "email" in chunk.columns:
+            chunk["email"] = chunk["email"].str.strip()
+
+        if "source" in chunk.columns:
+            source = chunk["source"].str.lower()
+            chunk["source"] = source.map(SOURCE_MAPPING).fillna(source)
+
+        records = chunk.to_dict("records")
+        return [{k: v for k, v in record.items() if pd.notna(v)} for record in records]
+
+    @staticmethod
+    def find_existing_emails(supabase, emails: list[str]) -> set[str]:
+        """Return the emails that already exist, one query per DUPLICATE_LOOKUP_CHUNK_SIZE emails"""
+        existing = set()
+        for start in range(0, len(emails), DUPLICATE_LOOKUP_CHUNK_SIZE):
+            batch = emails[start : start + DUPLICATE_LOOKUP_CHUNK_SIZE]
+            result = supabase.table("leads").select("email").in_("email", batch).execute()
+            existing.update(row["email"].lower() for row in (result.data or []) if row.get("email"))
+        return existing
+
+    def process_chunk(
+        self,
+        chunk: pd.DataFrame,
+        first_row: int,
+        options: ImportOptions,
+        result: ImportResult,
+        supabase,
+        seen_emails: set[str],
+    ):
+        """
+        Validate, dedupe, score and insert one chunk, updating result in place.
+
+        Args:
+            chunk: Raw rows from read_chunks
+            first_row: Spreadsheet row number of the chunk's first row
+            options: Import settings
+            result: Running totals to update
+            supabase: Supabase client
+            seen_emails: Lower-cased emails already imported earlier in this file
+        """
+        records = self.normalize_chunk(chunk)
+        rows = list(range(first_row, first_row + len(records)))
+
+        if options.skip_duplicates:
+            emails = [r["email"] for r in records if r.get("email")]
+            existing = self.find_existing_emails(supabase, emails) | seen_emails
+            kept = []
+            for row, record in zip(rows, records):
+                email = record.get("email")
+                if email and email.lower() in existing:
+                    result.duplicates += 1
+                    continue
+                if email:
+                    # Later rows repeating this email are in-file duplicates
+                    existing.add(email.lower())
+                    seen_emails.add(email.lower())
+                kept.append((row, record))
+        else:
+            kept = list(zip(rows, records))
+
+        batch: list[tuple[int, dict[str, Any]]] = []
+        for row, record in kept:
+            try:
+                lead = LeadCreate(**record)
+                lead_dict = lead.model_dump(
+                    mode="json", exclude_none=True, exclude=SCORING_ONLY_FIELDS
+                )
+            except Exception as e:
+                if options.validate_strict:
+                    result.add_error(row, str(e), record)
+                    continue
+                # Use partial data
+                lead_dict = {k: v for k, v in record.items() if k not in SCORING_ONLY_FIELDS}
+            batch.append((row, lead_dict))
+
+        if options.auto_score:
+            self._score(batch)
+
+        now = datetime.utcnow().isoformat()
+        for _, lead_dict in batch:
+            lead_dict["id"] = str(uuid4())
+            lead_dict["created_at"] = now
+            lead_dict["updated_at"] = now
+            lead_dict["import_batch_id"] = options.import_id
+            if options.user:
+                lead_dict["created_by"] = options.user.get("id")
+                lead_dict["created_by_email"] = options.user.get("email")
+                lead_dict["updated_by"] = options.user.get("id")
+                lead_dict["updated_by_email"] = options.user.get("email")
+
+        self._insert(batch, result, supabase)
+
+        result.processed += len(records)
+        result.chunks_processed += 1
+
+    @staticmethod
+    def _score(batch: list[tuple[int, dict[str, Any]]]):
+        """Attach lead_score and temperature to every lead in the batch in one pass"""
+        if not batch:
+            return
+        frame = lead_scoring_engine.leads_to_frame(lead for _, lead in batch)
+        scores = lead_scoring_engine.score_batch(frame)
+        for (_, lead_dict), score, temperature in zip(
+            batch, scores["total_score"], scores["temperature"]
+        ):
+            lead_dict["lead_score"] = int(score)
+            lead_dict["temperature"] = temperature
+
+    @staticmethod
+    def _insert(batch: list[tuple[int, dict[str, Any]]], result: ImportResult, supabase):
+        """
+        Insert the batch in one request.
+
+        If the bulk insert is rejected, fall back to row-by-row inserts for
+        this chunk only, so a single bad row is reported against its row
+        number instead of failing its 499 neighbours.
+        """
+        if not batch:
+            return
+
+        try:
+            # Rows carry different optional columns; let absent ones take
+            # their column defaults instead of NULL
+            response = (
+                supabase.table("leads")
+                .insert([lead for _, lead in batch], default_to_null=False)
+                .execute()
+            )
+            inserted = batch if response.data else []
+            if not inserted:
+                for row, lead in batch:
+                    result.add_error(row, "Failed to insert", lead)
+        except Exception as e:
+            logger.warning(f"Bulk insert failed, retrying rows individually: {str(e)}")
+            inserted = []
+            for row, lead in batch:
+                try:
+                    if supabase.table("leads").insert(lead).execute().data:
+                        inserted.append((row, lead))
+                    else:
+                        result.add_error(row, "Failed to insert", lead)
+                except Exception as row_error:
+                    result.add_error(row, str(row_error), lead)
+
+        result.success += len(inserted)
+        for _, lead in inserted[: MAX_REPORTED_LEADS - len(result.imported_leads)]:
+            result.imported_leads.append(
+                {
+                    "id": lead["id"],
+                    "name": f"{lead.get('first_name', '')} {lead.get('last_name', '')}",
+                    "score": lead.get("lead_score"),
+                }
+            )
+
+    # ------------------------------------------------------------------
+    # Running imports
+    # ------------------------------------------------------------------
+
+    def run_import(
+        self,
+        data: bytes,
+        filename: str,
+        options: ImportOptions,
+        total_rows: int | None = None,
+        on_progress: Callable[[ImportResult], None] | None = None,
+    ) -> ImportResult:
+        """
+        Import an upload chunk by chunk.
+
+        Args:
+            data: Raw file bytes
+            filename: Original filename (selects the CSV or Excel reader)
+            options: Import settings
+            total_rows: Row count if already known
+            on_progress: Called with the running result after every chunk
+
+        Returns:
+            ImportResult: Final totals
+
+        Raises:
+            ValueError: If the file cannot be parsed or is missing required columns
+        """
+        result = ImportResult(
+            import_id=options.import_id,
+            status="running",
+            total_rows=total_rows if total_rows is not None else self.count_rows(data, filename),
+            started_at=datetime.utcnow().isoformat(),
+        )
+        supabase = get_supabase_client()
+        seen_emails: set[str] = set()
+
+        first_row = 2  # +2 for header and 0-index
+        for chunk in self.read_chunks(data, filename, options.field_mapping):
+            self.process_chunk(chunk, first_row, options, result, supabase, seen_emails)
+            first_row += len(chunk)
+            if on_progress:
+                on_progress(result)
+
+        result.status = "completed" if result.failed == 0 else "completed_with_errors"
+        result.finished_at = datetime.utcnow().isoformat()
+
+        if result.success > 0:
+            get_pusher_service().trigger(
+                "leads",
+                "bulk-import-complete",
+                {
+                    "import_id": result.import_id,
+                    "success_count": result.success,
+                    "failed_count": result.failed,
+                },
+            )
+
+        logger.info(
+            f"Bulk import {result.import_id} completed: {result.success} success, "
+            f"{result.failed} failed, {result.duplicates} duplicates"
+        )
+        return result
+
+    def mark_queued(self, options: ImportOptions, total_rows: int) -> ImportResult:
+        """Record a not-yet-started import so its status can be polled"""
+        queued = ImportResult(import_id=options.import_id, total_rows=total_rows)
+        self._save_status(queued)
+        return queued
+
+    def run_tracked_import(
+        self,
+        data: bytes,
+        filename: str,
+        options: ImportOptions,
+        total_rows: int,
+        on_progress: Callable[[ImportResult], None] | None = None,
+    ) -> ImportResult:
+        """
+        Run an import, saving its status after every chunk for get_status.
+
+        A failure is recorded as a "failed" status and re-raised.
+        """
+
+        def progress(result: ImportResult):
+            self._save_status(result)
+            if on_progress:
+                on_progress(result)
+
+        try:
+            final = self.run_import(data, filename, options, total_rows, on_progress=progress)
+        except Exception as e:
+            self._save_status(
+                ImportResult(
+                    import_id=options.import_id,
+                    status="failed",
+                    total_rows=total_rows,
+                    error=str(e),
+                    finished_at=datetime.utcnow().isoformat(),
+                )
+            )
+            raise
+        self._save_status(final)
+        return final
+
+    # ------------------------------------------------------------------
+    # Job status
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _status_key(import_id: str) -> str:
+        return f"crm:lead_import:{import_id}"
+
+    def _save_status(self, result: ImportResult):
+        payload = result.to_dict()
+        if redis_client.is_connected:
+            redis_client.setex(
+                self._status_key(result.import_id), IMPORT_STATUS_TTL, json.dumps(payload)
+            )
+            return
+        with self._lock:
+            self._local_status[result.import_id] = payload
+
+    def get_status(self, import_id: str) -> dict[str, Any] | None:
+        """Return the latest progress snapshot for an import, or None if unknown"""
+        if redis_client.is_connected:
+            cached = redis_client.get(self._status_key(import_id))
+            if cached:
+                return json.loads(cached)
+        with self._lock:
+            return self._local_status.get(import_id)
+
+
+class MissingFieldsError(ValueError):
+    """Raised when an upload lacks required lead columns"""
+
+    def __init__(self, missing: list[str], found: list[str]):
+        super().__init__(f"Missing required fields: {', '.join(missing)}")
+        self.missing = missing
+        self.found = found
+
+
+# Create singleton instance
+lead_import_service = LeadImportService()
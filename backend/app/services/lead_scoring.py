@@ -26,9 +26,21 @@ Temperature Classification:
     WARM: 60-79 points (qualified, high priority)
     COOL: 40-59 points (needs nurturing)
     COLD: 0-39 points (low priority/unqualified)
+
+Batch Scoring:
+    score_batch() scores many leads at once from columnar inputs with
+    NumPy bucketing and set-membership lookups. It returns the same points
+    as calculate_score() for every component and is what bulk import and
+    LeadService.rescore_all_leads use.
 """
 
 import logging
+from collections.abc import Iterable, Mapping
+from enum import Enum
+from typing import Any
+
+import numpy as np
+import pandas as pd
 
 # Import SQLAlchemy ORM model
 from app.models.lead_sqlalchemy import Lead
@@ -44,6 +56,25 @@ from app.models.lead_schemas import (
 
 logger = logging.getLogger(__name__)
 
+# Columns read by score_batch (missing columns are treated as unknown)
+SCORE_BATCH_COLUMNS = [
+    "property_value",
+    "zip_code",
+    "source",
+    "status",
+    "urgency",
+    "interaction_count",
+    "response_time_minutes",
+    "budget_range_min",
+    "budget_confirmed",
+    "is_decision_maker",
+]
+
+
+def _enum_value(value: Any) -> Any:
+    """Plain value of an enum member (ORM and schema enums are distinct classes)"""
+    return value.value if isinstance(value, Enum) else value
+
 
 class LeadScoringEngine:
     """
@@ -85,6 +116,45 @@ class LeadScoringEngine:
         "48188",  # Canton, Plymouth
     }
 
+    # Engagement points by source (intent level)
+    _SOURCE_SCORES: dict[LeadSource, int] = {
+        LeadSource.WEBSITE_FORM: 15,  # Highest intent - filled out form
+        LeadSource.PHONE_INQUIRY: 15,  # Direct contact
+        LeadSource.EMAIL_INQUIRY: 14,  # Direct contact
+        LeadSource.REFERRAL: 13,  # Trusted referral
+        LeadSource.GOOGLE_LSA: 12,  # High-intent Google ads
+        LeadSource.GOOGLE_ADS: 12,  # Paid search
+        LeadSource.PARTNER_REFERRAL: 11,  # Professional referral
+        LeadSource.ORGANIC_SEARCH: 10,  # Organic search
+        LeadSource.FACEBOOK_ADS: 9,  # Social media
+        LeadSource.STORM_RESPONSE: 11,  # Urgent need
+        LeadSource.REPEAT_CUSTOMER: 14,  # Previous customer
+        LeadSource.DOOR_TO_DOOR: 6,  # Lowest intent
+    }
+
+    # Statuses that earn the +3 engagement boost
+    _QUALIFIED_STATUSES: set[LeadStatus] = {
+        LeadStatus.QUALIFIED,
+        LeadStatus.APPOINTMENT_SCHEDULED,
+        LeadStatus.INSPECTION_COMPLETED,
+    }
+
+    # BANT need points by urgency
+    _URGENCY_NEED: dict[UrgencyLevel, int] = {
+        UrgencyLevel.IMMEDIATE: 5,  # Urgent need (storm damage, leak)
+        UrgencyLevel.ONE_TO_THREE_MONTHS: 3,  # Near-term need
+        UrgencyLevel.THREE_TO_SIX_MONTHS: 2,  # Planning ahead
+        UrgencyLevel.PLANNING: 1,  # Long-term planning
+    }
+
+    # BANT timeline points by urgency
+    _URGENCY_TIMELINE: dict[UrgencyLevel, int] = {
+        UrgencyLevel.IMMEDIATE: 5,  # Ready to buy now
+        UrgencyLevel.ONE_TO_THREE_MONTHS: 3,  # Near-term buyer
+        UrgencyLevel.THREE_TO_SIX_MONTHS: 1,  # Future buyer
+        UrgencyLevel.PLANNING: 0,  # No immediate timeline
+    }
+
     def calculate_score(
         self,
         lead: Lead,
@@ -233,31 +303,10 @@ class LeadScoringEngine:
         and higher likelihood of conversion.
         """
         # Base score by source (intent level)
-        source_scores = {
-            LeadSource.WEBSITE_FORM: 15,  # Highest intent - filled out form
-            LeadSource.PHONE_INQUIRY: 15,  # Direct contact
-            LeadSource.EMAIL_INQUIRY: 14,  # Direct contact
-            LeadSource.REFERRAL: 13,  # Trusted referral
-            LeadSource.GOOGLE_LSA: 12,  # High-intent Google ads
-            LeadSource.GOOGLE_ADS: 12,  # Paid search
-            LeadSource.PARTNER_REFERRAL: 11,  # Professional referral
-            LeadSource.ORGANIC_SEARCH: 10,  # Organic search
-            LeadSource.FACEBOOK_ADS: 9,  # Social media
-            LeadSource.STORM_RESPONSE: 11,  # Urgent need
-            LeadSource.REPEAT_CUSTOMER: 14,  # Previous customer
-            LeadSource.DOOR_TO_DOOR: 6,  # Lowest intent
-        }
-
-        base_score = source_scores.get(source, 8)
+        base_score = self._SOURCE_SCORES.get(_enum_value(source), 8)
 
         # Boost for qualified status (shows progression)
-        qualified_statuses = {
-            LeadStatus.QUALIFIED,
-            LeadStatus.APPOINTMENT_SCHEDULED,
-            LeadStatus.INSPECTION_COMPLETED,
-        }
-
-        if status in qualified_statuses:
+        if _enum_value(status) in self._QUALIFIED_STATUSES:
             base_score = min(15, base_score + 3)
 
         return base_score
@@ -285,15 +334,15 @@ class LeadScoringEngine:
         else:
             return 1  # Poor response (>24 hours)
 
-    def _score_interactions(self, count: int) -> int:
+    def _score_interactions(self, count: int | None) -> int:
         """
         Score interaction count (0-10 points).
 
         More interactions indicate higher engagement and nurturing effort.
         Industry standard: 16+ touchpoints for conversion.
         """
-        if count == 0:
-            return 0  # No engagement yet
+        if not count:
+            return 0  # No engagement yet (or never recorded)
         elif count >= 10:
             return 10  # Highly engaged (approaching 16-touch standard)
         elif count >= 5:
@@ -330,13 +379,7 @@ class LeadScoringEngine:
 
         Urgency indicates the 'N' (Need) in BANT - how pressing is the need?
         """
-        urgency_map = {
-            UrgencyLevel.IMMEDIATE: 5,  # Urgent need (storm damage, leak)
-            UrgencyLevel.ONE_TO_THREE_MONTHS: 3,  # Near-term need
-            UrgencyLevel.THREE_TO_SIX_MONTHS: 2,  # Planning ahead
-            UrgencyLevel.PLANNING: 1,  # Long-term planning
-        }
-        return urgency_map.get(urgency, 1) if urgency else 1
+        return self._URGENCY_NEED.get(_enum_value(urgency), 1) if urgency else 1
 
     def _score_timeline(self, urgency: UrgencyLevel | None) -> int:
         """
@@ -344,13 +387,7 @@ class LeadScoringEngine:
 
         Timeline is the 'T' in BANT - when do they plan to buy?
         """
-        timeline_map = {
-            UrgencyLevel.IMMEDIATE: 5,  # Ready to buy now
-            UrgencyLevel.ONE_TO_THREE_MONTHS: 3,  # Near-term buyer
-            UrgencyLevel.THREE_TO_SIX_MONTHS: 1,  # Future buyer
-            UrgencyLevel.PLANNING: 0,  # No immediate timeline
-        }
-        return timeline_map.get(urgency, 0) if urgency else 0
+        return self._URGENCY_TIMELINE.get(_enum_value(urgency), 0) if urgency else 0
 
     def _classify_temperature(self, score: int) -> LeadTemperature:
         """
@@ -410,6 +447,166 @@ class LeadScoringEngine:
             response_time_minutes=lead.response_time_minutes,
         )
 
+    # ------------------------------------------------------------------
+    # Batch scoring
+    # ------------------------------------------------------------------
+
+    def score_batch(self, leads: pd.DataFrame | Mapping[str, Any]) -> pd.DataFrame:
+        """
+        Score many leads at once.
+
+        Every component mirrors its scalar counterpart (_score_property_value,
+        _score_location, ...) with np.select bucketing and set-membership
+        lookups, so results match calculate_score() row for row.
+
+        Args:
+            leads: DataFrame or mapping of equal-length arrays with any of
+                   SCORE_BATCH_COLUMNS. Enum members and plain string values
+                   are both accepted; missing columns count as unknown.
+
+        Returns:
+            DataFrame with the LeadScoreBreakdown fields as columns, one row
+            per lead, aligned with the input index. ``temperature`` holds the
+            LeadTemperature string value.
+        """
+        frame = leads if isinstance(leads, pd.DataFrame) else pd.DataFrame(leads)
+        n = len(frame)
+
+        def column(name: str) -> pd.Series:
+            if name in frame.columns:
+                return frame[name]
+            return pd.Series([None] * n, index=frame.index, dtype=object)
+
+        def numeric(name: str) -> np.ndarray:
+            return pd.to_numeric(column(name), errors="coerce").to_numpy(dtype=float)
+
+        def values(name: str) -> pd.Series:
+            return column(name).map(_enum_value)
+
+        def flag(name: str) -> np.ndarray:
+            return column(name).map(lambda v: bool(v) if pd.notna(v) else False).to_numpy(dtype=bool)
+
+        property_value = numeric("property_value")
+        # Scalar rules test "if value:", i.e. present and non-zero
+        has_value = ~np.isnan(property_value) & (property_value != 0)
+
+        zip_codes = column("zip_code")
+        has_zip = zip_codes.notna().to_numpy() & (zip_codes.astype(str) != "").to_numpy()
+        zip5 = zip_codes.astype(str).str[:5]
+        premium_zip = has_zip & zip5.isin(self.PREMIUM_ZIP_CODES).to_numpy()
+        target_zip = has_zip & zip5.isin(self.TARGET_ZIP_CODES).to_numpy()
+
+        # Demographics
+        property_value_pts = np.select(
+            [~has_value, property_value >= 500000, property_value >= 300000, property_value >= 200000],
+            [5, 30, 20, 10],
+            default=5,
+        )
+        location_pts = np.select([premium_zip, target_zip], [10, 7], default=3)
+        income_pts = np.minimum(
+            15,
+            np.select(
+                [has_value & (property_value >= 500000), has_value & (property_value >= 300000)],
+                [10, 5],
+                default=0,
+            )
+            + np.where(premium_zip, 5, 0),
+        )
+        demographics = property_value_pts + location_pts + income_pts
+
+        # Behavioral
+        source_scores = {source.value: pts for source, pts in self._SOURCE_SCORES.items()}
+        engagement_pts = values("source").map(source_scores).fillna(8).to_numpy(dtype=int)
+        qualified = values("status").isin({s.value for s in self._QUALIFIED_STATUSES}).to_numpy()
+        engagement_pts = np.where(qualified, np.minimum(15, engagement_pts + 3), engagement_pts)
+
+        minutes = numeric("response_time_minutes")
+        response_pts = np.select(
+            [np.isnan(minutes), minutes <= 2, minutes <= 5, minutes <= 15, minutes <= 60, minutes <= 1440],
+            [1, 10, 9, 7, 5, 3],
+            default=1,
+        )
+
+        interactions = np.nan_to_num(numeric("interaction_count"), nan=0.0)
+        interaction_pts = np.select(
+            [interactions == 0, interactions >= 10, interactions >= 5, interactions >= 3],
+            [0, 10, 7, 5],
+            default=3,
+        )
+        behavioral = engagement_pts + response_pts + interaction_pts
+
+        # BANT
+        budget_min = numeric("budget_range_min")
+        budget_pts = np.select(
+            [
+                flag("budget_confirmed"),
+                budget_min >= 15000,
+                budget_min >= 8000,
+                has_value & (property_value >= 300000),
+            ],
+            [8, 6, 4, 3],
+            default=0,
+        )
+        authority_pts = np.where(flag("is_decision_maker"), 7, 1)
+        urgency = values("urgency")
+        has_urgency = urgency.notna().to_numpy() & (urgency != "").to_numpy()
+        need_pts = np.where(
+            has_urgency,
+            urgency.map({u.value: pts for u, pts in self._URGENCY_NEED.items()}).fillna(1),
+            1,
+        ).astype(int)
+        timeline_pts = np.where(
+            has_urgency,
+            urgency.map({u.value: pts for u, pts in self._URGENCY_TIMELINE.items()}).fillna(0),
+            0,
+        ).astype(int)
+        bant = np.minimum(10, budget_pts + authority_pts + need_pts + timeline_pts)
+
+        total = np.minimum(100, demographics + behavioral + bant)
+        temperature = np.select(
+            [total >= 80, total >= 60, total >= 40],
+            [LeadTemperature.HOT.value, LeadTemperature.WARM.value, LeadTemperature.COOL.value],
+            default=LeadTemperature.COLD.value,
+        )
+
+        return pd.DataFrame(
+            {
+                "total_score": total,
+                "temperature": temperature,
+                "demographics_score": demographics,
+                "property_value_points": property_value_pts,
+                "location_points": location_pts,
+                "income_estimate_points": income_pts,
+                "behavioral_score": behavioral,
+                "engagement_points": engagement_pts,
+                "response_time_points": response_pts,
+                "interaction_count_points": interaction_pts,
+                "bant_score": bant,
+                "budget_points": budget_pts,
+                "authority_points": authority_pts,
+                "need_points": need_pts,
+                "timeline_points": timeline_pts,
+            },
+            index=frame.index,
+        ).astype({"temperature": object})
+
+    @staticmethod
+    def leads_to_frame(leads: Iterable[Any]) -> pd.DataFrame:
+        """
+        Build a score_batch input frame from Lead objects, rows or dicts.
+
+        Args:
+            leads: Objects exposing SCORE_BATCH_COLUMNS as attributes or keys
+
+        Returns:
+            DataFrame with one row per lead
+        """
+        records = []
+        for lead in leads:
+            getter = lead.get if isinstance(lead, Mapping) else lambda name: getattr(lead, name, None)
+            records.append({name: getter(name) for name in SCORE_BATCH_COLUMNS})
+        return pd.DataFrame(records, columns=SCORE_BATCH_COLUMNS)
+
 
 # Singleton instance for application-wide use
 lead_scoring_engine = LeadScoringEngine()
@@ -8,13 +8,22 @@ Service layer for Lead operations using SQLAlchemy ORM.
 from datetime import datetime
 from typing import Any
 
-from sqlalchemy import asc, desc
+import pandas as pd
+from sqlalchemy import asc, desc, update
 
 from app.database import get_db_session
 from app.models.lead_sqlalchemy import Lead, LeadStatusEnum, LeadTemperatureEnum
 from app.schemas.lead import LeadCreate, LeadListFilters, LeadUpdate
-from app.services.lead_scoring import lead_scoring_engine
-from app.utils.cache import cache_result, cache_invalidate
+from app.services.lead_scoring import SCORE_BATCH_COLUMNS, lead_scoring_engine
+from app.utils.cache import cache_result, invalidate_tags
+from app.utils.pagination import count_total, paginate_keyset, resolve_keyset_sort
+from app.utils.stats_query import StatsQuery
+
+# Non-nullable columns usable as keyset sort keys
+LEAD_KEYSET_SORT_FIELDS = ["created_at", "updated_at", "lead_score"]
+
+# Leads read, scored and written back per rescore_all_leads round
+RESCORE_CHUNK_SIZE = 1000
 
 
 class LeadService:
@@ -64,7 +73,7 @@ class LeadService:
             lead_dict = lead.to_dict()
 
             # Invalidate lead stats cache after creation
-            cache_invalidate("crm:leads:*")
+            invalidate_tags("leads")
 
             return lead_dict
 
@@ -83,54 +92,107 @@ class LeadService:
             return db.query(Lead).filter(Lead.id == lead_id, Lead.is_deleted == False).first()
 
     @staticmethod
-    def get_leads_with_filters(
-        filters: LeadListFilters, page: int = 1, per_page: int = 50, sort: str = "created_at:desc"
-    ) -> tuple[list[Lead], int]:
+    def _filtered_query(db, filters: LeadListFilters):
         """
-        Get leads with filtering, pagination, and sorting.
+        Build the lead list query with filters applied (no sorting).
 
         Args:
+            db: Database session
             filters: Filter parameters
-            page: Page number
-            per_page: Items per page
-            sort: Sort field and direction
 
         Returns:
-            tuple: (leads, total_count)
+            Query: Filtered lead query
         """
-        with get_db_session() as db:
-            query = db.query(Lead).filter(Lead.is_deleted == False)
+        query = db.query(Lead).filter(Lead.is_deleted == False)
+
+        # Apply filters
+        if filters.status:
+            statuses = filters.status.split(",")
+            query = query.filter(Lead.status.in_(statuses))
+
+        if filters.temperature:
+            temps = filters.temperature.split(",")
+            query = query.filter(Lead.temperature.in_(temps))
+
+        if filters.source:
+            sources = filters.source.split(",")
+            query = query.filter(Lead.source.in_(sources))
+
+        if filters.assigned_to:
+            query = query.filter(Lead.assigned_to == filters.assigned_to)
+
+        if filters.created_after:
+            query = query.filter(Lead.created_at >= filters.created_after)
+
+        if filters.min_score is not None:
+            query = query.filter(Lead.lead_score >= filters.min_score)
+
+        if filters.max_score is not None:
+            query = query.filter(Lead.lead_score <= filters.max_score)
+
+        if filters.zip_code:
+            query = query.filter(Lead.zip_code == filters.zip_code)
+
+        if filters.converted is not None:
+            query = query.filter(Lead.converted_to_customer == filters.converted)
+
+        return query
 
-            # Apply filters
-            if filters.status:
-                statuses = filters.status.split(",")
-                query = query.filter(Lead.status.in_(statuses))
+    @staticmethod
+    def get_leads_page(
+        filters: LeadListFilters,
+        cursor: str | None = None,
+        per_page: int = 50,
+        sort: str = "created_at:desc",
+        total_mode: str | None = None,
+    ) -> tuple[list[dict], str | None, int | None, str | None]:
+        """
+        Get one keyset-paginated page of leads.
 
-            if filters.temperature:
-                temps = filters.temperature.split(",")
-                query = query.filter(Lead.temperature.in_(temps))
+        Args:
+            filters: Filter parameters
+            cursor: Cursor from the previous page (None for the first page)
+            per_page: Items per page
+            sort: Sort field and direction (created_at, updated_at or lead_score)
+            total_mode: None, "exact", "estimate" or "cached"
 
-            if filters.source:
-                sources = filters.source.split(",")
-                query = query.filter(Lead.source.in_(sources))
+        Returns:
+            tuple: (leads, next_cursor, total, total_type)
 
-            if filters.assigned_to:
-                query = query.filter(Lead.assigned_to == filters.assigned_to)
+        Raises:
+            ValueError: If the sort or cursor is invalid
+        """
+        sort_column, direction = resolve_keyset_sort(Lead, sort, LEAD_KEYSET_SORT_FIELDS)
 
-            if filters.created_after:
-                query = query.filter(Lead.created_at >= filters.created_after)
+        with get_db_session() as db:
+            query = LeadService._filtered_query(db, filters)
 
-            if filters.min_score is not None:
-                query = query.filter(Lead.lead_score >= filters.min_score)
+            leads, next_cursor = paginate_keyset(
+                query, sort_column, cursor, limit=per_page, direction=direction
+            )
+            total, total_type = count_total(query, total_mode, tag="leads")
 
-            if filters.max_score is not None:
-                query = query.filter(Lead.lead_score <= filters.max_score)
+            # Convert to dictionaries while still in session to avoid detached instance errors
+            return [lead.to_dict() for lead in leads], next_cursor, total, total_type
 
-            if filters.zip_code:
-                query = query.filter(Lead.zip_code == filters.zip_code)
+    @staticmethod
+    def get_leads_with_filters(
+        filters: LeadListFilters, page: int = 1, per_page: int = 50, sort: str = "created_at:desc"
+    ) -> tuple[list[Lead], int]:
+        """
+        Get leads with filtering, pagination, and sorting.
+
+        Args:
+            filters: Filter parameters
+            page: Page number
+            per_page: Items per page
+            sort: Sort field and direction
 
-            if filters.converted is not None:
-                query = query.filter(Lead.converted_to_customer == filters.converted)
+        Returns:
+            tuple: (leads, total_count)
+        """
+        with get_db_session() as db:
+            query = LeadService._filtered_query(db, filters)
 
             # Get total count
             total = query.count()
@@ -200,7 +262,7 @@ class LeadService:
             db.refresh(lead)
 
             # Invalidate lead cache after update
-            cache_invalidate("crm:leads:*")
+            invalidate_tags("leads", f"lead:{lead_id}")
 
             return lead
 
@@ -224,10 +286,12 @@ class LeadService:
             lead.soft_delete()
             db.commit()
 
+            invalidate_tags("leads", f"lead:{lead_id}")
+
             return True
 
     @staticmethod
-    @cache_result(ttl=30, key_prefix="leads")
+    @cache_result(ttl=30, key_prefix="leads", tags=["leads"])
     def get_hot_leads() -> list[Lead]:
         """
         Get all hot leads (score >= 80).
@@ -274,6 +338,8 @@ class LeadService:
             db.commit()
             db.refresh(lead)
 
+            invalidate_tags("leads", f"lead:{lead_id}")
+
             return lead
 
     @staticmethod
@@ -314,81 +380,58 @@ class LeadService:
             db.commit()
             db.refresh(lead)
 
+            invalidate_tags("leads", f"lead:{lead_id}")
+
             return lead
 
     @staticmethod
-    @cache_result(ttl=300, key_prefix="leads")
+    @cache_result(ttl=300, key_prefix="leads", l1_ttl=60, tags=["leads"], stale_ttl=300)
     def get_lead_stats() -> dict[str, Any]:
         """
         Get lead statistics and KPIs.
-        Cached for 5min (standard dashboard data).
+        Cached for 5min (standard dashboard data), 60s in-process (L1);
+        served stale for up to 5min more while one worker refreshes it.
+        All counters come from a single conditional-aggregate scan.
 
         Returns:
             Dict: Lead statistics
         """
-        with get_db_session() as db:
+        stats = (
+            StatsQuery(Lead, Lead.is_deleted == False)
+            .count("total_leads")
             # Temperature counts
-            hot_count = (
-                db.query(Lead)
-                .filter(Lead.is_deleted == False, Lead.temperature == LeadTemperatureEnum.HOT)
-                .count()
-            )
-
-            warm_count = (
-                db.query(Lead)
-                .filter(Lead.is_deleted == False, Lead.temperature == LeadTemperatureEnum.WARM)
-                .count()
-            )
-
-            cool_count = (
-                db.query(Lead)
-                .filter(Lead.is_deleted == False, Lead.temperature == LeadTemperatureEnum.COOL)
-                .count()
-            )
-
-            cold_count = (
-                db.query(Lead)
-                .filter(Lead.is_deleted == False, Lead.temperature == LeadTemperatureEnum.COLD)
-                .count()
-            )
-
+            .count("hot", Lead.temperature == LeadTemperatureEnum.HOT)
+            .count("warm", Lead.temperature == LeadTemperatureEnum.WARM)
+            .count("cool", Lead.temperature == LeadTemperatureEnum.COOL)
+            .count("cold", Lead.temperature == LeadTemperatureEnum.COLD)
             # Status counts
-            new_count = (
-                db.query(Lead)
-                .filter(Lead.is_deleted == False, Lead.status == LeadStatusEnum.NEW)
-                .count()
-            )
-
-            qualified_count = (
-                db.query(Lead)
-                .filter(Lead.is_deleted == False, Lead.status == LeadStatusEnum.QUALIFIED)
-                .count()
-            )
+            .count("new", Lead.status == LeadStatusEnum.NEW)
+            .count("qualified", Lead.status == LeadStatusEnum.QUALIFIED)
+            # Conversion
+            .count("converted_count", Lead.converted_to_customer == True)
+        )
 
-            # Total and conversion metrics
-            total_leads = db.query(Lead).filter(Lead.is_deleted == False).count()
-            converted_count = (
-                db.query(Lead)
-                .filter(Lead.is_deleted == False, Lead.converted_to_customer == True)
-                .count()
-            )
-
-            conversion_rate = (converted_count / total_leads * 100) if total_leads > 0 else 0
-
-            return {
-                "total_leads": total_leads,
-                "by_temperature": {
-                    "hot": hot_count,
-                    "warm": warm_count,
-                    "cool": cool_count,
-                    "cold": cold_count,
-                },
-                "by_status": {"new": new_count, "qualified": qualified_count},
-                "conversion": {
-                    "converted_count": converted_count,
-                    "conversion_rate": round(conversion_rate, 2),
-                },
-            }
+        with get_db_session() as db:
+            counts = stats.run(db)
+
+        total_leads = counts["total_leads"]
+        converted_count = counts["converted_count"]
+        conversion_rate = (converted_count / total_leads * 100) if total_leads > 0 else 0
+
+        return {
+            "total_leads": total_leads,
+            "by_temperature": {
+                "hot": counts["hot"],
+                "warm": counts["warm"],
+                "cool": counts["cool"],
+                "cold": counts["cold"],
+            },
+            "by_status": {"new": counts["new"], "qualified": counts["qualified"]},
+            "conversion": {
+                "converted_count": converted_count,
+                "conversion_rate": round(conversion_rate, 2),
+            },
+        }
 
     @staticmethod
     def recalculate_lead_score(lead_id: str, **kwargs) -> tuple[Lead, dict[str, Any]] | None:
@@ -433,6 +476,72 @@ class LeadService:
 
             return lead, score_breakdown.model_dump()
 
+    @staticmethod
+    def rescore_all_leads(chunk_size: int = RESCORE_CHUNK_SIZE) -> dict[str, int]:
+        """
+        Recompute lead_score and temperature for every active lead.
+
+        Leads are read in id-ordered keyset chunks (scoring columns only),
+        scored with LeadScoringEngine.score_batch, and only rows whose score
+        or temperature changed are written back, with one bulk UPDATE per
+        chunk. Each chunk commits on its own so a long run never holds a
+        transaction open.
+
+        Args:
+            chunk_size: Leads per read/score/write round
+
+        Returns:
+            dict: {"scanned": leads read, "updated": leads whose score changed}
+        """
+        columns = [getattr(Lead, name) for name in SCORE_BATCH_COLUMNS if hasattr(Lead, name)]
+        scanned = updated = 0
+        last_id = None
+
+        while True:
+            with get_db_session() as db:
+                query = db.query(Lead.id, Lead.lead_score, Lead.temperature, *columns).filter(
+                    Lead.is_deleted == False
+                )
+                if last_id is not None:
+                    query = query.filter(Lead.id > last_id)
+                rows = query.order_by(Lead.id).limit(chunk_size).all()
+                if not rows:
+                    break
+
+                frame = pd.DataFrame([row._asdict() for row in rows])
+                scores = lead_scoring_engine.score_batch(frame)
+                current = frame["temperature"].map(lambda t: t.value if t is not None else None)
+                changed = (scores["total_score"] != frame["lead_score"]) | (
+                    scores["temperature"] != current
+                )
+
+                now = datetime.utcnow()
+                changes = [
+                    {
+                        "id": lead_id,
+                        "lead_score": int(score),
+                        "temperature": LeadTemperatureEnum(temperature),
+                        "updated_at": now,
+                    }
+                    for lead_id, score, temperature in zip(
+                        frame.loc[changed, "id"],
+                        scores.loc[changed, "total_score"],
+                        scores.loc[changed, "temperature"],
+                    )
+                ]
+                if changes:
+                    db.execute(update(Lead), changes)
+                    db.commit()
+
+                scanned += len(rows)
+                updated += len(changes)
+                last_id = rows[-1].id
+
+        if updated:
+            invalidate_tags("leads")
+
+        return {"scanned": scanned, "updated": updated}
+
 
 # Create service instance
 lead_service = LeadService()
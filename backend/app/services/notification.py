@@ -7,6 +7,12 @@ Main notification service that orchestrates email, SMS, and real-time notificati
 
 import json
 import logging
+import os
+import socket
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Any
 
@@ -24,6 +30,27 @@ from app.utils.notification_templates import notification_templates
 
 logger = logging.getLogger(__name__)
 
+# IDs per ``in_`` filter when loading recipients and preferences in bulk
+BULK_LOOKUP_CHUNK_SIZE = 500
+
+# Personalizations per SendGrid request (the API limit is 1,000)
+SENDGRID_BATCH_SIZE = 1000
+
+# Events per Pusher batch trigger (the API limit is 10)
+REALTIME_BATCH_SIZE = 10
+
+# Concurrent provider calls for channels sent one message at a time (SMS)
+BULK_SEND_CONCURRENCY = int(os.getenv("NOTIFICATION_BULK_CONCURRENCY", 8))
+
+# Scheduled notifications claimed per batch by one worker
+SCHEDULED_BATCH_SIZE = int(os.getenv("SCHEDULED_NOTIFICATION_BATCH_SIZE", 50))
+
+# Seconds before a claimed but unfinished scheduled notification may be claimed again
+SCHEDULED_CLAIM_LEASE = int(os.getenv("SCHEDULED_NOTIFICATION_LEASE", 300))
+
+# Seconds a worker waits between polls when nothing is due
+SCHEDULED_POLL_INTERVAL = float(os.getenv("SCHEDULED_NOTIFICATION_POLL_INTERVAL", 5))
+
 
 class NotificationService:
     """
@@ -54,6 +81,11 @@ class NotificationService:
             "sms": {"per_minute": 10, "per_hour": 100},
         }
 
+        # Scheduled notification claiming (RPC from migration 010, retried after an interval)
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.claim_rpc_retry_interval = 600
+        self._claim_rpc_disabled_until = 0.0
+
     def send_notification(
         self,
         type: str | NotificationType,
@@ -279,50 +311,311 @@ class NotificationService:
         recipients: list[dict[str, Any]],
         template_data: dict[str, Any],
         channels: list[str] | None = None,
+        priority: str = "normal",
     ) -> dict[str, Any]:
         """
         Send notifications to multiple recipients.
 
+        Recipients and preferences are loaded in one query each and
+        notification rows are inserted and status-updated in bulk. Emails are
+        rendered once per locale/variant group and sent as SendGrid
+        personalizations; SMS messages are sent concurrently.
+
         Args:
             type: Notification type
             recipients: List of recipient dictionaries
             template_data: Base template data
-            channels: Channels to use
+            channels: Channels to use (defaults to each user's preferences)
+            priority: Notification priority
 
         Returns:
-            Dictionary with bulk send results
+            Dictionary with bulk send results, including a per-recipient
+            entry in "results" (in input order)
         """
-        results = {"total": len(recipients), "sent": 0, "failed": 0, "errors": []}
+        results = {
+            "total": len(recipients),
+            "sent": 0,
+            "failed": 0,
+            "scheduled": 0,
+            "errors": [],
+            "results": [],
+        }
+        if not recipients:
+            return results
 
-        for recipient in recipients:
-            try:
+        type_str = type.value if hasattr(type, "value") else str(type)
+        outcomes: list[dict[str, Any]] = []
+        to_send: list[dict[str, Any]] = []
+        to_schedule: list[dict[str, Any]] = []
+
+        try:
+            user_ids = [str(r["id"]) for r in recipients if r.get("id")]
+            users = self._get_recipients_bulk(user_ids)
+            preferences = self._get_user_preferences_bulk(user_ids)
+
+            for recipient_input in recipients:
                 # Merge recipient data with template data
                 data = {**template_data}
-                data.update(recipient)
+                data.update(recipient_input)
+                recipient_id = recipient_input.get("id")
+
+                outcome = {
+                    "recipient_id": recipient_id,
+                    "recipient": recipient_input.get("email") or recipient_input.get("phone"),
+                    "success": False,
+                    "channels": {},
+                    "notification_id": None,
+                }
+                outcomes.append(outcome)
 
-                # Send notification
-                result = self.send_notification(
-                    type=type, data=data, recipient_id=recipient.get("id"), channels=channels
+                user_key = str(recipient_id) if recipient_id else None
+                recipient = self._build_recipient(dict(users.get(user_key) or {}), recipient_id, data)
+                if not recipient:
+                    outcome["error"] = "Recipient not found"
+                    continue
+
+                user_preferences = preferences.get(user_key)
+                try:
+                    entry_channels = channels or self._determine_channels(
+                        type, user_preferences, priority
+                    )
+                except Exception as e:
+                    outcome["error"] = str(e)
+                    continue
+
+                entry = {
+                    "outcome": outcome,
+                    "recipient": recipient,
+                    "data": data,
+                    "channels": entry_channels,
+                }
+
+                if priority not in ["urgent", "high"] and self._is_quiet_hours(user_preferences):
+                    to_schedule.append(entry)
+                else:
+                    to_send.append(entry)
+
+            if to_schedule:
+                self._schedule_notifications_bulk(type_str, to_schedule, priority)
+            if to_send:
+                self._send_bulk_entries(type, type_str, to_send, priority)
+
+        except Exception as e:
+            logger.error(f"Failed to send bulk notifications: {str(e)}")
+            for outcome in outcomes:
+                if not outcome["success"] and "error" not in outcome:
+                    outcome["error"] = str(e)
+
+        # Recipients not reached before a failure are reported as failed
+        for recipient_input in recipients[len(outcomes) :]:
+            outcomes.append(
+                {
+                    "recipient_id": recipient_input.get("id"),
+                    "recipient": recipient_input.get("email") or recipient_input.get("phone"),
+                    "success": False,
+                    "channels": {},
+                    "notification_id": None,
+                    "error": "Not processed",
+                }
+            )
+
+        for outcome in outcomes:
+            if outcome["success"]:
+                results["sent"] += 1
+                if outcome.get("scheduled_id"):
+                    results["scheduled"] += 1
+            else:
+                results["failed"] += 1
+                results["errors"].append(
+                    {
+                        "recipient": outcome["recipient"],
+                        "error": outcome.get("error", "Unknown error"),
+                    }
                 )
+        results["results"] = outcomes
+
+        return results
 
-                if result["success"]:
-                    results["sent"] += 1
+    def _send_bulk_entries(
+        self,
+        type: str | NotificationType,
+        type_str: str,
+        entries: list[dict[str, Any]],
+        priority: str,
+    ):
+        """Save, send and record status for prepared bulk recipients."""
+        notifications = self._save_notifications_bulk(type_str, entries, priority)
+        for entry, notification in zip(entries, notifications):
+            if notification:
+                entry["outcome"]["notification_id"] = notification.get("id")
+
+        by_channel: dict[str, list[dict[str, Any]]] = defaultdict(list)
+        for entry in entries:
+            for channel in entry["channels"]:
+                by_channel[channel].append(entry)
+
+        for channel, channel_entries in by_channel.items():
+            try:
+                if channel == NotificationChannel.EMAIL.value:
+                    self._send_bulk_email(type_str, channel_entries)
+                elif channel == NotificationChannel.IN_APP.value:
+                    self._send_bulk_realtime(type_str, channel_entries)
                 else:
-                    results["failed"] += 1
-                    results["errors"].append(
+                    self._send_bulk_individually(channel, type, channel_entries)
+            except Exception as e:
+                logger.error(f"Failed to send bulk {channel} notifications: {str(e)}")
+                for entry in channel_entries:
+                    entry["outcome"]["channels"].setdefault(
+                        channel, {"success": False, "error": str(e)}
+                    )
+
+        statuses: dict[NotificationStatus, list[str]] = defaultdict(list)
+        for entry in entries:
+            outcome = entry["outcome"]
+            outcome["success"] = any(r.get("success") for r in outcome["channels"].values())
+            if not outcome["success"]:
+                errors = [r["error"] for r in outcome["channels"].values() if r.get("error")]
+                outcome["error"] = "; ".join(errors) if errors else "No channel delivered"
+            if outcome["notification_id"]:
+                status = NotificationStatus.SENT if outcome["success"] else NotificationStatus.FAILED
+                statuses[status].append(outcome["notification_id"])
+
+        for status, notification_ids in statuses.items():
+            self._update_notification_statuses_bulk(notification_ids, status)
+
+    def _send_bulk_email(self, type_str: str, entries: list[dict[str, Any]]):
+        """
+        Send emails as SendGrid personalizations.
+
+        Each locale/variant group is rendered once; values that differ per
+        recipient are left as substitution tags and filled in by SendGrid.
+        """
+        template_variables = set(self.templates.get_template_variables("email", type_str))
+        groups: dict[tuple, list[dict[str, Any]]] = defaultdict(list)
+        for entry in entries:
+            if not entry["recipient"].get("email"):
+                entry["outcome"]["channels"]["email"] = {
+                    "success": False,
+                    "error": "No email address",
+                }
+                continue
+            groups[(entry["data"].get("locale"), entry["data"].get("variant"))].append(entry)
+
+        for group in groups.values():
+            # Variables with the same value for everyone are rendered into the content
+            shared = dict(group[0]["data"])
+            for entry in group[1:]:
+                for key in list(shared):
+                    if key not in entry["data"] or entry["data"][key] != shared[key]:
+                        del shared[key]
+            personal_keys = (
+                {key for entry in group for key in entry["data"]} - set(shared)
+            ) & template_variables
+
+            html_content = self.templates.render_template(
+                "email", type_str, {**shared, **{k: f"-{k}:html-" for k in personal_keys}}, "html"
+            )
+            plain_vars = {**shared, **{k: f"-{k}-" for k in personal_keys}}
+            plain_content = self.templates.render_template("email", type_str, plain_vars, "plain")
+            subject = self.templates.get_email_subject(type_str, plain_vars)
+
+            if not all([html_content, subject]):
+                logger.error(f"Failed to render email template for {type_str}")
+                for entry in group:
+                    entry["outcome"]["channels"]["email"] = {
+                        "success": False,
+                        "error": "Template rendering failed",
+                    }
+                continue
+
+            for start in range(0, len(group), SENDGRID_BATCH_SIZE):
+                batch = group[start : start + SENDGRID_BATCH_SIZE]
+                personalizations = []
+                for entry in batch:
+                    substitutions = {}
+                    for key in personal_keys:
+                        value = entry["data"].get(key)
+                        substitutions[f"-{key}-"] = self.templates.format_variable(value)
+                        substitutions[f"-{key}:html-"] = self.templates.format_variable(
+                            value, escape_html=True
+                        )
+                    custom_args = {"notification_type": type_str}
+                    if entry["outcome"]["notification_id"]:
+                        custom_args["notification_id"] = str(entry["outcome"]["notification_id"])
+                    personalizations.append(
                         {
-                            "recipient": recipient.get("email") or recipient.get("phone"),
-                            "error": result.get("error", "Unknown error"),
+                            "email": entry["recipient"]["email"],
+                            "substitutions": substitutions,
+                            "custom_args": custom_args,
                         }
                     )
 
-            except Exception as e:
-                results["failed"] += 1
-                results["errors"].append(
-                    {"recipient": recipient.get("email") or recipient.get("phone"), "error": str(e)}
+                response = self.email_service.send_bulk_emails(
+                    recipients=personalizations,
+                    subject=subject,
+                    html_content=html_content,
+                    plain_content=plain_content,
+                    categories=[type_str, "crm_notification"],
                 )
+                channel_result = {
+                    "success": bool(response.get("success")),
+                    "message_id": response.get("message_id"),
+                }
+                if not channel_result["success"]:
+                    channel_result["error"] = response.get("error") or "; ".join(
+                        str(e) for e in response.get("errors", [])
+                    )
+                for entry in batch:
+                    entry["outcome"]["channels"]["email"] = dict(channel_result)
+
+    def _send_bulk_realtime(self, type_str: str, entries: list[dict[str, Any]]):
+        """Send in-app notifications in Pusher batch triggers."""
+        for start in range(0, len(entries), REALTIME_BATCH_SIZE):
+            batch = entries[start : start + REALTIME_BATCH_SIZE]
+            events = []
+            for entry in batch:
+                notification_id = entry["outcome"]["notification_id"]
+                data = entry["data"]
+                events.append(
+                    {
+                        "channel": f"private-user-{entry['recipient'].get('id')}",
+                        "name": "notification",
+                        "data": {
+                            "id": str(notification_id) if notification_id else None,
+                            "type": type_str,
+                            "title": data.get(
+                                "title", f"New {type_str.replace('_', ' ').title()}"
+                            ),
+                            "message": data.get("message", ""),
+                            "data": data,
+                            "timestamp": datetime.utcnow().isoformat(),
+                        },
+                    }
+                )
+            success = self.realtime_service.trigger_batch(events)
+            for entry in batch:
+                entry["outcome"]["channels"]["in_app"] = {"success": success}
 
-        return results
+    def _send_bulk_individually(
+        self, channel: str, type: str | NotificationType, entries: list[dict[str, Any]]
+    ):
+        """Send a channel without a batch API (SMS) with bounded concurrency."""
+
+        def send(entry):
+            return self._send_channel_notification(
+                channel=channel,
+                type=type,
+                recipient=entry["recipient"],
+                data=entry["data"],
+                notification_id=entry["outcome"]["notification_id"],
+            )
+
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(BULK_SEND_CONCURRENCY, len(entries))),
+            thread_name_prefix=f"notify-{channel}",
+        ) as executor:
+            for entry, channel_result in zip(entries, executor.map(send, entries)):
+                entry["outcome"]["channels"][channel] = channel_result
 
     def _get_recipient_info(
         self, recipient_id: str | None, data: dict[str, Any]
@@ -345,6 +638,12 @@ class NotificationService:
             except:
                 pass
 
+        return self._build_recipient(recipient, recipient_id, data)
+
+    def _build_recipient(
+        self, recipient: dict[str, Any], recipient_id: str | None, data: dict[str, Any]
+    ) -> dict[str, Any] | None:
+        """Overlay provided contact data on a user record."""
         # Override with provided data
         recipient.update(
             {
@@ -384,6 +683,54 @@ class NotificationService:
 
         return None
 
+    def _get_recipients_bulk(self, user_ids: list[str]) -> dict[str, dict[str, Any]]:
+        """Load user records for many recipients, keyed by user ID."""
+        users = {}
+        if not user_ids or not self.supabase:
+            return users
+
+        unique_ids = list(dict.fromkeys(user_ids))
+        for start in range(0, len(unique_ids), BULK_LOOKUP_CHUNK_SIZE):
+            chunk = unique_ids[start : start + BULK_LOOKUP_CHUNK_SIZE]
+            try:
+                result = self.supabase.from_("users").select("*").in_("id", chunk).execute()
+                for row in result.data or []:
+                    users[str(row["id"])] = row
+            except Exception as e:
+                logger.error(f"Failed to load notification recipients: {str(e)}")
+
+        return users
+
+    def _get_user_preferences_bulk(
+        self, user_ids: list[str]
+    ) -> dict[str, NotificationPreferences]:
+        """Load notification preferences for many users, keyed by user ID."""
+        preferences = {}
+        if not user_ids or not self.supabase:
+            return preferences
+
+        unique_ids = list(dict.fromkeys(user_ids))
+        for start in range(0, len(unique_ids), BULK_LOOKUP_CHUNK_SIZE):
+            chunk = unique_ids[start : start + BULK_LOOKUP_CHUNK_SIZE]
+            try:
+                result = (
+                    self.supabase.from_("notification_preferences")
+                    .select("*")
+                    .in_("user_id", chunk)
+                    .execute()
+                )
+            except Exception as e:
+                logger.error(f"Failed to load notification preferences: {str(e)}")
+                continue
+
+            for row in result.data or []:
+                try:
+                    preferences[str(row["user_id"])] = NotificationPreferences(**row)
+                except Exception:
+                    pass
+
+        return preferences
+
     def _determine_channels(
         self,
         type: str | NotificationType,
@@ -504,6 +851,42 @@ class NotificationService:
 
         return {"success": False}
 
+    def _schedule_notifications_bulk(
+        self, type_str: str, entries: list[dict[str, Any]], priority: str
+    ):
+        """Schedule prepared bulk recipients for after quiet hours in one insert."""
+        if not self.supabase:
+            for entry in entries:
+                entry["outcome"]["error"] = "Cannot schedule without database"
+            return
+
+        send_at = (datetime.utcnow() + timedelta(hours=1)).isoformat()
+        rows = [
+            {
+                "type": type_str,
+                "channels": entry["channels"],
+                "recipient_id": entry["recipient"].get("id"),
+                "data": json.dumps(entry["data"]),
+                "priority": priority,
+                "scheduled_for": send_at,
+                "status": NotificationStatus.PENDING.value,
+                "created_at": datetime.utcnow().isoformat(),
+            }
+            for entry in entries
+        ]
+
+        try:
+            result = self.supabase.from_("scheduled_notifications").insert(rows).execute()
+        except Exception as e:
+            logger.error(f"Failed to schedule notifications: {str(e)}")
+            for entry in entries:
+                entry["outcome"]["error"] = str(e)
+            return
+
+        for entry, row in zip(entries, result.data or []):
+            entry["outcome"]["success"] = True
+            entry["outcome"]["scheduled_id"] = row["id"]
+
     def _save_notification(
         self,
         type: str | NotificationType,
@@ -543,6 +926,63 @@ class NotificationService:
 
         return None
 
+    def _save_notifications_bulk(
+        self, type_str: str, entries: list[dict[str, Any]], priority: str
+    ) -> list[dict | None]:
+        """Save notifications for prepared bulk recipients in one insert."""
+        if not self.supabase:
+            return [None] * len(entries)
+
+        rows = []
+        for entry in entries:
+            recipient = entry["recipient"]
+            channels = entry["channels"]
+            rows.append(
+                {
+                    "type": type_str,
+                    "channel": channels[0] if channels else NotificationChannel.EMAIL.value,
+                    "priority": priority,
+                    "recipient_id": recipient.get("id"),
+                    "recipient_email": recipient.get("email"),
+                    "recipient_phone": recipient.get("phone"),
+                    "recipient_name": f"{recipient.get('first_name') or ''} {recipient.get('last_name') or ''}".strip(),
+                    "subject": entry["data"].get("subject"),
+                    "content": json.dumps(entry["data"]),
+                    "status": NotificationStatus.PENDING.value,
+                    "created_at": datetime.utcnow().isoformat(),
+                }
+            )
+
+        try:
+            result = self.supabase.from_("notifications").insert(rows).execute()
+            saved = list(result.data or [])
+        except Exception as e:
+            logger.error(f"Failed to save notifications: {str(e)}")
+            saved = []
+
+        # Rows come back in insert order
+        return saved + [None] * (len(entries) - len(saved))
+
+    def _update_notification_statuses_bulk(
+        self, notification_ids: list[str], status: NotificationStatus
+    ):
+        """Set the same status on many notifications in one update."""
+        if not self.supabase or not notification_ids:
+            return
+
+        try:
+            now = datetime.utcnow().isoformat()
+            update_data = {"status": status.value, "updated_at": now}
+            if status == NotificationStatus.SENT:
+                update_data["sent_at"] = now
+
+            self.supabase.from_("notifications").update(update_data).in_(
+                "id", notification_ids
+            ).execute()
+
+        except Exception as e:
+            logger.error(f"Failed to update notification statuses: {str(e)}")
+
     def _update_notification_status(
         self,
         notification_id: str,
@@ -625,54 +1065,186 @@ class NotificationService:
             logger.error(f"Failed to retry notification: {str(e)}")
             return False
 
-    def process_scheduled_notifications(self):
-        """Process scheduled notifications that are due."""
+    def process_scheduled_notifications(
+        self, batch_size: int = SCHEDULED_BATCH_SIZE, max_batches: int | None = None
+    ) -> dict[str, int]:
+        """
+        Process scheduled notifications that are due.
+
+        Due rows are claimed in batches so several workers can run this at
+        once without double-sending; each batch is sent concurrently and its
+        statuses are written back in bulk.
+
+        Args:
+            batch_size: Notifications claimed per batch
+            max_batches: Stop after this many batches (default: until none are due)
+
+        Returns:
+            Counts of claimed, sent and failed notifications
+        """
+        totals = {"claimed": 0, "sent": 0, "failed": 0}
         if not self.supabase:
-            return
+            return totals
 
-        try:
-            # Get due notifications
-            result = (
-                self.supabase.from_("scheduled_notifications")
-                .select("*")
-                .lte("scheduled_for", datetime.utcnow().isoformat())
-                .eq("status", NotificationStatus.PENDING.value)
-                .execute()
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            try:
+                claimed = self.claim_scheduled_notifications(batch_size)
+            except Exception as e:
+                logger.error(f"Failed to claim scheduled notifications: {str(e)}")
+                break
+
+            if not claimed:
+                break
+
+            batches += 1
+            counts = self._send_scheduled_batch(claimed)
+            totals["claimed"] += len(claimed)
+            totals["sent"] += counts["sent"]
+            totals["failed"] += counts["failed"]
+
+            if len(claimed) < batch_size:
+                break
+
+        return totals
+
+    def run_scheduled_notification_worker(
+        self,
+        stop: threading.Event,
+        batch_size: int = SCHEDULED_BATCH_SIZE,
+        poll_interval: float = SCHEDULED_POLL_INTERVAL,
+    ):
+        """
+        Process scheduled notifications until stop is set.
+
+        Run one per worker process; throughput scales with the number of
+        processes because each claims its own batches.
+        """
+        logger.info(f"Scheduled notification worker {self.worker_id} started")
+        while not stop.is_set():
+            totals = self.process_scheduled_notifications(batch_size=batch_size)
+            if totals["claimed"]:
+                logger.info(
+                    f"Processed {totals['claimed']} scheduled notifications "
+                    f"({totals['sent']} sent, {totals['failed']} failed)"
+                )
+            else:
+                stop.wait(poll_interval)
+        logger.info(f"Scheduled notification worker {self.worker_id} stopped")
+
+    def claim_scheduled_notifications(self, batch_size: int) -> list[dict[str, Any]]:
+        """
+        Claim up to batch_size due scheduled notifications for this worker.
+
+        Uses the claim_scheduled_notifications RPC (FOR UPDATE SKIP LOCKED)
+        when deployed, otherwise flips status to sending with a conditional
+        update; either way a row is claimed by one worker only. Rows left in
+        sending by a worker that died are reclaimed once their lease expires.
+        """
+        if time.monotonic() >= self._claim_rpc_disabled_until:
+            try:
+                result = self.supabase.rpc(
+                    "claim_scheduled_notifications",
+                    {
+                        "p_worker": self.worker_id,
+                        "p_batch_size": batch_size,
+                        "p_lease_seconds": SCHEDULED_CLAIM_LEASE,
+                    },
+                ).execute()
+                return list(result.data or [])
+            except Exception as e:
+                logger.warning(
+                    f"claim_scheduled_notifications RPC unavailable, claiming by status update "
+                    f"for {self.claim_rpc_retry_interval}s: {str(e)}"
+                )
+                self._claim_rpc_disabled_until = (
+                    time.monotonic() + self.claim_rpc_retry_interval
+                )
+
+        now = datetime.utcnow()
+        lease_cutoff = (now - timedelta(seconds=SCHEDULED_CLAIM_LEASE)).isoformat()
+        # Pending rows, plus sending rows whose claim expired (or was never stamped)
+        claimable = (
+            f"status.eq.{NotificationStatus.PENDING.value},"
+            f"and(status.eq.{NotificationStatus.SENDING.value},"
+            f'or(claimed_at.is.null,claimed_at.lt."{lease_cutoff}"))'
+        )
+
+        due = (
+            self.supabase.from_("scheduled_notifications")
+            .select("id")
+            .lte("scheduled_for", now.isoformat())
+            .or_(claimable)
+            .order("scheduled_for")
+            .limit(batch_size)
+            .execute()
+        )
+        ids = [row["id"] for row in due.data or []]
+        if not ids:
+            return []
+
+        # Only rows still claimable are updated, so rows another worker claimed first are skipped
+        result = (
+            self.supabase.from_("scheduled_notifications")
+            .update(
+                {
+                    "status": NotificationStatus.SENDING.value,
+                    "claimed_by": self.worker_id,
+                    "claimed_at": now.isoformat(),
+                }
             )
+            .in_("id", ids)
+            .or_(claimable)
+            .execute()
+        )
+        return list(result.data or [])
 
-            if not result.data:
-                return
+    def _send_scheduled_batch(self, claimed: list[dict[str, Any]]) -> dict[str, int]:
+        """Send claimed scheduled notifications concurrently and record their statuses in bulk."""
 
-            for scheduled in result.data:
-                try:
-                    # Parse data
-                    data = json.loads(scheduled.get("data", "{}"))
-                    channels = scheduled.get("channels", [])
-
-                    # Send notification
-                    result = self.send_notification(
-                        type=scheduled["type"],
-                        data=data,
-                        recipient_id=scheduled.get("recipient_id"),
-                        channels=channels,
-                        priority=scheduled.get("priority", "normal"),
-                    )
+        def send(scheduled):
+            try:
+                # Parse data
+                data = scheduled.get("data") or "{}"
+                data = json.loads(data) if isinstance(data, str) else data
 
-                    # Update status
-                    status = (
-                        NotificationStatus.SENT if result["success"] else NotificationStatus.FAILED
-                    )
-                    self.supabase.from_("scheduled_notifications").update(
-                        {"status": status.value, "processed_at": datetime.utcnow().isoformat()}
-                    ).eq("id", scheduled["id"]).execute()
+                result = self.send_notification(
+                    type=scheduled["type"],
+                    data=data,
+                    recipient_id=scheduled.get("recipient_id"),
+                    channels=scheduled.get("channels", []),
+                    priority=scheduled.get("priority", "normal"),
+                )
+                return bool(result.get("success"))
 
-                except Exception as e:
-                    logger.error(
-                        f"Failed to process scheduled notification {scheduled['id']}: {str(e)}"
-                    )
+            except Exception as e:
+                logger.error(f"Failed to process scheduled notification {scheduled['id']}: {str(e)}")
+                return False
 
-        except Exception as e:
-            logger.error(f"Failed to process scheduled notifications: {str(e)}")
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(BULK_SEND_CONCURRENCY, len(claimed))),
+            thread_name_prefix="notify-scheduled",
+        ) as executor:
+            outcomes = list(executor.map(send, claimed))
+
+        statuses: dict[NotificationStatus, list[str]] = defaultdict(list)
+        for scheduled, success in zip(claimed, outcomes):
+            status = NotificationStatus.SENT if success else NotificationStatus.FAILED
+            statuses[status].append(scheduled["id"])
+
+        processed_at = datetime.utcnow().isoformat()
+        for status, ids in statuses.items():
+            try:
+                self.supabase.from_("scheduled_notifications").update(
+                    {"status": status.value, "processed_at": processed_at}
+                ).in_("id", ids).execute()
+            except Exception as e:
+                logger.error(f"Failed to update scheduled notification statuses: {str(e)}")
+
+        return {
+            "sent": len(statuses[NotificationStatus.SENT]),
+            "failed": len(statuses[NotificationStatus.FAILED]),
+        }
 
 
 # Singleton instance
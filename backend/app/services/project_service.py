@@ -17,6 +17,7 @@ from app.models.project_schemas import (
     ProjectUpdate,
 )
 from app.services.notification import notification_service
+from app.utils.cache import invalidate_tags
 from app.utils.supabase_client import get_supabase_client
 
 logger = logging.getLogger(__name__)
@@ -86,6 +87,9 @@ class ProjectService:
                     priority="normal",
                 )
 
+                # Cached list totals (count_total tag) include the new row
+                invalidate_tags("projects")
+
                 logger.info(f"Project created: {project['id']}")
                 return True, project, None
 
@@ -145,6 +149,7 @@ class ProjectService:
 
             if result.data:
                 project = result.data[0]
+                invalidate_tags("projects")
 
                 # Check for status changes
                 if old_project["status"] != project["status"]:
@@ -548,6 +553,7 @@ class ProjectService:
             )
 
             if update_result.data:
+                invalidate_tags("projects")
                 schedule_data = {
                     "project_id": project_id,
                     "start_date": start_date.isoformat(),
@@ -15,6 +15,7 @@ import logging
 import os
 import statistics
 from collections import defaultdict
+from collections.abc import Callable
 from datetime import datetime, timedelta
 from typing import Any
 
@@ -421,8 +422,15 @@ class ReviewsService:
 
     # Aggregation Methods
 
-    def fetch_all_reviews(self, refresh: bool = False) -> tuple[bool, dict | None, str | None]:
-        """Fetch and aggregate reviews from all platforms"""
+    def fetch_all_reviews(
+        self, refresh: bool = False, should_stop: Callable[[], bool] | None = None
+    ) -> tuple[bool, dict | None, str | None]:
+        """
+        Fetch and aggregate reviews from all platforms
+
+        should_stop is checked before each platform and before storing; when
+        it returns True the refresh stops early and reports failure.
+        """
         try:
             cache_key = "reviews:all"
 
@@ -435,33 +443,25 @@ class ReviewsService:
             errors = []
 
             # Fetch from each platform
-            if self.platforms["google"]["enabled"]:
-                success, reviews, error = self.fetch_gmb_reviews()
-                if success and reviews:
-                    all_reviews.extend(reviews)
-                elif error:
-                    errors.append(f"Google: {error}")
-
-            if self.platforms["yelp"]["enabled"]:
-                success, reviews, error = self.fetch_yelp_reviews()
-                if success and reviews:
-                    all_reviews.extend(reviews)
-                elif error:
-                    errors.append(f"Yelp: {error}")
-
-            if self.platforms["facebook"]["enabled"]:
-                success, reviews, error = self.fetch_facebook_reviews()
+            platform_fetchers = [
+                ("google", "Google", self.fetch_gmb_reviews),
+                ("yelp", "Yelp", self.fetch_yelp_reviews),
+                ("facebook", "Facebook", self.fetch_facebook_reviews),
+                ("birdeye", "BirdEye", self.fetch_birdeye_reviews),
+            ]
+            for platform, label, fetch in platform_fetchers:
+                if not self.platforms[platform]["enabled"]:
+                    continue
+                if should_stop and should_stop():
+                    return False, None, "Review refresh stopped"
+                success, reviews, error = fetch()
                 if success and reviews:
                     all_reviews.extend(reviews)
                 elif error:
-                    errors.append(f"Facebook: {error}")
+                    errors.append(f"{label}: {error}")
 
-            if self.platforms["birdeye"]["enabled"]:
-                success, reviews, error = self.fetch_birdeye_reviews()
-                if success and reviews:
-                    all_reviews.extend(reviews)
-                elif error:
-                    errors.append(f"BirdEye: {error}")
+            if should_stop and should_stop():
+                return False, None, "Review refresh stopped"
 
             # Store in database
             for review in all_reviews:
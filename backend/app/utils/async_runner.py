@@ -0,0 +1,169 @@
+"""
+Shared event loop for calling async services from Flask routes
+
+PURPOSE:
+Flask views are synchronous. Creating and closing a new asyncio loop per
+request throws away everything bound to that loop - httpx/aiohttp
+connection pools, AsyncOpenAI clients, Playwright browsers - and pays
+loop start-up on every call. This module runs one long-lived loop in a
+daemon thread per process and submits coroutines to it, so async clients
+and their pools are reused across requests.
+
+USAGE:
+    from app.utils.async_runner import run_async, async_route
+
+    # From a sync view
+    results = run_async(service.process_search_query(query, context))
+
+    # Or write the view itself as a coroutine
+    @bp.route('/forecast')
+    @async_route
+    async def forecast():
+        ...
+
+NOTES:
+- The calling thread's contextvars (Flask request/app context) are copied
+  into the task, so `request`, `g` and `current_app` work inside it.
+- The loop is shared by every request in the process: coroutines must not
+  block it. Offload blocking DB/CPU work with `await asyncio.to_thread(...)`.
+- gunicorn/uwsgi workers each get their own loop; the thread is started
+  lazily after fork.
+"""
+
+import asyncio
+import atexit
+import concurrent.futures
+import contextvars
+import logging
+import os
+import threading
+from functools import wraps
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Default upper bound on how long a view waits for its coroutine (seconds)
+DEFAULT_TIMEOUT = float(os.getenv("ASYNC_ROUTE_TIMEOUT", 300))
+
+
+class AsyncLoopRunner:
+    """One event loop in a background thread, shared by all callers in the process"""
+
+    def __init__(self, name: str = "async-runner"):
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The running loop, started on first use (and again in forked children)"""
+        if self._loop is None or self._pid != os.getpid() or not self._thread.is_alive():
+            with self._lock:
+                if self._loop is None or self._pid != os.getpid() or not self._thread.is_alive():
+                    self._start()
+        return self._loop
+
+    def _start(self):
+        loop = asyncio.new_event_loop()
+        ready = threading.Event()
+
+        def run():
+            asyncio.set_event_loop(loop)
+            loop.call_soon(ready.set)
+            loop.run_forever()
+
+        thread = threading.Thread(target=run, name=self.name, daemon=True)
+        thread.start()
+        ready.wait()
+        self._loop, self._thread, self._pid = loop, thread, os.getpid()
+        logger.info(f"Started shared event loop thread {self.name} (pid {self._pid})")
+
+    def submit(self, coro: Awaitable[T]) -> "concurrent.futures.Future[T]":
+        """Schedule a coroutine on the shared loop, carrying the caller's context"""
+        loop = self.loop
+        if self.in_loop_thread():
+            # Close it so the rejected coroutine is not reported as never awaited
+            coro.close()
+            raise RuntimeError("run_async() called from the shared loop; await the coroutine instead")
+
+        context = contextvars.copy_context()
+        future: concurrent.futures.Future = concurrent.futures.Future()
+
+        def start():
+            if future.cancelled():
+                coro.close()
+                return
+            task = loop.create_task(coro, context=context)
+
+            def done(t: asyncio.Task):
+                try:
+                    if t.cancelled():
+                        future.cancel()
+                    elif t.exception() is not None:
+                        future.set_exception(t.exception())
+                    else:
+                        future.set_result(t.result())
+                except concurrent.futures.InvalidStateError:
+                    pass  # caller already gave up
+
+            task.add_done_callback(done)
+            # Cancel the task if the caller gives up waiting
+            future.add_done_callback(lambda f: f.cancelled() and loop.call_soon_threadsafe(task.cancel))
+
+        loop.call_soon_threadsafe(start)
+        return future
+
+    def run(self, coro: Awaitable[T], timeout: Optional[float] = DEFAULT_TIMEOUT) -> T:
+        """Run a coroutine on the shared loop and wait for its result"""
+        future = self.submit(coro)
+        try:
+            return future.result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise TimeoutError(f"Async call did not finish within {timeout}s")
+
+    def in_loop_thread(self) -> bool:
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def shutdown(self, timeout: float = 5.0):
+        """Cancel outstanding tasks and stop the loop"""
+        loop, thread = self._loop, self._thread
+        if loop is None or self._pid != os.getpid() or not thread.is_alive():
+            return
+
+        async def cancel_pending():
+            tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await loop.shutdown_asyncgens()
+
+        try:
+            asyncio.run_coroutine_threadsafe(cancel_pending(), loop).result(timeout)
+        except Exception as e:
+            logger.warning(f"Error while draining shared event loop: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+        self._loop = self._thread = None
+
+
+# Create singleton instance
+async_runner = AsyncLoopRunner()
+atexit.register(async_runner.shutdown)
+
+
+def run_async(coro: Awaitable[T], timeout: Optional[float] = DEFAULT_TIMEOUT) -> T:
+    """Run a coroutine on the process-wide shared loop from synchronous code"""
+    return async_runner.run(coro, timeout=timeout)
+
+
+def async_route(f: Callable[..., Awaitable[Any]]) -> Callable[..., Any]:
+    """Decorator to run an async Flask view on the shared loop"""
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        return run_async(f(*args, **kwargs))
+    return wrapper
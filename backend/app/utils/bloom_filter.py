@@ -0,0 +1,200 @@
+"""
+iSwitch Roofs CRM - Redis Bloom Filter
+Version: 1.0.0
+Date: 2026-10-16
+
+PURPOSE:
+Shared, memory-cheap "have we seen this key?" prefilter stored as a Redis
+bitmap (SETBIT/GETBIT), so it works on any Redis without the RedisBloom
+module. A negative answer is definitive; a positive answer means "maybe"
+and must be confirmed against the database.
+
+USAGE:
+    from app.utils.bloom_filter import RedisBloomFilter
+
+    known = RedisBloomFilter("crm:bloom:lead_keys", capacity=500_000)
+    known.add_many(["phone:2485551234", "email:jane@example.com"])
+    known.might_contain_many(["phone:2485551234", "phone:3135550000"])
+    # [True, False]
+
+REBUILDS:
+    ``rebuild`` fills a temporary bitmap and RENAMEs it over the live one
+    under a Redis lock, so readers never see an empty or half-built filter
+    and only one worker rebuilds at a time. The ready marker records when
+    the build started, so callers can confirm negatives against rows
+    written since then (by any path, not just the ones that call add_many).
+
+SIZING:
+    bits   m = -n * ln(p) / ln(2)^2
+    hashes k = m / n * ln(2)
+    500k keys at 1% false positives = ~4.8M bits (~600KB), 7 hashes.
+"""
+
+import hashlib
+import logging
+import math
+import time
+import uuid
+from typing import Iterable, List, Optional
+
+from app.utils.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+# Items per Redis pipeline round trip
+PIPELINE_CHUNK_SIZE = 1000
+
+
+class RedisBloomFilter:
+    """
+    Bloom filter over a Redis bitmap.
+
+    The filter is only trusted once ``mark_ready`` has been called after a
+    full build; until then (or once the ready marker expires) ``is_ready``
+    is False and callers should skip the prefilter.
+    """
+
+    def __init__(self, key: str, capacity: int = 1_000_000, error_rate: float = 0.01):
+        """
+        Args:
+            key: Redis key holding the bitmap
+            capacity: Expected number of distinct items
+            error_rate: Target false-positive rate at capacity
+        """
+        self.key = key
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+
+    @property
+    def ready_key(self) -> str:
+        return f"{self.key}:ready"
+
+    def _offsets(self, item: str) -> List[int]:
+        """Bit offsets for an item (double hashing over one SHA-256 digest)."""
+        digest = hashlib.sha256(item.encode()).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:16], "big") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    @property
+    def lock_key(self) -> str:
+        return f"{self.key}:rebuild-lock"
+
+    def is_ready(self) -> bool:
+        """Whether the filter has been fully built and can be trusted."""
+        return bool(redis_client.is_connected and redis_client.exists(self.ready_key))
+
+    def built_at(self) -> Optional[float]:
+        """Epoch seconds when the current filter's build started, or None if not ready."""
+        if not redis_client.is_connected:
+            return None
+        raw = redis_client.get(self.ready_key)
+        try:
+            return float(raw) if raw else None
+        except ValueError:
+            return None
+
+    def mark_ready(self, ttl: int, built_at: Optional[float] = None):
+        """Mark the filter as built; it expires after ttl seconds and must be rebuilt."""
+        redis_client.setex(self.ready_key, ttl, str(built_at if built_at is not None else time.time()))
+
+    def clear(self):
+        """Drop the bitmap and the ready marker."""
+        redis_client.delete(self.key, self.ready_key)
+
+    def add_many(self, items: Iterable[str]) -> int:
+        """
+        Add items to the filter.
+
+        Returns:
+            int: Number of items added
+        """
+        return self._add_many(self.key, items)
+
+    def rebuild(self, items: Iterable[str], ttl: int, lock_timeout: int = 3600) -> Optional[int]:
+        """
+        Replace the filter with one built from items.
+
+        The new bitmap is built under a temporary key and swapped in with
+        RENAME, so readers keep using the previous filter until it is done.
+
+        Args:
+            items: Every item that should be in the filter
+            ttl: Seconds until the rebuilt filter expires
+            lock_timeout: Seconds before an abandoned rebuild lock is released
+
+        Returns:
+            int: Number of items added, or None if another worker holds the
+                 rebuild lock
+        """
+        token = uuid.uuid4().hex
+        if not redis_client.set(self.lock_key, token, ex=lock_timeout, nx=True):
+            return None
+
+        building_key = f"{self.key}:building:{token}"
+        try:
+            # Rows written after this point are not guaranteed to be in the filter
+            started = time.time()
+            added = self._add_many(building_key, items, strict=True)
+            if added == 0:
+                # RENAME needs a source key; an empty filter is a zero bit
+                redis_client.setbit(building_key, 0, 0)
+            if not redis_client.rename(building_key, self.key):
+                raise RuntimeError(f"Failed to swap in rebuilt filter {self.key}")
+            self.mark_ready(ttl, built_at=started)
+            return added
+        finally:
+            redis_client.delete(building_key)
+            redis_client.delete_if_equals(self.lock_key, token)
+
+    def _add_many(self, key: str, items: Iterable[str], strict: bool = False) -> int:
+        added = 0
+        for chunk in _chunks(items, PIPELINE_CHUNK_SIZE):
+            pipe = redis_client.pipeline()
+            if pipe is None:
+                if strict:
+                    raise RuntimeError("Redis is unavailable")
+                return added
+            for item in chunk:
+                for offset in self._offsets(item):
+                    pipe.setbit(key, offset, 1)
+            pipe.execute()
+            added += len(chunk)
+        return added
+
+    def might_contain_many(self, items: Iterable[str]) -> List[bool]:
+        """
+        Test items against the filter.
+
+        Returns:
+            list: False = definitely never added, True = possibly added.
+                  All True if Redis is unavailable.
+        """
+        items = list(items)
+        results: List[bool] = []
+        for chunk in _chunks(items, PIPELINE_CHUNK_SIZE):
+            pipe = redis_client.pipeline()
+            if pipe is None:
+                return results + [True] * (len(items) - len(results))
+            for item in chunk:
+                for offset in self._offsets(item):
+                    pipe.getbit(self.key, offset)
+            bits = pipe.execute()
+            k = self.hash_count
+            results.extend(all(bits[i * k:(i + 1) * k]) for i in range(len(chunk)))
+        return results
+
+
+def _chunks(items: Iterable[str], size: int):
+    """Yield lists of up to size items."""
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+__all__ = ["RedisBloomFilter"]
@@ -10,7 +10,8 @@ Transparent Redis caching decorator for service methods with:
 - Cache statistics tracking (hits/misses/errors)
 - Graceful error handling and fallback
 - JSON serialization with support for complex objects
-- Cache invalidation by pattern
+- Cache invalidation by tag (indexed) or by pattern (SCAN fallback)
+- Optional in-process L1 tier (bounded LRU) in front of Redis (L2)
 
 USAGE:
     from app.utils.cache import cache_result, cache_invalidate, get_cache_stats
@@ -20,19 +21,58 @@ USAGE:
         # ... expensive database query ...
         return stats
 
-    # Invalidate on mutations
+    # Hot keys: serve from process memory for up to 60s (L1), Redis behind it
+    @cache_result(ttl=300, key_prefix="leads", l1_ttl=60)
+    def get_lead_stats():
+        return stats
+
+    # Tag entries so mutations can drop exactly the affected keys
+    @cache_result(ttl=300, key_prefix="leads", tags=["leads"])
+    def get_lead_stats():
+        return stats
+
+    # Invalidate on mutations (evicts L1 in every worker via pub/sub)
+    invalidate_tags("leads", f"lead:{lead_id}")
+
+    # Pattern invalidation still works, but SCANs the keyspace
     cache_invalidate("crm:leads:*")
 
 TTL STRATEGY:
 - 30s: Real-time metrics (lead_response, active_counts)
 - 300s (5min): Dashboard data (lead_stats, hot_leads)
 - 3600s (1hr): Historical analytics (revenue_trends, marketing_roi)
+
+TWO-TIER MODE:
+Passing ``l1_ttl`` keeps the deserialized result in a per-process LRU for
+min(l1_ttl, ttl) seconds, so repeated reads skip the Redis round trip and
+``json.loads``. ``cache_invalidate`` evicts matching L1 entries locally and
+publishes the pattern on ``CACHE_INVALIDATION_CHANNEL`` so every other
+worker evicts its copy too.
+
+STAMPEDE PROTECTION:
+With ``single_flight`` (or ``stale_ttl``), a miss takes a short Redis lock
+so only one worker recomputes the key while the rest wait for its result.
+``stale_ttl`` keeps expired values around for that many extra seconds and
+serves them immediately while one worker refreshes in the background.
+
+TAG INDEX:
+Entries cached with ``tags`` are recorded in one Redis set per tag
+(``{namespace}:tags:{tag}``). ``invalidate_tags`` reads those sets and
+deletes exactly the listed keys, so its cost tracks the number of affected
+entries instead of the size of the keyspace.
 """
 
+import fnmatch
 import functools
 import hashlib
+import inspect
 import json
 import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
 from typing import Any, Callable, Optional
 from datetime import datetime
 
@@ -53,13 +93,28 @@ class CacheStats:
 
     def __init__(self):
         self.hits = 0
+        self.l1_hits = 0
+        self.l2_hits = 0
+        self.stale_hits = 0
         self.misses = 0
         self.errors = 0
         self.last_reset = datetime.now()
 
-    def record_hit(self):
-        """Increment cache hit counter."""
+    def record_hit(self, tier: str = "l2", stale: bool = False):
+        """
+        Increment cache hit counter.
+
+        Args:
+            tier: "l1" for in-process hits, "l2" for Redis hits
+            stale: True when an expired value was served during revalidation
+        """
         self.hits += 1
+        if stale:
+            self.stale_hits += 1
+        if tier == "l1":
+            self.l1_hits += 1
+        else:
+            self.l2_hits += 1
 
     def record_miss(self):
         """Increment cache miss counter."""
@@ -81,16 +136,26 @@ class CacheStats:
 
         return {
             "hits": self.hits,
+            "l1_hits": self.l1_hits,
+            "l2_hits": self.l2_hits,
+            "stale_hits": self.stale_hits,
             "misses": self.misses,
             "errors": self.errors,
             "total_requests": total_requests,
             "hit_rate_percent": round(hit_rate, 2),
+            "l1_hit_rate_percent": round(
+                (self.l1_hits / total_requests * 100) if total_requests > 0 else 0.0, 2
+            ),
+            "l1_entries": len(local_cache),
             "last_reset": self.last_reset.isoformat()
         }
 
     def reset(self):
         """Reset all statistics counters."""
         self.hits = 0
+        self.l1_hits = 0
+        self.l2_hits = 0
+        self.stale_hits = 0
         self.misses = 0
         self.errors = 0
         self.last_reset = datetime.now()
@@ -101,6 +166,146 @@ class CacheStats:
 cache_stats = CacheStats()
 
 
+# ============================================================================
+# IN-PROCESS L1 CACHE
+# ============================================================================
+
+CACHE_INVALIDATION_CHANNEL = "crm:cache:invalidate"
+
+# Seconds between checks while waiting on another worker's recomputation
+LOCK_POLL_INTERVAL = 0.05
+
+# Tag sets outlive any single entry so they never expire before their members
+TAG_INDEX_TTL = int(os.getenv("CACHE_TAG_INDEX_TTL", 86400))
+
+
+class LocalCache:
+    """
+    Bounded, thread-safe LRU cache with per-entry expiry.
+
+    Holds already-deserialized results so L1 hits cost a dict lookup.
+    Values are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> tuple[bool, Any]:
+        """
+        Look up a key.
+
+        Returns:
+            tuple: (found, value) - found is False for missing or expired keys
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return False, None
+
+            self._entries.move_to_end(key)
+            return True, value
+
+    def set(self, key: str, value: Any, ttl: float):
+        """Store a value for ttl seconds, evicting the least recently used entry if full."""
+        if ttl <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, *keys: str) -> int:
+        """Evict specific keys."""
+        with self._lock:
+            return sum(1 for key in keys if self._entries.pop(key, None) is not None)
+
+    def invalidate(self, pattern: str) -> int:
+        """Evict all keys matching a glob-style pattern."""
+        with self._lock:
+            matched = [key for key in self._entries if fnmatch.fnmatchcase(key, pattern)]
+            for key in matched:
+                del self._entries[key]
+            return len(matched)
+
+    def clear(self):
+        """Evict everything."""
+        with self._lock:
+            self._entries.clear()
+
+
+# Global L1 cache instance (one per worker process)
+local_cache = LocalCache(max_entries=int(os.getenv("CACHE_L1_MAX_ENTRIES", 1024)))
+
+_listener_lock = threading.Lock()
+_listener_thread: Optional[threading.Thread] = None
+
+
+def _listen_for_invalidations(pubsub):
+    """Evict L1 entries for every pattern published by any worker."""
+    global _listener_thread
+
+    try:
+        while True:
+            # Poll rather than listen() so the pool's socket timeout never fires
+            message = pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+            if not message or message.get("type") != "message":
+                continue
+            pattern = message.get("data")
+            if isinstance(pattern, bytes):
+                pattern = pattern.decode()
+            evicted = local_cache.invalidate(pattern)
+            logger.debug(f"L1 invalidation received: {pattern} ({evicted} evicted)")
+    except Exception as e:
+        # Without the subscription, L1 entries could outlive remote mutations
+        logger.error(f"Cache invalidation listener stopped: {e}", exc_info=True)
+        local_cache.clear()
+    finally:
+        with _listener_lock:
+            _listener_thread = None
+
+
+def _ensure_invalidation_listener() -> bool:
+    """
+    Start the pub/sub listener thread on first L1 use.
+
+    Returns:
+        bool: True if cross-worker invalidation is active
+    """
+    global _listener_thread
+
+    if _listener_thread is not None:
+        return True
+
+    with _listener_lock:
+        if _listener_thread is not None:
+            return True
+
+        pubsub = redis_client.subscribe(CACHE_INVALIDATION_CHANNEL)
+        if pubsub is None:
+            return False
+
+        _listener_thread = threading.Thread(
+            target=_listen_for_invalidations,
+            args=(pubsub,),
+            name="cache-invalidation-listener",
+            daemon=True,
+        )
+        _listener_thread.start()
+        return True
+
+
 # ============================================================================
 # CACHE KEY GENERATION
 # ============================================================================
@@ -121,17 +326,15 @@ def _generate_cache_key(
         namespace: Cache namespace (e.g., "crm")
         key_prefix: Functional prefix (e.g., "leads", "metrics")
         func_name: Function name
-        args: Positional arguments
+        args: Positional arguments (without self/cls)
         kwargs: Keyword arguments
 
     Returns:
         str: Cache key like "crm:leads:get_lead_stats:a1b2c3d4"
     """
     # Create stable string representation of arguments
-    # Filter out 'self' and 'cls' from args
-    filtered_args = [arg for arg in args if arg not in ('self', 'cls')]
-
-    arg_string = f"{filtered_args}:{sorted(kwargs.items())}"
+    # ('self'/'cls' are stripped by the decorator before this is called)
+    arg_string = f"{list(args)}:{sorted(kwargs.items())}"
     arg_hash = hashlib.md5(arg_string.encode()).hexdigest()[:8]
 
     # Build key components
@@ -143,6 +346,39 @@ def _generate_cache_key(
     return ":".join(components)
 
 
+def _tag_key(namespace: str, tag: str) -> str:
+    """
+    Build the Redis key of a tag's index set.
+
+    Returns:
+        str: Tag set key like "crm:tags:leads"
+    """
+    return f"{namespace}:tags:{tag}"
+
+
+def _resolve_tags(
+    tags: Optional[list[str] | Callable[..., list[str]]],
+    args: tuple,
+    kwargs: dict
+) -> list[str]:
+    """
+    Resolve static tags or compute them from the call arguments.
+
+    Args:
+        tags: List of tags, or a callable taking the function's arguments
+        args: Positional arguments
+        kwargs: Keyword arguments
+
+    Returns:
+        list: Tags for this cache entry
+    """
+    if not tags:
+        return []
+    if callable(tags):
+        return list(tags(*args, **kwargs) or [])
+    return list(tags)
+
+
 def _serialize_result(result: Any) -> str:
     """
     Serialize result to JSON string with fallback for complex objects.
@@ -161,6 +397,68 @@ def _serialize_result(result: Any) -> str:
         return json.dumps({"__serialized__": str(result)})
 
 
+def _unwrap_entry(cached: Any) -> tuple[Any, Optional[float]]:
+    """
+    Split a stale-while-revalidate envelope into its value and freshness.
+
+    Args:
+        cached: Deserialized cache entry
+
+    Returns:
+        tuple: (value, seconds until stale) - None for plain entries
+    """
+    if isinstance(cached, dict) and "__fresh_until__" in cached:
+        return cached.get("value"), cached["__fresh_until__"] - time.time()
+    return cached, None
+
+
+def _lock_key(cache_key: str) -> str:
+    """Redis key of a cache entry's recomputation lock."""
+    return f"{cache_key}:lock"
+
+
+def _acquire_lock(cache_key: str, timeout: int) -> Optional[str]:
+    """
+    Try to become the single worker recomputing a key.
+
+    Returns:
+        str: Lock token if acquired, None if another worker holds the lock
+    """
+    token = uuid.uuid4().hex
+    if redis_client.set(_lock_key(cache_key), token, ex=timeout, nx=True):
+        return token
+    return None
+
+
+def _release_lock(cache_key: str, token: str):
+    """Release a recomputation lock if it is still ours."""
+    try:
+        # Compare-and-delete in one step: a lock that expired and was taken
+        # by another worker between a GET and a DEL must not be deleted
+        redis_client.delete_if_equals(_lock_key(cache_key), token)
+    except Exception as e:
+        logger.warning(f"Failed to release cache lock for {cache_key}: {e}")
+
+
+def _wait_for_value(cache_key: str, timeout: int) -> Optional[str]:
+    """
+    Wait for the lock holder to store a key.
+
+    Returns:
+        str: Cached data, or None if the holder finished without storing it
+            or the wait timed out (the caller then computes it itself)
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        time.sleep(LOCK_POLL_INTERVAL)
+        cached_data = redis_client.get(cache_key)
+        if cached_data:
+            return cached_data
+        if not redis_client.exists(_lock_key(cache_key)):
+            return None
+    return None
+
+
 def _deserialize_result(cached_data: str) -> Any:
     """
     Deserialize JSON string back to Python object.
@@ -181,7 +479,12 @@ def _deserialize_result(cached_data: str) -> Any:
 def cache_result(
     ttl: int = 300,
     key_prefix: str = "",
-    namespace: str = "crm"
+    namespace: str = "crm",
+    l1_ttl: Optional[int] = None,
+    tags: Optional[list[str] | Callable[..., list[str]]] = None,
+    stale_ttl: Optional[int] = None,
+    single_flight: bool = False,
+    lock_timeout: int = 10
 ) -> Callable:
     """
     Production-grade caching decorator with automatic key generation.
@@ -192,6 +495,8 @@ def cache_result(
     - Graceful degradation on Redis failure
     - Cache statistics tracking
     - JSON serialization with fallback
+    - Optional in-process L1 tier for hot keys
+    - Optional stampede protection and stale-while-revalidate
 
     Args:
         ttl: Time to live in seconds (default: 300s = 5min)
@@ -200,6 +505,18 @@ def cache_result(
             - 3600s: Historical analytics
         key_prefix: Cache key prefix for grouping (e.g., "leads", "metrics")
         namespace: Top-level namespace (default: "crm")
+        l1_ttl: Enable the in-process L1 tier, keeping entries for
+            min(l1_ttl, ttl) seconds (default: None = Redis only).
+            L1 is only used while cross-worker invalidation is available.
+        tags: Tags to index the entry under for ``invalidate_tags``. Either a
+            list of strings or a callable receiving the function's arguments
+            and returning one (e.g. ``lambda lead_id: [f"lead:{lead_id}"]``).
+        stale_ttl: Keep serving the expired value for this many extra seconds
+            while a single worker recomputes it in the background
+            (stale-while-revalidate). Implies ``single_flight``.
+        single_flight: On a miss, let only one worker recompute the key
+            (guarded by a short Redis lock); the others wait for its result.
+        lock_timeout: Lock expiry and maximum wait in seconds (default: 10).
 
     Usage:
         @cache_result(ttl=30, key_prefix="leads")
@@ -210,7 +527,54 @@ def cache_result(
         {namespace}:{key_prefix}:{func_name}:{hash(args+kwargs)}
         Example: "crm:leads:get_hot_leads:a1b2c3d4"
     """
+    local_ttl = min(l1_ttl, ttl) if l1_ttl else 0
+    use_lock = single_flight or bool(stale_ttl)
+    redis_ttl = ttl + (stale_ttl or 0)
+
     def decorator(func: Callable) -> Callable:
+        # Bound methods share one key across instances (and processes)
+        params = list(inspect.signature(func).parameters)
+        is_method = bool(params) and params[0] in ("self", "cls")
+
+        def _store(cache_key: str, result: Any, args: tuple, kwargs: dict):
+            """Write a fresh result to Redis (with its tag index) and to L1."""
+            if stale_ttl:
+                serialized = _serialize_result(
+                    {"__fresh_until__": time.time() + ttl, "value": result}
+                )
+            else:
+                serialized = _serialize_result(result)
+            entry_tags = _resolve_tags(tags, args, kwargs)
+
+            if entry_tags:
+                # Write the entry and its tag memberships in one round trip
+                pipe = redis_client.pipeline()
+                pipe.setex(cache_key, redis_ttl, serialized)
+                for tag in entry_tags:
+                    tag_key = _tag_key(namespace, tag)
+                    pipe.sadd(tag_key, cache_key)
+                    pipe.expire(tag_key, max(TAG_INDEX_TTL, redis_ttl))
+                pipe.execute()
+            else:
+                redis_client.setex(cache_key, redis_ttl, serialized)
+
+            if local_ttl and _ensure_invalidation_listener():
+                # Store the JSON round-tripped form so L1 and L2 hits agree
+                value, _ = _unwrap_entry(_deserialize_result(serialized))
+                local_cache.set(cache_key, value, local_ttl)
+
+            logger.debug(f"Cache STORED: {cache_key} (TTL: {ttl}s, stale: {stale_ttl or 0}s)")
+
+        def _refresh(cache_key: str, token: str, args: tuple, kwargs: dict):
+            """Recompute a stale entry in the background, then release its lock."""
+            try:
+                _store(cache_key, func(*args, **kwargs), args, kwargs)
+            except Exception as e:
+                cache_stats.record_error()
+                logger.error(f"Background refresh failed for {cache_key}: {e}", exc_info=True)
+            finally:
+                _release_lock(cache_key, token)
+
         @functools.wraps(func)
         def wrapper(*args, **kwargs) -> Any:
             # Check if Redis is available
@@ -218,37 +582,68 @@ def cache_result(
                 logger.debug(f"Redis unavailable, executing {func.__name__} without cache")
                 return func(*args, **kwargs)
 
+            cache_key = None
+            token = None
+
             try:
                 # Generate cache key
                 cache_key = _generate_cache_key(
                     namespace=namespace,
                     key_prefix=key_prefix,
                     func_name=func.__name__,
-                    args=args,
+                    args=args[1:] if is_method else args,
                     kwargs=kwargs
                 )
 
+                use_l1 = local_ttl > 0 and _ensure_invalidation_listener()
+
+                # Try the in-process tier first
+                if use_l1:
+                    found, value = local_cache.get(cache_key)
+                    if found:
+                        cache_stats.record_hit("l1")
+                        logger.debug(f"Cache L1 HIT: {cache_key}")
+                        return value
+
                 # Try to get from cache
                 cached_data = redis_client.get(cache_key)
 
+                if not cached_data and use_lock:
+                    # Single-flight: one worker recomputes, the others wait for it
+                    token = _acquire_lock(cache_key, lock_timeout)
+                    if token is None:
+                        cached_data = _wait_for_value(cache_key, lock_timeout)
+
                 if cached_data:
-                    # Cache hit
-                    cache_stats.record_hit()
-                    logger.debug(f"Cache HIT: {cache_key}")
-                    return _deserialize_result(cached_data)
+                    value, fresh_for = _unwrap_entry(_deserialize_result(cached_data))
 
-                # Cache miss - execute function
-                cache_stats.record_miss()
-                logger.debug(f"Cache MISS: {cache_key}")
+                    if fresh_for is None or fresh_for > 0:
+                        # Cache hit
+                        cache_stats.record_hit("l2")
+                        logger.debug(f"Cache HIT: {cache_key}")
 
-                result = func(*args, **kwargs)
+                        if use_l1:
+                            # Never keep the L1 copy past the Redis entry's freshness
+                            remaining = fresh_for if fresh_for else redis_client.ttl(cache_key)
+                            entry_ttl = min(local_ttl, remaining) if remaining > 0 else local_ttl
+                            local_cache.set(cache_key, value, entry_ttl)
 
-                # Store result in cache
-                serialized = _serialize_result(result)
-                redis_client.setex(cache_key, ttl, serialized)
+                        return value
 
-                logger.debug(f"Cache STORED: {cache_key} (TTL: {ttl}s)")
-                return result
+                    # Stale hit - serve it now, let one worker refresh in the background
+                    cache_stats.record_hit("l2", stale=True)
+                    logger.debug(f"Cache STALE HIT: {cache_key}")
+
+                    refresh_token = _acquire_lock(cache_key, lock_timeout)
+                    if refresh_token:
+                        threading.Thread(
+                            target=_refresh,
+                            args=(cache_key, refresh_token, args, kwargs),
+                            name=f"cache-refresh-{func.__name__}",
+                            daemon=True,
+                        ).start()
+
+                    return value
 
             except Exception as e:
                 # Log error but don't fail the request
@@ -256,8 +651,29 @@ def cache_result(
                 logger.error(f"Cache error in {func.__name__}: {e}", exc_info=True)
 
                 # Fallback to direct execution
+                if token:
+                    _release_lock(cache_key, token)
                 return func(*args, **kwargs)
 
+            # Cache miss - execute function
+            cache_stats.record_miss()
+            logger.debug(f"Cache MISS: {cache_key}")
+
+            try:
+                result = func(*args, **kwargs)
+
+                try:
+                    _store(cache_key, result, args, kwargs)
+                except Exception as e:
+                    cache_stats.record_error()
+                    logger.error(f"Cache store error in {func.__name__}: {e}", exc_info=True)
+
+                return result
+
+            finally:
+                if token:
+                    _release_lock(cache_key, token)
+
         return wrapper
     return decorator
 
@@ -271,6 +687,11 @@ def cache_invalidate(pattern: str) -> int:
     Invalidate cache entries matching a pattern.
 
     Use this after data mutations to ensure cache consistency.
+    Matching L1 entries are evicted in this process and, via pub/sub,
+    in every other worker.
+
+    Keys are found with an incremental SCAN, which still walks the whole
+    keyspace. Prefer ``invalidate_tags`` for entries cached with tags.
 
     Args:
         pattern: Redis key pattern with wildcards
@@ -290,19 +711,25 @@ def cache_invalidate(pattern: str) -> int:
         cache_invalidate("crm:customers:*")
     """
     try:
+        local_cache.invalidate(pattern)
+
         if not redis_client or not redis_client.is_connected:
             logger.warning("Redis unavailable, cache invalidation skipped")
             return 0
 
-        # Get all keys matching pattern
-        keys = redis_client.keys(pattern)
+        redis_client.publish(CACHE_INVALIDATION_CHANNEL, pattern)
+
+        # Get all keys matching pattern (SCAN, so Redis is never blocked)
+        keys = redis_client.scan_keys(pattern, count=1000)
 
         if not keys:
             logger.debug(f"No cache keys found for pattern: {pattern}")
             return 0
 
         # Delete all matching keys
-        deleted = redis_client.delete(*keys)
+        deleted = 0
+        for i in range(0, len(keys), 1000):
+            deleted += redis_client.delete(*keys[i:i + 1000])
         logger.info(f"Cache invalidated: {deleted} keys deleted (pattern: {pattern})")
 
         return deleted
@@ -312,6 +739,102 @@ def cache_invalidate(pattern: str) -> int:
         return 0
 
 
+def invalidate_tags(*tags: str, namespace: str = "crm") -> int:
+    """
+    Invalidate every cache entry recorded under any of the given tags.
+
+    Reads the tag sets in one pipelined call, then deletes the entries and
+    the tag sets (and notifies other workers' L1 tiers) in a second one.
+
+    Args:
+        *tags: Tags passed to ``cache_result(tags=...)``
+        namespace: Cache namespace (default: "crm")
+
+    Returns:
+        int: Number of keys deleted
+
+    Usage:
+        # After updating a lead
+        invalidate_tags("leads", f"lead:{lead_id}")
+    """
+    if not tags:
+        return 0
+
+    try:
+        if not redis_client or not redis_client.is_connected:
+            logger.warning("Redis unavailable, cache invalidation skipped")
+            return 0
+
+        tag_keys = [_tag_key(namespace, tag) for tag in tags]
+
+        pipe = redis_client.pipeline()
+        for tag_key in tag_keys:
+            pipe.smembers(tag_key)
+        keys = sorted(set().union(*pipe.execute()))
+
+        local_cache.delete(*keys)
+
+        pipe = redis_client.pipeline()
+        if keys:
+            pipe.delete(*keys)
+        pipe.delete(*tag_keys)
+        for key in keys:
+            pipe.publish(CACHE_INVALIDATION_CHANNEL, key)
+        results = pipe.execute()
+
+        deleted = results[0] if keys else 0
+        logger.info(f"Cache invalidated: {deleted} keys deleted (tags: {', '.join(tags)})")
+
+        return deleted
+
+    except Exception as e:
+        logger.error(f"Cache tag invalidation error: {e}", exc_info=True)
+        return 0
+
+
+def invalidate_keys(*keys: str) -> int:
+    """
+    Delete specific cache keys from Redis and from every worker's L1 tier.
+
+    For callers that manage their own keys in ``local_cache``/Redis rather
+    than through ``cache_result``.
+
+    Args:
+        *keys: Exact cache keys
+
+    Returns:
+        int: Number of Redis keys deleted
+    """
+    if not keys:
+        return 0
+
+    local_cache.delete(*keys)
+
+    try:
+        if not redis_client or not redis_client.is_connected:
+            return 0
+
+        pipe = redis_client.pipeline()
+        pipe.delete(*keys)
+        for key in keys:
+            pipe.publish(CACHE_INVALIDATION_CHANNEL, key)
+        return pipe.execute()[0]
+
+    except Exception as e:
+        logger.error(f"Cache key invalidation error: {e}", exc_info=True)
+        return 0
+
+
+def start_invalidation_listener() -> bool:
+    """
+    Subscribe this worker's L1 tier to invalidations published by other workers.
+
+    Returns:
+        bool: True if cross-worker invalidation is active
+    """
+    return _ensure_invalidation_listener()
+
+
 def cache_invalidate_function(
     func_name: str,
     key_prefix: str = "",
@@ -413,9 +936,12 @@ def warm_cache(func: Callable, *args, **kwargs) -> Any:
 __all__ = [
     "cache_result",
     "cache_invalidate",
+    "invalidate_tags",
     "cache_invalidate_function",
     "get_cache_stats",
     "reset_cache_stats",
     "clear_all_cache",
     "warm_cache",
+    "local_cache",
+    "LocalCache",
 ]
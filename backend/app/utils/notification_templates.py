@@ -458,19 +458,11 @@ class NotificationTemplates:
                 return None
 
             # Create safe template with HTML escaping for variables
-            safe_vars = {}
-            for key, value in variables.items():
-                if value is None:
-                    safe_vars[key] = ""
-                elif isinstance(value, str) and format == "html" and template_type == "email":
-                    # Only escape HTML for HTML email templates
-                    # Don't escape if it looks like it contains HTML (for hot_reasons list)
-                    if not ("<" in str(value) and ">" in str(value)):
-                        safe_vars[key] = html.escape(str(value))
-                    else:
-                        safe_vars[key] = str(value)
-                else:
-                    safe_vars[key] = str(value)
+            # Only escape HTML for HTML email templates
+            escape_html = format == "html" and template_type == "email"
+            safe_vars = {
+                key: self.format_variable(value, escape_html) for key, value in variables.items()
+            }
 
             # Use Template for safe substitution
             template = Template(template_str)
@@ -480,6 +472,25 @@ class NotificationTemplates:
             logger.error(f"Failed to render template {template_name}: {str(e)}")
             return None
 
+    @staticmethod
+    def format_variable(value: Any, escape_html: bool = False) -> str:
+        """
+        Format a variable value for substitution into a template.
+
+        Args:
+            value: Variable value
+            escape_html: Whether the value is going into HTML content
+
+        Returns:
+            String value, HTML-escaped if required
+        """
+        if value is None:
+            return ""
+        # Don't escape if it looks like it contains HTML (for hot_reasons list)
+        if isinstance(value, str) and escape_html and not ("<" in value and ">" in value):
+            return html.escape(value)
+        return str(value)
+
     def get_email_subject(self, template_name: str, variables: dict[str, Any]) -> str | None:
         """
         Get rendered email subject.
@@ -16,11 +16,31 @@ USAGE:
 
     # Cursor-based pagination (efficient for large datasets)
     results = paginate_cursor(query, cursor=last_id, limit=50)
+
+    # Keyset pagination with opaque cursors (stable under inserts, no COUNT)
+    sort_column, direction = resolve_keyset_sort(Lead, "created_at:desc", ["created_at"])
+    items, next_cursor = paginate_keyset(query, sort_column, cursor, limit=50, direction=direction)
+    total, total_type = count_total(query, "estimate")
+    response = create_keyset_response(items, next_cursor, 50, total, total_type)
 """
 
+import base64
+import hashlib
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
 from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import asc, desc, text, tuple_
 from sqlalchemy.orm import Query
 
+# Supported include_total modes for keyset pagination
+TOTAL_MODES = ("exact", "estimate", "cached")
+
+# How long cached totals live before being recounted (seconds)
+COUNT_CACHE_TTL = 60
+
 
 def paginate_query(
     query: Query,
@@ -304,11 +324,375 @@ def create_cursor_response(
     return response
 
 
+# ============================================================================
+# KEYSET PAGINATION
+# ============================================================================
+
+
+def resolve_keyset_sort(
+    model: Any,
+    sort: Optional[str],
+    allowed_fields: List[str],
+    default: str = "created_at:desc"
+) -> Tuple[Any, str]:
+    """
+    Resolve a "field:direction" sort parameter for keyset pagination.
+
+    Keyset pagination needs a non-null sort key, so only the listed
+    fields are accepted.
+
+    Args:
+        model: SQLAlchemy model
+        sort: Sort parameter (e.g. "lead_score:desc"), None for default
+        allowed_fields: Sortable non-nullable column names
+        default: Sort used when none is given
+
+    Returns:
+        tuple: (sort_column, direction)
+
+    Raises:
+        ValueError: If the field or direction is not supported
+    """
+    field, _, direction = (sort or default).partition(":")
+    direction = (direction or "asc").lower()
+
+    if field not in allowed_fields:
+        raise ValueError(
+            f"Cursor pagination supports sorting by: {', '.join(allowed_fields)}"
+        )
+    if direction not in ("asc", "desc"):
+        raise ValueError("Sort direction must be 'asc' or 'desc'")
+
+    return getattr(model, field), direction
+
+
+def encode_cursor(sort_column: Any, direction: str, sort_value: Any, row_id: Any) -> str:
+    """
+    Encode an opaque cursor for the row after which the next page starts.
+
+    Args:
+        sort_column: Column the page is sorted by
+        direction: "asc" or "desc"
+        sort_value: Sort key of the last row
+        row_id: Primary key of the last row (tiebreak)
+
+    Returns:
+        str: URL-safe cursor string
+    """
+    payload = {
+        "s": sort_column.key,
+        "d": direction,
+        "v": [_to_cursor_value(sort_value), _to_cursor_value(row_id)],
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_column: Any, id_column: Any, direction: str) -> Tuple[Any, Any]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Cursor string from the client
+        sort_column: Column the page is sorted by
+        id_column: Primary key column
+        direction: "asc" or "desc"
+
+    Returns:
+        tuple: (sort_value, row_id)
+
+    Raises:
+        ValueError: If the cursor is malformed or was issued for another sort
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        sort_value, row_id = payload["v"]
+        field, cursor_direction = payload["s"], payload["d"]
+    except (ValueError, TypeError, KeyError):
+        raise ValueError("Invalid cursor")
+
+    if field != sort_column.key or cursor_direction != direction:
+        raise ValueError("Cursor does not match the requested sort order")
+
+    return _from_cursor_value(sort_column, sort_value), _from_cursor_value(id_column, row_id)
+
+
+def _to_cursor_value(value: Any) -> Any:
+    """Convert a column value to a JSON-safe cursor value."""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def _from_cursor_value(column: Any, value: Any) -> Any:
+    """Restore a cursor value to the column's Python type."""
+    if value is None:
+        return None
+
+    try:
+        python_type = column.type.python_type
+    except (AttributeError, NotImplementedError):
+        return value
+
+    try:
+        if python_type is datetime:
+            return datetime.fromisoformat(value)
+        if python_type is date:
+            return date.fromisoformat(value)
+        if python_type is Decimal:
+            return Decimal(value)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+
+    return value
+
+
+def paginate_keyset(
+    query: Query,
+    sort_column: Any,
+    cursor: Optional[str] = None,
+    limit: int = 50,
+    direction: str = "desc",
+    max_limit: int = 100
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Keyset (seek) pagination on (sort key, id).
+
+    Instead of OFFSET, each page starts strictly after the last row of the
+    previous one using a row-value comparison, so page N costs the same as
+    page 1 and rows inserted meanwhile never shift or duplicate results.
+    The id tiebreak keeps the order total when sort keys repeat.
+
+    Args:
+        query: SQLAlchemy query (filters applied, no ORDER BY)
+        sort_column: Non-nullable column to sort by
+        cursor: Cursor from the previous page (None/"" for the first page)
+        limit: Items per page
+        direction: "asc" or "desc"
+        max_limit: Maximum items per page (default: 100)
+
+    Returns:
+        tuple: (results, next_cursor) - next_cursor is None on the last page
+
+    Raises:
+        ValueError: If the cursor is invalid
+
+    Example:
+        query = db.query(Lead).filter(Lead.is_deleted == False)
+        leads, next_cursor = paginate_keyset(query, Lead.created_at, cursor, limit=50)
+    """
+    limit = min(max(1, limit), max_limit)
+    model = query.column_descriptions[0]["entity"]
+    id_column = model.id
+
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor, sort_column, id_column, direction)
+        key = tuple_(sort_column, id_column)
+        if direction == "desc":
+            query = query.filter(key < tuple_(sort_value, row_id))
+        else:
+            query = query.filter(key > tuple_(sort_value, row_id))
+
+    order = desc if direction == "desc" else asc
+    query = query.order_by(None).order_by(order(sort_column), order(id_column))
+
+    # Fetch one extra row to learn whether another page exists
+    rows = query.limit(limit + 1).all()
+    results = rows[:limit]
+
+    next_cursor = None
+    if len(rows) > limit:
+        last = results[-1]
+        next_cursor = encode_cursor(
+            sort_column, direction, getattr(last, sort_column.key), last.id
+        )
+
+    return results, next_cursor
+
+
+# ============================================================================
+# OPTIONAL TOTALS
+# ============================================================================
+
+
+def extract_total_mode(request_args: Dict[str, Any]) -> Optional[str]:
+    """
+    Extract the include_total parameter.
+
+    Args:
+        request_args: Flask request.args dictionary
+
+    Returns:
+        str or None: "exact", "estimate", "cached" or None (no total)
+
+    Raises:
+        ValueError: If the mode is not supported
+    """
+    mode = request_args.get("include_total")
+    if not mode or mode.lower() in ("false", "none", "0"):
+        return None
+
+    mode = mode.lower()
+    if mode == "true":
+        return "exact"
+    if mode not in TOTAL_MODES:
+        raise ValueError(f"include_total must be one of: {', '.join(TOTAL_MODES)}")
+    return mode
+
+
+def count_total(
+    query: Query,
+    mode: Optional[str],
+    tag: Optional[str] = None
+) -> Tuple[Optional[int], Optional[str]]:
+    """
+    Count the rows matched by a query, as cheaply as the caller allows.
+
+    Modes:
+        - exact: COUNT(*) over the filtered query
+        - estimate: Postgres planner row estimate (EXPLAIN), no table scan;
+          falls back to exact on other databases
+        - cached: exact count cached in Redis per filter signature for
+          COUNT_CACHE_TTL seconds, tagged with ``tag`` so invalidate_tags
+          on the table refreshes it
+
+    Args:
+        query: SQLAlchemy query with filters applied
+        mode: Total mode (None skips counting)
+        tag: Cache tag for cached totals (e.g. "leads")
+
+    Returns:
+        tuple: (total, total_type) - (None, None) when mode is None
+    """
+    if mode is None:
+        return None, None
+
+    query = query.order_by(None)
+
+    if mode == "estimate":
+        estimate = _estimate_count(query)
+        if estimate is not None:
+            return estimate, "estimate"
+        return query.count(), "exact"
+
+    if mode == "cached":
+        from app.utils.cache import cache_result
+
+        table = query.column_descriptions[0]["entity"].__tablename__
+
+        @cache_result(ttl=COUNT_CACHE_TTL, key_prefix="counts", tags=[tag or table])
+        def cached_count(table: str, signature: str) -> int:
+            return query.count()
+
+        return cached_count(table, _query_signature(query)), "cached"
+
+    return query.count(), "exact"
+
+
+def _literal_sql(query: Query) -> str:
+    """Render a query's SQL with parameters inlined."""
+    dialect = query.session.get_bind().dialect
+    return str(query.statement.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+
+
+def _query_signature(query: Query) -> str:
+    """Stable hash of a query's SQL and parameters (its filter signature)."""
+    try:
+        sql = _literal_sql(query)
+    except Exception:
+        compiled = query.statement.compile()
+        sql = f"{compiled}:{sorted((k, repr(v)) for k, v in compiled.params.items())}"
+    return hashlib.md5(sql.encode()).hexdigest()
+
+
+def _estimate_count(query: Query) -> Optional[int]:
+    """
+    Planner row estimate for a query (Postgres only).
+
+    Returns:
+        int or None: Estimated rows, or None when unavailable
+    """
+    if query.session.get_bind().dialect.name != "postgresql":
+        return None
+
+    try:
+        # Escape colons so literal timestamps aren't read as bind params
+        sql = _literal_sql(query).replace(":", "\\:")
+        plan = query.session.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+    except Exception:
+        return None
+
+
+def create_keyset_response(
+    items: List[Any],
+    next_cursor: Optional[str],
+    limit: int,
+    total: Optional[int] = None,
+    total_type: Optional[str] = None,
+    data_key: str = "data"
+) -> Dict[str, Any]:
+    """
+    Create standardized keyset pagination response.
+
+    Args:
+        items: List of result items
+        next_cursor: Cursor for the next page (None on the last page)
+        limit: Items per page
+        total: Optional total count
+        total_type: How the total was obtained ("exact", "estimate", "cached")
+        data_key: Key holding the items (default: "data")
+
+    Returns:
+        dict: Keyset-paginated response with metadata
+
+    Example:
+        # Returns:
+        {
+            "data": [...items...],
+            "pagination": {
+                "limit": 50,
+                "has_next": True,
+                "next_cursor": "eyJzIjoiY3JlYXRlZF9hdCIs...",
+                "total_items": 1200,
+                "total_type": "estimate"
+            }
+        }
+    """
+    pagination = {
+        "limit": limit,
+        "has_next": next_cursor is not None,
+        "next_cursor": next_cursor,
+    }
+
+    if total is not None:
+        pagination["total_items"] = total
+        pagination["total_type"] = total_type
+
+    return {data_key: items, "pagination": pagination}
+
+
 # Export public API
 __all__ = [
     "paginate_query",
     "create_pagination_response",
     "paginate_cursor",
     "extract_pagination_params",
-    "create_cursor_response"
+    "create_cursor_response",
+    "resolve_keyset_sort",
+    "encode_cursor",
+    "decode_cursor",
+    "paginate_keyset",
+    "extract_total_mode",
+    "count_total",
+    "create_keyset_response",
+    "TOTAL_MODES",
+    "COUNT_CACHE_TTL"
 ]
@@ -7,7 +7,7 @@ import redis
 import json
 import hashlib
 from functools import wraps
-from typing import Optional, Any, Callable
+from typing import Optional, Any, Callable, Dict, List
 import os
 import logging
 from datetime import timedelta
@@ -94,6 +94,36 @@ def cache_prediction(ttl: int = DEFAULT_TTL, key_prefix: str = "ml") -> Callable
     return decorator
 
 
+def cache_get_many(keys: List[str]) -> List[Optional[Any]]:
+    """Fetch many cached values with one MGET (None for each miss)"""
+    if not ENABLED or redis_client is None or not keys:
+        return [None] * len(keys)
+
+    try:
+        return [json.loads(value) if value else None for value in redis_client.mget(keys)]
+
+    except redis.RedisError as e:
+        logger.error(f"❌ Redis error: {e}. Treating {len(keys)} keys as misses.")
+        return [None] * len(keys)
+
+
+def cache_set_many(items: Dict[str, Any], ttl: int = DEFAULT_TTL) -> int:
+    """Store many values with TTL in one pipelined round trip"""
+    if not ENABLED or redis_client is None or not items:
+        return 0
+
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        for key, value in items.items():
+            pipe.setex(key, ttl, json.dumps(value, default=str))
+        pipe.execute()
+        return len(items)
+
+    except redis.RedisError as e:
+        logger.error(f"❌ Redis error: {e}. {len(items)} values not cached.")
+        return 0
+
+
 def invalidate_cache(key_pattern: str) -> int:
     """Invalidate cache entries matching pattern"""
     if not ENABLED or redis_client is None:
@@ -101,12 +131,13 @@ def invalidate_cache(key_pattern: str) -> int:
         return 0
 
     try:
-        keys = redis_client.keys(key_pattern)
+        # SCAN instead of KEYS so a large prediction cache doesn't block Redis
+        keys = list(redis_client.scan_iter(match=key_pattern, count=1000))
         if not keys:
             logger.info(f"No cache keys found matching: {key_pattern}")
             return 0
 
-        count = redis_client.delete(*keys)
+        count = sum(redis_client.delete(*keys[i:i + 1000]) for i in range(0, len(keys), 1000))
         logger.info(f"✅ Invalidated {count} cache entries matching: {key_pattern}")
         return count
 
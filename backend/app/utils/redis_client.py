@@ -19,6 +19,15 @@ from redis.exceptions import ConnectionError, TimeoutError
 logger = logging.getLogger(__name__)
 
 
+# Deletes KEYS[1] only while it still holds ARGV[1], atomically on the server
+DELETE_IF_EQUALS_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
 class RedisClient:
     """
     Redis client wrapper with connection pooling and error handling
@@ -92,7 +101,7 @@ class RedisClient:
             logger.error(f"Redis GET error for key {key}: {str(e)}")
             return None
 
-    def set(self, key: str, value: str, ex: int | None = None) -> bool:
+    def set(self, key: str, value: str, ex: int | None = None, nx: bool = False) -> bool:
         """
         Set key-value pair
 
@@ -100,17 +109,27 @@ class RedisClient:
             key: Redis key
             value: Value to store
             ex: Optional expiration in seconds
+            nx: Only set the key if it does not already exist
 
         Returns:
             Success boolean
         """
         try:
             self._ensure_connected()
-            return self.client.set(key, value, ex=ex)
+            return bool(self.client.set(key, value, ex=ex, nx=nx))
         except Exception as e:
             logger.error(f"Redis SET error for key {key}: {str(e)}")
             return False
 
+    def delete_if_equals(self, key: str, value: str) -> bool:
+        """Delete key only if it still holds value (compare-and-delete, e.g. releasing a lock)"""
+        try:
+            self._ensure_connected()
+            return bool(self.client.eval(DELETE_IF_EQUALS_SCRIPT, 1, key, value))
+        except Exception as e:
+            logger.error(f"Redis compare-and-delete error for key {key}: {str(e)}")
+            return False
+
     def setex(self, key: str, seconds: int, value: str) -> bool:
         """Set key with expiration"""
         try:
@@ -138,6 +157,15 @@ class RedisClient:
             logger.error(f"Redis EXISTS error for key {key}: {str(e)}")
             return False
 
+    def rename(self, src: str, dst: str) -> bool:
+        """Atomically move src to dst, replacing dst"""
+        try:
+            self._ensure_connected()
+            return bool(self.client.rename(src, dst))
+        except Exception as e:
+            logger.error(f"Redis RENAME error for key {src}: {str(e)}")
+            return False
+
     def expire(self, key: str, seconds: int) -> bool:
         """Set expiration on existing key"""
         try:
@@ -201,6 +229,15 @@ class RedisClient:
             logger.error(f"Redis HGETALL error for {name}: {str(e)}")
             return {}
 
+    def hlen(self, name: str) -> int:
+        """Get number of fields in hash"""
+        try:
+            self._ensure_connected()
+            return self.client.hlen(name)
+        except Exception as e:
+            logger.error(f"Redis HLEN error for {name}: {str(e)}")
+            return 0
+
     def hdel(self, name: str, *keys: str) -> int:
         """Delete hash fields"""
         try:
@@ -291,6 +328,53 @@ class RedisClient:
             logger.error(f"Redis SISMEMBER error for key {key}: {str(e)}")
             return False
 
+    def setbit(self, key: str, offset: int, value: int) -> int:
+        """Set bit at offset, returning the previous bit"""
+        try:
+            self._ensure_connected()
+            return int(self.client.setbit(key, offset, value))
+        except Exception as e:
+            logger.error(f"Redis SETBIT error for key {key}: {str(e)}")
+            return 0
+
+    def getbit(self, key: str, offset: int) -> int:
+        """Get bit at offset"""
+        try:
+            self._ensure_connected()
+            return int(self.client.getbit(key, offset))
+        except Exception as e:
+            logger.error(f"Redis GETBIT error for key {key}: {str(e)}")
+            return 0
+
+    def zadd(self, key: str, mapping: dict[str, float], nx: bool = False, xx: bool = False) -> int:
+        """Add members to a sorted set with their scores (nx: only new members, xx: only existing)"""
+        try:
+            self._ensure_connected()
+            return self.client.zadd(key, mapping, nx=nx, xx=xx)
+        except Exception as e:
+            logger.error(f"Redis ZADD error for key {key}: {str(e)}")
+            return 0
+
+    def zrem(self, key: str, *values: str) -> int:
+        """Remove members from a sorted set"""
+        try:
+            self._ensure_connected()
+            return self.client.zrem(key, *values)
+        except Exception as e:
+            logger.error(f"Redis ZREM error for key {key}: {str(e)}")
+            return 0
+
+    def zrangebyscore(
+        self, key: str, min: float | str, max: float | str, start: int | None = None, num: int | None = None
+    ) -> list[str]:
+        """Get sorted set members with scores between min and max, lowest first"""
+        try:
+            self._ensure_connected()
+            return self.client.zrangebyscore(key, min, max, start=start, num=num) or []
+        except Exception as e:
+            logger.error(f"Redis ZRANGEBYSCORE error for key {key}: {str(e)}")
+            return []
+
     def publish(self, channel: str, message: str) -> int:
         """Publish message to channel"""
         try:
@@ -366,11 +450,13 @@ class MockRedisClient:
     def get(self, key: str) -> str | None:
         return self.storage.get(key)
 
-    def set(self, key: str, value: str, ex: int | None = None) -> bool:
+    def set(self, key: str, value: str, ex: int | None = None, nx: bool = False) -> bool:
+        import time
+
+        if nx and key in self.storage and self.expiry.get(key, float("inf")) > time.time():
+            return False
         self.storage[key] = value
         if ex:
-            import time
-
             self.expiry[key] = time.time() + ex
         return True
 
@@ -389,9 +475,23 @@ class MockRedisClient:
                 count += 1
         return count
 
+    def delete_if_equals(self, key: str, value: str) -> bool:
+        if self.storage.get(key) != value:
+            return False
+        return bool(self.delete(key))
+
     def exists(self, key: str) -> bool:
         return key in self.storage
 
+    def rename(self, src: str, dst: str) -> bool:
+        if src not in self.storage:
+            return False
+        self.storage[dst] = self.storage.pop(src)
+        self.expiry.pop(dst, None)
+        if src in self.expiry:
+            self.expiry[dst] = self.expiry.pop(src)
+        return True
+
     def expire(self, key: str, seconds: int) -> bool:
         if key in self.storage:
             import time
@@ -440,6 +540,9 @@ class MockRedisClient:
                 result[field] = v
         return result
 
+    def hlen(self, name: str) -> int:
+        return len(self.hgetall(name))
+
     def hdel(self, name: str, *keys: str) -> int:
         count = 0
         for key in keys:
@@ -503,6 +606,52 @@ class MockRedisClient:
         s = set(json.loads(self.storage.get(key, "[]")))
         return value in s
 
+    def setbit(self, key: str, offset: int, value: int) -> int:
+        bits = self.storage.setdefault(key, bytearray())
+        byte, bit = divmod(offset, 8)
+        if len(bits) <= byte:
+            bits.extend(bytes(byte + 1 - len(bits)))
+        mask = 0x80 >> bit
+        previous = 1 if bits[byte] & mask else 0
+        bits[byte] = bits[byte] | mask if value else bits[byte] & ~mask
+        return previous
+
+    def getbit(self, key: str, offset: int) -> int:
+        bits = self.storage.get(key, bytearray())
+        byte, bit = divmod(offset, 8)
+        if byte >= len(bits):
+            return 0
+        return 1 if bits[byte] & (0x80 >> bit) else 0
+
+    def zadd(self, key: str, mapping: dict[str, float], nx: bool = False, xx: bool = False) -> int:
+        z = json.loads(self.storage.get(key, "{}"))
+        added = 0 if xx else len(set(mapping) - set(z))
+        z.update(
+            {
+                member: float(score)
+                for member, score in mapping.items()
+                if not (nx and member in z) and not (xx and member not in z)
+            }
+        )
+        self.storage[key] = json.dumps(z)
+        return added
+
+    def zrem(self, key: str, *values: str) -> int:
+        z = json.loads(self.storage.get(key, "{}"))
+        removed = sum(1 for v in values if z.pop(v, None) is not None)
+        self.storage[key] = json.dumps(z)
+        return removed
+
+    def zrangebyscore(
+        self, key: str, min: float | str, max: float | str, start: int | None = None, num: int | None = None
+    ) -> list[str]:
+        low, high = float(min), float(max)
+        z = json.loads(self.storage.get(key, "{}"))
+        members = [m for m, score in sorted(z.items(), key=lambda item: (item[1], item[0])) if low <= score <= high]
+        if start is not None and num is not None:
+            members = members[start : start + num]
+        return members
+
     def publish(self, channel: str, message: str) -> int:
         # Mock publish, just log
         logger.debug(f"Mock publish to {channel}: {message}")
@@ -528,8 +677,31 @@ class MockRedisClient:
         return next_cursor, matching_keys[start:end]
 
     def pipeline(self):
-        # Return self for basic chaining
-        return self
+        return MockPipeline(self)
+
+
+class MockPipeline:
+    """
+    Mock Redis pipeline that queues commands and runs them on execute()
+    """
+
+    def __init__(self, client: MockRedisClient):
+        self.client = client
+        self.commands = []
+
+    def __getattr__(self, name: str):
+        method = getattr(self.client, name)
+
+        def queue(*args, **kwargs):
+            self.commands.append((method, args, kwargs))
+            return self
+
+        return queue
+
+    def execute(self) -> list[Any]:
+        results = [method(*args, **kwargs) for method, args, kwargs in self.commands]
+        self.commands = []
+        return results
 
 
 # Create singleton instance
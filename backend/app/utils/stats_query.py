@@ -0,0 +1,177 @@
+"""
+iSwitch Roofs CRM - Conditional Aggregate Stats Builder
+Version: 1.0.0
+Date: 2026-10-16
+
+PURPOSE:
+Collect many dashboard counters into a single scan per table, using
+COUNT(*) FILTER (WHERE ...) / SUM(...) FILTER (WHERE ...) instead of one
+COUNT query per counter. Several tables can be combined into one SELECT,
+so a whole dashboard payload costs one database round trip.
+
+USAGE:
+    from app.utils.stats_query import StatsQuery, date_range, day_bounds, run_stats
+
+    today_start, tomorrow_start = day_bounds(date.today())
+
+    leads = (
+        StatsQuery(Lead, Lead.is_deleted == False)
+        .count("total_leads")
+        .count("hot_leads", Lead.lead_score >= 80)
+        .count("leads_today", *date_range(Lead.created_at, today_start, tomorrow_start))
+        .avg("avg_response", Lead.response_time_minutes)
+    )
+    customers = StatsQuery(Customer).count("total_customers")
+
+    stats = run_stats(db, leads, customers)
+    # {"total_leads": 120, "hot_leads": 14, "leads_today": 3, ...}
+
+SARGABLE DATES:
+Never wrap an indexed column in a function (``func.date(created_at) == today``);
+use ``date_range`` to compare the raw column against half-open datetime bounds
+so the created_at indexes stay usable.
+"""
+
+from datetime import date, datetime, time, timedelta
+from functools import reduce
+from typing import Any, Optional
+
+from sqlalchemy import and_, func, select, true
+from sqlalchemy.orm import Session
+
+
+def day_bounds(day: date) -> tuple[datetime, datetime]:
+    """
+    Get the half-open datetime range covering one calendar day.
+
+    Args:
+        day: Calendar date
+
+    Returns:
+        tuple: (start of day, start of next day)
+    """
+    start = datetime.combine(day, time.min)
+    return start, start + timedelta(days=1)
+
+
+def date_range(
+    column: Any,
+    start: Optional[date] = None,
+    end: Optional[date] = None
+) -> list[Any]:
+    """
+    Build index-friendly range predicates: ``start <= column < end``.
+
+    Args:
+        column: Date/datetime column
+        start: Inclusive lower bound (dates are promoted to midnight)
+        end: Exclusive upper bound (dates are promoted to midnight)
+
+    Returns:
+        list: Predicates to splat into a filter
+    """
+    predicates = []
+    if start is not None:
+        predicates.append(column >= _as_datetime(start))
+    if end is not None:
+        predicates.append(column < _as_datetime(end))
+    return predicates
+
+
+def _as_datetime(value: date) -> datetime:
+    """Promote a date to midnight; datetimes pass through."""
+    if isinstance(value, datetime):
+        return value
+    return datetime.combine(value, time.min)
+
+
+class StatsQuery:
+    """
+    Named conditional aggregates over one table, evaluated in a single scan.
+
+    Each counter becomes one ``AGG(...) FILTER (WHERE ...)`` column of the
+    same SELECT. Counter names must be unique across queries passed to
+    ``run_stats`` together.
+    """
+
+    def __init__(self, model: Any, *base_filters: Any):
+        """
+        Args:
+            model: SQLAlchemy model (table) to aggregate over
+            *base_filters: Predicates applied to every counter (WHERE clause)
+        """
+        self.model = model
+        self.base_filters = base_filters
+        self.columns: list[Any] = []
+
+    def _add(self, name: str, aggregate: Any, conditions: tuple) -> "StatsQuery":
+        if conditions:
+            aggregate = aggregate.filter(and_(*conditions))
+        self.columns.append(aggregate.label(name))
+        return self
+
+    def count(self, name: str, *conditions: Any) -> "StatsQuery":
+        """Count rows matching all conditions."""
+        return self._add(name, func.count(), conditions)
+
+    def sum(self, name: str, column: Any, *conditions: Any) -> "StatsQuery":
+        """Sum a column over rows matching all conditions (0 when none match)."""
+        aggregate = func.sum(column)
+        if conditions:
+            aggregate = aggregate.filter(and_(*conditions))
+        self.columns.append(func.coalesce(aggregate, 0).label(name))
+        return self
+
+    def avg(self, name: str, column: Any, *conditions: Any) -> "StatsQuery":
+        """Average a column over rows matching all conditions (NULL when none match)."""
+        return self._add(name, func.avg(column), conditions)
+
+    def statement(self):
+        """Build the single-row SELECT for this table."""
+        stmt = select(*self.columns).select_from(self.model)
+        if self.base_filters:
+            stmt = stmt.where(*self.base_filters)
+        return stmt
+
+    def run(self, db: Session) -> dict[str, Any]:
+        """
+        Execute this query on its own.
+
+        Returns:
+            dict: Counter name -> value
+        """
+        return dict(db.execute(self.statement()).one()._mapping)
+
+
+def run_stats(db: Session, *queries: StatsQuery) -> dict[str, Any]:
+    """
+    Evaluate several StatsQuery objects in one round trip.
+
+    Each query is a single-row subquery; they are cross-joined so the
+    database returns every counter in one row.
+
+    Args:
+        db: Database session
+        *queries: Stats queries (one per table)
+
+    Returns:
+        dict: Counter name -> value for all queries
+    """
+    if len(queries) == 1:
+        return queries[0].run(db)
+
+    subqueries = [query.statement().subquery() for query in queries]
+    joined = reduce(lambda left, right: left.join(right, true()), subqueries)
+    stmt = select(*[column for subquery in subqueries for column in subquery.c]).select_from(
+        joined
+    )
+
+    return dict(db.execute(stmt).one()._mapping)
+
+
+__all__ = [
+    "StatsQuery",
+    "date_range",
+    "day_bounds",
+    "run_stats",
+]
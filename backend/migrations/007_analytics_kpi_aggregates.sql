@@ -0,0 +1,262 @@
+-- iSwitch Roofs CRM KPI Aggregation Functions
+-- Version: 1.0.0
+-- Date: 2026-10-16
+-- Purpose: Compute AnalyticsService KPIs inside Postgres
+--
+-- RATIONALE:
+-- AnalyticsService used to pull every lead, project, customer and review row
+-- in the reporting window through Supabase and count/sum/average in Python.
+-- These functions return one JSONB object of aggregates per call instead, so
+-- calculate_kpis() transfers a few hundred bytes regardless of table size.
+--
+-- Called through Supabase RPC from app/services/analytics_aggregates.py.
+-- Until this migration is applied, AnalyticsService falls back to the
+-- row-pulling implementation.
+--
+-- ROLLBACK:
+-- DROP FUNCTION statements at the end of this file
+
+-- ============================================================================
+-- SUPPORTING INDEXES
+-- ============================================================================
+
+-- Window scans on projects, customers and reviews by creation time
+CREATE INDEX IF NOT EXISTS idx_projects_created_at
+ON projects(created_at);
+
+CREATE INDEX IF NOT EXISTS idx_customers_created_at
+ON customers(created_at);
+
+CREATE INDEX IF NOT EXISTS idx_reviews_created_at
+ON reviews(created_at);
+
+-- ============================================================================
+-- LEAD METRICS
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION analytics_lead_metrics(p_start TIMESTAMPTZ, p_end TIMESTAMPTZ)
+RETURNS JSONB
+LANGUAGE sql
+STABLE
+AS $$
+    WITH window_leads AS (
+        SELECT
+            temperature::text AS temperature,
+            COALESCE(source::text, 'unknown') AS source,
+            COALESCE(lead_score, 0) AS lead_score,
+            response_time_minutes
+        FROM leads
+        WHERE created_at >= p_start
+          AND created_at <= p_end
+    ),
+    totals AS (
+        SELECT
+            COUNT(*) AS total,
+            COUNT(*) FILTER (WHERE temperature = 'hot') AS hot,
+            COUNT(*) FILTER (WHERE temperature = 'warm') AS warm,
+            COUNT(*) FILTER (WHERE temperature = 'cold') AS cold,
+            AVG(response_time_minutes) FILTER (WHERE response_time_minutes <> 0) AS avg_response_time,
+            AVG(lead_score) AS avg_lead_score
+        FROM window_leads
+    ),
+    by_source AS (
+        SELECT source, COUNT(*) AS lead_count
+        FROM window_leads
+        GROUP BY source
+    )
+    SELECT jsonb_build_object(
+        'total', t.total,
+        'hot', t.hot,
+        'warm', t.warm,
+        'cold', t.cold,
+        'avg_response_time', COALESCE(t.avg_response_time, 0),
+        'avg_lead_score', COALESCE(t.avg_lead_score, 0),
+        'previous_total', (
+            SELECT COUNT(*)
+            FROM leads
+            WHERE created_at >= p_start - (p_end - p_start)
+              AND created_at < p_start
+        ),
+        'sources', COALESCE((SELECT jsonb_object_agg(source, lead_count) FROM by_source), '{}'::jsonb)
+    )
+    FROM totals t;
+$$;
+
+-- ============================================================================
+-- REVENUE METRICS
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION analytics_revenue_metrics(p_start TIMESTAMPTZ, p_end TIMESTAMPTZ)
+RETURNS JSONB
+LANGUAGE sql
+STABLE
+AS $$
+    WITH window_projects AS (
+        SELECT
+            status::text AS status,
+            COALESCE(project_type::text, 'unknown') AS project_type,
+            COALESCE(quoted_amount, 0)::numeric AS quoted_amount,
+            COALESCE(actual_amount, 0)::numeric AS actual_amount,
+            margin_percentage::numeric AS margin_percentage
+        FROM projects
+        WHERE created_at >= p_start
+          AND created_at <= p_end
+    ),
+    totals AS (
+        SELECT
+            COUNT(*) AS total_projects,
+            COUNT(*) FILTER (WHERE status = 'completed') AS completed_projects,
+            COALESCE(SUM(quoted_amount), 0) AS total_quoted,
+            COALESCE(SUM(actual_amount) FILTER (WHERE status = 'completed'), 0) AS total_actual,
+            COALESCE(SUM(quoted_amount) FILTER (WHERE status IN ('approved', 'in_progress')), 0)
+                AS pipeline_value,
+            AVG(actual_amount) FILTER (WHERE status = 'completed') AS avg_deal_size,
+            AVG(margin_percentage) FILTER (WHERE status = 'completed' AND margin_percentage <> 0)
+                AS avg_margin
+        FROM window_projects
+    ),
+    by_type AS (
+        SELECT project_type, SUM(actual_amount) AS revenue
+        FROM window_projects
+        WHERE status = 'completed'
+        GROUP BY project_type
+    )
+    SELECT jsonb_build_object(
+        'total_projects', t.total_projects,
+        'completed_projects', t.completed_projects,
+        'total_quoted', t.total_quoted,
+        'total_actual', t.total_actual,
+        'pipeline_value', t.pipeline_value,
+        'avg_deal_size', COALESCE(t.avg_deal_size, 0),
+        'avg_margin', COALESCE(t.avg_margin, 0),
+        'revenue_by_type', COALESCE((SELECT jsonb_object_agg(project_type, revenue) FROM by_type), '{}'::jsonb)
+    )
+    FROM totals t;
+$$;
+
+-- ============================================================================
+-- CONVERSION METRICS
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION analytics_conversion_metrics(p_start TIMESTAMPTZ, p_end TIMESTAMPTZ)
+RETURNS JSONB
+LANGUAGE sql
+STABLE
+AS $$
+    WITH window_leads AS (
+        SELECT
+            status::text AS status,
+            temperature::text AS temperature,
+            COALESCE(source::text, 'unknown') AS source,
+            created_at,
+            converted_to_customer_at
+        FROM leads
+        WHERE created_at >= p_start
+          AND created_at <= p_end
+    ),
+    totals AS (
+        SELECT
+            COUNT(*) AS total_leads,
+            COUNT(*) FILTER (WHERE status IN ('qualified', 'converted')) AS qualified_leads,
+            COUNT(*) FILTER (WHERE status = 'converted') AS converted_leads,
+            -- Whole days, floored like Python's timedelta.days
+            AVG(FLOOR(EXTRACT(EPOCH FROM (converted_to_customer_at - created_at)) / 86400))
+                FILTER (WHERE converted_to_customer_at IS NOT NULL) AS avg_conversion_days
+        FROM window_leads
+    ),
+    by_temperature AS (
+        SELECT
+            temperature,
+            COUNT(*) AS total,
+            COUNT(*) FILTER (WHERE status = 'converted') AS converted
+        FROM window_leads
+        WHERE temperature IN ('hot', 'warm', 'cold')
+        GROUP BY temperature
+    ),
+    by_source AS (
+        SELECT
+            source,
+            COUNT(*) AS total,
+            COUNT(*) FILTER (WHERE status = 'converted') AS converted
+        FROM window_leads
+        GROUP BY source
+    )
+    SELECT jsonb_build_object(
+        'total_leads', t.total_leads,
+        'qualified_leads', t.qualified_leads,
+        'converted_leads', t.converted_leads,
+        'avg_conversion_days', COALESCE(t.avg_conversion_days, 0),
+        'by_temperature', COALESCE((
+            SELECT jsonb_object_agg(temperature, jsonb_build_object('total', total, 'converted', converted))
+            FROM by_temperature
+        ), '{}'::jsonb),
+        'by_source', COALESCE((
+            SELECT jsonb_object_agg(source, jsonb_build_object('total', total, 'converted', converted))
+            FROM by_source
+        ), '{}'::jsonb)
+    )
+    FROM totals t;
+$$;
+
+-- ============================================================================
+-- CUSTOMER METRICS
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION analytics_customer_metrics(p_start TIMESTAMPTZ, p_end TIMESTAMPTZ)
+RETURNS JSONB
+LANGUAGE sql
+STABLE
+AS $$
+    WITH window_customers AS (
+        SELECT
+            lifetime_value::numeric AS lifetime_value,
+            COALESCE(referral_source, 'direct') AS referral_source
+        FROM customers
+        WHERE created_at >= p_start
+          AND created_at <= p_end
+    ),
+    window_reviews AS (
+        SELECT COALESCE(rating, 0) AS rating
+        FROM reviews
+        WHERE created_at >= p_start
+          AND created_at <= p_end
+    ),
+    by_referral AS (
+        SELECT referral_source, COUNT(*) AS customer_count
+        FROM window_customers
+        GROUP BY referral_source
+    )
+    SELECT jsonb_build_object(
+        'new_customers', (SELECT COUNT(*) FROM window_customers),
+        'total_customers', (SELECT COUNT(*) FROM customers),
+        'avg_lifetime_value', COALESCE(
+            (SELECT AVG(lifetime_value) FILTER (WHERE lifetime_value <> 0) FROM window_customers), 0
+        ),
+        'referral_sources', COALESCE(
+            (SELECT jsonb_object_agg(referral_source, customer_count) FROM by_referral), '{}'::jsonb
+        ),
+        'total_reviews', r.total_reviews,
+        'avg_rating', COALESCE(r.avg_rating, 0),
+        'promoters', r.promoters,
+        'detractors', r.detractors
+    )
+    FROM (
+        SELECT
+            COUNT(*) AS total_reviews,
+            AVG(rating) AS avg_rating,
+            COUNT(*) FILTER (WHERE rating >= 4) AS promoters,
+            COUNT(*) FILTER (WHERE rating <= 2) AS detractors
+        FROM window_reviews
+    ) r;
+$$;
+
+-- ============================================================================
+-- ROLLBACK
+-- ============================================================================
+-- DROP FUNCTION IF EXISTS analytics_lead_metrics(TIMESTAMPTZ, TIMESTAMPTZ);
+-- DROP FUNCTION IF EXISTS analytics_revenue_metrics(TIMESTAMPTZ, TIMESTAMPTZ);
+-- DROP FUNCTION IF EXISTS analytics_conversion_metrics(TIMESTAMPTZ, TIMESTAMPTZ);
+-- DROP FUNCTION IF EXISTS analytics_customer_metrics(TIMESTAMPTZ, TIMESTAMPTZ);
+-- DROP INDEX IF EXISTS idx_projects_created_at;
+-- DROP INDEX IF EXISTS idx_customers_created_at;
+-- DROP INDEX IF EXISTS idx_reviews_created_at;
@@ -0,0 +1,69 @@
+-- iSwitch Roofs CRM Keyset Pagination Indexes
+-- Version: 1.0.0
+-- Date: 2026-10-16
+-- Purpose: Support cursor (keyset) pagination on list endpoints
+--
+-- RATIONALE:
+-- /api/leads, /api/customers, /api/projects and /api/appointments accept
+-- ?cursor= for keyset pagination. Each page is fetched with
+--   WHERE (sort_key, id) < (:last_sort_key, :last_id) ORDER BY sort_key, id LIMIT n
+-- A composite (sort_key, id) index lets Postgres seek straight to the cursor
+-- position, so deep pages cost the same as the first one.
+--
+-- Partial indexes match the is_deleted = false filter every list query applies.
+--
+-- ROLLBACK:
+-- DROP INDEX statements at the end of this file
+
+-- ============================================================================
+-- LEADS
+-- ============================================================================
+
+-- Query pattern: ... WHERE is_deleted = false ORDER BY created_at DESC, id DESC
+CREATE INDEX IF NOT EXISTS idx_leads_keyset_created_at
+ON leads(created_at, id)
+WHERE is_deleted = false;
+
+-- Query pattern: ... WHERE is_deleted = false ORDER BY lead_score DESC, id DESC
+CREATE INDEX IF NOT EXISTS idx_leads_keyset_lead_score
+ON leads(lead_score, id)
+WHERE is_deleted = false;
+
+-- ============================================================================
+-- CUSTOMERS
+-- ============================================================================
+
+CREATE INDEX IF NOT EXISTS idx_customers_keyset_created_at
+ON customers(created_at, id)
+WHERE is_deleted = false;
+
+CREATE INDEX IF NOT EXISTS idx_customers_keyset_lifetime_value
+ON customers(lifetime_value, id)
+WHERE is_deleted = false;
+
+-- ============================================================================
+-- PROJECTS
+-- ============================================================================
+
+CREATE INDEX IF NOT EXISTS idx_projects_keyset_created_at
+ON projects(created_at, id)
+WHERE is_deleted = false;
+
+-- ============================================================================
+-- APPOINTMENTS
+-- ============================================================================
+
+-- Query pattern: ... WHERE is_deleted = false ORDER BY scheduled_date ASC, id ASC
+CREATE INDEX IF NOT EXISTS idx_appointments_keyset_scheduled_date
+ON appointments(scheduled_date, id)
+WHERE is_deleted = false;
+
+-- ============================================================================
+-- ROLLBACK
+-- ============================================================================
+-- DROP INDEX IF EXISTS idx_leads_keyset_created_at;
+-- DROP INDEX IF EXISTS idx_leads_keyset_lead_score;
+-- DROP INDEX IF EXISTS idx_customers_keyset_created_at;
+-- DROP INDEX IF EXISTS idx_customers_keyset_lifetime_value;
+-- DROP INDEX IF EXISTS idx_projects_keyset_created_at;
+-- DROP INDEX IF EXISTS idx_appointments_keyset_scheduled_date;
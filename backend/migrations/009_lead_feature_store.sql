@@ -0,0 +1,36 @@
+-- iSwitch Roofs CRM Lead Feature Store
+-- Version: 1.0.0
+-- Date: 2026-10-16
+-- Purpose: Precomputed per-lead aggregates for online NBA inference
+--
+-- RATIONALE:
+-- /api/v1/ml/predict/nba used to receive each lead's full interaction and
+-- appointment history in the request body and recompute rates every call.
+-- lead_features keeps running counters per lead, bumped by one upsert per
+-- new interaction/appointment, so /api/v1/ml/predict/nba/leads can score
+-- leads from their ids with one indexed read regardless of history length.
+--
+-- Maintained by app/ml/feature_store.py (LeadFeatureStore); backfill with
+-- LeadFeatureStore.rebuild().
+--
+-- ROLLBACK:
+-- DROP TABLE IF EXISTS lead_features;
+
+CREATE TABLE IF NOT EXISTS lead_features (
+    lead_id VARCHAR(36) PRIMARY KEY,
+
+    -- Interaction counters
+    interaction_count INTEGER NOT NULL DEFAULT 0,
+    email_count INTEGER NOT NULL DEFAULT 0,
+    email_opened_count INTEGER NOT NULL DEFAULT 0,
+    outbound_count INTEGER NOT NULL DEFAULT 0,
+    outbound_responded_count INTEGER NOT NULL DEFAULT 0,
+    total_duration_minutes DOUBLE PRECISION NOT NULL DEFAULT 0,
+    last_interaction_at TIMESTAMP,
+
+    -- Appointment counters
+    appointment_count INTEGER NOT NULL DEFAULT 0,
+    appointment_completed_count INTEGER NOT NULL DEFAULT 0,
+
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
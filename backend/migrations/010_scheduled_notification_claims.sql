@@ -0,0 +1,59 @@
+-- iSwitch Roofs CRM Scheduled Notification Claims
+-- Version: 1.0.0
+-- Date: 2026-10-16
+-- Purpose: Let several notification workers drain scheduled_notifications
+--
+-- RATIONALE:
+-- process_scheduled_notifications used to select every due row and send
+-- them one by one. Two workers running the scheduler both saw the same rows
+-- and double-sent them. claim_scheduled_notifications() hands each worker a
+-- disjoint batch: due rows are locked with FOR UPDATE SKIP LOCKED and
+-- flipped to 'sending' in the same statement, so concurrent claims never
+-- overlap. Rows left in 'sending' by a worker that died are claimable again
+-- once their lease expires.
+--
+-- Called through Supabase RPC from app/services/notification.py. Until this
+-- migration is applied, workers claim with a conditional status update
+-- (status = 'pending') instead.
+--
+-- ROLLBACK:
+-- DROP FUNCTION IF EXISTS claim_scheduled_notifications(TEXT, INTEGER, INTEGER);
+-- DROP INDEX IF EXISTS idx_scheduled_notifications_due;
+-- ALTER TABLE scheduled_notifications DROP COLUMN IF EXISTS claimed_by, DROP COLUMN IF EXISTS claimed_at;
+
+ALTER TABLE scheduled_notifications
+    ADD COLUMN IF NOT EXISTS claimed_by TEXT,
+    ADD COLUMN IF NOT EXISTS claimed_at TIMESTAMPTZ;
+
+-- Due-row scans only touch unsent rows
+CREATE INDEX IF NOT EXISTS idx_scheduled_notifications_due
+ON scheduled_notifications(scheduled_for)
+WHERE status IN ('pending', 'sending');
+
+CREATE OR REPLACE FUNCTION claim_scheduled_notifications(
+    p_worker TEXT,
+    p_batch_size INTEGER,
+    p_lease_seconds INTEGER DEFAULT 300
+)
+RETURNS SETOF scheduled_notifications
+LANGUAGE sql
+AS $$
+    UPDATE scheduled_notifications AS s
+    SET status = 'sending',
+        claimed_by = p_worker,
+        claimed_at = NOW()
+    FROM (
+        SELECT id
+        FROM scheduled_notifications
+        WHERE scheduled_for <= NOW()
+          AND (
+              status = 'pending'
+              OR (status = 'sending' AND claimed_at < NOW() - make_interval(secs => p_lease_seconds))
+          )
+        ORDER BY scheduled_for
+        LIMIT p_batch_size
+        FOR UPDATE SKIP LOCKED
+    ) AS due
+    WHERE s.id = due.id
+    RETURNING s.*;
+$$;
@@ -215,6 +215,15 @@ def reset_database():
     # After test: teardown
 
 
+@pytest.fixture(autouse=True)
+def forecast_model_dir(tmp_path, monkeypatch):
+    """Keep revenue forecast models fitted during tests out of the repository."""
+    from app.ml.forecasting_service import revenue_forecast_service
+
+    monkeypatch.setattr(revenue_forecast_service, "model_dir", tmp_path / "forecasts")
+    monkeypatch.setattr(revenue_forecast_service, "_models", {})
+
+
 @pytest.fixture
 def mock_datetime(mocker):
     """
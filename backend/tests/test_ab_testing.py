@@ -10,7 +10,11 @@ from unittest.mock import Mock, patch, MagicMock
 import hashlib
 from typing import Dict, List
 
-from app.ml.ab_testing import ABTestingFramework, ExperimentConfig
+import numpy as np
+
+from app.ml import ab_testing
+from app.ml.ab_testing import ABTestingFramework, ExperimentConfig, VariantStatsStore
+from app.utils import redis_cache
 
 
 class TestABTestingFramework:
@@ -515,5 +519,180 @@ class TestABTestingEdgeCases:
             framework.create_experiment(config)
 
 
+class FakeRedis:
+    """Just the commands VariantStatsStore uses"""
+
+    def __init__(self):
+        self.strings = {}
+        self.hashes = {}
+        self.lists = {}
+        self.transactions = 0
+
+    def set(self, key, value):
+        self.strings[key] = value
+
+    def get(self, key):
+        return self.strings.get(key)
+
+    def lrange(self, key, start, end):
+        return self.lists.get(key, [])[start:end + 1]
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self, transaction)
+
+
+class FakePipeline:
+    def __init__(self, redis, transaction):
+        self.redis, self.transaction, self.calls = redis, transaction, []
+
+    def __getattr__(self, name):
+        return lambda *args: self.calls.append((name, args))
+
+    def execute(self):
+        self.redis.transactions += self.transaction
+        out = []
+        for name, args in self.calls:
+            if name == 'incr':
+                value = int(self.redis.strings.get(args[0], 0)) + 1
+                self.redis.strings[args[0]] = str(value)
+            elif name == 'hgetall':
+                value = dict(self.redis.hashes.get(args[0], {}))
+            elif name == 'lpush':
+                items = self.redis.lists.setdefault(args[0], [])
+                items.insert(0, args[1])
+                value = len(items)
+            elif name == 'ltrim':
+                key, start, end = args
+                self.redis.lists[key] = self.redis.lists.get(key, [])[start:end + 1]
+                value = True
+            else:
+                key, field, amount = args
+                fields = self.redis.hashes.setdefault(key, {})
+                cast = int if name == 'hincrby' else float
+                value = cast(fields.get(field, 0)) + amount
+                fields[field] = str(value)
+            out.append(value)
+        return out
+
+
+class TestStreamingStatistics:
+    """Per-variant sufficient statistics and sequential testing."""
+
+    @staticmethod
+    def _config(**overrides):
+        config = dict(
+            name="Streaming Test",
+            description="Test description",
+            hypothesis="Variant converts better",
+            variants=[
+                {"id": "control", "name": "Control", "type": "control"},
+                {"id": "variant_a", "name": "Variant A", "type": "treatment"}
+            ],
+            traffic_allocation={"control": 0.5, "variant_a": 0.5},
+            metric="revenue",
+            min_sample_size=1000
+        )
+        config.update(overrides)
+        return ExperimentConfig(**config)
+
+    def test_statistics_match_raw_results(self):
+        framework = ABTestingFramework(Mock(), store=VariantStatsStore())
+        experiment_id = framework.create_experiment(self._config())['experiment_id']
+        rng = np.random.default_rng(3)
+        values = {'control': rng.gamma(2.0, 500.0, 300), 'variant_a': rng.gamma(2.5, 500.0, 200)}
+        for variant_id, metric_values in values.items():
+            for i, value in enumerate(metric_values):
+                framework.record_result(experiment_id, f"u{i}", variant_id, float(value), converted=value > 1000)
+
+        analysis = framework.analyze_experiment(experiment_id)
+
+        for variant in analysis['variants']:
+            raw = values[variant['variant_id']]
+            assert variant['sample_size'] == len(raw)
+            assert variant['avg_metric_value'] == round(float(np.mean(raw)), 2)
+            assert variant['conversion_rate'] == round(float(np.mean(raw > 1000)) * 100, 2)
+        summary = framework.get_experiment_summary(experiment_id)
+        assert summary['samples_per_variant'] == {'Control': 300, 'Variant A': 200}
+
+    def test_redis_counters_survive_restart(self):
+        fake = FakeRedis()
+        with patch.object(redis_cache, 'redis_client', fake):
+            first = ABTestingFramework(Mock())
+            experiment_id = first.create_experiment(self._config())['experiment_id']
+            for i in range(10):
+                result = first.record_result(experiment_id, f"u{i}", "variant_a", 100.0, converted=i < 4)
+
+            restarted = ABTestingFramework(Mock())
+            summary = restarted.get_experiment_summary(experiment_id)
+
+        assert result['result_id'] == 10
+        assert fake.transactions == 10
+        assert summary['samples_per_variant'] == {'Control': 0, 'Variant A': 10}
+        assert summary['overall_conversion_rate'] == 40.0
+
+    def test_user_and_metadata_kept_in_result_log(self):
+        framework = ABTestingFramework(Mock(), store=VariantStatsStore())
+        experiment_id = framework.create_experiment(self._config())['experiment_id']
+        framework.record_result(experiment_id, "u1", "control", 10.0, metadata={'source': 'email'})
+        framework.record_result(experiment_id, "u2", "variant_a", 20.0, converted=True)
+
+        results = framework.get_recent_results(experiment_id)
+
+        assert [r['user_id'] for r in results] == ["u2", "u1"]
+        assert results[0]['converted'] is True
+        assert results[1]['metadata'] == {'source': 'email'}
+        assert results[1]['variant_id'] == "control"
+
+    def test_redis_result_log_is_capped(self):
+        fake = FakeRedis()
+        with patch.object(redis_cache, 'redis_client', fake), patch.object(ab_testing, 'RESULT_LOG_SIZE', 5):
+            framework = ABTestingFramework(Mock())
+            experiment_id = framework.create_experiment(self._config())['experiment_id']
+            for i in range(8):
+                framework.record_result(experiment_id, f"u{i}", "control", 1.0, metadata={'i': i})
+
+            results = framework.get_recent_results(experiment_id, limit=50)
+            summary = framework.get_experiment_summary(experiment_id)
+
+        assert fake.transactions == 8
+        assert [r['user_id'] for r in results] == ["u7", "u6", "u5", "u4", "u3"]
+        assert results[0]['metadata'] == {'i': 7}
+        assert summary['samples_per_variant']['Control'] == 8
+
+    def test_unknown_variant_rejected(self):
+        framework = ABTestingFramework(Mock(), store=VariantStatsStore())
+        experiment_id = framework.create_experiment(self._config())['experiment_id']
+
+        with pytest.raises(ValueError, match="not found"):
+            framework.record_result(experiment_id, "u1", "variant_z", 1.0)
+
+    def _run_sequential(self, control_rate, variant_rate, checks=40, batch=50):
+        framework = ABTestingFramework(Mock(), store=VariantStatsStore())
+        experiment_id = framework.create_experiment(self._config(sequential_testing=True))['experiment_id']
+        rng = np.random.default_rng(11)
+        for check in range(checks):
+            for i in range(batch):
+                user = f"u{check}_{i}"
+                framework.record_result(experiment_id, user, "control", 0.0, converted=rng.random() < control_rate)
+                framework.record_result(experiment_id, user, "variant_a", 0.0, converted=rng.random() < variant_rate)
+            analysis = framework.analyze_experiment(experiment_id)
+            if analysis['status'] == 'winner_identified':
+                return analysis, (check + 1) * batch
+        return analysis, None
+
+    def test_sequential_mode_stops_early_on_clear_winner(self):
+        analysis, stopped_at = self._run_sequential(0.10, 0.25)
+
+        assert stopped_at is not None and stopped_at < 1000
+        assert analysis['stopped_early']
+        assert analysis['winner']['variant_id'] == 'variant_a'
+
+    def test_sequential_mode_holds_under_repeated_looks_without_effect(self):
+        analysis, stopped_at = self._run_sequential(0.20, 0.20)
+
+        assert stopped_at is None
+        assert not analysis['stopped_early']
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
@@ -22,12 +22,16 @@ from app.services.alert_service import (
     mark_responded,
     trigger_lead_alert,
 )
+from app.services.escalation_scheduler import InMemoryDelayQueue
 
 
 @pytest.fixture
 def alert_service():
     """Create alert service instance for testing"""
-    return AlertService()
+    service = AlertService()
+    service.escalation_scheduler.queue = InMemoryDelayQueue()
+    yield service
+    service.escalation_scheduler.shutdown()
 
 
 @pytest.fixture
@@ -423,6 +427,7 @@ class TestAlertService:
         """Test escalation timer triggers after timeout"""
         # Setup
         alert_service.response_timeout = 0.1  # 100ms for testing
+        alert_service.escalation_scheduler.poll_interval = 0.01
 
         alert_data = {
             "alert_id": "alert-test",
@@ -448,12 +453,34 @@ class TestAlertService:
 
         # Wait for timer
         time.sleep(0.2)
+        alert_service.escalation_scheduler.shutdown()
 
         # Assert escalation was triggered
         mock_notification.send_notification.assert_called()
         notification_args = mock_notification.send_notification.call_args[1]
         assert notification_args["type"] == "lead_alert_escalation"
 
+    def test_mark_responded_cancels_escalation(
+        self, alert_service, mock_redis, mock_notification, mock_realtime, mock_db
+    ):
+        """Test responding before the deadline drops the pending escalation"""
+        alert_data = {
+            "alert_id": "alert-test",
+            "lead_id": "lead-test",
+            "lead_data": {"name": "Test Lead"},
+            "status": AlertStatus.PENDING.value,
+            "created_at": datetime.utcnow().isoformat(),
+        }
+        mock_redis.get.return_value = json.dumps(alert_data)
+
+        alert_service._start_escalation_timer("alert-test", "lead-test", {})
+        assert alert_service.escalation_scheduler.pending() == 1
+
+        alert_service.mark_responded("alert-test", "user-1", {"action": "called"})
+        alert_service.escalation_scheduler.shutdown()
+
+        assert alert_service.escalation_scheduler.pending() == 0
+
 
 class TestAlertConvenienceFunctions:
     """Test convenience functions"""
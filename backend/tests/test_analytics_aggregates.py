@@ -0,0 +1,152 @@
+"""
+Unit Tests for the KPI aggregation layer
+
+Checks that AnalyticsService builds KPIs from database-side aggregates and
+produces the same output as the row-scan fallback.
+"""
+
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+from app.services.analytics_aggregates import AnalyticsAggregates
+from app.services.analytics_service import AnalyticsService
+
+
+START = datetime(2025, 10, 1)
+END = datetime(2025, 10, 31)
+
+LEAD_ROWS = [
+    {"id": "1", "created_at": "2025-10-02T00:00:00", "temperature": "hot", "lead_score": 90,
+     "source": "website", "status": "converted", "response_time_minutes": 5,
+     "converted_to_customer_at": "2025-10-12T12:00:00"},
+    {"id": "2", "created_at": "2025-10-03T00:00:00", "temperature": "warm", "lead_score": 60,
+     "source": "referral", "status": "qualified", "response_time_minutes": None,
+     "converted_to_customer_at": None},
+    {"id": "3", "created_at": "2025-10-04T00:00:00", "temperature": "hot", "lead_score": 75,
+     "source": "website", "status": "new", "response_time_minutes": 15,
+     "converted_to_customer_at": None},
+]
+
+PROJECT_ROWS = [
+    {"id": "p1", "quoted_amount": 30000, "actual_amount": 28000, "status": "completed",
+     "project_type": "replacement", "margin_percentage": 30},
+    {"id": "p2", "quoted_amount": 12000, "actual_amount": 0, "status": "in_progress",
+     "project_type": "repair", "margin_percentage": None},
+]
+
+
+@pytest.fixture
+def service():
+    """AnalyticsService with a mocked Supabase client"""
+    svc = AnalyticsService()
+    svc._supabase = MagicMock()
+    return svc
+
+
+@pytest.fixture
+def rows_only():
+    """Force the row-scan fallback"""
+    with patch("app.services.analytics_service.analytics_aggregates") as aggregates:
+        aggregates.lead_metrics.return_value = None
+        aggregates.revenue_metrics.return_value = None
+        aggregates.conversion_metrics.return_value = None
+        aggregates.customer_metrics.return_value = None
+        yield aggregates
+
+
+def _table_returning(service, rows_by_table):
+    def table(name):
+        query = MagicMock()
+        for method in ("select", "gte", "lte", "lt"):
+            getattr(query, method).return_value = query
+        query.execute.return_value.data = rows_by_table.get(name, [])
+        return query
+
+    service._supabase.table.side_effect = table
+
+
+class TestAnalyticsAggregates:
+    """Tests for the RPC wrapper"""
+
+    def test_returns_aggregate_object(self):
+        layer = AnalyticsAggregates()
+        layer._supabase = MagicMock()
+        layer._supabase.rpc.return_value.execute.return_value.data = {"total": 3}
+
+        assert layer.lead_metrics(START, END) == {"total": 3}
+        layer._supabase.rpc.assert_called_once_with(
+            "analytics_lead_metrics",
+            {"p_start": START.isoformat(), "p_end": END.isoformat()},
+        )
+
+    def test_disabled_after_failure(self):
+        layer = AnalyticsAggregates(retry_interval=600)
+        layer._supabase = MagicMock()
+        layer._supabase.rpc.side_effect = Exception("Could not find the function")
+
+        assert layer.lead_metrics(START, END) is None
+        assert layer.revenue_metrics(START, END) is None
+        assert layer._supabase.rpc.call_count == 1
+
+
+class TestKPIsFromAggregates:
+    """Aggregate-based KPIs must match the row-scan implementation"""
+
+    def test_lead_metrics_match(self, service, rows_only):
+        _table_returning(service, {"leads": LEAD_ROWS})
+        expected = service._calculate_lead_metrics(START, END)
+
+        aggregates = {
+            "total": 3, "hot": 2, "warm": 1, "cold": 0,
+            "avg_response_time": 10.0, "avg_lead_score": 75.0,
+            "previous_total": 3, "sources": {"website": 2, "referral": 1},
+        }
+        rows_only.lead_metrics.return_value = aggregates
+
+        assert service._calculate_lead_metrics(START, END) == expected
+
+    def test_revenue_metrics_match(self, service, rows_only):
+        _table_returning(service, {"projects": PROJECT_ROWS})
+        expected = service._calculate_revenue_metrics(START, END)
+
+        rows_only.revenue_metrics.return_value = {
+            "total_projects": 2, "completed_projects": 1,
+            "total_quoted": 42000, "total_actual": 28000, "pipeline_value": 12000,
+            "avg_deal_size": 28000, "avg_margin": 30, "revenue_by_type": {"replacement": 28000},
+        }
+
+        assert service._calculate_revenue_metrics(START, END) == expected
+
+    def test_conversion_metrics_match(self, service, rows_only):
+        _table_returning(service, {"leads": LEAD_ROWS})
+        expected = service._calculate_conversion_metrics(START, END)
+
+        rows_only.conversion_metrics.return_value = {
+            "total_leads": 3, "qualified_leads": 2, "converted_leads": 1,
+            "avg_conversion_days": 10,
+            "by_temperature": {
+                "hot": {"total": 2, "converted": 1},
+                "warm": {"total": 1, "converted": 0},
+            },
+            "by_source": {
+                "website": {"total": 2, "converted": 1},
+                "referral": {"total": 1, "converted": 0},
+            },
+        }
+
+        assert service._calculate_conversion_metrics(START, END) == expected
+
+    def test_customer_metrics_no_row_queries(self, service, rows_only):
+        rows_only.customer_metrics.return_value = {
+            "new_customers": 2, "total_customers": 40, "avg_lifetime_value": 25000,
+            "referral_sources": {"direct": 2}, "total_reviews": 4, "avg_rating": 4.25,
+            "promoters": 3, "detractors": 1,
+        }
+
+        metrics = service._calculate_customer_metrics(START, END)
+
+        service._supabase.table.assert_not_called()
+        assert metrics["net_promoter_score"] == 50.0
+        assert metrics["ltv_to_cac_ratio"] == 50.0
+        assert metrics["avg_rating"] == 4.25
@@ -0,0 +1,105 @@
+"""
+Unit Tests for the shared event loop runner used by async Flask routes
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from flask import Flask, request
+
+from app.utils.async_runner import AsyncLoopRunner, async_route
+
+
+@pytest.fixture
+def runner():
+    runner = AsyncLoopRunner(name="test-runner")
+    yield runner
+    runner.shutdown()
+
+
+async def _current_loop():
+    return asyncio.get_running_loop()
+
+
+class TestAsyncLoopRunner:
+    def test_loop_is_reused_across_calls(self, runner):
+        assert runner.run(_current_loop()) is runner.run(_current_loop())
+
+    def test_loop_bound_resources_survive_between_calls(self, runner):
+        # Stand-in for a connection pool created on first use
+        async def make_queue():
+            return asyncio.Queue()
+
+        async def use(q):
+            await q.put(1)
+            return await q.get()
+
+        queue = runner.run(make_queue())
+
+        assert runner.run(use(queue)) == 1
+        assert runner.run(use(queue)) == 1
+
+    def test_exceptions_propagate(self, runner):
+        async def boom():
+            raise ValueError("bad input")
+
+        with pytest.raises(ValueError, match="bad input"):
+            runner.run(boom())
+
+    def test_timeout_cancels_task(self, runner):
+        cancelled = threading.Event()
+
+        async def slow():
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        with pytest.raises(TimeoutError):
+            runner.run(slow(), timeout=0.05)
+
+        assert cancelled.wait(1)
+
+    def test_callers_in_different_threads_overlap(self, runner):
+        results = []
+
+        def call():
+            results.append(runner.run(asyncio.sleep(0.2, result="done")))
+
+        start = time.perf_counter()
+        threads = [threading.Thread(target=call) for _ in range(5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert results == ["done"] * 5
+        assert time.perf_counter() - start < 0.8
+
+    def test_nested_call_from_loop_rejected(self, runner):
+        inner = _current_loop()
+
+        async def nested():
+            return runner.run(inner)
+
+        with pytest.raises(RuntimeError, match="await the coroutine"):
+            runner.run(nested())
+        # The rejected coroutine is closed rather than left un-awaited
+        assert inner.cr_frame is None
+
+
+def test_async_route_sees_request_context():
+    app = Flask(__name__)
+
+    @app.route("/echo")
+    @async_route
+    async def echo():
+        await asyncio.sleep(0)
+        return {"q": request.args["q"], "thread": threading.current_thread().name}
+
+    response = app.test_client().get("/echo?q=roofs")
+
+    assert response.json == {"q": "roofs", "thread": "async-runner"}
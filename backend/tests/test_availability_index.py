@@ -0,0 +1,368 @@
+"""
+Unit Tests for the appointment availability index
+"""
+
+from datetime import date, datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.services.appointments_service import AppointmentsService
+from app.services.availability_index import (
+    AvailabilityIndex,
+    BusyIntervals,
+    intersect_windows,
+    parse_timestamp,
+    sweep_schedule,
+)
+from app.utils.cache import local_cache
+
+MONDAY = date(2025, 1, 13)
+
+
+def at(hour, minute=0, day=MONDAY):
+    return datetime(day.year, day.month, day.day, hour, minute)
+
+
+def appointment(appointment_id, member_id, start, end):
+    return {
+        "id": appointment_id,
+        "team_member_id": member_id,
+        "scheduled_start": start.isoformat(),
+        "scheduled_end": end.isoformat(),
+    }
+
+
+class FakeFetch:
+    """Busy appointment source that records each range query"""
+
+    def __init__(self, appointments):
+        self.appointments = appointments
+        self.calls = []
+
+    def __call__(self, member_ids, start, end):
+        self.calls.append((list(member_ids), start, end))
+        return [
+            a
+            for a in self.appointments
+            if a["team_member_id"] in member_ids
+            and start <= parse_timestamp(a["scheduled_start"]) < end
+        ]
+
+
+@pytest.fixture(autouse=True)
+def clear_local_cache():
+    local_cache.clear()
+    yield
+    local_cache.clear()
+
+
+class TestBusyIntervals:
+    def test_conflict_returns_earliest_overlap(self):
+        busy = BusyIntervals(
+            [
+                (at(13), at(14), "b"),
+                (at(9), at(12), "a"),
+                (at(15), at(16), "c"),
+            ]
+        )
+
+        assert busy.conflict(at(11), at(13, 30))[2] == "a"
+        assert busy.conflict(at(14), at(15)) is None
+        assert busy.conflict(at(8), at(9)) is None
+
+    def test_conflict_finds_long_interval_behind_short_ones(self):
+        busy = BusyIntervals([(at(8), at(17), "all-day"), (at(9), at(10), "short")])
+
+        assert busy.conflict(at(15), at(16))[2] == "all-day"
+
+    def test_conflict_ignores_excluded_appointment(self):
+        busy = BusyIntervals([(at(9), at(10), "moving")])
+
+        assert busy.conflict(at(9, 30), at(10, 30), exclude_id="moving") is None
+
+    def test_free_windows_merge_overlapping_bookings(self):
+        busy = BusyIntervals([(at(9), at(11), "a"), (at(10), at(12), "b"), (at(14), at(15), "c")])
+
+        assert busy.free_windows(at(8), at(18)) == [
+            (at(8), at(9)),
+            (at(12), at(14)),
+            (at(15), at(18)),
+        ]
+
+    def test_json_round_trip(self):
+        busy = BusyIntervals([(at(9), at(10), "a")])
+
+        assert BusyIntervals.from_json(busy.to_json()).intervals == busy.intervals
+
+
+def test_intersect_windows():
+    first = [(at(8), at(10)), (at(12), at(18))]
+    second = [(at(9), at(13)), (at(15), at(16))]
+
+    assert intersect_windows(first, second) == [
+        (at(9), at(10)),
+        (at(12), at(13)),
+        (at(15), at(16)),
+    ]
+
+
+class TestAvailabilityIndex:
+    def test_get_many_loads_all_members_and_days_in_one_query(self):
+        fetch = FakeFetch(
+            [
+                appointment("a", "m1", at(9), at(10)),
+                appointment("b", "m2", at(9, day=date(2025, 1, 14)), at(10, day=date(2025, 1, 14))),
+            ]
+        )
+        index = AvailabilityIndex(fetch)
+
+        busy = index.get_many(["m1", "m2"], MONDAY, date(2025, 1, 15))
+
+        assert len(fetch.calls) == 1
+        assert len(busy) == 6
+        assert len(busy[("m1", MONDAY)]) == 1
+        assert len(busy[("m2", date(2025, 1, 14))]) == 1
+        assert len(busy[("m2", MONDAY)]) == 0
+
+    def test_cached_days_are_not_reloaded(self):
+        fetch = FakeFetch([appointment("a", "m1", at(9), at(10))])
+        index = AvailabilityIndex(fetch)
+
+        index.get("m1", MONDAY)
+        index.get("m1", MONDAY)
+
+        assert len(fetch.calls) == 1
+
+    def test_invalidate_reloads_day(self):
+        fetch = FakeFetch([])
+        index = AvailabilityIndex(fetch)
+        assert len(index.get("m1", MONDAY)) == 0
+
+        fetch.appointments.append(appointment("a", "m1", at(9), at(10)))
+        index.invalidate("m1", MONDAY)
+
+        assert len(index.get("m1", MONDAY)) == 1
+        assert len(fetch.calls) == 2
+
+    def test_refresh_bypasses_cache(self):
+        fetch = FakeFetch([])
+        index = AvailabilityIndex(fetch)
+        index.get("m1", MONDAY)
+
+        fetch.appointments.append(appointment("a", "m1", at(9), at(10)))
+
+        assert len(index.get("m1", MONDAY, refresh=True)) == 1
+
+
+class TestAppointmentsAvailability:
+    @pytest.fixture
+    def service(self):
+        service = AppointmentsService()
+        fetch = FakeFetch(
+            [
+                appointment("a1", "m1", at(9), at(10)),
+                appointment("a2", "m2", at(11), at(12)),
+            ]
+        )
+        service.availability_index = AvailabilityIndex(fetch)
+        service.fetch = fetch
+        return service
+
+    def test_check_availability_reports_conflict(self, service):
+        assert service.check_availability("m1", at(9, 30), 60) == (
+            False,
+            "Conflicts with appointment at 09:00 AM",
+        )
+        assert service.check_availability("m1", at(10), 60) == (True, None)
+        assert service.check_availability("m1", at(9, 30), 60, exclude_appointment_id="a1") == (
+            True,
+            None,
+        )
+
+    def test_check_availability_outside_business_hours(self, service):
+        available, reason = service.check_availability("m1", at(17, 30), 60)
+
+        assert available is False
+        assert reason.startswith("Outside business hours")
+
+    def test_available_slots_fill_each_free_window(self, service):
+        slots = service.get_available_slots("m1", at(0), duration=60)
+
+        # 08:00-09:00 fits nothing with buffer; 10:00-18:00 fits 75-minute steps
+        assert [slot["start"] for slot in slots][:2] == [
+            at(10).isoformat(),
+            at(11, 15).isoformat(),
+        ]
+        assert len(slots) == 6
+
+    def test_find_slots_returns_member_and_crew_windows(self, service):
+        result = service.find_slots((at(0), at(0, day=date(2025, 1, 19))), ["m1", "m2"], duration=60)
+
+        # Saturday 09:00-14:00 and Sunday closed
+        assert len(service.fetch.calls) == 1
+        assert result["members"]["m1"][0] == {
+            "start": at(10).isoformat(),
+            "end": at(18).isoformat(),
+            "minutes": 480,
+        }
+        assert result["common"][:2] == [
+            {"start": at(12).isoformat(), "end": at(18).isoformat(), "minutes": 360},
+            {
+                "start": at(8, day=date(2025, 1, 14)).isoformat(),
+                "end": at(18, day=date(2025, 1, 14)).isoformat(),
+                "minutes": 600,
+            },
+        ]
+        assert result["common"][-1]["start"] == at(9, day=date(2025, 1, 18)).isoformat()
+
+
+class TestSweepSchedule:
+    def test_busy_free_and_common_blocks(self):
+        tuesday = date(2025, 1, 14)
+        result = sweep_schedule(
+            ["m1", "m2"],
+            [MONDAY, tuesday],
+            {MONDAY: (at(8), at(18)), tuesday: None},
+            [
+                ("m1", at(9), at(10)),
+                ("m1", at(9, 30), at(11)),
+                ("m2", at(10, 30), at(12)),
+                ("m2", at(17), at(19)),
+                ("m2", at(9, day=tuesday), at(10, day=tuesday)),
+            ],
+        )
+
+        assert result["busy"][0] == [[[540, 660]], []]
+        assert result["busy"][1] == [[[630, 720], [1020, 1140]], [[540, 600]]]
+        assert result["free"][0] == [[[480, 540], [660, 1080]], []]
+        assert result["free"][1] == [[[480, 630], [720, 1020]], []]
+        assert result["common_free"] == [[[480, 540], [720, 1020]], []]
+
+    def test_back_to_back_appointments_leave_no_gap(self):
+        result = sweep_schedule(
+            ["m1"],
+            [MONDAY],
+            {MONDAY: (at(8), at(18))},
+            [("m1", at(8), at(9)), ("m1", at(9), at(10))],
+        )
+
+        assert result["free"][0][0] == [[600, 1080]]
+        assert result["common_free"][0] == [[600, 1080]]
+
+
+class ChainQuery:
+    """Supabase query chain returning fixed rows"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    def __getattr__(self, name):
+        def method(*args):
+            self.calls.append((name, args))
+            return self
+
+        return method
+
+    def execute(self):
+        result = MagicMock()
+        result.data = self.rows
+        return result
+
+
+class PagedQuery(ChainQuery):
+    """ChainQuery serving only the rows selected by its range() call"""
+
+    def execute(self):
+        start, end = dict(self.calls)["range"]
+        result = MagicMock()
+        result.data = self.rows[start : end + 1]
+        return result
+
+
+def test_busy_appointments_are_read_page_by_page():
+    rows = [appointment(f"a{i}", "m1", at(9), at(10)) for i in range(5)]
+    queries = []
+
+    def table(name):
+        queries.append(PagedQuery(rows))
+        return queries[-1]
+
+    service = AppointmentsService()
+    service._supabase = MagicMock()
+    service._supabase.table.side_effect = table
+
+    with patch("app.services.appointments_service.APPOINTMENT_PAGE_SIZE", 2):
+        busy = service._fetch_busy_appointments(["m1"], at(0), at(23))
+
+    assert [row["id"] for row in busy] == [f"a{i}" for i in range(5)]
+    assert [query.calls[-1] for query in queries] == [("range", (0, 1)), ("range", (2, 3)), ("range", (4, 5))]
+    assert ("order", ("id",)) in queries[0].calls
+
+
+def test_get_team_schedules_builds_matrix_from_one_query():
+    rows = [
+        {
+            "id": "a1",
+            "team_member_id": "m2",
+            "appointment_type": "inspection",
+            "status": "scheduled",
+            "scheduled_start": "2025-01-13T09:00:00+00:00",
+            "scheduled_end": "2025-01-13T10:00:00+00:00",
+            "customers": {"name": "Pat Doe"},
+        },
+        {
+            "id": "a2",
+            "team_member_id": "m1",
+            "appointment_type": "estimate",
+            "status": "cancelled",
+            "scheduled_start": "2025-01-14T13:00:00+00:00",
+            "scheduled_end": "2025-01-14T14:00:00+00:00",
+            "customers": None,
+        },
+    ]
+    query = ChainQuery(rows)
+    service = AppointmentsService()
+    service._supabase = MagicMock()
+    service._supabase.table.return_value = query
+
+    result = service.get_team_schedules(["m1", "m2"], at(0), at(0, day=date(2025, 1, 14)))
+
+    assert service._supabase.table.call_count == 1
+    assert ("in_", ("team_member_id", ["m1", "m2"])) in query.calls
+    assert ("order", ("id",)) in query.calls and query.calls[-1] == ("range", (0, 999))
+    assert result["members"] == ["m1", "m2"]
+    assert result["days"] == ["2025-01-13", "2025-01-14"]
+    assert result["business_hours"] == [[480, 1080], [480, 1080]]
+    assert result["appointments"][0] == {
+        "id": "a1",
+        "member": 1,
+        "day": 0,
+        "start": 540,
+        "end": 600,
+        "type": "inspection",
+        "status": "scheduled",
+        "customer": "Pat Doe",
+    }
+    # Cancelled appointments are listed but do not block time
+    assert result["appointments"][1]["customer"] is None
+    assert result["busy"] == [[[], []], [[[540, 600]], []]]
+    assert result["free"][0] == [[[480, 1080]], [[480, 1080]]]
+    assert result["common_free"] == [[[480, 540], [600, 1080]], [[480, 1080]]]
+
+
+def test_cancel_invalidates_availability_and_list_totals():
+    query = ChainQuery([appointment("a1", "m1", at(9), at(10))])
+    service = AppointmentsService()
+    service._supabase = MagicMock()
+    service._supabase.table.return_value = query
+    service.availability_index = MagicMock()
+
+    with patch.object(service, "_cancel_reminders"), patch.object(
+        service, "_send_cancellation_notification"
+    ), patch("app.services.appointments_service.invalidate_tags") as invalidate:
+        assert service.cancel_appointment("a1") == (True, None)
+
+    service.availability_index.invalidate.assert_called_once_with("m1", MONDAY)
+    invalidate.assert_called_once_with("appointments")
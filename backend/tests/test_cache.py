@@ -0,0 +1,328 @@
+"""
+Tests for the Redis caching decorators
+
+Covers the Redis-backed (L2) path and the optional in-process (L1) tier.
+"""
+
+import fnmatch
+from unittest.mock import MagicMock, patch
+
+import pytest
+from app.utils import cache as cache_module
+from app.utils.cache import (
+    LocalCache,
+    cache_invalidate,
+    cache_result,
+    cache_stats,
+    invalidate_tags,
+)
+from app.utils.redis_client import MockRedisClient
+
+
+@pytest.fixture
+def mock_redis():
+    """In-memory Redis stand-in that reports itself as connected"""
+    client = MockRedisClient()
+    client.is_connected = True
+    client.subscribe = MagicMock(return_value=MagicMock())
+    client.scan_keys = lambda pattern="*", count=100: [
+        key for key in client.storage if fnmatch.fnmatch(key, pattern)
+    ]
+    with patch("app.utils.cache.redis_client", client), patch(
+        "app.utils.cache._ensure_invalidation_listener", return_value=True
+    ):
+        yield client
+
+
+@pytest.fixture(autouse=True)
+def clean_cache_state():
+    """Reset global cache state between tests"""
+    cache_module.local_cache.clear()
+    cache_stats.reset()
+    yield
+    cache_module.local_cache.clear()
+
+
+class TestLocalCache:
+    """Tests for the bounded LRU"""
+
+    def test_evicts_least_recently_used(self):
+        lru = LocalCache(max_entries=2)
+        lru.set("a", 1, 60)
+        lru.set("b", 2, 60)
+        lru.get("a")
+        lru.set("c", 3, 60)
+
+        assert lru.get("a") == (True, 1)
+        assert lru.get("b") == (False, None)
+        assert lru.get("c") == (True, 3)
+
+    def test_expired_entries_are_misses(self):
+        lru = LocalCache()
+        with patch("app.utils.cache.time.monotonic", return_value=1000.0):
+            lru.set("a", 1, 10)
+        with patch("app.utils.cache.time.monotonic", return_value=1011.0):
+            assert lru.get("a") == (False, None)
+        assert len(lru) == 0
+
+    def test_invalidate_pattern(self):
+        lru = LocalCache()
+        lru.set("crm:leads:get_lead_stats:1", 1, 60)
+        lru.set("crm:metrics:get_x:1", 2, 60)
+
+        assert lru.invalidate("crm:leads:*") == 1
+        assert lru.get("crm:metrics:get_x:1") == (True, 2)
+
+
+class TestCacheResult:
+    """Tests for the cache_result decorator"""
+
+    def test_l2_only_by_default(self, mock_redis):
+        calls = []
+
+        @cache_result(ttl=300, key_prefix="leads")
+        def get_stats():
+            calls.append(1)
+            return {"total": 5}
+
+        assert get_stats() == {"total": 5}
+        assert get_stats() == {"total": 5}
+
+        assert len(calls) == 1
+        assert len(cache_module.local_cache) == 0
+        stats = cache_stats.get_stats()
+        assert stats["l2_hits"] == 1
+        assert stats["l1_hits"] == 0
+
+    def test_l1_serves_repeat_reads_without_redis(self, mock_redis):
+        @cache_result(ttl=300, key_prefix="leads", l1_ttl=60)
+        def get_stats():
+            return {"total": 5}
+
+        get_stats()
+        with patch.object(mock_redis, "get", side_effect=AssertionError("Redis hit")):
+            assert get_stats() == {"total": 5}
+
+        stats = cache_stats.get_stats()
+        assert stats["l1_hits"] == 1
+        assert stats["misses"] == 1
+
+    def test_l1_ttl_capped_at_redis_ttl(self, mock_redis):
+        @cache_result(ttl=30, key_prefix="leads", l1_ttl=600)
+        def get_stats():
+            return {"total": 5}
+
+        with patch.object(cache_module.local_cache, "set") as local_set:
+            get_stats()
+
+        assert local_set.call_args[0][2] == 30
+
+    def test_l1_populated_from_l2_hit(self, mock_redis):
+        @cache_result(ttl=300, key_prefix="leads", l1_ttl=60)
+        def get_stats():
+            return {"total": 5}
+
+        get_stats()
+        cache_module.local_cache.clear()
+
+        assert get_stats() == {"total": 5}
+        assert get_stats() == {"total": 5}
+
+        stats = cache_stats.get_stats()
+        assert stats["l2_hits"] == 1
+        assert stats["l1_hits"] == 1
+
+    def test_invalidate_evicts_both_tiers_and_publishes(self, mock_redis):
+        calls = []
+
+        @cache_result(ttl=300, key_prefix="leads", l1_ttl=60)
+        def get_stats():
+            calls.append(1)
+            return {"total": len(calls)}
+
+        get_stats()
+        with patch.object(mock_redis, "publish") as publish:
+            cache_invalidate("crm:leads:*")
+
+        publish.assert_called_once_with(cache_module.CACHE_INVALIDATION_CHANNEL, "crm:leads:*")
+        assert get_stats() == {"total": 2}
+
+    def test_redis_unavailable_bypasses_cache(self):
+        client = MagicMock(is_connected=False)
+        calls = []
+
+        @cache_result(ttl=300, l1_ttl=60)
+        def get_stats():
+            calls.append(1)
+            return 1
+
+        with patch("app.utils.cache.redis_client", client):
+            get_stats()
+            get_stats()
+
+        assert len(calls) == 2
+
+
+class TestTagInvalidation:
+    """Tests for tag-indexed invalidation"""
+
+    def test_tags_recorded_in_index(self, mock_redis):
+        @cache_result(ttl=300, key_prefix="leads", tags=["leads"])
+        def get_stats():
+            return 1
+
+        get_stats()
+
+        members = mock_redis.smembers("crm:tags:leads")
+        assert len(members) == 1
+        assert next(iter(members)).startswith("crm:leads:get_stats:")
+
+    def test_invalidate_tags_deletes_only_tagged_keys(self, mock_redis):
+        calls = {"lead": 0, "other": 0}
+
+        @cache_result(ttl=300, key_prefix="leads", tags=lambda lead_id: [f"lead:{lead_id}"])
+        def get_lead(lead_id):
+            calls["lead"] += 1
+            return lead_id
+
+        @cache_result(ttl=300, key_prefix="leads", tags=["other"])
+        def get_other():
+            calls["other"] += 1
+            return "other"
+
+        get_lead("1")
+        get_lead("2")
+        get_other()
+
+        with patch.object(mock_redis, "scan_keys", side_effect=AssertionError("SCAN used")):
+            assert invalidate_tags("lead:1") == 1
+        assert mock_redis.smembers("crm:tags:lead:1") == set()
+
+        get_lead("1")
+        get_lead("2")
+        get_other()
+
+        assert calls == {"lead": 3, "other": 1}
+
+    def test_invalidate_tags_evicts_l1(self, mock_redis):
+        calls = []
+
+        @cache_result(ttl=300, key_prefix="leads", l1_ttl=60, tags=["leads"])
+        def get_stats():
+            calls.append(1)
+            return len(calls)
+
+        get_stats()
+        invalidate_tags("leads")
+
+        assert get_stats() == 2
+
+    def test_invalidate_unknown_tag(self, mock_redis):
+        assert invalidate_tags("missing") == 0
+
+
+class TestStampedeProtection:
+    """Tests for single-flight recomputation and stale-while-revalidate"""
+
+    def test_method_keys_ignore_instance(self, mock_redis):
+        class Service:
+            calls = 0
+
+            @cache_result(ttl=300, key_prefix="metrics")
+            def get_metrics(self, days=30):
+                Service.calls += 1
+                return days
+
+        Service().get_metrics(days=7)
+        Service().get_metrics(days=7)
+
+        assert Service.calls == 1
+
+    def test_single_flight_waits_for_lock_holder(self, mock_redis):
+        calls = []
+
+        @cache_result(ttl=300, key_prefix="leads", single_flight=True, lock_timeout=1)
+        def get_stats():
+            calls.append(1)
+            return {"total": 5}
+
+        key = cache_module._generate_cache_key("crm", "leads", "get_stats", (), {})
+        mock_redis.set(cache_module._lock_key(key), "other-worker", ex=10)
+
+        def holder_finishes(_):
+            mock_redis.setex(key, 300, '{"total": 5}')
+
+        with patch("app.utils.cache.time.sleep", side_effect=holder_finishes):
+            assert get_stats() == {"total": 5}
+
+        assert calls == []
+
+    def test_single_flight_releases_lock(self, mock_redis):
+        @cache_result(ttl=300, key_prefix="leads", single_flight=True)
+        def get_stats():
+            return 1
+
+        get_stats()
+
+        key = cache_module._generate_cache_key("crm", "leads", "get_stats", (), {})
+        assert not mock_redis.exists(cache_module._lock_key(key))
+
+    def test_release_keeps_lock_taken_over_by_another_worker(self, mock_redis):
+        key = cache_module._generate_cache_key("crm", "leads", "get_stats", (), {})
+        token = cache_module._acquire_lock(key, 10)
+        # Our lock expired and another worker took it over
+        mock_redis.set(cache_module._lock_key(key), "other-worker", ex=10)
+
+        cache_module._release_lock(key, token)
+
+        assert mock_redis.get(cache_module._lock_key(key)) == "other-worker"
+
+    def test_stale_value_served_while_refreshing(self, mock_redis):
+        calls = []
+
+        @cache_result(ttl=300, key_prefix="leads", stale_ttl=300)
+        def get_stats():
+            calls.append(1)
+            return {"version": len(calls)}
+
+        with patch("app.utils.cache.time.time", return_value=1000.0):
+            get_stats()
+
+        with patch("app.utils.cache.threading.Thread") as thread:
+            assert get_stats() == {"version": 1}
+
+        thread.assert_called_once()
+        refresh = thread.call_args.kwargs
+        refresh["target"](*refresh["args"])
+
+        assert get_stats() == {"version": 2}
+        assert cache_stats.get_stats()["stale_hits"] == 1
+
+    def test_stale_refresh_skipped_when_locked(self, mock_redis):
+        @cache_result(ttl=300, key_prefix="leads", stale_ttl=300)
+        def get_stats():
+            return 1
+
+        with patch("app.utils.cache.time.time", return_value=1000.0):
+            get_stats()
+
+        key = cache_module._generate_cache_key("crm", "leads", "get_stats", (), {})
+        mock_redis.set(cache_module._lock_key(key), "other-worker", ex=10)
+
+        with patch("app.utils.cache.threading.Thread") as thread:
+            assert get_stats() == 1
+
+        thread.assert_not_called()
+
+    def test_function_errors_propagate_without_retry(self, mock_redis):
+        calls = []
+
+        @cache_result(ttl=300, single_flight=True)
+        def failing():
+            calls.append(1)
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            failing()
+
+        assert calls == [1]
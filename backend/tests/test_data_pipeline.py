@@ -0,0 +1,266 @@
+"""
+Unit Tests for DataPipelineService orchestration and deduplication
+"""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from flask import Flask
+
+from app.routes import data_pipeline as pipeline_routes
+from app.services.intelligence import data_pipeline_service as pipeline_module
+from app.services.intelligence.data_pipeline_service import DataPipelineService
+from app.utils.bloom_filter import RedisBloomFilter
+from app.utils.redis_client import MockRedisClient
+
+STAGE_DELAY = 0.2
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv("SKIP_AUTH", "true")
+    app = Flask(__name__)
+    app.register_blueprint(pipeline_routes.bp, url_prefix="/api/data-pipeline")
+    with patch.object(pipeline_routes, "job_queue") as queue, \
+            patch.object(pipeline_routes, "job_accepted", return_value=("", 202)):
+        app.queue = queue
+        yield app.test_client()
+
+
+class TestRunPipelineRoute:
+    @pytest.mark.parametrize("value, expected", [("false", False), ("True", True), (False, False)])
+    def test_concurrent_flag_parsed(self, client, value, expected):
+        response = client.post("/api/data-pipeline/run", json={"concurrent": value})
+
+        assert response.status_code == 202
+        assert client.application.queue.enqueue.call_args.kwargs["concurrent"] is expected
+
+    @pytest.mark.parametrize("body", [{"concurrent": "nope"}, {"concurrent": 1},
+                                      {"stage_timeout": "abc"}, {"stage_timeout": -5},
+                                      {"stage_timeout": 0}])
+    def test_invalid_options_rejected(self, client, body):
+        response = client.post("/api/data-pipeline/run", json=body)
+
+        assert response.status_code == 400
+        client.application.queue.enqueue.assert_not_called()
+
+    def test_stage_timeout_coerced(self, client):
+        client.post("/api/data-pipeline/run", json={"stage_timeout": "30"})
+
+        assert client.application.queue.enqueue.call_args.kwargs["stage_timeout"] == 30.0
+
+
+@pytest.fixture
+def service():
+    """Pipeline with slow stub collectors and no database work"""
+    svc = DataPipelineService(db=MagicMock())
+
+    def slow_stage(source):
+        async def collect(filters):
+            await asyncio.sleep(STAGE_DELAY)
+            return [{"source": source}]
+        return collect
+
+    svc._discover_properties = slow_stage("property_assessor")
+    svc._detect_storm_damage = slow_stage("storm_damage")
+    svc._monitor_social_media = slow_stage("nextdoor")
+    svc._gather_market_intelligence = slow_stage("zillow")
+    svc._enrich_and_score_leads = AsyncMock(side_effect=lambda leads, filters: leads)
+    svc._deduplicate_and_validate = AsyncMock(side_effect=lambda leads: leads)
+    svc._ingest_leads = AsyncMock(side_effect=lambda leads: len(leads))
+    return svc
+
+
+class TestRunPipeline:
+    @pytest.mark.asyncio
+    async def test_concurrent_wall_time_is_slowest_stage(self, service):
+        started = time.perf_counter()
+        results = await service.run_pipeline()
+        elapsed = time.perf_counter() - started
+
+        assert results["status"] == "success"
+        assert results["execution_mode"] == "concurrent"
+        assert results["total_raw_leads"] == 4
+        assert elapsed < STAGE_DELAY * 2
+
+        for name, _, _ in DataPipelineService.COLLECTION_STAGES:
+            assert results["stages"][name]["duration_seconds"] >= STAGE_DELAY * 0.9
+        assert "duration_seconds" in results["stages"]["enrichment"]
+
+    @pytest.mark.asyncio
+    async def test_sequential_mode(self, service):
+        started = time.perf_counter()
+        results = await service.run_pipeline(concurrent=False)
+
+        assert results["execution_mode"] == "sequential"
+        assert time.perf_counter() - started >= STAGE_DELAY * 4
+
+    @pytest.mark.asyncio
+    async def test_stage_timeout_is_partial_failure(self, service):
+        async def hangs(filters):
+            await asyncio.sleep(10)
+
+        service._monitor_social_media = hangs
+
+        results = await service.run_pipeline(stage_timeout=STAGE_DELAY * 2)
+
+        assert results["status"] == "partial"
+        assert results["failed_stages"] == ["social_monitoring"]
+        assert results["stages"]["social_monitoring"]["status"] == "timeout"
+        assert results["total_ingested_leads"] == 3
+
+    @pytest.mark.asyncio
+    async def test_stage_error_is_isolated(self, service):
+        service._detect_storm_damage = AsyncMock(side_effect=RuntimeError("NOAA down"))
+
+        results = await service.run_pipeline()
+
+        storm = results["stages"]["storm_detection"]
+        assert storm["status"] == "failed"
+        assert storm["error"] == "NOAA down"
+        assert results["total_raw_leads"] == 3
+
+
+STORED_LEADS = [
+    ("1234 Example St", "(248) 555-0100", "Owner@Example.com"),
+    ("77 Elm Rd", None, None),
+]
+
+
+def _candidate(i, **overrides):
+    lead = {"address": f"{i} New St", "phone": f"313-555-{i:04d}", "email": f"new{i}@example.com"}
+    lead.update(overrides)
+    return lead
+
+
+@pytest.fixture
+def dedupe_service():
+    """Pipeline whose database returns STORED_LEADS for any key lookup"""
+    db = MagicMock()
+    query = db.query.return_value
+    query.filter.return_value.all.return_value = STORED_LEADS
+    query.filter.return_value.yield_per.return_value = STORED_LEADS
+    return DataPipelineService(db=db)
+
+
+@pytest.fixture
+def mock_redis():
+    client = MockRedisClient()
+    client.is_connected = True
+    with patch("app.utils.bloom_filter.redis_client", client), \
+            patch("app.services.intelligence.data_pipeline_service.redis_client", client):
+        yield client
+
+
+class TestBatchedDeduplication:
+    @pytest.mark.asyncio
+    async def test_one_query_per_chunk(self, dedupe_service):
+        leads = [_candidate(i) for i in range(1200)]
+
+        await dedupe_service._find_existing_leads(leads)
+
+        assert dedupe_service.db.query.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_matches_on_normalized_keys(self, dedupe_service):
+        leads = [
+            _candidate(1, phone="248.555.0100"),
+            _candidate(2, email=" owner@example.com "),
+            _candidate(3, address="77  ELM rd"),
+            _candidate(4),
+        ]
+
+        assert await dedupe_service._find_existing_leads(leads) == [True, True, True, False]
+
+    @pytest.mark.asyncio
+    async def test_leads_without_keys_skip_database(self, dedupe_service):
+        flags = await dedupe_service._find_existing_leads([{"city": "Troy"}])
+
+        assert flags == [False]
+        dedupe_service.db.query.assert_not_called()
+
+
+class TestBloomPrefilter:
+    def test_no_false_negatives(self, mock_redis):
+        bloom = RedisBloomFilter("test:bloom", capacity=1000, error_rate=0.01)
+        items = [f"phone:{i}" for i in range(500)]
+        bloom.add_many(items)
+
+        assert all(bloom.might_contain_many(items))
+        false_positives = sum(bloom.might_contain_many(f"email:{i}" for i in range(1000)))
+        assert false_positives < 50
+
+    @pytest.mark.asyncio
+    async def test_unseen_leads_only_checked_against_recent_writes(self, dedupe_service, mock_redis):
+        with patch.object(pipeline_module, "BLOOM_PREFILTER_ENABLED", True), \
+                patch.object(pipeline_module, "known_lead_keys",
+                             RedisBloomFilter("test:leads", capacity=1000)), \
+                patch.object(dedupe_service, "_query_existing_keys",
+                             wraps=dedupe_service._query_existing_keys) as query_keys:
+            dedupe_service.rebuild_known_leads_filter()
+
+            flags = await dedupe_service._find_existing_leads([_candidate(i) for i in range(50)])
+            assert flags == [False] * 50
+            assert query_keys.call_count == 1
+            assert query_keys.call_args.args[1] is not None
+
+            query_keys.reset_mock()
+            known = _candidate(99, phone="2485550100")
+            assert await dedupe_service._find_existing_leads([known]) == [True]
+            assert query_keys.call_args.args[1] is None
+
+    @pytest.mark.asyncio
+    async def test_lead_inserted_outside_orm_still_found(self, dedupe_service, mock_redis):
+        """Leads written after the build (e.g. through Supabase) are caught by the recent-writes check"""
+        with patch.object(pipeline_module, "BLOOM_PREFILTER_ENABLED", True), \
+                patch.object(pipeline_module, "known_lead_keys",
+                             RedisBloomFilter("test:leads", capacity=1000)):
+            dedupe_service.rebuild_known_leads_filter()
+            dedupe_service.db.query.return_value.filter.return_value.all.return_value = [
+                ("5 New St", "313-555-0005", "new5@example.com")
+            ]
+
+            assert await dedupe_service._find_existing_leads([_candidate(5)]) == [True]
+
+    def test_rebuild_swaps_in_complete_filter(self, dedupe_service, mock_redis):
+        bloom = RedisBloomFilter("test:leads", capacity=1000)
+        bloom.add_many(["phone:stale"])
+        with patch.object(pipeline_module, "known_lead_keys", bloom):
+            assert dedupe_service.rebuild_known_leads_filter() == len(STORED_LEADS)
+
+        assert bloom.might_contain_many(["phone:2485550100", "phone:stale"]) == [True, False]
+        assert bloom.built_at() is not None
+        assert not [key for key in mock_redis.storage if ":building:" in key or key == bloom.lock_key]
+
+    def test_concurrent_rebuild_skipped(self, dedupe_service, mock_redis):
+        bloom = RedisBloomFilter("test:leads", capacity=1000)
+        mock_redis.set(bloom.lock_key, "other-worker", ex=60, nx=True)
+        with patch.object(pipeline_module, "known_lead_keys", bloom):
+            assert dedupe_service.rebuild_known_leads_filter() == 0
+
+        assert not bloom.is_ready()
+
+    @pytest.mark.asyncio
+    async def test_cold_filter_queues_background_rebuild(self, dedupe_service, mock_redis):
+        with patch.object(pipeline_module, "BLOOM_PREFILTER_ENABLED", True), \
+                patch.object(pipeline_module, "known_lead_keys",
+                             RedisBloomFilter("test:leads", capacity=1000)), \
+                patch.object(pipeline_module, "job_queue") as queue:
+            await dedupe_service._find_existing_leads([_candidate(1)])
+            await dedupe_service._find_existing_leads([_candidate(2)])
+
+        queue.enqueue.assert_called_once_with("data_pipeline.rebuild_known_leads")
+        dedupe_service.db.query.return_value.filter.return_value.yield_per.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_unbuilt_filter_falls_back_to_database(self, dedupe_service):
+        redis_down = MagicMock(is_connected=False)
+        with patch.object(pipeline_module, "BLOOM_PREFILTER_ENABLED", True), \
+                patch("app.utils.bloom_filter.redis_client", redis_down), \
+                patch("app.services.intelligence.data_pipeline_service.redis_client", redis_down):
+            flags = await dedupe_service._find_existing_leads([_candidate(1)])
+
+        assert flags == [False]
+        assert dedupe_service.db.query.call_count == 1
@@ -0,0 +1,106 @@
+"""
+Unit Tests for the lead alert escalation scheduler
+"""
+
+import time
+
+import pytest
+
+from app.services.escalation_scheduler import (
+    EscalationScheduler,
+    InMemoryDelayQueue,
+    RedisDelayQueue,
+)
+from app.utils.redis_client import MockRedisClient
+
+
+class Recorder:
+    def __init__(self):
+        self.fired = []
+
+    def __call__(self, key, payload):
+        self.fired.append((key, payload))
+
+
+@pytest.fixture(params=["memory", "redis"])
+def delay_queue(request):
+    if request.param == "memory":
+        return InMemoryDelayQueue()
+    return RedisDelayQueue(client=MockRedisClient())
+
+
+class TestDelayQueue:
+    def test_claims_only_due_entries_in_due_order(self, delay_queue):
+        now = time.time()
+        delay_queue.schedule("alert-late", now - 1, {"lead_id": "lead-2"})
+        delay_queue.schedule("alert-early", now - 5, {"lead_id": "lead-1"})
+        delay_queue.schedule("alert-future", now + 60, {"lead_id": "lead-3"})
+
+        claimed = delay_queue.claim_due(10)
+
+        assert claimed == [("alert-early", {"lead_id": "lead-1"}), ("alert-late", {"lead_id": "lead-2"})]
+        assert delay_queue.pending() == 1
+
+    def test_claim_respects_batch_limit(self, delay_queue):
+        for i in range(5):
+            delay_queue.schedule(f"alert-{i}", time.time() - 1, {})
+
+        assert len(delay_queue.claim_due(3)) == 3
+        assert len(delay_queue.claim_due(3)) == 2
+        assert delay_queue.claim_due(3) == []
+
+    def test_cancelled_entry_never_fires(self, delay_queue):
+        delay_queue.schedule("alert-1", time.time() - 1, {})
+
+        assert delay_queue.cancel("alert-1") is True
+        assert delay_queue.cancel("alert-1") is False
+        assert delay_queue.claim_due(10) == []
+
+    def test_rescheduling_replaces_pending_entry(self, delay_queue):
+        delay_queue.schedule("alert-1", time.time() - 1, {"attempt": 1})
+        delay_queue.schedule("alert-1", time.time() + 60, {"attempt": 2})
+
+        assert delay_queue.claim_due(10) == []
+        assert delay_queue.pending() == 1
+
+
+class TestEscalationScheduler:
+    def test_run_due_fires_handler_once(self):
+        handler = Recorder()
+        scheduler = EscalationScheduler(handler, queue=InMemoryDelayQueue())
+        scheduler.queue.schedule("alert-1", time.time() - 1, {"lead_id": "lead-1"})
+
+        assert scheduler.run_due() == 1
+        assert scheduler.run_due() == 0
+        assert handler.fired == [("alert-1", {"lead_id": "lead-1"})]
+
+    def test_handler_errors_do_not_stop_the_batch(self):
+        fired = []
+
+        def handler(key, payload):
+            fired.append(key)
+            if key == "alert-1":
+                raise RuntimeError("notification provider down")
+
+        scheduler = EscalationScheduler(handler, queue=InMemoryDelayQueue())
+        scheduler.queue.schedule("alert-1", time.time() - 2, {})
+        scheduler.queue.schedule("alert-2", time.time() - 1, {})
+
+        assert scheduler.run_due() == 2
+        assert fired == ["alert-1", "alert-2"]
+
+    def test_background_thread_fires_after_delay(self):
+        handler = Recorder()
+        scheduler = EscalationScheduler(handler, queue=InMemoryDelayQueue(), poll_interval=0.01)
+        try:
+            scheduler.schedule("alert-1", 0.05, {"lead_id": "lead-1"})
+            scheduler.schedule("alert-2", 0.05)
+            scheduler.cancel("alert-2")
+
+            deadline = time.time() + 2
+            while not handler.fired and time.time() < deadline:
+                time.sleep(0.01)
+        finally:
+            scheduler.shutdown()
+
+        assert handler.fired == [("alert-1", {"lead_id": "lead-1"})]
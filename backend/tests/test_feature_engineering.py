@@ -0,0 +1,126 @@
+"""
+Unit Tests for the columnar NBA feature builders
+"""
+
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.ml.feature_engineering import (
+    BehavioralFeatureExtractor,
+    LeadSourceFeatureExtractor,
+    build_feature_pipeline,
+    build_history_features,
+)
+
+BEHAVIORAL_COLUMNS = [
+    'interaction_count',
+    'email_open_rate',
+    'response_rate',
+    'appointment_show_rate',
+    'avg_interaction_duration',
+]
+
+
+def _interaction(rng):
+    interaction = {'type': rng.choice(['email', 'call', 'sms'])}
+    for key, values in [
+        ('opened', [True, False, None, 1, 0]),
+        ('direction', ['outbound', 'inbound']),
+        ('response_received', [True, False, None]),
+        ('duration_minutes', [0, 3, 7.5, 20]),
+    ]:
+        if rng.random() < 0.7:
+            interaction[key] = rng.choice(values)
+    return interaction
+
+
+def _leads(n, seed=3):
+    rng = random.Random(seed)
+    return pd.DataFrame({
+        'interactions': [
+            rng.choice([None, []] + [[_interaction(rng) for _ in range(rng.randint(1, 8))]] * 4)
+            for _ in range(n)
+        ],
+        'appointments': [
+            rng.choice([None, [], [{'completed': rng.random() < 0.5} for _ in range(rng.randint(1, 4))],
+                        [{}, {'completed': True}]])
+            for _ in range(n)
+        ],
+        'source': [rng.choice(['Google_Ads', 'referral', 'website', 'door_to_door', None]) for _ in range(n)],
+    }, index=[f'lead_{i}' for i in range(n)])
+
+
+def _reference(X):
+    """The original row-wise transform"""
+    extractor = BehavioralFeatureExtractor()
+    return pd.DataFrame({
+        'interaction_count': X['interactions'].apply(lambda x: len(x) if isinstance(x, list) else 0),
+        'email_open_rate': X.apply(extractor._calculate_email_open_rate, axis=1),
+        'response_rate': X.apply(extractor._calculate_response_rate, axis=1),
+        'appointment_show_rate': X.apply(extractor._calculate_show_rate, axis=1),
+        'avg_interaction_duration': X.apply(extractor._calculate_avg_duration, axis=1),
+    })
+
+
+class TestHistoryFeatures:
+    def test_matches_row_wise_definitions(self):
+        X = _leads(500)
+
+        result = BehavioralFeatureExtractor().transform(X)
+
+        pd.testing.assert_frame_equal(
+            result[BEHAVIORAL_COLUMNS], _reference(X)[BEHAVIORAL_COLUMNS], check_dtype=False
+        )
+
+    def test_empty_histories(self):
+        X = pd.DataFrame({'interactions': [[], None], 'appointments': [[], []]})
+
+        features = build_history_features(X)
+
+        assert features.to_dict('list') == {
+            'interaction_count': [0, 0],
+            'email_open_rate': [0.0, 0.0],
+            'response_rate': [0.0, 0.0],
+            'avg_interaction_duration': [0.0, 0.0],
+            'appointment_show_rate': [0.0, 0.0],
+        }
+
+    def test_missing_appointments_column(self):
+        X = pd.DataFrame({'interactions': [[{'type': 'email', 'opened': True}]]})
+
+        assert build_history_features(X)['appointment_show_rate'].tolist() == [0.0]
+
+
+class TestSourceFeatures:
+    def test_categories(self):
+        X = _leads(5, seed=1).assign(
+            source=['Google_Ads', 'referral', 'website', 'door_to_door', None]
+        )
+
+        result = LeadSourceFeatureExtractor().transform(X)
+
+        assert result['source_category'].tolist() == ['paid', 'referral', 'organic', 'other', 'other']
+        assert result['is_paid_channel'].tolist() == [1, 0, 0, 0, 0]
+
+
+def test_pipeline_output_is_stable():
+    X = _leads(60).assign(
+        id=lambda df: df.index,
+        source=lambda df: df['source'].fillna('website'),
+        created_at=pd.date_range('2025-01-01', periods=60, freq='D'),
+        last_interaction_at=pd.date_range('2025-02-01', periods=60, freq='D'),
+        assigned_to='rep_1',
+        estimated_value=np.linspace(100000, 1200000, 60),
+        property_zip='48302',
+        lead_score=50,
+    )
+
+    pipeline = build_feature_pipeline()
+    fitted = pipeline.fit_transform(X)
+
+    assert fitted.shape[0] == 60
+    assert not np.isnan(fitted).any()
+    np.testing.assert_allclose(pipeline.transform(X.iloc[:10]), fitted[:10])
@@ -0,0 +1,259 @@
+"""
+Unit Tests for the lead feature store and /predict/nba/leads
+"""
+
+import asyncio
+import random
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi import BackgroundTasks
+from sklearn.ensemble import GradientBoostingClassifier
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.ml import feature_store as feature_store_module
+from app.ml.feature_engineering import BEHAVIORAL_FEATURES, build_feature_pipeline, build_history_features
+from app.ml.feature_store import LeadFeatureStore
+from app.ml.next_best_action import NextBestActionModel
+from app.models.appointment_sqlalchemy import Appointment, AppointmentStatus, AppointmentType
+from app.models.interaction_sqlalchemy import (
+    EntityType,
+    Interaction,
+    InteractionDirection,
+    InteractionOutcome,
+    InteractionType,
+)
+from app.models.lead_feature_sqlalchemy import LeadFeatureRecord
+from app.models.lead_sqlalchemy import Lead, LeadSourceEnum
+from app.routes.ml_predictions import (
+    LeadIdsPredictionRequest,
+    ModelManager,
+    predict_by_lead_ids,
+)
+
+CREATED_AT = datetime(2025, 9, 1, 10, 0)
+
+
+@pytest.fixture
+def store_db(app):
+    """SQLite leads/lead_features tables behind the feature store's session helper"""
+    engine = create_engine("sqlite://")
+    for model in (Lead, LeadFeatureRecord, Interaction, Appointment):
+        model.__table__.create(engine)
+
+    @contextmanager
+    def session_scope():
+        with Session(engine) as session:
+            yield session
+            session.commit()
+
+    with patch.object(feature_store_module, "get_db_session", session_scope):
+        with Session(engine) as session:
+            yield session
+
+
+def _add_leads(session, n):
+    sources = [LeadSourceEnum.GOOGLE_ADS, LeadSourceEnum.REFERRAL, LeadSourceEnum.FACEBOOK_ADS]
+    for i in range(n):
+        session.add(Lead(
+            id=f"lead-{i:03d}", first_name="Test", last_name=f"Lead{i}", phone="2485550000",
+            source=sources[i % 3], zip_code=["48302", "48187", "48009"][i % 3],
+            property_value=200000 + i * 5000, lead_score=i % 100, created_at=CREATED_AT,
+        ))
+    session.commit()
+
+
+def _histories(n, seed=5):
+    rng = random.Random(seed)
+    histories = []
+    for i in range(n):
+        interactions = [
+            {
+                "lead_id": f"lead-{i:03d}",
+                "type": rng.choice(["email", "phone_call", "sms"]),
+                "opened": rng.random() < 0.5,
+                "direction": rng.choice(["outbound", "inbound"]),
+                "response_received": rng.random() < 0.4,
+                "duration_minutes": rng.choice([0, 3, 12]),
+                "interaction_date": (CREATED_AT + timedelta(days=rng.randint(1, 30))).isoformat(),
+            }
+            for _ in range(rng.randint(0, 6))
+        ]
+        appointments = [
+            {"lead_id": f"lead-{i:03d}", "completed": rng.random() < 0.5}
+            for _ in range(rng.randint(0, 3))
+        ]
+        histories.append((interactions, appointments))
+    return histories
+
+
+def _record(store, histories):
+    for interactions, appointments in histories:
+        for interaction in interactions:
+            assert store.record_interaction(interaction)
+        for appointment in appointments:
+            store.record_appointment(appointment)
+            if appointment["completed"]:
+                store.record_appointment(appointment, scheduled=False, completed=True)
+
+
+class TestLeadFeatureStore:
+    def test_counters_match_history_features(self, store_db):
+        _add_leads(store_db, 30)
+        histories = _histories(30)
+        store = LeadFeatureStore()
+        _record(store, histories)
+
+        frame = store.get_feature_frame([f"lead-{i:03d}" for i in range(30)])
+
+        expected = build_history_features(pd.DataFrame({
+            "interactions": [h[0] for h in histories],
+            "appointments": [h[1] for h in histories],
+        }, index=[f"lead-{i:03d}" for i in range(30)]))
+        pd.testing.assert_frame_equal(
+            frame.loc[expected.index, BEHAVIORAL_FEATURES], expected[BEHAVIORAL_FEATURES], check_dtype=False
+        )
+
+    def test_last_interaction_is_latest(self, store_db):
+        _add_leads(store_db, 1)
+        store = LeadFeatureStore()
+        for day in (5, 9, 2):
+            store.record_interaction({"entity_type": "lead", "entity_id": "lead-000",
+                                      "interaction_date": f"2025-09-{day:02d}T12:00:00Z"})
+
+        record = store_db.get(LeadFeatureRecord, "lead-000")
+
+        assert record.interaction_count == 3
+        assert record.last_interaction_at == datetime(2025, 9, 9, 12, 0)
+
+    def test_non_lead_activity_is_ignored(self, store_db):
+        store = LeadFeatureStore()
+
+        assert not store.record_interaction({"entity_type": "customer", "entity_id": "c-1"})
+        assert not store.record_appointment({"customer_id": "c-1"})
+        assert store_db.query(LeadFeatureRecord).count() == 0
+
+    def test_unknown_deleted_and_inactive_leads(self, store_db):
+        _add_leads(store_db, 3)
+        store_db.get(Lead, "lead-002").is_deleted = True
+        store_db.commit()
+
+        frame = LeadFeatureStore().get_feature_frame(["lead-000", "lead-001", "lead-002", "missing"])
+
+        assert sorted(frame.index) == ["lead-000", "lead-001"]
+        assert frame.loc["lead-000", "interaction_count"] == 0
+        assert frame.loc["lead-000", "last_interaction_at"] == CREATED_AT
+        assert frame.loc["lead-000", "source"] == "google_ads"
+
+    def test_rebuild_matches_incremental(self, store_db):
+        _add_leads(store_db, 1)
+        rows = [
+            (InteractionType.EMAIL, InteractionDirection.OUTBOUND, True, InteractionOutcome.SUCCESSFUL, 4),
+            (InteractionType.EMAIL, InteractionDirection.OUTBOUND, False, InteractionOutcome.NO_ANSWER, None),
+            (InteractionType.PHONE_CALL, InteractionDirection.INBOUND, False, None, 10),
+        ]
+        store = LeadFeatureStore()
+        for i, (kind, direction, opened, outcome, duration) in enumerate(rows):
+            interaction = dict(
+                entity_type=EntityType.LEAD, entity_id="lead-000", interaction_type=kind,
+                direction=direction, email_opened=opened, outcome=outcome, duration_minutes=duration,
+                interaction_date=CREATED_AT + timedelta(days=i),
+            )
+            store_db.add(Interaction(subject="Touch", performed_by="rep-1", **interaction))
+            store.record_interaction(interaction)
+        for status in (AppointmentStatus.COMPLETED, AppointmentStatus.NO_SHOW):
+            appointment = dict(entity_type="lead", entity_id="lead-000", status=status)
+            store_db.add(Appointment(appointment_type=AppointmentType.ROOF_INSPECTION, title="Inspection",
+                                     scheduled_date=CREATED_AT, duration_minutes=60, assigned_to="rep-1",
+                                     **appointment))
+            store.record_appointment(appointment, completed=status == AppointmentStatus.COMPLETED)
+        store_db.commit()
+        incremental = store.get_feature_frame(["lead-000"])
+
+        assert store.rebuild() == 1
+
+        pd.testing.assert_frame_equal(store.get_feature_frame(["lead-000"]), incremental)
+        assert incremental.loc["lead-000", "response_rate"] == 0.5
+        assert incremental.loc["lead-000", "appointment_show_rate"] == 0.5
+
+
+@pytest.fixture
+def manager(tmp_path):
+    """ModelManager with a small model fitted on stored-lead features"""
+    rng = np.random.default_rng(0)
+    frame = pd.DataFrame({
+        "id": [f"lead-{i:03d}" for i in range(60)],
+        "source": rng.choice(["google_ads", "referral", "facebook_ads"], 60),
+        "created_at": pd.Timestamp(CREATED_AT),
+        "last_interaction_at": pd.Timestamp(CREATED_AT) + pd.to_timedelta(rng.integers(0, 30, 60), unit="D"),
+        "assigned_to": "unassigned",
+        "estimated_value": rng.uniform(1e5, 9e5, 60),
+        "property_zip": "48302",
+        "lead_score": rng.integers(0, 100, 60),
+        "interactions": [[{"type": "email", "opened": bool(i % 2)}] * (i % 5) for i in range(60)],
+        "appointments": [[]] * 60,
+    })
+    pipeline = build_feature_pipeline()
+    X = pipeline.fit_transform(frame)
+    y = np.array(NextBestActionModel.ACTIONS[:3])[np.arange(len(X)) % 3]
+
+    model = NextBestActionModel(model_path=str(tmp_path))
+    model.model = GradientBoostingClassifier(n_estimators=10, max_depth=3, random_state=0).fit(X, y)
+
+    mgr = ModelManager()
+    saved = (mgr._model, mgr._pipeline)
+    mgr._model, mgr._pipeline = model, pipeline
+    yield mgr
+    mgr._model, mgr._pipeline = saved
+
+
+class TestPredictByLeadIds:
+    def test_matches_full_history_payload(self, store_db, manager):
+        _add_leads(store_db, 20)
+        histories = _histories(20, seed=9)
+        _record(LeadFeatureStore(), histories)
+        lead_ids = [f"lead-{i:03d}" for i in range(20)]
+
+        response = asyncio.run(predict_by_lead_ids(
+            LeadIdsPredictionRequest(lead_ids=lead_ids + ["missing"]), BackgroundTasks(), manager
+        ))
+
+        assert [p.lead_id for p in response.predictions] == lead_ids
+        assert [(e.index, e.lead_id) for e in response.errors] == [(20, "missing")]
+
+        stored = LeadFeatureStore().get_feature_frame(lead_ids)
+        full = stored.drop(columns=BEHAVIORAL_FEATURES).assign(
+            interactions=[h[0] for h in histories],
+            appointments=[h[1] for h in histories],
+        )
+        expected = manager.model.predict(manager.pipeline.transform(full), return_probabilities=True)
+        for prediction, result in zip(response.predictions, expected):
+            assert prediction.action == result["action"]
+            assert prediction.all_probabilities == pytest.approx(result["all_probabilities"])
+
+
+def test_create_interaction_updates_store():
+    from app.models.interaction_schemas import InteractionCreate
+    from app.services import interaction_service as interaction_service_module
+
+    service = interaction_service_module.InteractionService()
+    service.supabase = MagicMock()
+    row = {"id": "i-1", "entity_type": "lead", "entity_id": "lead-000", "interaction_type": "email"}
+    service.supabase.from_.return_value.insert.return_value.execute.return_value.data = [row]
+
+    data = InteractionCreate(
+        entity_type="lead", entity_id="6b1f0d4e-6f1a-4c8e-9d7a-2f3b4c5d6e7f", interaction_type="email",
+        direction="outbound", subject="Quote follow-up",
+        performed_by="0b1f0d4e-6f1a-4c8e-9d7a-2f3b4c5d6e7f",
+    )
+    with patch.object(interaction_service_module, "lead_feature_store") as store, \
+            patch.object(service, "_update_customer_last_interaction"):
+        success, _, _ = service.create_interaction(data, created_by="rep-1")
+
+    assert success
+    store.record_interaction.assert_called_once_with(row)
@@ -0,0 +1,128 @@
+"""
+Unit Tests for the revenue forecasting service
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pytest
+
+from app.ml import forecasting_service
+from app.ml.forecasting_service import (
+    RevenueForecastService,
+    daily_revenue_frame,
+    fit_candidate,
+    select_model,
+)
+
+
+def _rows(days=120, seed=0):
+    """Daily revenue with a trend and a weekday pattern"""
+    rng = np.random.default_rng(seed)
+    start = datetime(2025, 6, 1)
+    return [
+        (start + timedelta(days=i), 5000 + 40 * i + 1500 * ((start + timedelta(days=i)).weekday() < 5)
+         + rng.normal(0, 100), 2)
+        for i in range(days)
+    ]
+
+
+@pytest.fixture
+def frame():
+    return daily_revenue_frame(_rows(), datetime(2025, 6, 1), 120)
+
+
+class TestDailyRevenueFrame:
+    def test_start_time_of_day_is_ignored(self):
+        df = daily_revenue_frame(_rows(days=10), datetime(2025, 6, 1, 14, 37), 10)
+
+        assert df.index[0] == datetime(2025, 6, 1)
+        assert (df['revenue'] > 0).all()
+        assert df['project_count'].tolist() == [2] * 10
+
+
+class TestModelSelection:
+    def test_lowest_holdout_error_wins(self, frame):
+        best = select_model(frame, candidates=['arima', 'linear'], max_workers=2, processes=True)
+
+        assert best['model_type'] == 'linear'
+        scores = {c['model_type']: c['holdout_mae'] for c in best['candidates']}
+        assert scores['linear'] == best['holdout_mae'] < scores['arima']
+        assert best['metrics']['training_samples'] == 120
+
+    def test_fits_in_process_by_default(self, frame):
+        with patch.object(forecasting_service, 'ProcessPoolExecutor') as pool:
+            best = select_model(frame, candidates=['linear'])
+
+        pool.assert_not_called()
+        assert best['model_type'] == 'linear'
+
+    def test_failed_candidate_is_reported_not_raised(self, frame):
+        broken = frame.assign(revenue=np.nan)
+
+        result = fit_candidate('linear', broken)
+
+        assert result['model_type'] == 'linear'
+        assert 'error' in result and 'model' not in result
+
+    def test_short_history_rejected(self, frame):
+        with pytest.raises(ValueError, match="more than 30 days"):
+            select_model(frame.iloc[:30])
+
+
+@pytest.fixture
+def service(tmp_path):
+    with patch.object(forecasting_service, 'query_daily_revenue', return_value=_rows()), \
+            patch.object(forecasting_service, 'revenue_watermark', return_value='2025-10-01|120') as watermark, \
+            patch.object(forecasting_service, 'select_model', wraps=select_model) as select:
+        yield RevenueForecastService(model_dir=str(tmp_path)), watermark, select
+
+
+class TestRevenueForecastService:
+    def test_model_reused_until_revenue_changes(self, service):
+        svc, watermark, select = service
+        db = Mock()
+
+        first = svc.get_model(db)
+        second = svc.get_model(db)
+        assert select.call_count == 1
+        assert asyncio.run(second.predict_revenue(days_ahead=14))['forecast'] == \
+            asyncio.run(first.predict_revenue(days_ahead=14))['forecast']
+        assert first.selection['candidates']
+
+        watermark.return_value = '2025-10-02|121'
+        svc.get_model(db)
+        assert select.call_count == 2
+
+    def test_persisted_model_shared_across_instances(self, service, tmp_path):
+        svc, _, select = service
+        svc.get_model(Mock())
+
+        other = RevenueForecastService(model_dir=str(tmp_path)).get_model(Mock())
+
+        assert select.call_count == 1
+        assert len(list(tmp_path.glob('revenue_forecast_*.joblib'))) == 1
+        assert other.model_type == svc.get_model(Mock()).model_type
+
+    def test_new_model_only_replaces_same_window(self, service, tmp_path):
+        svc, watermark, _ = service
+        svc.get_model(Mock(), historical_days=180)
+        svc.get_model(Mock(), historical_days=90)
+
+        watermark.return_value = '2025-10-02|121'
+        svc.get_model(Mock(), historical_days=180)
+
+        assert len(list(tmp_path.glob('revenue_forecast_180d_*.joblib'))) == 1
+        assert len(list(tmp_path.glob('revenue_forecast_90d_*.joblib'))) == 1
+
+    def test_unknown_watermark_fits_without_caching(self, service, tmp_path):
+        svc, watermark, select = service
+        watermark.side_effect = RuntimeError('db unavailable')
+
+        svc.get_model(Mock())
+        svc.get_model(Mock())
+
+        assert select.call_count == 2
+        assert not list(tmp_path.glob('*.joblib'))
@@ -0,0 +1,362 @@
+"""
+Unit Tests for the background job queue
+"""
+
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+from flask import Flask
+
+from app.routes import jobs as jobs_routes
+from app.services.background_tasks import cancellable
+from app.services.job_queue import (
+    InMemoryJobStore,
+    JobQueue,
+    JobStatus,
+    RedisJobStore,
+    job_task,
+)
+from app.utils.async_runner import run_async
+from app.utils.redis_client import MockRedisClient
+
+attempts = {"flaky": 0}
+gate = threading.Event()
+
+
+@job_task("tests.add")
+def add(ctx, a, b):
+    return {"sum": a + b}
+
+
+@job_task("tests.flaky", max_retries=2, retry_backoff=0.01)
+def flaky(ctx, failures):
+    attempts["flaky"] += 1
+    if attempts["flaky"] <= failures:
+        raise ConnectionError("upstream unavailable")
+    return attempts["flaky"]
+
+
+@job_task("tests.slow_retry", max_retries=1, retry_backoff=60)
+def slow_retry(ctx):
+    raise ConnectionError("upstream unavailable")
+
+
+@job_task("tests.stepped")
+def stepped(ctx, steps):
+    for step in range(steps):
+        ctx.report(step / steps * 100, f"step {step}")
+        gate.wait(5)
+    return steps
+
+
+@job_task("tests.awaiting")
+def awaiting(ctx, seconds):
+    return run_async(cancellable(ctx, asyncio.sleep(seconds, "done"), poll_interval=0.02), timeout=None)
+
+
+@pytest.fixture(autouse=True)
+def reset_task_state():
+    attempts["flaky"] = 0
+    gate.clear()
+    yield
+    gate.set()
+
+
+@pytest.fixture
+def queue():
+    queue = JobQueue(store=InMemoryJobStore(), max_workers=2, poll_interval=0.01)
+    yield queue
+    queue.shutdown()
+
+
+def wait_for(queue, job_id, *statuses, timeout=5):
+    deadline = time.time() + timeout
+    while (status := queue.status(job_id))["status"] not in statuses:
+        assert time.time() < deadline, f"job stuck in {status['status']}"
+        time.sleep(0.01)
+    return status
+
+
+class TestJobQueue:
+    def test_job_runs_and_stores_result(self, queue):
+        job = queue.enqueue("tests.add", 2, b=3)
+
+        status = wait_for(queue, job.job_id, JobStatus.SUCCEEDED)
+
+        assert status["progress"] == 100.0
+        assert status["attempts"] == 1
+        assert queue.get(job.job_id).result == {"sum": 5}
+
+    def test_unknown_task_rejected(self, queue):
+        with pytest.raises(ValueError, match="Unknown job task"):
+            queue.enqueue("tests.missing")
+
+    def test_progress_reported_while_running(self, queue):
+        job = queue.enqueue("tests.stepped", 4)
+
+        deadline = time.time() + 5
+        while queue.status(job.job_id)["message"] != "step 0":
+            assert time.time() < deadline
+            time.sleep(0.01)
+        assert queue.status(job.job_id)["status"] == JobStatus.RUNNING
+
+        gate.set()
+        status = wait_for(queue, job.job_id, JobStatus.SUCCEEDED)
+        assert status["message"] == "step 3"
+
+    def test_failures_retried_until_success(self, queue):
+        job = queue.enqueue("tests.flaky", 2)
+
+        status = wait_for(queue, job.job_id, JobStatus.SUCCEEDED, JobStatus.FAILED)
+
+        assert status["status"] == JobStatus.SUCCEEDED
+        assert status["attempts"] == 3
+        assert queue.get(job.job_id).result == 3
+
+    def test_gives_up_after_max_retries(self, queue):
+        job = queue.enqueue("tests.flaky", 5)
+
+        status = wait_for(queue, job.job_id, JobStatus.SUCCEEDED, JobStatus.FAILED)
+
+        assert status["status"] == JobStatus.FAILED
+        assert status["attempts"] == 3
+        assert status["error"] == "ConnectionError: upstream unavailable"
+
+    def test_retry_waits_for_backoff_and_can_be_cancelled(self, queue):
+        job = queue.enqueue("tests.slow_retry")
+
+        status = wait_for(queue, job.job_id, JobStatus.RETRYING)
+        assert status["attempts"] == 1
+        assert status["next_attempt_at"] > status["started_at"]
+
+        status = queue.cancel(job.job_id)
+        assert status["status"] == JobStatus.CANCELLED
+        assert status["attempts"] == 1
+
+    def test_queued_job_cancelled_without_running(self):
+        queue = JobQueue(store=InMemoryJobStore(), embedded_workers=False)
+        job = queue.enqueue("tests.add", 1, 1)
+
+        assert queue.cancel(job.job_id)["status"] == JobStatus.CANCELLED
+
+        queue.start()
+        time.sleep(0.1)
+        queue.shutdown()
+        assert queue.get(job.job_id).result is None
+
+    def test_running_job_stops_at_next_report(self, queue):
+        job = queue.enqueue("tests.stepped", 10)
+        wait_for(queue, job.job_id, JobStatus.RUNNING)
+
+        assert queue.cancel(job.job_id)["cancel_requested"] is True
+        gate.set()
+
+        status = wait_for(queue, job.job_id, JobStatus.CANCELLED)
+        assert status["progress"] < 100
+
+    def test_cancel_interrupts_awaited_coroutine(self, queue):
+        job = queue.enqueue("tests.awaiting", 30)
+        wait_for(queue, job.job_id, JobStatus.RUNNING)
+
+        queue.cancel(job.job_id)
+
+        status = wait_for(queue, job.job_id, JobStatus.CANCELLED, timeout=2)
+        assert queue.get(job.job_id).result is None
+        assert status["cancel_requested"] is False
+
+    def test_embedded_workers_default_to_threads(self, monkeypatch):
+        monkeypatch.delenv("JOB_WORKER_EXECUTOR", raising=False)
+        store = RedisJobStore(client=MockRedisClient())
+
+        assert JobQueue(store=store, embedded_workers=True).executor_kind == "thread"
+        assert JobQueue(store=store, embedded_workers=False).executor_kind == "process"
+
+
+class TestRedisJobStore:
+    def test_claims_due_jobs_oldest_first_exactly_once(self):
+        store = RedisJobStore(client=MockRedisClient())
+        queue = JobQueue(store=store, embedded_workers=False)
+        first = queue.enqueue("tests.add", 1, 1)
+        second = queue.enqueue("tests.add", 2, 2)
+        later = queue.enqueue("tests.add", 3, 3)
+        later.run_at = time.time() + 60
+        store.push(later)
+
+        assert store.claim() == first.job_id
+        assert store.claim() == second.job_id
+        assert store.claim() is None
+        assert store.remove(later.job_id) is True
+
+    def test_claim_leases_job_until_released(self):
+        store = RedisJobStore(client=MockRedisClient())
+        job = JobQueue(store=store, embedded_workers=False).enqueue("tests.add", 1, 1)
+
+        assert store.claim(lease_timeout=0) == job.job_id
+        store.renew([job.job_id], lease_timeout=60)
+
+        assert store.reclaim_expired() == []
+        assert store.release(job.job_id) is True
+        assert store.release(job.job_id) is False
+
+    def test_expired_lease_reclaimed_once(self):
+        store = RedisJobStore(client=MockRedisClient())
+        job = JobQueue(store=store, embedded_workers=False).enqueue("tests.add", 1, 1)
+        store.claim(lease_timeout=0)
+
+        assert store.reclaim_expired() == [job.job_id]
+        assert store.reclaim_expired() == []
+        # The original owner learns it lost the lease
+        assert store.release(job.job_id) is False
+
+
+class TestLostWorkers:
+    def _claim_and_abandon(self, store, task, *args):
+        """Simulate a worker process that claimed and started a job, then died"""
+        queue = JobQueue(store=store, embedded_workers=False, lease_timeout=0)
+        job = queue.enqueue(task, *args)
+        assert store.claim(lease_timeout=0) == job.job_id
+        job = store.get(job.job_id)
+        job.status, job.attempts = JobStatus.RUNNING, 1
+        store.save(job)
+        return job
+
+    def test_sweep_requeues_job_with_retries_left(self):
+        store = RedisJobStore(client=MockRedisClient())
+        job = self._claim_and_abandon(store, "tests.flaky", 0)
+
+        JobQueue(store=store, embedded_workers=False)._maintain_leases()
+
+        requeued = store.get(job.job_id)
+        assert requeued.status == JobStatus.RETRYING
+        assert requeued.error.startswith("LeaseExpired")
+        assert store.client.zrangebyscore(store.QUEUE_KEY, "-inf", "inf") == [job.job_id]
+
+    def test_sweep_fails_job_without_retries(self):
+        store = RedisJobStore(client=MockRedisClient())
+        job = self._claim_and_abandon(store, "tests.add", 1, 1)
+
+        JobQueue(store=store, embedded_workers=False)._maintain_leases()
+
+        assert store.get(job.job_id).status == JobStatus.FAILED
+        assert store.client.zrangebyscore(store.QUEUE_KEY, "-inf", "inf") == []
+
+    def test_running_jobs_keep_their_leases(self):
+        store = RedisJobStore(client=MockRedisClient())
+        queue = JobQueue(store=store, max_workers=1, executor="thread", poll_interval=0.01, lease_timeout=0.3)
+        job = queue.enqueue("tests.stepped", 2)
+        try:
+            wait_for(queue, job.job_id, JobStatus.RUNNING)
+            time.sleep(0.5)
+
+            assert store.reclaim_expired() == []
+            gate.set()
+            assert wait_for(queue, job.job_id, JobStatus.SUCCEEDED)["attempts"] == 1
+        finally:
+            queue.shutdown()
+
+
+@pytest.fixture
+def client(queue, monkeypatch):
+    monkeypatch.setenv("SKIP_AUTH", "true")
+    app = Flask(__name__)
+    app.register_blueprint(jobs_routes.bp, url_prefix="/api/jobs")
+    with patch.object(jobs_routes, "job_queue", queue):
+        yield app.test_client()
+
+
+class TestJobRoutes:
+    def test_enqueue_and_fetch_result(self, client, queue):
+        response = client.post("/api/jobs", json={"task": "tests.add", "args": [4, 5]})
+
+        assert response.status_code == 202
+        job_id = response.json["job_id"]
+        assert response.json["status_url"] == f"/api/jobs/{job_id}"
+
+        wait_for(queue, job_id, JobStatus.SUCCEEDED)
+        result = client.get(f"/api/jobs/{job_id}/result")
+        assert result.status_code == 200
+        assert result.json["result"] == {"sum": 9}
+
+    def test_unexposed_task_cannot_be_enqueued(self, client):
+        response = client.post("/api/jobs", json={"task": "leads.bulk_import", "args": ["/etc/passwd"]})
+
+        assert response.status_code == 400
+
+    @pytest.mark.parametrize(
+        "task, args",
+        [
+            ("live_data.generate", [100000]),
+            ("data_pipeline.run", [{}, "yes", -1]),
+            ("revenue.train", [100000, "auto"]),
+            ("calls.process", ["any-call"]),
+        ],
+    )
+    def test_endpoint_validated_tasks_cannot_be_enqueued(self, client, queue, task, args):
+        response = client.post("/api/jobs", json={"task": task, "args": args})
+
+        assert response.status_code == 400
+
+    def test_pending_result_and_cancel(self, client, queue):
+        job = queue.enqueue("tests.stepped", 3)
+        wait_for(queue, job.job_id, JobStatus.RUNNING)
+
+        assert client.get(f"/api/jobs/{job.job_id}/result").status_code == 202
+        assert client.post(f"/api/jobs/{job.job_id}/cancel").json["cancel_requested"] is True
+        gate.set()
+        wait_for(queue, job.job_id, JobStatus.CANCELLED)
+
+        assert client.get(f"/api/jobs/{job.job_id}/result").status_code == 409
+        assert client.post(f"/api/jobs/{job.job_id}/cancel").status_code == 409
+        assert client.get("/api/jobs/missing").status_code == 404
+
+
+USERS = {
+    "alice-token": {"user_id": "alice", "email": "alice@example.com", "role": "user"},
+    "bob-token": {"user_id": "bob", "email": "bob@example.com", "role": "user"},
+    "admin-token": {"user_id": "root", "email": "admin@example.com", "role": "admin"},
+}
+
+
+class TestJobOwnership:
+    @pytest.fixture
+    def authed_client(self, queue, monkeypatch):
+        monkeypatch.setenv("SKIP_AUTH", "false")
+        app = Flask(__name__)
+        app.register_blueprint(jobs_routes.bp, url_prefix="/api/jobs")
+        with patch.object(jobs_routes, "job_queue", queue), patch(
+            "app.utils.auth.auth_service.validate_token", side_effect=USERS.get
+        ):
+            yield app.test_client()
+
+    @staticmethod
+    def as_user(token):
+        return {"Authorization": f"Bearer {token}"}
+
+    def test_only_owner_or_admin_sees_job(self, authed_client, queue):
+        job = queue.enqueue("tests.add", 1, 2, created_by="alice")
+        wait_for(queue, job.job_id, JobStatus.SUCCEEDED)
+
+        for path in (f"/api/jobs/{job.job_id}", f"/api/jobs/{job.job_id}/result"):
+            assert authed_client.get(path, headers=self.as_user("alice-token")).status_code == 200
+            assert authed_client.get(path, headers=self.as_user("admin-token")).status_code == 200
+            assert authed_client.get(path, headers=self.as_user("bob-token")).status_code == 404
+
+    def test_other_user_cannot_cancel(self, authed_client, queue):
+        job = queue.enqueue("tests.stepped", 3, created_by="alice")
+        wait_for(queue, job.job_id, JobStatus.RUNNING)
+
+        response = authed_client.post(f"/api/jobs/{job.job_id}/cancel", headers=self.as_user("bob-token"))
+
+        assert response.status_code == 404
+        assert queue.status(job.job_id)["cancel_requested"] is False
+        gate.set()
+        wait_for(queue, job.job_id, JobStatus.SUCCEEDED)
+
+    def test_system_jobs_visible_to_admins_only(self, authed_client, queue):
+        job = queue.enqueue("tests.add", 1, 2)
+
+        assert authed_client.get(f"/api/jobs/{job.job_id}", headers=self.as_user("alice-token")).status_code == 404
+        assert authed_client.get(f"/api/jobs/{job.job_id}", headers=self.as_user("admin-token")).status_code == 200
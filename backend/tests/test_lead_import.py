@@ -0,0 +1,144 @@
+"""
+Unit Tests for the chunked lead import service
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from app.services import lead_import_service as import_module
+from app.services.lead_import_service import (
+    ImportOptions,
+    LeadImportService,
+    MissingFieldsError,
+)
+
+HEADER = "first_name,last_name,phone,email,source,zip_code\n"
+
+
+def _csv(rows):
+    return (HEADER + "".join(rows)).encode()
+
+
+def _row(i, email=None):
+    email = email or f"lead{i}@example.com"
+    return f"Lead,Number{i},(248) 555-{i:04d},{email},website,48009\n"
+
+
+@pytest.fixture
+def supabase(app):
+    """Supabase stub where existing@example.com is already stored"""
+    client = MagicMock()
+    table = client.table.return_value
+
+    def lookup(column, values):
+        found = [{"email": v} for v in values if v.lower() == "existing@example.com"]
+        return MagicMock(execute=MagicMock(return_value=MagicMock(data=found)))
+
+    table.select.return_value.in_.side_effect = lookup
+    table.insert.side_effect = lambda rows, **kwargs: MagicMock(
+        execute=MagicMock(return_value=MagicMock(data=rows))
+    )
+
+    with patch.object(import_module, "get_supabase_client", return_value=client), \
+            patch.object(import_module, "get_pusher_service"):
+        yield client
+
+
+@pytest.fixture
+def service():
+    return LeadImportService(chunk_size=50)
+
+
+class TestChunkedImport:
+    def test_one_lookup_and_insert_per_chunk(self, service, supabase):
+        data = _csv(_row(i) for i in range(120))
+
+        result = service.run_import(data, "leads.csv", ImportOptions())
+
+        assert result.success == 120
+        assert result.chunks_processed == 3
+        table = supabase.table.return_value
+        assert table.select.return_value.in_.call_count == 3
+        assert table.insert.call_count == 3
+
+    def test_duplicate_lookup_split_for_url_length(self, supabase):
+        service = LeadImportService(chunk_size=250)
+        data = _csv(_row(i) for i in range(250))
+
+        result = service.run_import(data, "leads.csv", ImportOptions())
+
+        assert result.success == 250
+        lookups = supabase.table.return_value.select.return_value.in_.call_args_list
+        assert [len(call.args[1]) for call in lookups] == [100, 100, 50]
+
+    def test_duplicates_in_database_and_file(self, service, supabase):
+        data = _csv([_row(1), _row(2, "Existing@example.com"), _row(3, "lead1@EXAMPLE.com")])
+
+        result = service.run_import(data, "leads.csv", ImportOptions())
+
+        assert result.success == 1
+        assert result.duplicates == 2
+
+    def test_rows_are_normalized_and_scored(self, service, supabase):
+        service.run_import(_csv([_row(7)]), "leads.csv", ImportOptions(import_id="batch-1"))
+
+        (lead,), _ = supabase.table.return_value.insert.call_args
+        lead = lead[0]
+        assert lead["phone"] == "2485550007"
+        assert lead["source"] == "website_form"
+        assert lead["zip_code"] == "48009"
+        assert lead["import_batch_id"] == "batch-1"
+        assert lead["lead_score"] > 0
+        assert "budget_confirmed" not in lead
+
+    def test_strict_validation_reports_row_numbers(self, service, supabase):
+        data = _csv([_row(1), "Bad,Phone,123,,website,48009\n"])
+
+        result = service.run_import(data, "leads.csv", ImportOptions(validate_strict=True))
+
+        assert result.success == 1
+        assert result.failed == 1
+        assert result.errors[0]["row"] == 3
+
+    def test_rejected_bulk_insert_falls_back_to_rows(self, service, supabase):
+        def insert(rows, **kwargs):
+            if isinstance(rows, list):
+                raise Exception("bulk insert rejected")
+            if rows["last_name"] == "Number2":
+                raise Exception("bad row")
+            return MagicMock(execute=MagicMock(return_value=MagicMock(data=[rows])))
+
+        supabase.table.return_value.insert.side_effect = insert
+
+        result = service.run_import(_csv(_row(i) for i in range(4)), "leads.csv", ImportOptions())
+
+        assert result.success == 3
+        assert result.errors == [{"row": 4, "error": "bad row", "data": result.errors[0]["data"]}]
+
+    def test_missing_columns_raise_before_any_insert(self, service, supabase):
+        with pytest.raises(MissingFieldsError) as exc:
+            service.run_import(b"first_name,phone\nA,2485550000\n", "leads.csv", ImportOptions())
+
+        assert exc.value.missing == ["last_name", "source"]
+        supabase.table.return_value.insert.assert_not_called()
+
+
+class TestTrackedImport:
+    def test_progress_is_reported(self, service, supabase):
+        data = _csv(_row(i) for i in range(100))
+        options = ImportOptions(import_id="job-1")
+
+        with patch.object(import_module.redis_client, "is_connected", False):
+            service.mark_queued(options, total_rows=100)
+            assert service.get_status("job-1")["status"] == "queued"
+
+            service.run_tracked_import(data, "leads.csv", options, total_rows=100)
+            status = service.get_status("job-1")
+
+        assert status["status"] == "completed"
+        assert status["processed"] == 100
+        assert status["progress_percentage"] == 100.0
+
+    def test_unknown_import(self, service):
+        with patch.object(import_module.redis_client, "is_connected", False):
+            assert service.get_status("missing") is None
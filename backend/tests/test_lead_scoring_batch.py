@@ -0,0 +1,173 @@
+"""
+Unit Tests for LeadScoringEngine.score_batch and bulk rescoring
+"""
+
+import random
+from contextlib import contextmanager
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.models.lead_schemas import LeadSource, LeadStatus, UrgencyLevel
+from app.models.lead_sqlalchemy import Lead, LeadSourceEnum, LeadStatusEnum, LeadTemperatureEnum
+from app.services import lead_service as lead_service_module
+from app.services.lead_scoring import SCORE_BATCH_COLUMNS, LeadScoringEngine
+from app.services.lead_service import LeadService
+
+ZIP_CODES = [None, "", "48009", "48009-1234", "48075", "48201", "480"]
+PROPERTY_VALUES = [None, 0, 150000, 200000, 299999, 300000, 499999, 500000, 900000]
+RESPONSE_MINUTES = [None, 0, 2, 3, 5, 15, 16, 60, 61, 1440, 1441]
+INTERACTIONS = [0, 1, 2, 3, 4, 5, 9, 10, 25]
+BUDGET_MINS = [None, 0, 5000, 8000, 14999, 15000]
+SOURCES = list(LeadSource) + [None]
+STATUSES = list(LeadStatus)
+URGENCIES = list(UrgencyLevel) + [None]
+
+
+def _random_leads(n, seed=7):
+    rng = random.Random(seed)
+    return [
+        {
+            "property_value": rng.choice(PROPERTY_VALUES),
+            "zip_code": rng.choice(ZIP_CODES),
+            "source": rng.choice(SOURCES),
+            "status": rng.choice(STATUSES),
+            "urgency": rng.choice(URGENCIES),
+            "interaction_count": rng.choice(INTERACTIONS),
+            "response_time_minutes": rng.choice(RESPONSE_MINUTES),
+            "budget_range_min": rng.choice(BUDGET_MINS),
+            "budget_confirmed": rng.random() < 0.2,
+            "is_decision_maker": rng.random() < 0.5,
+        }
+        for _ in range(n)
+    ]
+
+
+def _scalar(engine, attrs):
+    lead = Lead(
+        **{k: v for k, v in attrs.items() if k not in ("budget_confirmed", "is_decision_maker")}
+    )
+    return engine.calculate_score(
+        lead,
+        budget_confirmed=attrs["budget_confirmed"],
+        is_decision_maker=attrs["is_decision_maker"],
+    ).model_dump(mode="json")
+
+
+class TestScoreBatch:
+    def test_matches_scalar_engine(self, app):
+        engine = LeadScoringEngine()
+        leads = _random_leads(2000)
+
+        batch = engine.score_batch(pd.DataFrame(leads, columns=SCORE_BATCH_COLUMNS))
+
+        expected = pd.DataFrame([_scalar(engine, attrs) for attrs in leads])
+        pd.testing.assert_frame_equal(
+            batch[expected.columns].reset_index(drop=True),
+            expected,
+            check_dtype=False,
+        )
+
+    def test_unknown_interaction_count_matches_scalar(self, app):
+        engine = LeadScoringEngine()
+        attrs = dict(_random_leads(1, seed=3)[0], interaction_count=None)
+
+        batch = engine.score_batch(pd.DataFrame([attrs], columns=SCORE_BATCH_COLUMNS))
+        scalar = _scalar(engine, attrs)
+
+        assert scalar["interaction_count_points"] == 0
+        assert batch.iloc[0][list(scalar)].to_dict() == scalar
+
+    def test_accepts_orm_enums_and_plain_strings(self):
+        engine = LeadScoringEngine()
+        frame = {
+            "source": [LeadSourceEnum.WEBSITE_FORM, "website_form", LeadSource.WEBSITE_FORM],
+            "status": [LeadStatusEnum.QUALIFIED, "qualified", LeadStatus.QUALIFIED],
+        }
+
+        scores = engine.score_batch(frame)
+
+        assert scores["engagement_points"].tolist() == [15, 15, 15]
+
+    def test_missing_columns_are_unknown(self):
+        scores = LeadScoringEngine().score_batch(pd.DataFrame(index=range(2)))
+
+        assert scores["property_value_points"].tolist() == [5, 5]
+        assert scores["location_points"].tolist() == [3, 3]
+        assert scores["temperature"].tolist() == ["cold", "cold"]
+
+    def test_empty_input(self):
+        scores = LeadScoringEngine().score_batch(pd.DataFrame(columns=SCORE_BATCH_COLUMNS))
+
+        assert len(scores) == 0
+
+
+@pytest.fixture
+def lead_db(app):
+    """SQLite leads table behind LeadService's session helper"""
+    engine = create_engine("sqlite://")
+    Lead.__table__.create(engine)
+
+    @contextmanager
+    def session_scope():
+        with Session(engine) as session:
+            yield session
+            session.commit()
+
+    with patch.object(lead_service_module, "get_db_session", session_scope), \
+            patch.object(lead_service_module, "invalidate_tags") as invalidate:
+        with Session(engine) as session:
+            yield session, invalidate
+
+
+class TestRescoreAllLeads:
+    def test_scores_written_in_chunks(self, lead_db):
+        session, invalidate = lead_db
+        leads = _random_leads(25, seed=11)
+        for i, attrs in enumerate(leads):
+            session.add(
+                Lead(
+                    id=f"lead-{i:03d}",
+                    first_name="Test",
+                    last_name=f"Lead{i}",
+                    phone="2485550000",
+                    source=LeadSourceEnum(attrs["source"].value) if attrs["source"] else LeadSourceEnum.REFERRAL,
+                    status=LeadStatusEnum(attrs["status"].value),
+                    property_value=attrs["property_value"],
+                    zip_code=attrs["zip_code"],
+                    interaction_count=attrs["interaction_count"],
+                    response_time_minutes=attrs["response_time_minutes"],
+                    budget_range_min=attrs["budget_range_min"],
+                    lead_score=-1,
+                    is_deleted=i == 0,
+                )
+            )
+        session.commit()
+
+        result = LeadService.rescore_all_leads(chunk_size=4)
+
+        assert result == {"scanned": 24, "updated": 24}
+        invalidate.assert_called_once_with("leads")
+
+        engine = LeadScoringEngine()
+        session.expire_all()
+        for lead in session.query(Lead).filter(Lead.is_deleted == False):
+            expected = engine.calculate_score(lead)
+            assert lead.lead_score == expected.total_score
+            assert lead.temperature == LeadTemperatureEnum(expected.temperature.value)
+
+        assert session.get(Lead, "lead-000").lead_score == -1
+
+    def test_unchanged_scores_are_not_rewritten(self, lead_db):
+        session, _ = lead_db
+        session.add(
+            Lead(id="lead-1", first_name="A", last_name="B", phone="2485550000",
+                 source=LeadSourceEnum.REFERRAL, interaction_count=0, lead_score=-1)
+        )
+        session.commit()
+
+        assert LeadService.rescore_all_leads()["updated"] == 1
+        assert LeadService.rescore_all_leads() == {"scanned": 1, "updated": 0}
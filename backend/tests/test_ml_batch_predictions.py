@@ -0,0 +1,125 @@
+"""
+Unit Tests for the vectorized /predict/nba/batch path
+"""
+
+import asyncio
+import uuid
+from contextlib import contextmanager
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+from fastapi import BackgroundTasks
+from pydantic import ValidationError
+from sklearn.ensemble import GradientBoostingClassifier
+
+from app.ml.feature_engineering import build_feature_pipeline
+from app.ml.next_best_action import NextBestActionModel
+from app.routes import ml_predictions
+from app.routes.ml_predictions import (
+    MAX_BATCH_SIZE,
+    BatchPredictionRequest,
+    LeadFeatures,
+    ModelManager,
+    features_batch_to_dataframe,
+    features_to_dataframe,
+    predict_batch,
+)
+
+
+def _lead(i, **overrides):
+    lead = {
+        "lead_id": f"lead_{i}",
+        "source": ["google_ads", "referral", "facebook_ads"][i % 3],
+        "created_at": "2025-09-01T10:00:00",
+        "last_interaction_at": "2025-10-01T10:00:00",
+        "interaction_count": i % 12,
+        "estimated_value": 200000.0 + i * 5000,
+        "property_zip": ["48302", "48187", "48009"][i % 3],
+        "lead_score": i % 100,
+        "interactions": [{"type": "email", "opened": i % 2 == 0}],
+        "appointments": [],
+    }
+    lead.update(overrides)
+    return lead
+
+
+@pytest.fixture(scope="module")
+def manager(tmp_path_factory):
+    """ModelManager with a small trained model and fitted pipeline"""
+    train = [LeadFeatures.model_validate(_lead(i)) for i in range(120)]
+    pipeline = build_feature_pipeline()
+    X = pipeline.fit_transform(features_batch_to_dataframe(train))
+    y = np.array(NextBestActionModel.ACTIONS[:3])[np.arange(len(X)) % 3]
+
+    model = NextBestActionModel(model_path=str(tmp_path_factory.mktemp("models")))
+    model.model = GradientBoostingClassifier(n_estimators=10, max_depth=3, random_state=0).fit(X, y)
+
+    mgr = ModelManager()
+    saved = (mgr._model, mgr._pipeline)
+    mgr._model, mgr._pipeline = model, pipeline
+    yield mgr
+    mgr._model, mgr._pipeline = saved
+
+
+def _run(manager, leads):
+    tasks = BackgroundTasks()
+    response = asyncio.run(predict_batch(BatchPredictionRequest(leads=leads), tasks, manager))
+    return response, tasks
+
+
+class TestBatchPrediction:
+    def test_matches_per_lead_predictions(self, manager):
+        leads = [_lead(i) for i in range(40)]
+
+        response, _ = _run(manager, leads)
+
+        assert response.processed_count == 40
+        for raw, prediction in zip(leads, response.predictions):
+            X = manager.pipeline.transform(features_to_dataframe(LeadFeatures.model_validate(raw)))
+            single = manager.model.predict_single(X)
+            assert prediction.lead_id == raw["lead_id"]
+            assert prediction.action == single["action"]
+            assert prediction.all_probabilities == pytest.approx(single["all_probabilities"])
+
+    def test_single_transform_and_predict_call(self, manager):
+        with patch.object(manager.pipeline, "transform", wraps=manager.pipeline.transform) as transform, \
+                patch.object(manager.model.model, "predict_proba",
+                             wraps=manager.model.model.predict_proba) as predict_proba:
+            _run(manager, [_lead(i) for i in range(25)])
+
+        assert transform.call_count == 1
+        assert predict_proba.call_count == 1
+
+    def test_invalid_leads_reported_per_row(self, manager):
+        leads = [_lead(0), _lead(1, property_zip="abc"), _lead(2), {"lead_id": "lead_3"}]
+
+        response, _ = _run(manager, leads)
+
+        assert [p.lead_id for p in response.predictions] == ["lead_0", "lead_2"]
+        assert response.failed_count == 2
+        assert [(e.index, e.lead_id) for e in response.errors] == [(1, "lead_1"), (3, "lead_3")]
+
+    def test_batch_cap(self):
+        assert MAX_BATCH_SIZE > 100
+        with pytest.raises(ValidationError):
+            BatchPredictionRequest(leads=[_lead(0)] * (MAX_BATCH_SIZE + 1))
+
+    def test_predictions_logged_with_one_insert(self, manager):
+        lead_ids = [str(uuid.uuid4()) for _ in range(3)]
+        response, tasks = _run(manager, [_lead(i, lead_id=lead_id) for i, lead_id in enumerate(lead_ids)]
+                               + [_lead(9)])
+        db = MagicMock()
+
+        @contextmanager
+        def session():
+            yield db
+
+        with patch.object(ml_predictions, "get_db_session", session):
+            for task in tasks.tasks:
+                task.func(*task.args, **task.kwargs)
+
+        assert db.execute.call_count == 1
+        _, rows = db.execute.call_args[0]
+        assert [row["lead_id"] for row in rows] == lead_ids
+        assert rows[0]["model_type"] == "nba"
@@ -0,0 +1,178 @@
+"""
+Unit Tests for memory-mapped model loading and background hot-swap
+"""
+
+import asyncio
+import threading
+from unittest.mock import patch
+
+import joblib
+import numpy as np
+import pytest
+from fastapi import BackgroundTasks, HTTPException
+from sklearn.ensemble import HistGradientBoostingClassifier
+
+from app.ml.feature_engineering import build_feature_pipeline
+from app.ml.next_best_action import NextBestActionModel
+from app.routes import ml_predictions
+from app.routes.ml_predictions import (
+    BatchPredictionRequest,
+    LeadFeatures,
+    ModelBundle,
+    ModelManager,
+    PredictionCache,
+    features_batch_to_dataframe,
+    predict_batch,
+    reload_models,
+)
+
+
+def _lead(i):
+    return {
+        "lead_id": f"lead_{i}",
+        "source": ["google_ads", "referral", "facebook_ads"][i % 3],
+        "created_at": "2025-09-01T10:00:00",
+        "last_interaction_at": "2025-10-01T10:00:00",
+        "interaction_count": i % 12,
+        "estimated_value": 200000.0 + i * 5000,
+        "property_zip": ["48302", "48187", "48009"][i % 3],
+        "lead_score": i % 100,
+        "interactions": [{"type": "email", "opened": i % 2 == 0}],
+    }
+
+
+def _save_version(model_dir, version, seed):
+    """Write model and pipeline artifacts the way the trainer does"""
+    pipeline = build_feature_pipeline()
+    X = pipeline.fit_transform(features_batch_to_dataframe(
+        [LeadFeatures.model_validate(_lead(i)) for i in range(90)]
+    ))
+    y = np.array(NextBestActionModel.ACTIONS[:3])[(np.arange(len(X)) + seed) % 3]
+
+    model = HistGradientBoostingClassifier(max_iter=15, random_state=seed).fit(X, y)
+    joblib.dump(model, model_dir / f"nba_model_v{version}.joblib", protocol=5)
+    joblib.dump(pipeline, model_dir / f"feature_pipeline_v{version}.joblib", protocol=5)
+
+
+@pytest.fixture
+def manager(tmp_path):
+    """Global ModelManager pointed at a temp artifact dir with versions 1 and 2"""
+    _save_version(tmp_path, "1", seed=0)
+    _save_version(tmp_path, "2", seed=1)
+
+    mgr = ModelManager()
+    saved = (mgr._bundle, mgr.prediction_cache, mgr.reload_status)
+    mgr._bundle, mgr.prediction_cache = ModelBundle(version="1"), PredictionCache()
+    with patch.object(ml_predictions, "MODEL_DIR", str(tmp_path)):
+        mgr.load_models(version="1")
+        yield mgr
+    if mgr._reload_thread is not None:
+        mgr._reload_thread.join(timeout=30)
+    mgr._bundle, mgr.prediction_cache, mgr.reload_status = saved
+
+
+def _wait_for_reload(manager):
+    manager._reload_thread.join(timeout=30)
+    return manager.reload_status
+
+
+def _run(manager, leads):
+    return asyncio.run(predict_batch(BatchPredictionRequest(leads=leads), BackgroundTasks(), manager))
+
+
+class TestArtifactLoading:
+    def test_numpy_parts_are_memory_mapped(self, manager):
+        predictors = manager.model.model._predictors
+
+        assert isinstance(predictors[0][0].nodes, np.memmap)
+        assert not predictors[0][0].nodes.flags.writeable
+        assert isinstance(manager.pipeline.named_steps["preprocessor"].named_transformers_["num"].mean_, np.memmap)
+
+    def test_memory_mapped_model_predicts_like_heap_copy(self, manager, tmp_path):
+        X = manager.pipeline.transform(features_batch_to_dataframe(
+            [LeadFeatures.model_validate(_lead(i)) for i in range(20)]
+        ))
+        heap = joblib.load(tmp_path / "nba_model_v1.joblib")
+
+        np.testing.assert_array_equal(manager.model.model.predict_proba(X), heap.predict_proba(X))
+
+
+class TestHotSwap:
+    def test_reload_swaps_after_canary(self, manager):
+        with patch.object(manager.prediction_cache, "purge") as purge:
+            manager.start_reload("2")
+            status = _wait_for_reload(manager)
+
+        assert status["state"] == "ready"
+        assert status["canary_action"] in NextBestActionModel.ACTIONS
+        assert manager.version == "2"
+        purge.assert_called_once()
+
+    def test_in_flight_request_finishes_on_old_bundle(self, manager):
+        X = manager.pipeline.transform(features_batch_to_dataframe([LeadFeatures.model_validate(_lead(0))]))
+        pinned = manager.current()
+
+        manager.start_reload("2")
+        _wait_for_reload(manager)
+
+        assert manager.current() is not pinned
+        assert pinned.version == "1"
+        assert manager.predict(X, pinned) == pinned.model.predict(X, return_probabilities=True)
+
+    def test_requests_served_while_loading(self, manager):
+        release = threading.Event()
+        load_bundle = manager._load_bundle
+
+        def slow_load(version):
+            release.wait(timeout=30)
+            return load_bundle(version)
+
+        with patch.object(manager, "_load_bundle", side_effect=slow_load):
+            manager.start_reload("2")
+            response = _run(manager, [_lead(i) for i in range(5)])
+            release.set()
+            _wait_for_reload(manager)
+
+        assert response.processed_count == 5
+        assert {p.model_version for p in response.predictions} == {"1"}
+        assert manager.version == "2"
+
+    def test_failed_reload_keeps_serving(self, manager):
+        before = manager.current()
+
+        manager.start_reload("missing")
+        status = _wait_for_reload(manager)
+
+        assert status["state"] == "failed"
+        assert "not found" in status["error"]
+        assert manager.current() is before
+
+    def test_broken_artifact_rejected_by_canary(self, manager, tmp_path):
+        joblib.dump(build_feature_pipeline(), tmp_path / "feature_pipeline_v2.joblib")  # unfitted
+
+        manager.start_reload("2")
+        status = _wait_for_reload(manager)
+
+        assert status["state"] == "failed"
+        assert manager.version == "1"
+
+    def test_concurrent_reload_rejected(self, manager):
+        manager.reload_status = {"state": "loading", "version": "2"}
+
+        with pytest.raises(HTTPException) as exc:
+            asyncio.run(reload_models(version="3", manager=manager))
+
+        assert exc.value.status_code == 409
+
+    def test_same_version_retrain_gets_new_cache_keys(self, manager, tmp_path):
+        X = manager.pipeline.transform(features_batch_to_dataframe([LeadFeatures.model_validate(_lead(0))]))
+        before = manager.current()
+
+        _save_version(tmp_path, "1", seed=5)
+        manager.start_reload("1")
+        assert _wait_for_reload(manager)["state"] == "ready"
+        after = manager.current()
+
+        assert after.version == before.version
+        assert after.artifact_hash != before.artifact_hash
+        assert manager.prediction_cache.keys(after.cache_tag, X) != manager.prediction_cache.keys(before.cache_tag, X)
@@ -0,0 +1,77 @@
+"""
+Unit Tests for NBA model training backends and hyperparameter search
+"""
+
+import json
+
+import numpy as np
+import pytest
+from sklearn.ensemble import GradientBoostingClassifier, HistGradientBoostingClassifier
+
+from app.ml.next_best_action import NextBestActionModel
+
+
+@pytest.fixture
+def data():
+    """Small separable 3-action problem"""
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(240, 6))
+    y = np.array(NextBestActionModel.ACTIONS[:3])[np.argmax(X[:, :3], axis=1)]
+    return X[:180], y[:180], X[180:], y[180:]
+
+
+class TestHyperparameterSearch:
+    def test_hist_halving_search(self, data, tmp_path):
+        model = NextBestActionModel(model_path=str(tmp_path))
+
+        model.train(*data, n_iter=6, backend="hist", search="halving", n_jobs=1)
+
+        assert isinstance(model.model, HistGradientBoostingClassifier)
+        assert model.evaluate(data[2], data[3], detailed=False)["accuracy"] > 0.6
+        # Later rounds evaluate fewer candidates on more data
+        rounds = {}
+        for result in model.search_results:
+            rounds.setdefault(result["iteration"], []).append(result["n_resources"])
+        assert len(rounds) > 1
+        assert len(rounds[0]) > len(rounds[max(rounds)])
+        assert rounds[0][0] < rounds[max(rounds)][0]
+
+    def test_candidate_times_recorded(self, data, tmp_path):
+        model = NextBestActionModel(model_path=str(tmp_path))
+
+        model.train(*data, n_iter=4, backend="hist", search="random", n_jobs=1)
+
+        assert len(model.search_results) == 4
+        for result in model.search_results:
+            assert result["fit_wall_time_s"] > 0
+            assert result["fit_cpu_time_s"] > 0
+            assert result["n_folds"] == 5
+            assert 0 <= result["mean_f1_weighted"] <= 1
+        assert model.training_stats["n_candidates"] == 4
+        assert model.training_stats["n_estimators"] == model.model.n_iter_
+
+    def test_metadata_includes_search_results(self, data, tmp_path):
+        model = NextBestActionModel(model_path=str(tmp_path))
+        model.train(*data, n_iter=3, backend="hist", search="random", n_jobs=1)
+
+        model.save(version="t1")
+
+        metadata = json.loads((tmp_path / "nba_model_vt1_metadata.json").read_text())
+        assert metadata["backend"] == "hist"
+        assert metadata["n_estimators"] == model.model.n_iter_
+        assert len(metadata["search_results"]) == 3
+        assert metadata["training_stats"]["search"] == "random"
+
+    def test_gbm_backend_without_search(self, data, tmp_path):
+        model = NextBestActionModel(model_path=str(tmp_path))
+
+        model.train(*data, hyperparameter_search=False, backend="gbm")
+
+        assert isinstance(model.model, GradientBoostingClassifier)
+        assert model.training_stats["n_estimators"] == 200
+        assert len(model.get_feature_importance(top_n=3)) == 3
+
+    @pytest.mark.parametrize("kwargs", [{"backend": "xgboost"}, {"search": "grid"}])
+    def test_invalid_options_rejected(self, data, tmp_path, kwargs):
+        with pytest.raises(ValueError):
+            NextBestActionModel(model_path=str(tmp_path)).train(*data, **kwargs)
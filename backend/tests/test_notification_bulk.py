@@ -0,0 +1,313 @@
+"""
+Unit Tests for bulk notification sending
+"""
+
+import json
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.services.notification import NotificationService
+
+
+def _split_conditions(expr):
+    """Split a PostgREST logic tree on its top-level commas"""
+    parts, depth, start = [], 0, 0
+    for i, char in enumerate(expr):
+        depth += char == "("
+        depth -= char == ")"
+        if char == "," and depth == 0:
+            parts.append(expr[start:i])
+            start = i + 1
+    return parts + [expr[start:]]
+
+
+def _logic_matches(expr, row):
+    """Evaluate a PostgREST or=/and= condition (eq, lt, is.null) against a row"""
+    for group, combine in (("and(", all), ("or(", any)):
+        if expr.startswith(group):
+            return combine(_logic_matches(part, row) for part in _split_conditions(expr[len(group):-1]))
+    column, op, value = expr.split(".", 2)
+    value = value.strip('"')
+    if op == "is":
+        return row.get(column) is None
+    if op == "lt":
+        return row.get(column) is not None and row.get(column) < value
+    return row.get(column) == value
+
+
+class FakeQuery:
+    """Applies a Supabase query chain to in-memory rows"""
+
+    def __init__(self, db, table):
+        self.db = db
+        self.table = table
+        self.op = "select"
+        self.payload = None
+        self.filters = []
+        self.row_limit = None
+
+    def select(self, *args):
+        return self
+
+    def insert(self, rows):
+        self.op, self.payload = "insert", rows
+        return self
+
+    def update(self, data):
+        self.op, self.payload = "update", data
+        return self
+
+    def in_(self, column, values):
+        self.filters.append(("in", column, list(values)))
+        return self
+
+    def eq(self, column, value):
+        self.filters.append(("eq", column, value))
+        return self
+
+    def or_(self, expr):
+        self.filters.append(("or", None, expr))
+        return self
+
+    def lte(self, column, value):
+        return self
+
+    def order(self, column):
+        return self
+
+    def limit(self, count):
+        self.row_limit = count
+        return self
+
+    def _matches(self, row):
+        for op, column, value in self.filters:
+            if op == "in" and row.get(column) not in value:
+                return False
+            if op == "eq" and row.get(column) != value:
+                return False
+            if op == "or" and not any(_logic_matches(part, row) for part in _split_conditions(value)):
+                return False
+        return True
+
+    def execute(self):
+        self.db.calls.append((self.table, self.op, self.payload, self.filters))
+        result = MagicMock()
+        rows = self.db.rows.setdefault(self.table, [])
+        if self.op == "insert":
+            result.data = [{**row, "id": f"{self.table}-{i}"} for i, row in enumerate(self.payload)]
+        elif self.op == "select":
+            result.data = [dict(row) for row in rows if self._matches(row)][: self.row_limit]
+        else:
+            updated = []
+            for row in rows:
+                if self._matches(row):
+                    row.update(self.payload)
+                    updated.append(dict(row))
+            result.data = updated
+        return result
+
+
+class FakeSupabase:
+    def __init__(self, rows=None):
+        self.rows = rows or {}
+        self.calls = []
+
+    def from_(self, table):
+        return FakeQuery(self, table)
+
+    def rpc(self, name, params):
+        raise RuntimeError(f"function {name} does not exist")
+
+    def calls_for(self, table, op):
+        return [call for call in self.calls if call[0] == table and call[1] == op]
+
+
+@pytest.fixture
+def service():
+    service = NotificationService()
+    service.supabase = FakeSupabase(
+        rows={
+            "users": [
+                {"id": "user-1", "email": "one@example.com", "first_name": "Ann"},
+                {"id": "user-2", "email": "two@example.com", "first_name": "Bob"},
+            ]
+        }
+    )
+    service.email_service = MagicMock()
+    service.email_service.send_bulk_emails.return_value = {"success": True, "message_id": "msg-1"}
+    service.sms_service = MagicMock()
+    service.sms_service.send_sms.return_value = (True, "SM1", {})
+    service.realtime_service = MagicMock()
+    service.realtime_service.trigger_batch.return_value = True
+    return service
+
+
+class TestSendBulkNotifications:
+    def test_loads_recipients_once_and_writes_in_bulk(self, service):
+        recipients = [{"id": "user-1"}, {"id": "user-2"}, {"email": "three@example.com", "first_name": "Cy"}]
+
+        results = service.send_bulk_notifications(
+            "review_request", recipients, {"review_url": "https://example.com/r"}, channels=["email"]
+        )
+
+        assert results["sent"] == 3
+        assert results["failed"] == 0
+        db = service.supabase
+        assert len(db.calls_for("users", "select")) == 1
+        assert len(db.calls_for("notification_preferences", "select")) == 1
+        assert len(db.calls_for("notifications", "insert")) == 1
+        updates = db.calls_for("notifications", "update")
+        assert len(updates) == 1
+        assert updates[0][2]["status"] == "sent"
+        assert updates[0][3] == [("in", "id", ["notifications-0", "notifications-1", "notifications-2"])]
+
+    def test_email_rendered_once_with_personalizations(self, service):
+        recipients = [{"id": "user-1", "first_name": "Ann"}, {"id": "user-2", "first_name": "Bob"}]
+
+        service.send_bulk_notifications(
+            "review_request", recipients, {"google_review_url": "https://example.com/r"}, channels=["email"]
+        )
+
+        service.email_service.send_bulk_emails.assert_called_once()
+        kwargs = service.email_service.send_bulk_emails.call_args.kwargs
+        assert "-first_name-" in kwargs["subject"]
+        assert "https://example.com/r" in kwargs["html_content"]
+        personalizations = kwargs["recipients"]
+        assert [p["email"] for p in personalizations] == ["one@example.com", "two@example.com"]
+        assert personalizations[0]["substitutions"]["-first_name-"] == "Ann"
+        assert personalizations[1]["substitutions"]["-first_name:html-"] == "Bob"
+        assert personalizations[0]["custom_args"]["notification_id"] == "notifications-0"
+
+    def test_sms_sent_per_recipient_and_failures_reported(self, service):
+        service.sms_service.send_sms.side_effect = lambda to_phone, message: (
+            (False, None, {"error": "invalid number"}) if to_phone == "bad" else (True, "SM1", {})
+        )
+        recipients = [
+            {"id": "user-1", "phone": "+12485550001"},
+            {"id": "user-2", "phone": "bad"},
+        ]
+
+        results = service.send_bulk_notifications(
+            "review_request", recipients, {"review_url": "https://example.com/r"}, channels=["sms"]
+        )
+
+        assert service.sms_service.send_sms.call_count == 2
+        assert results["sent"] == 1
+        assert results["failed"] == 1
+        assert [r["success"] for r in results["results"]] == [True, False]
+        statuses = {call[2]["status"] for call in service.supabase.calls_for("notifications", "update")}
+        assert statuses == {"sent", "failed"}
+
+    def test_recipient_without_contact_is_reported(self, service):
+        results = service.send_bulk_notifications(
+            "review_request", [{"id": "user-9"}], {}, channels=["email"]
+        )
+
+        assert results["failed"] == 1
+        assert results["results"][0]["error"] == "Recipient not found"
+        service.email_service.send_bulk_emails.assert_not_called()
+
+    def test_in_app_uses_batch_trigger(self, service):
+        recipients = [{"id": f"user-{i}", "email": f"u{i}@example.com"} for i in range(12)]
+
+        results = service.send_bulk_notifications(
+            "review_request", recipients, {}, channels=["in_app"]
+        )
+
+        assert results["sent"] == 12
+        assert service.realtime_service.trigger_batch.call_count == 2
+
+
+def scheduled_row(row_id, recipient_id="user-1"):
+    return {
+        "id": row_id,
+        "type": "review_request",
+        "channels": ["email"],
+        "recipient_id": recipient_id,
+        "data": json.dumps({"first_name": "Ann"}),
+        "priority": "normal",
+        "status": "pending",
+    }
+
+
+class TestProcessScheduledNotifications:
+    def test_claims_in_batches_and_writes_status_in_bulk(self, service):
+        service.supabase.rows["scheduled_notifications"] = [scheduled_row(f"s-{i}") for i in range(5)]
+        service.send_notification = MagicMock(return_value={"success": True})
+
+        totals = service.process_scheduled_notifications(batch_size=2)
+
+        assert totals == {"claimed": 5, "sent": 5, "failed": 0}
+        assert service.send_notification.call_count == 5
+        rows = service.supabase.rows["scheduled_notifications"]
+        assert {row["status"] for row in rows} == {"sent"}
+        status_writes = [
+            call
+            for call in service.supabase.calls_for("scheduled_notifications", "update")
+            if call[2]["status"] == "sent"
+        ]
+        # One status write per batch, not per notification
+        assert len(status_writes) == 3
+
+    def test_rows_claimed_by_another_worker_are_skipped(self, service):
+        service.supabase.rows["scheduled_notifications"] = [scheduled_row("s-1"), scheduled_row("s-2")]
+        service.send_notification = MagicMock(return_value={"success": True})
+        original_update = FakeQuery.update
+
+        def racing_update(query, data):
+            # Another worker flips s-1 between our select and our claim
+            service.supabase.rows["scheduled_notifications"][0].update(
+                status="sending", claimed_by="other", claimed_at=datetime.utcnow().isoformat()
+            )
+            return original_update(query, data)
+
+        with patch.object(FakeQuery, "update", racing_update):
+            claimed = service.claim_scheduled_notifications(10)
+
+        assert [row["id"] for row in claimed] == ["s-2"]
+
+    def test_fallback_stamps_claim_and_reclaims_expired_leases(self, service):
+        expired = (datetime.utcnow() - timedelta(hours=1)).isoformat()
+        service.supabase.rows["scheduled_notifications"] = [
+            scheduled_row("s-1"),
+            {**scheduled_row("s-2"), "status": "sending", "claimed_by": "dead", "claimed_at": expired},
+            {**scheduled_row("s-3"), "status": "sending"},
+            {**scheduled_row("s-4"), "status": "sending", "claimed_by": "live",
+             "claimed_at": datetime.utcnow().isoformat()},
+        ]
+
+        claimed = service.claim_scheduled_notifications(10)
+
+        assert [row["id"] for row in claimed] == ["s-1", "s-2", "s-3"]
+        assert {row["claimed_by"] for row in claimed} == {service.worker_id}
+        assert all(row["claimed_at"] > expired for row in claimed)
+        assert service.supabase.rows["scheduled_notifications"][3]["claimed_by"] == "live"
+
+    def test_uses_claim_rpc_when_deployed(self, service):
+        service.supabase.rpc = MagicMock()
+        service.supabase.rpc.return_value.execute.return_value.data = [scheduled_row("s-1")]
+
+        claimed = service.claim_scheduled_notifications(25)
+
+        assert [row["id"] for row in claimed] == ["s-1"]
+        name, params = service.supabase.rpc.call_args.args
+        assert name == "claim_scheduled_notifications"
+        assert params["p_batch_size"] == 25
+        assert params["p_worker"] == service.worker_id
+
+    def test_failed_sends_are_marked_failed(self, service):
+        service.supabase.rows["scheduled_notifications"] = [
+            scheduled_row("s-1"),
+            scheduled_row("s-2", recipient_id="user-2"),
+        ]
+        service.send_notification = MagicMock(
+            side_effect=lambda **kwargs: {"success": kwargs["recipient_id"] == "user-1"}
+        )
+
+        totals = service.process_scheduled_notifications()
+
+        assert totals == {"claimed": 2, "sent": 1, "failed": 1}
+        statuses = {row["id"]: row["status"] for row in service.supabase.rows["scheduled_notifications"]}
+        assert statuses == {"s-1": "sent", "s-2": "failed"}
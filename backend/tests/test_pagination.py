@@ -0,0 +1,159 @@
+"""
+Unit Tests for keyset pagination and optional totals
+"""
+
+import fnmatch
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+from sqlalchemy import Column, DateTime, Integer, String, create_engine
+from sqlalchemy.orm import Session, declarative_base
+
+from app.utils import cache as cache_module
+from app.utils.pagination import (
+    count_total,
+    create_keyset_response,
+    encode_cursor,
+    extract_total_mode,
+    paginate_keyset,
+    resolve_keyset_sort,
+)
+from app.utils.redis_client import MockRedisClient
+
+Base = declarative_base()
+
+
+class Row(Base):
+    __tablename__ = "keyset_rows"
+
+    id = Column(String(36), primary_key=True)
+    score = Column(Integer, nullable=False)
+    created_at = Column(DateTime, nullable=False)
+
+
+@pytest.fixture
+def db():
+    """In-memory SQLite session with rows sharing sort keys"""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+
+    with Session(engine) as session:
+        session.add_all([
+            Row(id=f"r{i:02d}", score=i % 3, created_at=datetime(2026, 10, 1 + i // 2))
+            for i in range(10)
+        ])
+        session.commit()
+        yield session
+
+
+def _walk(query, sort_column, direction, limit):
+    """Collect ids page by page"""
+    ids, cursor, pages = [], None, 0
+    while True:
+        rows, cursor = paginate_keyset(query, sort_column, cursor, limit=limit, direction=direction)
+        ids.extend(row.id for row in rows)
+        pages += 1
+        if cursor is None:
+            return ids, pages
+
+
+class TestKeysetPagination:
+    @pytest.mark.parametrize("direction", ["asc", "desc"])
+    def test_walk_matches_full_ordering(self, db, direction):
+        query = db.query(Row)
+        ids, pages = _walk(query, Row.created_at, direction, limit=3)
+
+        expected = sorted(
+            db.query(Row).all(),
+            key=lambda row: (row.created_at, row.id),
+            reverse=direction == "desc",
+        )
+        assert ids == [row.id for row in expected]
+        assert pages == 4
+
+    def test_ties_broken_by_id(self, db):
+        ids, _ = _walk(db.query(Row), Row.score, "desc", limit=2)
+        assert len(ids) == len(set(ids)) == 10
+
+    def test_stable_under_inserts(self, db):
+        query = db.query(Row)
+        first, cursor = paginate_keyset(query, Row.created_at, None, limit=4, direction="desc")
+
+        db.add(Row(id="new", score=0, created_at=datetime(2026, 11, 1)))
+        db.commit()
+
+        second, _ = paginate_keyset(query, Row.created_at, cursor, limit=4, direction="desc")
+        assert not {row.id for row in first} & {row.id for row in second}
+        assert "new" not in {row.id for row in second}
+
+    def test_last_page_has_no_cursor(self, db):
+        rows, cursor = paginate_keyset(db.query(Row), Row.created_at, None, limit=10)
+        assert len(rows) == 10
+        assert cursor is None
+
+    def test_cursor_for_other_sort_rejected(self, db):
+        cursor = encode_cursor(Row.score, "desc", 1, "r01")
+        with pytest.raises(ValueError):
+            paginate_keyset(db.query(Row), Row.created_at, cursor, direction="desc")
+
+    def test_garbage_cursor_rejected(self, db):
+        with pytest.raises(ValueError):
+            paginate_keyset(db.query(Row), Row.created_at, "not-a-cursor")
+
+
+class TestSortAndTotals:
+    def test_resolve_sort(self):
+        column, direction = resolve_keyset_sort(Row, "score:desc", ["score", "created_at"])
+        assert column is Row.score
+        assert direction == "desc"
+
+    def test_resolve_sort_rejects_unindexed_field(self):
+        with pytest.raises(ValueError):
+            resolve_keyset_sort(Row, "id:desc", ["created_at"])
+
+    def test_extract_total_mode(self):
+        assert extract_total_mode({}) is None
+        assert extract_total_mode({"include_total": "true"}) == "exact"
+        assert extract_total_mode({"include_total": "estimate"}) == "estimate"
+        with pytest.raises(ValueError):
+            extract_total_mode({"include_total": "maybe"})
+
+    def test_no_total_by_default(self, db):
+        assert count_total(db.query(Row), None) == (None, None)
+
+    def test_estimate_falls_back_to_exact_off_postgres(self, db):
+        query = db.query(Row).filter(Row.score == 0)
+        assert count_total(query, "estimate") == (4, "exact")
+
+    def test_cached_total_reused_per_filter(self, db):
+        client = MockRedisClient()
+        client.is_connected = True
+        client.subscribe = MagicMock(return_value=None)
+        client.scan_keys = lambda pattern="*", count=100: [
+            key for key in client.storage if fnmatch.fnmatch(key, pattern)
+        ]
+
+        with patch("app.utils.cache.redis_client", client):
+            query = db.query(Row).filter(Row.score == 0)
+            assert count_total(query, "cached", tag="rows") == (4, "cached")
+
+            with patch.object(type(query), "count", side_effect=AssertionError("recounted")):
+                assert count_total(query, "cached", tag="rows") == (4, "cached")
+
+            other = db.query(Row).filter(Row.score == 1)
+            assert count_total(other, "cached", tag="rows") == (3, "cached")
+
+            cache_module.invalidate_tags("rows")
+            assert client.smembers("crm:tags:rows") == set()
+
+    def test_response_shape(self):
+        response = create_keyset_response([1, 2], "abc", 2, 10, "estimate", data_key="leads")
+        assert response["leads"] == [1, 2]
+        assert response["pagination"] == {
+            "limit": 2,
+            "has_next": True,
+            "next_cursor": "abc",
+            "total_items": 10,
+            "total_type": "estimate",
+        }
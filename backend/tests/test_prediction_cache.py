@@ -0,0 +1,165 @@
+"""
+Unit Tests for the NBA prediction cache
+"""
+
+import asyncio
+import fnmatch
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from fastapi import BackgroundTasks
+from sklearn.ensemble import GradientBoostingClassifier
+
+from app.ml.feature_engineering import build_feature_pipeline
+from app.ml.next_best_action import NextBestActionModel
+from app.routes.ml_predictions import (
+    BatchPredictionRequest,
+    LeadFeatures,
+    ModelManager,
+    PredictionCache,
+    features_batch_to_dataframe,
+    get_model_metrics,
+    predict_batch,
+)
+from app.utils import redis_cache
+
+
+class FakeRedis:
+    """Just the commands the prediction cache uses"""
+
+    def __init__(self):
+        self.store = {}
+
+    def mget(self, keys):
+        return [self.store.get(key) for key in keys]
+
+    def pipeline(self, transaction=True):
+        return self
+
+    def setex(self, key, ttl, value):
+        self.store[key] = value
+
+    def execute(self):
+        return []
+
+    def scan_iter(self, match="*", count=None):
+        return [key for key in list(self.store) if fnmatch.fnmatch(key, match)]
+
+    def delete(self, *keys):
+        return sum(self.store.pop(key, None) is not None for key in keys)
+
+
+def _lead(i, **overrides):
+    lead = {
+        "lead_id": f"lead_{i}",
+        "source": ["google_ads", "referral", "facebook_ads"][i % 3],
+        "created_at": "2025-09-01T10:00:00",
+        "last_interaction_at": "2025-10-01T10:00:00",
+        "interaction_count": i % 12,
+        "estimated_value": 200000.0 + i * 5000,
+        "property_zip": ["48302", "48187", "48009"][i % 3],
+        "lead_score": i % 100,
+        "interactions": [{"type": "email", "opened": i % 2 == 0}],
+        "appointments": [],
+    }
+    lead.update(overrides)
+    return lead
+
+
+@pytest.fixture
+def redis():
+    fake = FakeRedis()
+    with patch.object(redis_cache, "redis_client", fake), patch.object(redis_cache, "ENABLED", True):
+        yield fake
+
+
+@pytest.fixture
+def manager(tmp_path):
+    """ModelManager with a small trained model and a fresh prediction cache"""
+    train = [LeadFeatures.model_validate(_lead(i)) for i in range(90)]
+    pipeline = build_feature_pipeline()
+    X = pipeline.fit_transform(features_batch_to_dataframe(train))
+    y = np.array(NextBestActionModel.ACTIONS[:3])[np.arange(len(X)) % 3]
+
+    model = NextBestActionModel(model_path=str(tmp_path))
+    model.model = GradientBoostingClassifier(n_estimators=10, max_depth=3, random_state=0).fit(X, y)
+
+    mgr = ModelManager()
+    saved = (mgr._model, mgr._pipeline, mgr.prediction_cache)
+    mgr._model, mgr._pipeline, mgr.prediction_cache = model, pipeline, PredictionCache()
+    yield mgr
+    mgr._model, mgr._pipeline, mgr.prediction_cache = saved
+
+
+def _run(manager, leads):
+    return asyncio.run(predict_batch(BatchPredictionRequest(leads=leads), BackgroundTasks(), manager))
+
+
+class TestPredictionCache:
+    def test_repeat_batch_served_from_cache(self, redis, manager):
+        leads = [_lead(i) for i in range(30)]
+        first = _run(manager, leads)
+
+        with patch.object(manager.model.model, "predict_proba") as predict_proba:
+            second = _run(manager, leads)
+
+        predict_proba.assert_not_called()
+        assert [p.model_dump(include={"lead_id", "action", "all_probabilities"}) for p in second.predictions] == \
+            [p.model_dump(include={"lead_id", "action", "all_probabilities"}) for p in first.predictions]
+        assert (manager.prediction_cache.hits, manager.prediction_cache.misses) == (30, 30)
+
+    def test_only_changed_leads_are_scored(self, redis, manager):
+        _run(manager, [_lead(i) for i in range(10)])
+        changed = [_lead(i) for i in range(10)]
+        changed[3] = _lead(3, lead_score=99)
+
+        with patch.object(manager.model.model, "predict_proba",
+                          wraps=manager.model.model.predict_proba) as predict_proba:
+            _run(manager, changed)
+
+        assert predict_proba.call_count == 1
+        assert len(predict_proba.call_args[0][0]) == 1
+
+    def test_keys_include_model_version(self, manager):
+        X = manager.pipeline.transform(features_batch_to_dataframe([LeadFeatures.model_validate(_lead(0))]))
+
+        v1, v2 = manager.prediction_cache.keys("1.0", X), manager.prediction_cache.keys("2.0", X)
+
+        assert v1[0] != v2[0]
+        assert v1[0].split(":")[-1] == v2[0].split(":")[-1]
+
+    def test_purge_only_drops_predictions(self, redis, manager):
+        _run(manager, [_lead(i) for i in range(5)])
+        redis.store["ml:other"] = "1"
+
+        assert manager.prediction_cache.purge() == 5
+        assert list(redis.store) == ["ml:other"]
+
+    def test_version_change_purges(self, redis, manager):
+        _run(manager, [_lead(0)])
+        version = manager._model_version
+
+        with patch.object(NextBestActionModel, "load"):
+            manager._model = None
+            manager.load_models(version="9.9")
+        manager._model_version = version
+
+        assert redis.store == {}
+
+    def test_without_redis_everything_misses(self, manager):
+        with patch.object(redis_cache, "redis_client", None):
+            response = _run(manager, [_lead(i) for i in range(4)] * 2)
+
+        assert response.processed_count == 8
+        assert manager.prediction_cache.hits == 0
+
+    def test_hit_rate_in_metrics(self, redis, manager):
+        leads = [_lead(i) for i in range(4)]
+        _run(manager, leads)
+        _run(manager, leads)
+
+        metrics = asyncio.run(get_model_metrics(manager))
+
+        assert metrics.prediction_cache.hits == 4
+        assert metrics.prediction_cache.hit_rate == pytest.approx(0.5)
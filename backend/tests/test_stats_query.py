@@ -0,0 +1,109 @@
+"""
+Unit Tests for the conditional-aggregate stats builder
+"""
+
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import Column, DateTime, Integer, Numeric, String, create_engine, event
+from sqlalchemy.orm import Session, declarative_base
+
+from app.utils.stats_query import StatsQuery, date_range, day_bounds, run_stats
+
+Base = declarative_base()
+
+
+class Item(Base):
+    __tablename__ = "stats_items"
+
+    id = Column(Integer, primary_key=True)
+    status = Column(String)
+    score = Column(Integer)
+    amount = Column(Numeric)
+    created_at = Column(DateTime)
+
+
+class Other(Base):
+    __tablename__ = "stats_others"
+
+    id = Column(Integer, primary_key=True)
+
+
+@pytest.fixture
+def db():
+    """In-memory SQLite session with a few rows"""
+    engine = create_engine("sqlite://")
+    statements = []
+    event.listen(
+        engine, "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement)
+    )
+    Base.metadata.create_all(engine)
+
+    with Session(engine) as session:
+        session.add_all([
+            Item(status="new", score=90, amount=100, created_at=datetime(2026, 10, 16, 9)),
+            Item(status="new", score=40, amount=50, created_at=datetime(2026, 10, 15, 23, 59)),
+            Item(status="won", score=85, amount=None, created_at=datetime(2026, 9, 30)),
+            Other(), Other(),
+        ])
+        session.commit()
+        statements.clear()
+        session.statements = statements
+        yield session
+
+
+class TestDateRange:
+    def test_half_open_bounds(self):
+        start, end = day_bounds(date(2026, 10, 16))
+        assert start == datetime(2026, 10, 16)
+        assert end == datetime(2026, 10, 17)
+
+    def test_open_ended(self):
+        assert len(date_range(Item.created_at, date(2026, 10, 1))) == 1
+        assert date_range(Item.created_at) == []
+
+    def test_raw_column_compared(self):
+        sql = str(date_range(Item.created_at, date(2026, 10, 1))[0])
+        assert "date(" not in sql.lower()
+
+
+class TestStatsQuery:
+    def test_counts_in_one_query(self, db):
+        today_start, tomorrow_start = day_bounds(date(2026, 10, 16))
+        stats = (
+            StatsQuery(Item)
+            .count("total")
+            .count("new", Item.status == "new")
+            .count("hot_today", Item.score >= 80,
+                   *date_range(Item.created_at, today_start, tomorrow_start))
+            .sum("amount", Item.amount, Item.status == "new")
+            .sum("won_amount", Item.amount, Item.status == "won")
+            .avg("avg_score", Item.score)
+            .run(db)
+        )
+
+        assert stats["total"] == 3
+        assert stats["new"] == 2
+        assert stats["hot_today"] == 1
+        assert stats["amount"] == 150
+        assert stats["won_amount"] == 0
+        assert stats["avg_score"] == pytest.approx(215 / 3)
+        assert len(db.statements) == 1
+
+    def test_base_filters_apply_to_every_counter(self, db):
+        stats = StatsQuery(Item, Item.status == "new").count("total").count(
+            "hot", Item.score >= 80
+        ).run(db)
+
+        assert stats == {"total": 2, "hot": 1}
+
+    def test_run_stats_combines_tables(self, db):
+        stats = run_stats(
+            db,
+            StatsQuery(Item).count("items"),
+            StatsQuery(Other).count("others"),
+        )
+
+        assert stats == {"items": 3, "others": 2}
+        assert len(db.statements) == 1